@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Count sqlite connections and schema DDL statements issued per request.
+
+Runs a few representative pages against a throwaway database twice: once with the
+legacy Database.get_connection() (new connection + full CREATE TABLE pass per call)
+and once with the request-scoped connection manager.
+
+    python benchmarks/connection_bench.py [--results 300]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wavelight import app
+from models import Database
+import migrations
+
+DDL_PREFIXES = ('CREATE ', 'ALTER ', 'PRAGMA TABLE_INFO')
+MEET = 'Bench Invitational'
+
+
+class _Counter:
+    def __init__(self):
+        self.connections = 0
+        self.ddl = 0
+        self.statements = 0
+
+    def trace(self, sql):
+        self.statements += 1
+        if sql.lstrip().upper().startswith(DDL_PREFIXES):
+            self.ddl += 1
+
+
+def _legacy_get_connection():
+    """The pre-request-scope behaviour: connect and re-run the track schema DDL on every call."""
+    conn = sqlite3.connect(app.config['DATABASE'], timeout=30)
+    conn.row_factory = sqlite3.Row
+    cur = conn.cursor()
+    for version, _, step in migrations.MIGRATIONS:
+        if version in (1, 2):  # the CREATE TABLE pass + BoardPosts probe initialize_tables used to run
+            step(cur)
+    conn.commit()
+    return conn
+
+
+def seed(db_path, n_results):
+    app.config['DATABASE'] = db_path
+    Database.bootstrap(db_path)
+    events = ['100m', '400m', '800m', '1500m', 'Long Jump']
+    conn = sqlite3.connect(db_path)
+    with conn:
+        for i in range(n_results):
+            event = events[i % len(events)]
+            result = f"{7 + (i % 50) / 10:.2f}" if event == 'Long Jump' else f"{50 + (i % 97) / 10:.2f}"
+            conn.execute(
+                'INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team) VALUES (?, ?, ?, ?, ?, ?)',
+                ('2024-04-20', f'Athlete {i % 120}', MEET, event, result, f'Team {i % 8}')
+            )
+    conn.close()
+
+
+def measure(paths):
+    counter = _Counter()
+    real_connect = sqlite3.connect
+
+    def counting_connect(*args, **kwargs):
+        conn = real_connect(*args, **kwargs)
+        counter.connections += 1
+        conn.set_trace_callback(counter.trace)
+        return conn
+
+    sqlite3.connect = counting_connect
+    try:
+        rows = []
+        with app.test_client() as client:
+            for path in paths:
+                before = (counter.connections, counter.ddl, counter.statements)
+                resp = client.get(path)
+                rows.append((path, resp.status_code,
+                             counter.connections - before[0],
+                             counter.ddl - before[1],
+                             counter.statements - before[2]))
+        return rows
+    finally:
+        sqlite3.connect = real_connect
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--results', type=int, default=300, help='rows to seed into the benchmark meet')
+    args = parser.parse_args()
+
+    original_db = app.config['DATABASE']
+    fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        seed(db_path, args.results)
+        paths = ['/', f'/meet/{MEET}', '/athlete/Athlete 1', '/leaderboard?event=400m']
+
+        current = Database.get_connection
+        Database.get_connection = staticmethod(_legacy_get_connection)
+        try:
+            before = measure(paths)
+        finally:
+            Database.get_connection = current
+        after = measure(paths)
+
+        print(f"{'path':<28} {'status':>6} {'conns before':>13} {'conns after':>12} "
+              f"{'DDL before':>11} {'DDL after':>10} {'stmts before':>13} {'stmts after':>12}")
+        for b, a in zip(before, after):
+            print(f"{b[0]:<28} {a[1]:>6} {b[2]:>13} {a[2]:>12} {b[3]:>11} {a[3]:>10} {b[4]:>13} {a[4]:>12}")
+    finally:
+        app.config['DATABASE'] = original_db
+        os.remove(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic track database at a chosen number of results.
+
+Builds athletes on teams, a season calendar of meets, individual results with realistic
+marks per event (ft-in as well as metric field marks, DNF/NM, qualifier suffixes), RS
+relay splits, explicit RelayTeams/RelayLegs, stagger scores and history, comments,
+board posts and football games. The same --results and --seed always give the same
+rows, so timings from two commits are measured on identical data.
+
+Rows are written straight into the dimension and *Rows tables (bypassing the view
+triggers), then Meets counts and the derived tables are rebuilt in one pass each.
+
+    python benchmarks/datagen.py --results 100000 --db bench.db [--seed 0]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import migrations
+from utils import athlete_bests, meet_winners
+from utils.result_values import load_time_events, parse_result
+
+# event -> (best, worst) mark for the athletes generated; seconds for times, meters for marks
+EVENT_MARKS = {
+    '100m': (10.6, 14.5), '200m': (21.5, 30.0), '400m': (48.0, 68.0), '800m': (112.0, 170.0),
+    '1600m': (255.0, 390.0), '3200m': (555.0, 840.0), '110mH': (14.0, 21.0), '100mH': (14.2, 20.5),
+    '300mH': (38.5, 52.0), 'Long Jump': (7.2, 4.3), 'Triple Jump': (14.8, 9.5), 'High Jump': (2.05, 1.35),
+    'Pole Vault': (4.8, 2.3), 'Shot Put': (17.5, 8.0), 'Discus': (55.0, 22.0), 'Javelin': (62.0, 25.0),
+}
+# Relative popularity of each event in a meet
+EVENT_WEIGHTS = {
+    '100m': 14, '200m': 11, '400m': 8, '800m': 7, '1600m': 8, '3200m': 5, '110mH': 3, '100mH': 3,
+    '300mH': 3, 'Long Jump': 6, 'Triple Jump': 3, 'High Jump': 4, 'Pole Vault': 2, 'Shot Put': 6,
+    'Discus': 5, 'Javelin': 2,
+}
+# Field events usually entered in feet and inches
+FT_IN_EVENTS = {'Long Jump', 'Triple Jump', 'High Jump', 'Pole Vault', 'Shot Put', 'Discus', 'Javelin'}
+# relay -> (split event, RS split event)
+RELAYS = {'4x100m': ('100m', '100m RS'), '4x400m': ('400m', '400m RS')}
+
+SEASON_START = date(2022, 1, 8)
+SEASONS = 3
+RESULTS_PER_ATHLETE = 30
+ATHLETES_PER_TEAM = 40
+RESULTS_PER_MEET = 400
+PLAYS_PER_GAME = 120
+
+
+def format_time(seconds):
+    if seconds < 60:
+        return f'{seconds:.2f}'
+    minutes, rest = divmod(seconds, 60)
+    return f'{int(minutes)}:{rest:05.2f}'
+
+
+def format_mark(meters, ft_in):
+    if not ft_in:
+        return f'{meters:.2f}'
+    inches = round(meters / 0.0254 * 4) / 4  # quarter-inch precision
+    feet, inches = divmod(inches, 12)
+    return f"{int(feet)}'{inches:g}\""
+
+
+class _Plan:
+    """Sizes derived from the requested number of results."""
+
+    def __init__(self, results):
+        self.results = results
+        self.athletes = max(60, results // RESULTS_PER_ATHLETE)
+        self.teams = max(4, self.athletes // ATHLETES_PER_TEAM)
+        self.meets = max(6, results // RESULTS_PER_MEET)
+        self.games = max(2, results // 20000)
+
+
+def _meet_dates(rng, count):
+    """Meet days drawn from SEASONS January-June seasons, oldest first."""
+    days = []
+    for season in range(SEASONS):
+        start = SEASON_START + timedelta(days=365 * season)
+        days.extend(start + timedelta(days=offset) for offset in range(0, 22 * 7))
+    return sorted(rng.choice(days) for _ in range(count))
+
+
+def _athletes(rng, plan):
+    """[(name, team index, is_female, talent, [events])]"""
+    events = list(EVENT_WEIGHTS)
+    weights = list(EVENT_WEIGHTS.values())
+    athletes = []
+    for i in range(plan.athletes):
+        is_female = i % 2
+        chosen = set()
+        while len(chosen) < rng.choice((2, 3, 3, 4)):
+            event = rng.choices(events, weights)[0]
+            if event == ('110mH' if is_female else '100mH'):
+                continue
+            chosen.add(event)
+        athletes.append((f'Athlete {i:06d}', i % plan.teams, is_female, rng.random() ** 0.7, sorted(chosen)))
+    return athletes
+
+
+def _mark(rng, event, talent, female):
+    best, worst = EVENT_MARKS[event]
+    if female:
+        # Slower times / shorter marks by ~11%
+        best, worst = (best * 1.11, worst * 1.11) if best < worst else (best * 0.89, worst * 0.89)
+    value = worst + (best - worst) * talent
+    return value * (1 + rng.gauss(0, 0.015))
+
+
+def _lower_is_better(event):
+    return EVENT_MARKS[event][0] < EVENT_MARKS[event][1]
+
+
+def _result_string(rng, event, value):
+    roll = rng.random()
+    if roll < 0.004:
+        return 'DNF' if _lower_is_better(event) else 'NM'
+    if _lower_is_better(event):
+        text = format_time(value)
+        return text + 'q' if roll > 0.99 else text
+    return format_mark(value, event in FT_IN_EVENTS and roll < 0.7)
+
+
+def _results(rng, plan, athletes, meets):
+    """Yield (Date, athlete index, meet index, event, result) up to plan.results rows."""
+    by_team = {}
+    for index, athlete in enumerate(athletes):
+        by_team.setdefault(athlete[1], []).append(index)
+    produced = 0
+    for meet_index, (meet_date, team_indexes) in enumerate(meets):
+        quota = (plan.results - produced) // (len(meets) - meet_index)
+        entries = []
+        for team in team_indexes:
+            roster = by_team.get(team, [])
+            for athlete_index in roster:
+                _, _, female, talent, events = athletes[athlete_index]
+                for event in events:
+                    entries.append((athlete_index, event, talent, female))
+            # RS splits: a team's best four 100m/400m runners, each relay in about half the meets
+            for split_event, rs_event in RELAYS.values():
+                runners = [i for i in roster if split_event in athletes[i][4]][:4]
+                if len(runners) == 4 and rng.random() < 0.5:
+                    entries.extend((i, rs_event, athletes[i][3], athletes[i][2]) for i in runners)
+        rng.shuffle(entries)
+        for athlete_index, event, talent, female in entries[:quota]:
+            base = event.replace(' RS', '')
+            value = _mark(rng, base, talent, female) * (0.97 if event.endswith(' RS') else 1)
+            yield meet_date.isoformat(), athlete_index, meet_index, event, _result_string(rng, base, value)
+            produced += 1
+    # Small meets can leave a shortfall; top it up with extra 100m heats at the last meet
+    meet_date = meets[-1][0].isoformat()
+    while produced < plan.results:
+        athlete_index = rng.randrange(len(athletes))
+        _, _, female, talent, _ = athletes[athlete_index]
+        yield meet_date, athlete_index, len(meets) - 1, '100m', format_time(_mark(rng, '100m', talent, female))
+        produced += 1
+
+
+def _ids(cur, table, id_column, name_column, names):
+    cur.executemany(f'INSERT OR IGNORE INTO {table} ({name_column}) VALUES (?)', [(name,) for name in names])
+    cur.execute(f'SELECT {name_column}, {id_column} FROM {table}')
+    return dict(cur.fetchall())
+
+
+def generate(db_path, results=100000, seed=0, progress=None):
+    """Create db_path (which must not exist) with `results` synthetic results. Returns {table: rows}."""
+    if os.path.exists(db_path):
+        raise FileExistsError(db_path)
+    rng = random.Random(seed)
+    plan = _Plan(results)
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA journal_mode = OFF')
+    conn.execute('PRAGMA synchronous = OFF')
+    migrations.migrate(conn)
+    cur = conn.cursor()
+    with conn:
+        athletes = _athletes(rng, plan)
+        teams = [f'Team {i:04d}' for i in range(plan.teams)]
+        meet_dates = _meet_dates(rng, plan.meets)
+        # Enough teams per meet for ~1.5x the meet's share of entries, so every meet is a sample
+        entries_per_team = plan.athletes / plan.teams * 3
+        teams_per_meet = min(plan.teams, max(2, round(plan.results / plan.meets * 1.5 / entries_per_team)))
+        meets = [(meet_date, rng.sample(range(plan.teams), teams_per_meet)) for meet_date in meet_dates]
+        meet_names = [f'{meet_date:%Y} Meet {i:05d}' for i, (meet_date, _) in enumerate(meets)]
+
+        athlete_ids = _ids(cur, 'Athletes', 'athlete_id', 'athlete_name', [a[0] for a in athletes])
+        cur.executemany('UPDATE Athletes SET is_female = ? WHERE athlete_name = ?',
+                        [(a[2], a[0]) for a in athletes])
+        team_ids = _ids(cur, 'Teams', 'team_id', 'team_name', teams)
+        meet_ids = _ids(cur, 'Meets', 'meet_id', 'meet_name', meet_names)
+        event_ids = _ids(cur, 'Events', 'event_id', 'event_name', [*EVENT_MARKS, *(rs for _, rs in RELAYS.values())])
+        time_events = load_time_events(cur)
+
+        def result_rows():
+            for n, (day, athlete_index, meet_index, event, result) in enumerate(_results(rng, plan, athletes, meets), 1):
+                name, team_index = athletes[athlete_index][:2]
+                value, kind = parse_result(result, event, time_event=time_events.get(event))
+                if progress and n % 100000 == 0:
+                    progress(f'{n} results')
+                yield (day, athlete_ids[name], meet_ids[meet_names[meet_index]], event_ids[event], result,
+                       team_ids[teams[team_index]], ('FR', 'SO', 'JR', 'SR')[athlete_index % 4], value, kind)
+
+        cur.executemany('INSERT INTO ResultRows (Date, Athlete_ID, Meet_ID, Event_ID, Result, Team_ID, Class, '
+                        'Result_Value, Result_Kind) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', result_rows())
+        cur.execute('''
+            UPDATE Meets
+            SET result_count = (SELECT COUNT(*) FROM ResultRows WHERE Meet_ID = Meets.meet_id),
+                date = (SELECT MIN(date(Date)) FROM ResultRows WHERE Meet_ID = Meets.meet_id)
+        ''')
+
+        # Explicit relays: one 4x100m and one 4x400m per team at about a third of its meets
+        roster = {}
+        for athlete in athletes:
+            roster.setdefault(athlete[1], []).append(athlete)
+        legs = []
+        for meet_index, (meet_date, team_indexes) in enumerate(meets):
+            for team_index in team_indexes:
+                for relay, (split_event, _) in RELAYS.items():
+                    runners = [a for a in roster.get(team_index, []) if split_event in a[4]][:4]
+                    if len(runners) < 4 or rng.random() > 0.33:
+                        continue
+                    splits = [_mark(rng, split_event, a[3], a[2]) * 0.97 for a in runners]
+                    cur.execute('INSERT INTO RelayTeams (Date, Meet_Name, Team, Event, Total_Result) '
+                                'VALUES (?, ?, ?, ?, ?)',
+                                (meet_date.isoformat(), meet_names[meet_index], teams[team_index], relay,
+                                 format_time(sum(splits))))
+                    legs.extend((cur.lastrowid, number, athlete_ids[a[0]], event_ids[split_event],
+                                 format_time(split), split, 'time')
+                                for number, (a, split) in enumerate(zip(runners, splits), 1))
+        cur.executemany('INSERT INTO RelayLegRows (Relay_ID, Leg_Number, Athlete_ID, Split_Event_ID, Split_Result, '
+                        'Split_Value, Split_Kind) VALUES (?, ?, ?, ?, ?, ?, ?)', legs)
+
+        # Stagger: history for every individual result of the most recent fifth of the meets
+        recent = {meet_ids[name] for name in meet_names[-max(1, len(meet_names) // 5):]}
+        cur.execute(f'''
+            SELECT m.meet_name, r.Event_ID, r.Date, r.Athlete_ID
+            FROM ResultRows r JOIN Meets m ON m.meet_id = r.Meet_ID
+            WHERE r.Meet_ID IN ({', '.join('?' for _ in recent)}) AND r.Event_ID NOT IN (?, ?)
+            GROUP BY r.Meet_ID, r.Event_ID, r.Date, r.Athlete_ID
+        ''', (*sorted(recent), *(event_ids[rs] for _, rs in RELAYS.values())))
+        history = [(*row, round(rng.gauss(0, 12), 2)) for row in cur.fetchall()]
+        cur.executemany('INSERT INTO StaggerHistoryRows (meet_name, event_id, date, athlete_id, delta) '
+                        'VALUES (?, ?, ?, ?, ?)', history)
+        cur.execute('''
+            INSERT INTO StaggerScoreRows (athlete_id, event_id, score)
+            SELECT athlete_id, event_id, 1000 + SUM(delta) FROM StaggerHistoryRows GROUP BY athlete_id, event_id
+        ''')
+
+        comments = []
+        for i in range(max(20, plan.meets * 2)):
+            if i % 3:
+                comments.append(('meet', meet_names[i % len(meet_names)], f'fan{i % 97}', f'Great races #{i}'))
+            else:
+                comments.append(('athlete', athletes[i % len(athletes)][0], f'coach{i % 31}', f'Nice PR #{i}'))
+        cur.executemany('INSERT INTO Comments (page_type, page_id, username, content) VALUES (?, ?, ?, ?)', comments)
+        cur.executemany('INSERT INTO BoardPosts (author_display_name, content, page_type, page_id) VALUES (?, ?, ?, ?)',
+                        [(f'fan{i % 53}', f'Board post {i}', 'meet' if i % 2 else 'global',
+                          meet_names[i % len(meet_names)] if i % 2 else '') for i in range(max(10, plan.meets))])
+
+        football_teams = ['Hawks', 'Owls', 'Bears', 'Foxes', 'Wolves', 'Eagles']
+        plays = []
+        for game in range(plan.games):
+            home, away = rng.sample(football_teams, 2)
+            game_date = SEASON_START + timedelta(days=240 + 7 * (game % 12) + 365 * (game // 12))
+            cur.execute('INSERT OR IGNORE INTO Games (home_team, away_team, game_date, home_score, away_score, '
+                        'season_year) VALUES (?, ?, ?, ?, ?, ?)',
+                        (home, away, game_date.isoformat(), rng.randrange(0, 45), rng.randrange(0, 45), game_date.year))
+            if not cur.rowcount:
+                continue
+            game_id = cur.lastrowid
+            for i in range(PLAYS_PER_GAME):
+                team = home if i % 2 else away
+                play_type = rng.choices(('Pass', 'Incomplete', 'Rush', 'Keep', 'Sack', 'FG', 'XP'),
+                                        (30, 15, 35, 6, 4, 2, 3))[0]
+                plays.append((game_id, play_type, f'{team} QB', f'{team} Player {rng.randrange(22)}', team,
+                              rng.randrange(-5, 40) if play_type in ('Pass', 'Rush', 'Keep') else 0,
+                              int(rng.random() < 0.05), int(play_type == 'Pass'), int(rng.random() < 0.8)))
+        cur.executemany('INSERT INTO Plays (game_id, play_type, quarterback, player_name, team, yards, is_touchdown, '
+                        'is_complete, is_successful) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', plays)
+
+        athlete_bests.rebuild(cur)
+        meet_winners.rebuild(cur)
+
+    counts = {}
+    for table in ('Athletes', 'Teams', 'Meets', 'ResultRows', 'RelayTeams', 'RelayLegRows', 'StaggerHistoryRows',
+                  'StaggerScoreRows', 'Comments', 'BoardPosts', 'Games', 'Plays', 'AthleteBests', 'MeetEventWinners'):
+        cur.execute(f'SELECT COUNT(*) FROM {table}')
+        counts[table] = cur.fetchone()[0]
+    conn.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--results', type=int, default=100000, help='number of results to generate')
+    parser.add_argument('--db', default='bench.db', help='database to create (must not exist)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: 0)')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = generate(args.db, args.results, args.seed, progress=lambda message: print(f'  {message}'))
+    print(f'{args.db}: generated in {time.perf_counter() - started:.1f}s')
+    for table, count in counts.items():
+        print(f'- {table}: {count}')
+
+
+if __name__ == '__main__':
+    main()
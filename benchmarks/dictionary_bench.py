@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Compare file size and read latency before and after dictionary-encoding athlete/team/event names.
+
+Seeds a synthetic Results table, copies it, migrates one copy to version 10 (names stored
+as text in ResultRows) and the other to the latest version (integer Athlete_ID/Event_ID/
+Team_ID behind the Results view), then VACUUMs both and times the same by-name queries.
+
+    python benchmarks/dictionary_bench.py [--rows 5000000] [--repeat 20]
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import migrations
+
+EVENTS = ['100m', '200m', '400m', '800m', '1500m', '3000m', '110m Hurdles', '400m Hurdles',
+          'Long Jump', 'Triple Jump', 'High Jump', 'Shot Put', 'Discus']
+FIELD_EVENTS = {'Long Jump', 'Triple Jump', 'High Jump', 'Shot Put', 'Discus'}
+N_ATHLETES = 40000
+N_TEAMS = 400
+N_MEETS = 4000
+
+QUERIES = [
+    ('athlete page', 'SELECT Event, Date, Meet_Name, Result FROM Results WHERE Athlete = ? ORDER BY Event, Date',
+     ('Athlete 17',)),
+    ('event leaderboard', 'SELECT Athlete, Team, Result FROM Results WHERE Event = ? '
+     'ORDER BY Result_Value LIMIT 50', ('400m',)),
+    ('meet page', 'SELECT Event, Athlete, Team, Result FROM Results WHERE Meet_Name = ? ORDER BY Event, Result_Value',
+     ('Meet 42',)),
+    ('team event', 'SELECT Athlete, Date, Result FROM Results WHERE Team = ? AND Event = ? ORDER BY Date',
+     ('Team 7', '800m')),
+]
+
+
+def seed(db_path, n_rows):
+    """Write n_rows synthetic results at schema version 9 (plain Results table)."""
+    conn = sqlite3.connect(db_path)
+    migrations.migrate(conn, target=9)
+
+    def rows():
+        for i in range(n_rows):
+            event = EVENTS[i % len(EVENTS)]
+            value = 5 + (i % 300) / 100 if event in FIELD_EVENTS else 10 + (i * 7 % 5000) / 10
+            meet = i // 500 % N_MEETS
+            yield (f'2024-{meet % 12 + 1:02d}-{meet % 28 + 1:02d}', f'Athlete {i * 31 % N_ATHLETES}',
+                   f'Meet {meet}', event, f'{value:.2f}', f'Team {i * 31 % N_ATHLETES % N_TEAMS}',
+                   value, 'mark' if event in FIELD_EVENTS else 'time')
+
+    with conn:
+        conn.executemany('INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team, Result_Value, Result_Kind) '
+                         'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows())
+    conn.close()
+
+
+def prepare(db_path, target):
+    conn = sqlite3.connect(db_path)
+    started = time.perf_counter()
+    migrations.migrate(conn, target=target)
+    elapsed = time.perf_counter() - started
+    conn.execute('VACUUM')
+    conn.close()
+    return elapsed, os.path.getsize(db_path)
+
+
+def time_queries(db_path, repeat):
+    conn = sqlite3.connect(db_path)
+    timings = []
+    for label, sql, params in QUERIES:
+        rows = conn.execute(sql, params).fetchall()  # warm the page cache
+        started = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(sql, params).fetchall()
+        timings.append((label, len(rows), (time.perf_counter() - started) / repeat * 1000))
+    conn.close()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000000, help='synthetic results to seed')
+    parser.add_argument('--repeat', type=int, default=20, help='runs per query')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        text_db = os.path.join(workdir, 'text.db')
+        ids_db = os.path.join(workdir, 'ids.db')
+        seed(text_db, args.rows)
+        shutil.copyfile(text_db, ids_db)
+        text_migrate, text_size = prepare(text_db, 10)
+        ids_migrate, ids_size = prepare(ids_db, migrations.MIGRATIONS[-1][0])
+
+        print(f'{args.rows} results')
+        print(f"{'':<24} {'names (v10)':>14} {'ids (latest)':>14}")
+        print(f"{'file size (MB)':<24} {text_size / 1e6:>14.1f} {ids_size / 1e6:>14.1f}")
+        print(f"{'migration (s)':<24} {text_migrate:>14.1f} {ids_migrate:>14.1f}")
+        for (label, rows, before), (_, _, after) in zip(time_queries(text_db, args.repeat),
+                                                        time_queries(ids_db, args.repeat)):
+            print(f"{label + ' (ms)':<24} {before:>14.2f} {after:>14.2f}   {rows} rows")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Concurrent load test: many clients reading a meet while results are being entered.
+
+Each client is a thread that picks an operation from the read/write mix until the
+duration (or its request count) runs out:
+
+    meet          GET  /meet/<meet>                       (the biggest meet in the database)
+    leaderboard   GET  /leaderboard?event=..&best_only=true
+    insert        POST /insert (5 rows for that meet, Accept: application/json)
+    stagger_rank  POST /meet/<meet>/stagger_rank
+
+In-process mode (the default) drives the WSGI app through one test client per thread,
+against a scratch copy of --db (generated with benchmarks/datagen.py when omitted).
+With --url the same mix is sent over HTTP to a running server; --db is then only read to
+pick the meet, athletes and events. The report gives p50/p95/p99 latency, throughput,
+error counts and how many requests failed with "database is locked".
+
+    python benchmarks/loadtest.py --clients 50 --duration 30 --mix meet=80,leaderboard=15,insert=4,stagger_rank=1
+    python benchmarks/loadtest.py --url http://127.0.0.1:5000 --db track.db --clients 20
+"""
+
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import re
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import got_request_exception
+
+from benchmarks import datagen
+from wavelight import app
+
+DEFAULT_MIX = 'meet=80,leaderboard=15,insert=4,stagger_rank=1'
+LEADERBOARD_EVENTS = ['100m', '400m', '1600m', 'Long Jump', 'Shot Put']
+INSERT_ROWS = 5
+LOCKED = 'database is locked'
+
+_CSRF_INPUT = re.compile(r'name="csrf_token"[^>]*value="([^"]+)"')
+
+
+class InProcessClient:
+    """One Flask test client; unhandled exceptions are caught through got_request_exception."""
+
+    _errors = threading.local()
+
+    def __init__(self):
+        self.client = app.test_client()
+
+    @classmethod
+    def record_exception(cls, sender, exception, **extra):
+        cls._errors.last = exception
+
+    def request(self, method, path, data=None, headers=None):
+        """Returns (status, error text or None)."""
+        self._errors.last = None
+        resp = self.client.open(path, method=method, data=data, headers=headers)
+        body = resp.get_data(as_text=True) if resp.status_code >= 500 else ''
+        error = self._errors.last
+        return resp.status_code, str(error) if error is not None else (body or None)
+
+
+class HttpClient:
+    """urllib opener with its own cookie jar (session + CSRF token) against base_url."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect())
+        self.csrf_token = None
+
+    def request(self, method, path, data=None, headers=None):
+        headers = dict(headers or {})
+        if method == 'POST':
+            if self.csrf_token is None:
+                _, body = self._send('GET', '/insert', None, {})
+                match = _CSRF_INPUT.search(body or '')
+                self.csrf_token = match.group(1) if match else ''
+            headers['X-CSRFToken'] = self.csrf_token
+        status, body = self._send(method, path, data, headers)
+        return status, (body or None) if status >= 500 else None
+
+    def _send(self, method, path, data, headers):
+        encoded = urllib.parse.urlencode(data, doseq=True).encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + urllib.parse.quote(path, safe='/?=&'), data=encoded,
+                                     headers=headers, method=method)
+        try:
+            with self.opener.open(req, timeout=120) as resp:
+                return resp.status, resp.read().decode(errors='replace')
+        except urllib.error.HTTPError as e:
+            return e.code, e.read().decode(errors='replace')
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    # A POST's redirect back to the meet page is not part of the measured request
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def parse_mix(text):
+    """'meet=80,insert=4' -> {'meet': 80.0, 'insert': 4.0}"""
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"unknown operation {name!r} (choose from {', '.join(OPERATIONS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def load_target(db_path):
+    """The meet the clients hammer (the biggest), its date and some athletes/teams to enter results for."""
+    conn = sqlite3.connect(db_path)
+    try:
+        meet, day = conn.execute('SELECT meet_name, date FROM Meets ORDER BY result_count DESC, meet_name LIMIT 1').fetchone()
+        entrants = conn.execute('''
+            SELECT DISTINCT a.athlete_name, t.team_name FROM ResultRows r
+            JOIN Athletes a ON a.athlete_id = r.Athlete_ID JOIN Teams t ON t.team_id = r.Team_ID
+            WHERE r.Meet_ID = (SELECT meet_id FROM Meets WHERE meet_name = ?)
+            ORDER BY a.athlete_name LIMIT 200
+        ''', (meet,)).fetchall()
+    finally:
+        conn.close()
+    return {'meet': meet, 'date': day, 'entrants': entrants}
+
+
+def _meet(client, target, rng):
+    return client.request('GET', f"/meet/{target['meet']}")
+
+
+def _leaderboard(client, target, rng):
+    return client.request('GET', f'/leaderboard?event={rng.choice(LEADERBOARD_EVENTS)}&best_only=true')
+
+
+def _insert(client, target, rng):
+    rows = [rng.choice(target['entrants']) for _ in range(INSERT_ROWS)]
+    data = {
+        'date[]': [target['date']] * INSERT_ROWS,
+        'athlete[]': [athlete for athlete, _ in rows],
+        'meet[]': [target['meet']] * INSERT_ROWS,
+        'event[]': ['100m'] * INSERT_ROWS,
+        'result[]': [f'{rng.uniform(10.8, 14.0):.2f}' for _ in rows],
+        'team[]': [team for _, team in rows],
+    }
+    return client.request('POST', '/insert', data=data, headers={'Accept': 'application/json'})
+
+
+def _stagger_rank(client, target, rng):
+    return client.request('POST', f"/meet/{target['meet']}/stagger_rank", data={})
+
+
+OPERATIONS = {'meet': _meet, 'leaderboard': _leaderboard, 'insert': _insert, 'stagger_rank': _stagger_rank}
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(samples, elapsed):
+    """samples: [(operation, ms, status, error text or None)] -> report dict."""
+    def stats(rows):
+        ordered = sorted(ms for _, ms, _, _ in rows)
+        return {
+            'requests': len(rows),
+            'errors': sum(1 for _, _, status, _ in rows if status >= 500),
+            'locked': sum(1 for _, _, _, error in rows if error and LOCKED in error),
+            'p50_ms': _percentile(ordered, 0.50),
+            'p95_ms': _percentile(ordered, 0.95),
+            'p99_ms': _percentile(ordered, 0.99),
+            'mean_ms': statistics.mean(ordered) if ordered else None,
+            'max_ms': ordered[-1] if ordered else None,
+        }
+
+    report = stats(samples)
+    report['elapsed_s'] = elapsed
+    report['throughput_rps'] = len(samples) / elapsed if elapsed else 0.0
+    report['operations'] = {name: stats([row for row in samples if row[0] == name])
+                            for name in sorted({row[0] for row in samples})}
+    return report
+
+
+def run(make_client, target, mix, clients=10, duration=10.0, requests_per_client=None, seed=0, think_ms=0):
+    """Run the clients until duration elapses (or each has sent requests_per_client). Returns summarize()."""
+    names, weights = list(mix), list(mix.values())
+    samples = []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(clients + 1)
+
+    def worker(number):
+        rng = random.Random(seed * 1000 + number)
+        client = make_client()
+        local = []
+        start_gate.wait()
+        deadline = time.perf_counter() + duration
+        while (len(local) < requests_per_client if requests_per_client else time.perf_counter() < deadline):
+            name = rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                status, error = OPERATIONS[name](client, target, rng)
+            except Exception as e:  # connection refused/reset, timeouts
+                status, error = 599, f'{type(e).__name__}: {e}'
+            local.append((name, (time.perf_counter() - started) * 1000, status, error))
+            if think_ms:
+                time.sleep(rng.uniform(0, 2 * think_ms) / 1000)
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(number,), daemon=True) for number in range(clients)]
+    for thread in threads:
+        thread.start()
+    start_gate.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return summarize(samples, time.perf_counter() - started)
+
+
+def print_report(report):
+    print(f"{report['requests']} requests in {report['elapsed_s']:.1f}s: {report['throughput_rps']:.1f} req/s, "
+          f"{report['errors']} errors, {report['locked']} database is locked")
+    print(f"{'operation':<14} {'requests':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} "
+          f"{'errors':>7} {'locked':>7}")
+    for name, stats in report['operations'].items():
+        print(f"{name:<14} {stats['requests']:>9} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} "
+              f"{stats['p99_ms']:>9.1f} {stats['max_ms']:>9.1f} {stats['errors']:>7} {stats['locked']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help='base URL of a running server (default: drive the app in-process)')
+    parser.add_argument('--db', help='database to load (in-process: copied first; default: generate one)')
+    parser.add_argument('--results', type=int, default=20000, help='results to generate when --db is omitted')
+    parser.add_argument('--clients', type=int, default=50, help='concurrent clients (default: 50)')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds to run (default: 30)')
+    parser.add_argument('--requests', type=int, help='requests per client instead of a duration')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'operation weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--think-ms', type=float, default=0, help='mean pause between a client\'s requests')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='also write the report to this path')
+    args = parser.parse_args()
+    mix = parse_mix(args.mix)
+
+    if args.url and not args.db:
+        parser.error('--url needs --db (the server\'s database) to pick the meet and athletes')
+    scratch = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(scratch, 'loadtest.db')
+        if args.url:
+            db_path = args.db
+        elif args.db:
+            shutil.copyfile(args.db, db_path)
+        else:
+            print(f'generating {args.results} results')
+            datagen.generate(db_path, args.results, args.seed)
+        target = load_target(db_path)
+
+        if args.url:
+            make_client = lambda: HttpClient(args.url)
+        else:
+            app.config['DATABASE'] = db_path
+            app.config['WTF_CSRF_ENABLED'] = False
+            app.config['SLOW_QUERY_LOG'] = None
+            got_request_exception.connect(InProcessClient.record_exception, app)
+            make_client = InProcessClient
+
+        print(f"{args.clients} clients on {target['meet']!r}, mix {args.mix}")
+        report = run(make_client, target, mix, args.clients, args.duration, args.requests, args.seed, args.think_ms)
+    finally:
+        shutil.rmtree(scratch)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
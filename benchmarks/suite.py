@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Time the key routes and model calls on generated databases and write a JSON report.
+
+For each size a database is generated once with benchmarks/datagen.py (kept in
+--data-dir and reused on later runs), copied to a scratch file, and every case is run
+once to warm caches and then --repeat times. The report records min/median/mean/max
+milliseconds and the SQL statement count per case, plus the git commit, so two reports
+can be compared:
+
+    python benchmarks/suite.py --sizes 10000,100000,1000000 --out bench-new.json
+    python benchmarks/suite.py --sizes 10000 --compare bench-old.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import g
+
+from benchmarks import datagen
+from wavelight import app
+from models import Result, compute_stagger_deltas_for_meet
+from routes.meet_routes import get_meet_placements
+from utils import instrumentation
+
+DEFAULT_SIZES = '10000,100000,1000000'
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _targets(db_path):
+    """The busiest athlete and the biggest meet, so the cases exercise the worst page."""
+    conn = sqlite3.connect(db_path)
+    try:
+        athlete = conn.execute('''
+            SELECT a.athlete_name FROM ResultRows r JOIN Athletes a ON a.athlete_id = r.Athlete_ID
+            GROUP BY r.Athlete_ID ORDER BY COUNT(*) DESC, a.athlete_name LIMIT 1
+        ''').fetchone()[0]
+        meet = conn.execute('SELECT meet_name FROM Meets ORDER BY result_count DESC, meet_name LIMIT 1').fetchone()[0]
+    finally:
+        conn.close()
+    return athlete, meet
+
+
+def _cases(athlete, meet):
+    """[(name, kind, target, config)]: kind 'get' requests a path, 'call' runs a model function in an
+    app context; config overrides app settings for that case (the meet cache is off otherwise)."""
+    return [
+        ('get_recent_winners', 'call', lambda: Result.get_recent_winners(), {}),
+        ('get_athlete_results', 'call', lambda: Result.get_athlete_results(athlete), {}),
+        ('leaderboard_time_best', 'get', '/leaderboard?event=100m&best_only=true', {}),
+        ('leaderboard_field_best', 'get', '/leaderboard?event=Long Jump&best_only=true', {}),
+        ('meet_page', 'get', f'/meet/{meet}', {}),
+        ('meet_page_cached', 'get', f'/meet/{meet}', {'MEET_CACHE': 'memory'}),
+        ('compute_stagger_deltas_for_meet', 'call',
+         lambda: compute_stagger_deltas_for_meet(meet, get_meet_placements), {}),
+    ]
+
+
+def _run_once(client, kind, target):
+    """Returns (milliseconds, SQL statements issued through Database)."""
+    if kind == 'get':
+        with instrumentation.capture_requests() as captured:
+            started = time.perf_counter()
+            resp = client.get(target)
+            elapsed = time.perf_counter() - started
+        assert resp.status_code == 200, (target, resp.status_code)
+        return elapsed * 1000, sum(stats.queries for _, stats in captured)
+    with app.test_request_context():
+        stats = g._sql_stats = instrumentation.RequestStats(0)
+        started = time.perf_counter()
+        target()
+        elapsed = time.perf_counter() - started
+        stats.finish()
+    return elapsed * 1000, stats.queries
+
+
+def run_size(db_path, repeat):
+    athlete, meet = _targets(db_path)
+    original = {key: app.config.get(key) for key in ('DATABASE', 'SLOW_QUERY_LOG', 'MEET_CACHE')}
+    app.config['DATABASE'] = db_path
+    app.config['SLOW_QUERY_LOG'] = None
+    report = {}
+    try:
+        with app.test_client() as client:
+            for name, kind, target, config in _cases(athlete, meet):
+                app.config['MEET_CACHE'] = None
+                app.config.update(config)
+                first_ms, queries = _run_once(client, kind, target)
+                runs = [_run_once(client, kind, target)[0] for _ in range(repeat)]
+                report[name] = {
+                    'first_ms': round(first_ms, 3),
+                    'min_ms': round(min(runs), 3),
+                    'median_ms': round(statistics.median(runs), 3),
+                    'mean_ms': round(statistics.mean(runs), 3),
+                    'max_ms': round(max(runs), 3),
+                    'queries': queries,
+                }
+                print(f"  {name:<34} median {report[name]['median_ms']:>10.2f} ms  {queries:>5} queries")
+    finally:
+        app.config.update(original)
+    return report
+
+
+def _git(*args):
+    try:
+        return subprocess.run(['git', *args], cwd=REPO, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old, new):
+    """Print median ms old -> new per size and case."""
+    for size, cases in new['sizes'].items():
+        before = old['sizes'].get(size, {})
+        print(f"\n{size} results ({old.get('commit') or '?'} -> {new.get('commit') or '?'})")
+        for name, stats in cases.items():
+            if name not in before:
+                print(f"  {name:<34} {'':>10}    {stats['median_ms']:>10.2f} ms")
+                continue
+            ratio = stats['median_ms'] / before[name]['median_ms'] if before[name]['median_ms'] else float('inf')
+            print(f"  {name:<34} {before[name]['median_ms']:>10.2f} -> {stats['median_ms']:>10.2f} ms  x{ratio:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f'comma-separated result counts (default: {DEFAULT_SIZES})')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per case after the warm-up run')
+    parser.add_argument('--seed', type=int, default=0, help='datagen seed (default: 0)')
+    parser.add_argument('--data-dir', default=os.path.join(REPO, 'benchmarks', 'data'),
+                        help='where generated databases are kept between runs')
+    parser.add_argument('--out', help='report path (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='earlier report to compare against')
+    args = parser.parse_args()
+
+    commit = _git('rev-parse', '--short', 'HEAD')
+    report = {
+        'commit': commit,
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'sizes': {},
+    }
+    os.makedirs(args.data_dir, exist_ok=True)
+    scratch = tempfile.mkdtemp()
+    try:
+        for size in (int(size) for size in args.sizes.split(',')):
+            source = os.path.join(args.data_dir, f'bench_{size}_seed{args.seed}.db')
+            if not os.path.exists(source):
+                print(f'generating {size} results -> {source}')
+                started = time.perf_counter()
+                datagen.generate(source + '.tmp', size, args.seed)
+                os.replace(source + '.tmp', source)
+                print(f'  done in {time.perf_counter() - started:.1f}s')
+            # Pages write caches (TeamScores, AthleteRankings); time a fresh copy every run
+            db_path = os.path.join(scratch, os.path.basename(source))
+            shutil.copyfile(source, db_path)
+            print(f'{size} results')
+            report['sizes'][str(size)] = run_size(db_path, args.repeat)
+    finally:
+        shutil.rmtree(scratch)
+
+    out = args.out or os.path.join(REPO, 'benchmarks', 'results', f"{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'wrote {out}')
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+"""pytest setup for the test_*.py files in this directory."""
+import os
+
+# wavelight registers the /debug pages only when asked to; test_instrumentation, test_profiler
+# and test_memory use them, and the first test module to import the app decides.
+os.environ.setdefault('DEBUG_ROUTES', '1')
@@ -1,55 +1,129 @@
+"""Set-based clean-up rules for Results.
+
+Each rule is one predicate over Results and a single UPDATE (new Result expression) or
+DELETE for the rows it matches; Result_Value/Result_Kind are recomputed in SQL. A dry run
+streams the affected Result_IDs per rule instead of writing. Rules run in order, so a dry
+run reports each rule against the data as it is now, not as earlier rules would leave it.
+
+    python db_normalization.py --db track.db [--dry-run] [--rule padding --rule duplicates]
+"""
+import argparse
 import sqlite3
 
-def normalization():
-    # Connect to SQLite database (or create it if it doesn't exist)
-    conn = sqlite3.connect('track.db')
-
-    # Create a cursor object
-    c = conn.cursor()
-
-    #In table Results, find results that start with a 0, and get rid of the 0
-    c.execute('SELECT * FROM Results WHERE Result LIKE "0%"')
-    results = c.fetchall()
-    for result in results:
-        result_id = result[0]
-        result_time = result[5]
-        result_time = result_time[1:]
-        c.execute('UPDATE Results SET Result = ? WHERE Result_ID = ?', (result_time, result_id))
-
-    #enforce 2 decimal places in results
-    c.execute('SELECT * FROM Results WHERE Result LIKE "%.%"')
-    results = c.fetchall()
-    for result in results:
-        result_id = result[0]
-        result_time = result[5] + '00'
-        result_time = result_time[:result_time.index('.') + 3]
-        #pad with 0s if necessary
-        c.execute('UPDATE Results SET Result = ? WHERE Result_ID = ?', (result_time, result_id))
-
-    print('finding invalid sprint times')
-    sprintevents = ['60m','100m','200m','400m','60mH','100mH','110mH','400mH']
-    # find results where there is a ':' in 400m and delete them as they are not valid
-    for event in sprintevents:
-        c.execute('SELECT * FROM Results WHERE Event = ? AND Result LIKE "%:%"', (event,))
-        results = c.fetchall()
-        for result in results:
-            print(f'deleting {result}')
-            c.execute('DELETE FROM Results WHERE Result_ID = ?', (result[0],))
-
-    #find duplicate results and delete them
-    print('finding duplicate results')
-    c.execute('SELECT * FROM Results')
-    results = c.fetchall()
-    for result in results:
-        athlete = result[1]
-        meet = result[2]
-        event = result[3]
-        team = result[5]
-        c.execute('SELECT * FROM Results WHERE Athlete = ? AND Meet_Name = ? AND Event = ? AND Team = ?', (athlete, meet, event, team))
-        if len(c.fetchall()) > 1:
-            print(f'deleting {result}')
-            #c.execute('DELETE FROM Results WHERE Result_ID = ?', (result[0],))
-        
-    # Commit the changes and close the connection
-    conn.commit()
-    conn.close()
+from utils.result_values import load_time_events, register_functions
+from utils import athlete_bests, meet_winners
+
+# A ':' in these results is a data-entry error (minutes typed into a sprint)
+SPRINT_EVENTS = ('60m', '100m', '200m', '400m', '60mH', '100mH', '110mH', '400mH')
+
+# Plain times/marks ("58.1", "2:05", "6.5"), not ft-in, DNF or qualifier-suffixed results
+_PLAIN_RESULT = "Result GLOB '*[0-9]*' AND Result NOT GLOB '*[^0-9:.]*'"
+
+# (name, description, predicate, new Result expression or None to delete, runs by default)
+RULES = [
+    ('leading_zero', 'drop a leading zero ("058.10" -> "58.10")',
+     "Result GLOB '0[0-9]*'", 'substr(Result, 2)', True),
+    # The sql/needs_padding.sql check, limited to plain results that already have decimals
+    ('padding', 'pad or truncate plain decimal results to two places ("58.1" -> "58.10")',
+     f"{_PLAIN_RESULT} AND instr(Result, '.') > 0 AND length(Result) - instr(Result, '.') != 2",
+     "substr(Result || '00', 1, instr(Result, '.') + 2)", True),
+    # Off by default: whole marks are often exact; points events never take decimals
+    ('whole_padding', 'add ".00" to plain results without decimals ("2:05" -> "2:05.00")',
+     f"{_PLAIN_RESULT} AND instr(Result, '.') = 0 "
+     "AND Event_ID NOT IN (SELECT event_id FROM Events WHERE kind = 'points')",
+     "Result || '.00'", False),
+    ('sprint_colon', 'delete sprint results containing ":"',
+     f"Event IN ({', '.join(repr(event) for event in SPRINT_EVENTS)}) AND Result LIKE '%:%'", None, True),
+    # Off by default: prelims and finals at one meet share this key
+    ('duplicates', 'delete all but the first result per (athlete, meet, event, team)',
+     '''Result_ID IN (
+            SELECT Result_ID FROM (
+                SELECT Result_ID, ROW_NUMBER() OVER (
+                    PARTITION BY Athlete_ID, Meet_ID, Event_ID, Team_ID ORDER BY Result_ID
+                ) AS rn
+                FROM ResultRows
+            )
+            WHERE rn > 1
+        )''', None, False),
+]
+
+RULE_NAMES = [rule[0] for rule in RULES]
+DEFAULT_RULES = [rule[0] for rule in RULES if rule[4]]
+
+
+def _selected(names):
+    names = DEFAULT_RULES if names is None else names
+    unknown = set(names) - set(RULE_NAMES)
+    if unknown:
+        raise ValueError(f"unknown normalization rule(s): {', '.join(sorted(unknown))}")
+    return [rule for rule in RULES if rule[0] in names]
+
+
+def iter_affected(cur, rules=None):
+    """Yield (rule name, Result_ID) for every row each rule would change, straight off the cursor."""
+    for name, _, predicate, _, _ in _selected(rules):
+        for (result_id,) in cur.execute(f'SELECT Result_ID FROM Results WHERE {predicate} ORDER BY Result_ID'):
+            yield name, result_id
+
+
+def apply_rules(cur, rules=None):
+    """Apply the rules on cur (caller commits). Returns {rule name: rows changed}."""
+    register_functions(cur.connection, load_time_events(cur))
+    counts = {}
+    for name, _, predicate, expression, _ in _selected(rules):
+        # Results is a view, so UPDATE/DELETE report no rowcount; count the matches first
+        cur.execute(f'SELECT COUNT(*) FROM Results WHERE {predicate}')
+        counts[name] = cur.fetchone()[0]
+        if not counts[name]:
+            continue
+        if expression is None:
+            cur.execute(f'DELETE FROM Results WHERE {predicate}')
+        else:
+            cur.execute(f'''
+                UPDATE Results
+                SET Result = {expression},
+                    Result_Value = result_value({expression}, Event),
+                    Result_Kind = result_kind({expression}, Event)
+                WHERE {predicate}
+            ''')
+    if any(counts.values()):
+        athlete_bests.rebuild(cur)
+        meet_winners.rebuild(cur)
+    return counts
+
+
+def normalization(db_path='track.db', rules=None):
+    """Apply the default (or given) rules to db_path in one transaction. Returns {rule name: rows changed}."""
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        with conn:
+            return apply_rules(conn.cursor(), rules)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply the Results normalization rules.')
+    parser.add_argument('--db', default='track.db', help='path to the sqlite database (default: track.db)')
+    parser.add_argument('--dry-run', action='store_true', help='print the Result_IDs each rule would change')
+    parser.add_argument('--rule', action='append', choices=RULE_NAMES, dest='rules',
+                        help=f"rule to run, repeatable (default: {', '.join(DEFAULT_RULES)})")
+    args = parser.parse_args()
+
+    if args.dry_run:
+        conn = sqlite3.connect(args.db, timeout=30)
+        try:
+            counts = {rule[0]: 0 for rule in _selected(args.rules)}
+            for name, result_id in iter_affected(conn.cursor(), args.rules):
+                print(f'{name}\t{result_id}')
+                counts[name] += 1
+        finally:
+            conn.close()
+    else:
+        counts = normalization(args.db, args.rules)
+    for name, count in counts.items():
+        print(f"{name}: {count} {'would change' if args.dry_run else 'changed'}")
+
+
+if __name__ == '__main__':
+    main()
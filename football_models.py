@@ -2,57 +2,12 @@ import sqlite3
 from flask import current_app
 from datetime import datetime
 
-class FootballDatabase:
-    @staticmethod
-    def initialize_football_tables(conn):
-        """Initialize football-specific tables"""
-        try:
-            cur = conn.cursor()
-            
-            # Games table - similar to Meets in track
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS Games (
-                    game_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    home_team TEXT NOT NULL,
-                    away_team TEXT NOT NULL,
-                    game_date DATE NOT NULL,
-                    home_score INTEGER DEFAULT 0,
-                    away_score INTEGER DEFAULT 0,
-                    season_year INTEGER NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(home_team, away_team, game_date)
-                )
-            ''')
-            
-            # Plays table - stores individual plays (passes, rushes, kicks)
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS Plays (
-                    play_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    game_id INTEGER NOT NULL,
-                    play_type TEXT NOT NULL,
-                    quarterback TEXT,
-                    player_name TEXT NOT NULL,
-                    team TEXT NOT NULL,
-                    yards INTEGER DEFAULT 0,
-                    is_touchdown INTEGER DEFAULT 0,
-                    is_complete INTEGER DEFAULT 1,
-                    is_successful INTEGER DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (game_id) REFERENCES Games(game_id) ON DELETE CASCADE
-                )
-            ''')
-            
-            conn.commit()
-        except Exception as e:
-            print(f"Error initializing football tables: {e}")
-
 class Game:
     @staticmethod
     def get_or_create_game(home_team, away_team, game_date):
         """Get existing game or create new one, returns game_id"""
         from models import Database
         conn = Database.get_connection()
-        FootballDatabase.initialize_football_tables(conn)
         
         with conn:
             cur = conn.cursor()
@@ -96,7 +51,6 @@ class Game:
         """Get all games, most recent first"""
         from models import Database
         conn = Database.get_connection()
-        FootballDatabase.initialize_football_tables(conn)
         
         with conn:
             cur = conn.cursor()
@@ -115,7 +69,6 @@ class Game:
         """Get all games for a specific team"""
         from models import Database
         conn = Database.get_connection()
-        FootballDatabase.initialize_football_tables(conn)
         
         with conn:
             cur = conn.cursor()
@@ -175,7 +128,6 @@ class Game:
         """Get team's win-loss record"""
         from models import Database
         conn = Database.get_connection()
-        FootballDatabase.initialize_football_tables(conn)
         
         if season_year is None:
             season_year = datetime.now().year
@@ -212,7 +164,6 @@ class Game:
         """Get team's all-time win-loss record"""
         from models import Database
         conn = Database.get_connection()
-        FootballDatabase.initialize_football_tables(conn)
         
         with conn:
             cur = conn.cursor()
@@ -247,7 +198,6 @@ class Play:
         """Add a new play to the database"""
         from models import Database
         conn = Database.get_connection()
-        FootballDatabase.initialize_football_tables(conn)
         
         with conn:
             cur = conn.cursor()
@@ -308,7 +258,6 @@ class Play:
         """Get comprehensive stats for a player"""
         from models import Database
         conn = Database.get_connection()
-        FootballDatabase.initialize_football_tables(conn)
         
         with conn:
             cur = conn.cursor()
@@ -371,7 +320,6 @@ class Play:
         """Get game-by-game stats for a player"""
         from models import Database
         conn = Database.get_connection()
-        FootballDatabase.initialize_football_tables(conn)
         
         with conn:
             cur = conn.cursor()
@@ -418,7 +366,6 @@ class Play:
         """Get all players who have played for a team"""
         from models import Database
         conn = Database.get_connection()
-        FootballDatabase.initialize_football_tables(conn)
         
         with conn:
             cur = conn.cursor()
@@ -469,59 +416,49 @@ class Play:
             
             players_teams = cur.fetchall()
             
+            # Passing stats, one row per quarterback
+            cur.execute('''
+                SELECT 
+                    quarterback,
+                    COUNT(*) as attempts,
+                    SUM(CASE WHEN is_complete = 1 AND play_type = 'Pass' THEN 1 ELSE 0 END) as completions,
+                    SUM(CASE WHEN play_type = 'Pass' THEN yards ELSE 0 END) as pass_yards,
+                    SUM(CASE WHEN play_type = 'Pass' AND is_touchdown = 1 THEN 1 ELSE 0 END) as pass_tds
+                FROM Plays
+                WHERE game_id = ? AND quarterback IS NOT NULL
+                AND (play_type = 'Pass' OR play_type = 'Incomplete' OR play_type = 'Sack')
+                GROUP BY quarterback
+            ''', (game_id,))
+            passing_by_player = {row[0]: tuple(row[1:]) for row in cur.fetchall()}
+            
+            # Rushing, receiving and kicking stats, one row per ball carrier
+            cur.execute('''
+                SELECT 
+                    player_name,
+                    SUM(CASE WHEN play_type IN ('Rush', 'Keep') THEN 1 ELSE 0 END) as carries,
+                    SUM(CASE WHEN play_type IN ('Rush', 'Keep') THEN yards END) as rush_yards,
+                    SUM(CASE WHEN play_type IN ('Rush', 'Keep') THEN is_touchdown END) as rush_tds,
+                    SUM(CASE WHEN play_type = 'Pass' AND is_complete = 1 THEN 1 ELSE 0 END) as receptions,
+                    SUM(CASE WHEN play_type = 'Pass' AND is_complete = 1 THEN yards END) as rec_yards,
+                    SUM(CASE WHEN play_type = 'Pass' AND is_complete = 1 THEN is_touchdown END) as rec_tds,
+                    SUM(CASE WHEN play_type = 'FG' THEN 1 ELSE 0 END) as fg_attempts,
+                    SUM(CASE WHEN play_type = 'FG' AND is_successful = 1 THEN 1 ELSE 0 END) as fg_made,
+                    SUM(CASE WHEN play_type = 'XP' THEN 1 ELSE 0 END) as xp_attempts,
+                    SUM(CASE WHEN play_type = 'XP' AND is_successful = 1 THEN 1 ELSE 0 END) as xp_made
+                FROM Plays
+                WHERE game_id = ? AND player_name IS NOT NULL
+                GROUP BY player_name
+            ''', (game_id,))
+            carrier_by_player = {row[0]: tuple(row[1:]) for row in cur.fetchall()}
+            
             stats = []
             for player_name, team in players_teams:
                 if not player_name or player_name == 'N/A':
                     continue
-                    
-                # Passing stats
-                cur.execute('''
-                    SELECT 
-                        COUNT(*) as attempts,
-                        SUM(CASE WHEN is_complete = 1 AND play_type = 'Pass' THEN 1 ELSE 0 END) as completions,
-                        SUM(CASE WHEN play_type = 'Pass' THEN yards ELSE 0 END) as pass_yards,
-                        SUM(CASE WHEN play_type = 'Pass' AND is_touchdown = 1 THEN 1 ELSE 0 END) as pass_tds
-                    FROM Plays
-                    WHERE game_id = ? AND quarterback = ? 
-                    AND (play_type = 'Pass' OR play_type = 'Incomplete' OR play_type = 'Sack')
-                ''', (game_id, player_name))
-                passing = cur.fetchone()
-                
-                # Rushing stats
-                cur.execute('''
-                    SELECT 
-                        COUNT(*) as carries,
-                        SUM(yards) as rush_yards,
-                        SUM(is_touchdown) as rush_tds
-                    FROM Plays
-                    WHERE game_id = ? AND player_name = ? 
-                    AND (play_type = 'Rush' OR play_type = 'Keep')
-                ''', (game_id, player_name))
-                rushing = cur.fetchone()
-                
-                # Receiving stats
-                cur.execute('''
-                    SELECT 
-                        COUNT(*) as receptions,
-                        SUM(yards) as rec_yards,
-                        SUM(is_touchdown) as rec_tds
-                    FROM Plays
-                    WHERE game_id = ? AND player_name = ? 
-                    AND play_type = 'Pass' AND is_complete = 1
-                ''', (game_id, player_name))
-                receiving = cur.fetchone()
                 
-                # Kicking stats
-                cur.execute('''
-                    SELECT 
-                        SUM(CASE WHEN play_type = 'FG' THEN 1 ELSE 0 END) as fg_attempts,
-                        SUM(CASE WHEN play_type = 'FG' AND is_successful = 1 THEN 1 ELSE 0 END) as fg_made,
-                        SUM(CASE WHEN play_type = 'XP' THEN 1 ELSE 0 END) as xp_attempts,
-                        SUM(CASE WHEN play_type = 'XP' AND is_successful = 1 THEN 1 ELSE 0 END) as xp_made
-                    FROM Plays
-                    WHERE game_id = ? AND player_name = ?
-                ''', (game_id, player_name))
-                kicking = cur.fetchone()
+                passing = passing_by_player.get(player_name, (0, None, None, None))
+                carrier = carrier_by_player.get(player_name, (0, None, None, 0, None, None, None, None, None, None))
+                rushing, receiving, kicking = carrier[0:3], carrier[3:6], carrier[6:10]
                 
                 # Only add player if they have any stats
                 if (passing[0] > 0 or rushing[0] > 0 or receiving[0] > 0 or 
@@ -1,106 +1,182 @@
+"""Merge results, relays, athletes and teams from another track database into this one.
+
+The source is ATTACHed and every table is merged with set-based INSERT ... SELECT ...
+WHERE NOT EXISTS statements, so Python memory stays flat however large either side is.
+Event aliases (HJ, SP, ...) are resolved to their registered names through EventAliases
+before anything is compared or written. Results are de-duplicated on (Date, Athlete,
+Meet_Name, Event, Result), which the idx_results_event_date index serves; relays on (Date, Meet_Name, Team, Event, Team_Designation),
+with source Relay_IDs remapped to the new target ids through a temp table for their legs.
+
+    python import_results.py --source track_clean.db --db track.db
+"""
+import argparse
 import sqlite3
-from datetime import datetime
 
-def connect_db(db_path):
-    try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
-    except sqlite3.Error as e:
-        print(f"Error connecting to {db_path}: {e}")
-        return None
-
-def import_results():
-    # Connect to both databases
-    source_conn = connect_db('track_clean.db')
-    target_conn = connect_db('track.db')
-    
-    if not source_conn or not target_conn:
-        return
-    
+import migrations
+from utils.result_values import load_time_events, register_functions
+from utils import athlete_bests, meet_cache, meet_winners
+
+_RELAY_KEY = ('Date', 'Meet_Name', 'Team', 'Event', 'Team_Designation')
+
+
+def _columns(cur, schema, table):
+    cur.execute(f'PRAGMA {schema}.table_info({table})')
+    return {row[1] for row in cur.fetchall()}
+
+
+def _canonical_event(column):
+    """SQL for column's registered event name: its EventAliases target, else the name itself."""
+    return f'COALESCE((SELECT event_name FROM main.EventAliases WHERE alias = {column}), {column})'
+
+
+def _relay_key_match(left, right):
+    return ' AND '.join(f'{left}.{column} IS {right}.{column}' for column in _RELAY_KEY)
+
+
+def _max_id(cur, table, column):
+    cur.execute(f'SELECT COALESCE(MAX({column}), 0) FROM {table}')
+    return cur.fetchone()[0]
+
+
+def _merge_names(cur, table, name, extra):
+    """Insert missing rows of Athletes/Teams and fill NULL extra columns from the source."""
+    source_columns = _columns(cur, 'src', table)
+    if name not in source_columns:
+        return 0
+    extra = [column for column in extra if column in source_columns]
+    cur.execute(f'''
+        INSERT INTO {table} ({', '.join([name, *extra])})
+        SELECT {', '.join(f's.{column}' for column in [name, *extra])}
+        FROM src.{table} s
+        WHERE s.{name} IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM main.{table} t WHERE t.{name} = s.{name})
+    ''')
+    inserted = cur.rowcount
+    for column in extra:
+        cur.execute(f'''
+            UPDATE main.{table}
+            SET {column} = (SELECT s.{column} FROM src.{table} s WHERE s.{name} = main.{table}.{name})
+            WHERE {column} IS NULL
+              AND EXISTS (SELECT 1 FROM src.{table} s WHERE s.{name} = main.{table}.{name} AND s.{column} IS NOT NULL)
+        ''')
+    return inserted
+
+
+def _merge_results(cur):
+    team = 'r.Team' if 'Team' in _columns(cur, 'src', 'Results') else "''"
+    before = _max_id(cur, 'ResultRows', 'Result_ID')
+    with meet_cache.deferred_versions(cur):
+        cur.execute(f'''
+            INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team, Result_Value, Result_Kind)
+            SELECT s.Date, s.Athlete, s.Meet_Name, s.Event, s.Result, s.Team,
+                   result_value(s.Result, s.Event), result_kind(s.Result, s.Event)
+            FROM (
+                SELECT r.Result_ID, r.Date, r.Athlete, r.Meet_Name, {_canonical_event('r.Event')} AS Event,
+                       r.Result, {team} AS Team
+                FROM src.Results r
+            ) s
+            WHERE s.Date IS NOT NULL AND s.Athlete IS NOT NULL AND s.Meet_Name IS NOT NULL
+              AND s.Event IS NOT NULL AND s.Result IS NOT NULL
+              AND NOT EXISTS (
+                  SELECT 1 FROM main.Results t
+                  WHERE t.Athlete = s.Athlete AND t.Event = s.Event AND t.Date = s.Date
+                    AND t.Result = s.Result AND t.Meet_Name = s.Meet_Name
+              )
+            ORDER BY s.Result_ID
+        ''')
+    # rowcount is not reported for inserts through the Results view's trigger
+    cur.execute('SELECT COUNT(*) FROM ResultRows WHERE Result_ID > ?', (before,))
+    return cur.fetchone()[0]
+
+
+def _merge_relays(cur):
+    """Returns (relay teams, relay legs) inserted."""
+    if 'Relay_ID' not in _columns(cur, 'src', 'RelayTeams'):
+        return 0, 0
+    before = _max_id(cur, 'RelayTeams', 'Relay_ID')
+    # One source relay per key (the lowest id) so the key maps back to a single new Relay_ID
+    cur.execute(f'''
+        CREATE TEMP TABLE merge_relays AS
+        SELECT MIN(s.Relay_ID) AS source_id, {', '.join(f's.{column}' for column in _RELAY_KEY)}
+        FROM (
+            SELECT r.Relay_ID, {', '.join(_canonical_event('r.Event') + ' AS Event' if column == 'Event' else f'r.{column}'
+                                          for column in _RELAY_KEY)}
+            FROM src.RelayTeams r
+        ) s
+        WHERE NOT EXISTS (SELECT 1 FROM main.RelayTeams t WHERE {_relay_key_match('t', 's')})
+        GROUP BY {', '.join(f's.{column}' for column in _RELAY_KEY)}
+    ''')
+    cur.execute(f'''
+        INSERT INTO main.RelayTeams ({', '.join(_RELAY_KEY)}, Total_Result)
+        SELECT {', '.join(f'm.{column}' for column in _RELAY_KEY)}, s.Total_Result
+        FROM temp.merge_relays m
+        JOIN src.RelayTeams s ON s.Relay_ID = m.source_id
+        ORDER BY m.source_id
+    ''')
+    teams = cur.rowcount
+    cur.execute(f'''
+        CREATE TEMP TABLE relay_id_map AS
+        SELECT m.source_id, t.Relay_ID AS target_id
+        FROM temp.merge_relays m
+        JOIN main.RelayTeams t ON {_relay_key_match('t', 'm')} AND t.Relay_ID > ?
+    ''', (before,))
+
+    before = _max_id(cur, 'RelayLegRows', 'Leg_ID')
+    cur.execute(f'''
+        INSERT INTO RelayLegs (Relay_ID, Leg_Number, Athlete, Split_Event, Split_Result, Split_Value, Split_Kind)
+        SELECT r.target_id, l.Leg_Number, l.Athlete, l.Split_Event, l.Split_Result,
+               result_value(l.Split_Result, l.Split_Event), result_kind(l.Split_Result, l.Split_Event)
+        FROM (
+            SELECT Relay_ID, Leg_Number, Athlete, {_canonical_event('Split_Event')} AS Split_Event, Split_Result
+            FROM src.RelayLegs
+        ) l
+        JOIN temp.relay_id_map r ON r.source_id = l.Relay_ID
+        ORDER BY l.Relay_ID, l.Leg_Number
+    ''')
+    cur.execute('SELECT COUNT(*) FROM RelayLegRows WHERE Leg_ID > ?', (before,))
+    legs = cur.fetchone()[0]
+    cur.execute('DROP TABLE temp.merge_relays')
+    cur.execute('DROP TABLE temp.relay_id_map')
+    return teams, legs
+
+
+def merge(conn, source_path):
+    """Merge source_path into conn's database in one transaction. Returns {what: rows inserted}."""
+    cur = conn.cursor()
+    register_functions(conn, load_time_events(cur))
+    cur.execute('ATTACH DATABASE ? AS src', (source_path,))
     try:
-        # Get data from source database
-        source_cur = source_conn.cursor()
-        source_cur.execute('SELECT * FROM Results')
-        old_results = source_cur.fetchall()
-        
-        # Prepare target database cursor
-        target_cur = target_conn.cursor()
-        
-        # Get existing results to avoid duplicates
-        target_cur.execute('SELECT Date, Athlete, Meet_Name, Event, Result FROM Results')
-        existing_results = set(
-            (str(row['Date']), row['Athlete'], row['Meet_Name'], row['Event'], str(row['Result']))
-            for row in target_cur.fetchall()
-        )
-        
-        # Counter for statistics
-        imported = 0
-        skipped = 0
-        
-        # Process each result
-        for result in old_results:
-            # Create a dictionary with all possible fields
-            result_dict = {
-                'Date': result['Date'] if 'Date' in result.keys() else None,
-                'Athlete': result['Athlete'] if 'Athlete' in result.keys() else None,
-                'Meet_Name': result['Meet_Name'] if 'Meet_Name' in result.keys() else None,
-                'Event': result['Event'] if 'Event' in result.keys() else None,
-                'Result': result['Result'] if 'Result' in result.keys() else None,
-                'Team': result['Team'] if 'Team' in result.keys() else ''  # Optional field
+        with conn:
+            counts = {
+                'athletes': _merge_names(cur, 'Athletes', 'athlete_name', ['bio', 'is_female']),
+                'teams': _merge_names(cur, 'Teams', 'team_name', ['logo_url']),
+                'results': _merge_results(cur),
             }
-            
-            # Skip if missing required fields
-            if not all([result_dict['Date'], result_dict['Athlete'], 
-                       result_dict['Meet_Name'], result_dict['Event'], 
-                       result_dict['Result']]):
-                skipped += 1
-                continue
-                
-            # Check for duplicates
-            result_tuple = (
-                str(result_dict['Date']),
-                result_dict['Athlete'],
-                result_dict['Meet_Name'],
-                result_dict['Event'],
-                str(result_dict['Result'])
-            )
-            
-            if result_tuple in existing_results:
-                skipped += 1
-                continue
-            
-            # Insert the result
-            try:
-                target_cur.execute('''
-                    INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    result_dict['Date'],
-                    result_dict['Athlete'],
-                    result_dict['Meet_Name'],
-                    result_dict['Event'],
-                    result_dict['Result'],
-                    result_dict['Team']
-                ))
-                imported += 1
-            except sqlite3.Error as e:
-                print(f"Error importing result: {result_dict}")
-                print(f"Error message: {e}")
-                skipped += 1
-        
-        # Commit changes
-        target_conn.commit()
-        
-        print(f"Import completed:")
-        print(f"- Imported: {imported} results")
-        print(f"- Skipped: {skipped} results")
-        
-    except sqlite3.Error as e:
-        print(f"An error occurred: {e}")
+            counts['relay teams'], counts['relay legs'] = _merge_relays(cur)
+            if counts['results'] or counts['relay legs']:
+                athlete_bests.rebuild(cur)
+                meet_winners.rebuild(cur)
     finally:
-        source_conn.close()
-        target_conn.close()
+        cur.execute('DETACH DATABASE src')
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge another track database into this one.')
+    parser.add_argument('--source', default='track_clean.db', help='database to merge from (default: track_clean.db)')
+    parser.add_argument('--db', default='track.db', help='database to merge into (default: track.db)')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db, timeout=30)
+    try:
+        migrations.migrate(conn)
+        counts = merge(conn, args.source)
+        print(f'Merged {args.source} into {args.db}:')
+        for what, count in counts.items():
+            print(f'- {what}: {count} imported')
+    finally:
+        conn.close()
+
 
-if __name__ == "__main__":
-    import_results() 
\ No newline at end of file
+if __name__ == '__main__':
+    main()
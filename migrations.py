@@ -0,0 +1,1286 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for the track/football database.
+
+The schema version lives in PRAGMA user_version. Every migration runs in its own
+transaction together with the version bump, so an interrupted upgrade can simply be
+re-run. The app applies pending migrations once at boot (see Database.bootstrap);
+on large databases run them ahead of a deploy instead:
+
+    python migrations.py --db track.db            # apply pending migrations
+    python migrations.py --db track.db --status   # show current/pending versions
+"""
+
+import argparse
+import re
+import sqlite3
+
+
+def _columns(cur, table):
+    cur.execute(f'PRAGMA table_info({table})')
+    return [row[1] for row in cur.fetchall()]
+
+
+def _baseline_track_tables(cur):
+    """Track tables as they existed before versioning (IF NOT EXISTS keeps old databases intact)."""
+    # Results table (original schema from create_db.py)
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS Results (
+            Result_ID INTEGER PRIMARY KEY,
+            Date TEXT,
+            Athlete TEXT,
+            Meet_Name TEXT,
+            Event TEXT,
+            Result TEXT,
+            Team TEXT
+        )
+    ''')
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS Athletes (
+            athlete_name TEXT PRIMARY KEY,
+            bio TEXT,
+            is_female INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS Teams (
+            team_name TEXT PRIMARY KEY,
+            logo_url TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS TeamScores (
+            meet_name TEXT,
+            team_name TEXT,
+            score REAL,
+            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (meet_name, team_name)
+        )
+    ''')
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS AthleteRankings (
+            meet_name TEXT,
+            event TEXT,
+            date TEXT,
+            athlete TEXT,
+            ranking_before INTEGER,
+            ranking_after INTEGER,
+            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (meet_name, event, date, athlete)
+        )
+    ''')
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS Comments (
+            comment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            page_type TEXT NOT NULL,
+            page_id TEXT NOT NULL,
+            username TEXT NOT NULL,
+            content TEXT NOT NULL,
+            parent_id INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (parent_id) REFERENCES Comments(comment_id) ON DELETE CASCADE
+        )
+    ''')
+    # BoardPosts (Reddit-style message board); page_type/page_id are added by migration 2
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS BoardPosts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            author_display_name TEXT NOT NULL,
+            content TEXT NOT NULL,
+            parent_id INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_ai_generated INTEGER DEFAULT 0,
+            ai_prompt TEXT,
+            FOREIGN KEY (parent_id) REFERENCES BoardPosts(id) ON DELETE CASCADE
+        )
+    ''')
+    # Stagger (ELO-style placement ranking): one score per athlete per event
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS StaggerScores (
+            athlete TEXT,
+            event TEXT,
+            score REAL NOT NULL DEFAULT 1000,
+            PRIMARY KEY (athlete, event)
+        )
+    ''')
+    # Deltas applied per meet so we can revert and re-rank
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS StaggerHistory (
+            meet_name TEXT,
+            event TEXT,
+            date TEXT,
+            athlete TEXT,
+            delta REAL NOT NULL,
+            PRIMARY KEY (meet_name, event, date, athlete)
+        )
+    ''')
+    # Explicit relay entries and their legs
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS RelayTeams (
+            Relay_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+            Date TEXT,
+            Meet_Name TEXT,
+            Team TEXT,
+            Event TEXT,
+            Total_Result TEXT,
+            Team_Designation TEXT DEFAULT 'A'
+        )
+    ''')
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS RelayLegs (
+            Leg_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+            Relay_ID INTEGER,
+            Leg_Number INTEGER,
+            Athlete TEXT,
+            Split_Event TEXT,
+            Split_Result TEXT,
+            FOREIGN KEY (Relay_ID) REFERENCES RelayTeams(Relay_ID) ON DELETE CASCADE
+        )
+    ''')
+
+
+def _board_post_scope_columns(cur):
+    """BoardPosts created before per-page boards existed lack page_type/page_id."""
+    columns = _columns(cur, 'BoardPosts')
+    if 'page_type' not in columns:
+        cur.execute("ALTER TABLE BoardPosts ADD COLUMN page_type TEXT DEFAULT 'global'")
+    if 'page_id' not in columns:
+        cur.execute("ALTER TABLE BoardPosts ADD COLUMN page_id TEXT DEFAULT ''")
+
+
+def _football_tables(cur):
+    # Games table - similar to Meets in track
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS Games (
+            game_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            home_team TEXT NOT NULL,
+            away_team TEXT NOT NULL,
+            game_date DATE NOT NULL,
+            home_score INTEGER DEFAULT 0,
+            away_score INTEGER DEFAULT 0,
+            season_year INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(home_team, away_team, game_date)
+        )
+    ''')
+    # Plays table - stores individual plays (passes, rushes, kicks)
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS Plays (
+            play_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            game_id INTEGER NOT NULL,
+            play_type TEXT NOT NULL,
+            quarterback TEXT,
+            player_name TEXT NOT NULL,
+            team TEXT NOT NULL,
+            yards INTEGER DEFAULT 0,
+            is_touchdown INTEGER DEFAULT 0,
+            is_complete INTEGER DEFAULT 1,
+            is_successful INTEGER DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (game_id) REFERENCES Games(game_id) ON DELETE CASCADE
+        )
+    ''')
+
+
+def _results_class_column(cur):
+    """Older imports carried a Class column that the athlete profile reads; fresh databases lacked it."""
+    if 'Class' not in _columns(cur, 'Results'):
+        cur.execute('ALTER TABLE Results ADD COLUMN Class TEXT')
+
+
+def _hot_path_indexes(cur):
+    """Secondary indexes for the lookups the routes run on every page view."""
+    # Results: one index per access pattern. Trailing columns let the profile/PR,
+    # leaderboard-count and meet/team listing queries be answered from the index alone.
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_athlete ON Results(Athlete, Event, Date, Result)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_event_date ON Results(Event, Date, Athlete, Result)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_meet ON Results(Meet_Name, Event, Date)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_team ON Results(Team, Event, Date)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_date ON Results(Date)')
+    # Stagger: profile history by athlete, event leaderboard by score
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_stagger_history_athlete ON StaggerHistory(athlete, event)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_stagger_scores_event ON StaggerScores(event, score DESC)')
+    # Threads are always loaded per page, oldest first
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_comments_page ON Comments(page_type, page_id, created_at)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_board_posts_page ON BoardPosts(page_type, page_id, created_at)')
+    # Relays: legs per relay in leg order, relays per athlete/meet/event
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_relay_legs_relay ON RelayLegs(Relay_ID, Leg_Number)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_relay_legs_athlete ON RelayLegs(Athlete)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_relay_teams_meet ON RelayTeams(Meet_Name, Event)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_relay_teams_event_date ON RelayTeams(Event, Date)')
+    # Football: plays per game/player/passer/team, games per team (home OR away)
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_plays_game ON Plays(game_id, team)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_plays_player ON Plays(player_name, play_type)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_plays_quarterback ON Plays(quarterback, play_type)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_plays_team ON Plays(team, player_name)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_games_home ON Games(home_team, game_date)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_games_away ON Games(away_team, game_date)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_games_date ON Games(game_date, game_id)')
+
+
+# Migrations 6, 8 and 9 fill derived columns and tables. They carry frozen copies of the parser
+# and queries as they stood when each was written, so later changes to utils.result_values,
+# utils.athlete_bests or utils.meet_winners (or to the Results schema they read) cannot change
+# what an old database migrates to. Do not edit them; the live modules can move on freely.
+
+# utils.result_values.parse_result without an Events registry (migration 7 adds it)
+_V6_FIELD_WORDS = ('jump', 'vault', 'put', 'throw', 'discus', 'javelin', 'hammer', 'weight', 'athlon')
+_V6_FIELD_ABBREVIATIONS = {'HJ', 'LJ', 'TJ', 'PV', 'SP', 'DT', 'JT', 'HT', 'WT'}
+_V6_FEET_CHARS = "\u2019\u2032\u00b4"
+_V6_INCH_CHARS = '\u201c\u201d\u2033\u2034'
+_V6_FT_IN = re.compile(r"^(\d+)\s*'\s*(\d+(?:\.\d+)?)?\s*\"?$")
+_V6_TIME = re.compile(r'^(?:(\d+):)?(\d+):(\d+(?:\.\d+)?)$')
+
+
+def _v6_parse_result(result, event):
+    """(value, kind) for a result string: seconds ('time') or meters ('ft-in'/'metric'); (None, None) if unparseable."""
+    if result is None:
+        return None, None
+    s = str(result).strip()
+    for c in _V6_FEET_CHARS:
+        s = s.replace(c, "'")
+    for c in _V6_INCH_CHARS:
+        s = s.replace(c, '"')
+    while s and s[-1].isalpha():
+        s = s[:-1].rstrip()
+    if not s:
+        return None, None
+    m = _V6_FT_IN.match(s)
+    if m:
+        inches = int(m.group(1)) * 12 + float(m.group(2) or 0)
+        return round(inches * 0.0254, 4), 'ft-in'
+    m = _V6_TIME.match(s)
+    if m:
+        return int(m.group(1) or 0) * 3600 + int(m.group(2)) * 60 + float(m.group(3)), 'time'
+    try:
+        value = float(s)
+    except ValueError:
+        return None, None
+    name = (event or '').strip()
+    timed = not name or (name.upper() not in _V6_FIELD_ABBREVIATIONS
+                         and not any(word in name.lower() for word in _V6_FIELD_WORDS))
+    return value, ('time' if timed else 'metric')
+
+
+def _result_value_columns(cur):
+    """Persisted numeric result (seconds/meters) + kind, backfilled with the parser frozen above."""
+    if 'Result_Value' not in _columns(cur, 'Results'):
+        cur.execute('ALTER TABLE Results ADD COLUMN Result_Value REAL')
+        cur.execute('ALTER TABLE Results ADD COLUMN Result_Kind TEXT')
+    if 'Split_Value' not in _columns(cur, 'RelayLegs'):
+        cur.execute('ALTER TABLE RelayLegs ADD COLUMN Split_Value REAL')
+        cur.execute('ALTER TABLE RelayLegs ADD COLUMN Split_Kind TEXT')
+    conn = cur.connection
+    conn.create_function('v6_result_value', 2, lambda r, e: _v6_parse_result(r, e)[0], deterministic=True)
+    conn.create_function('v6_result_kind', 2, lambda r, e: _v6_parse_result(r, e)[1], deterministic=True)
+    cur.execute('UPDATE Results SET Result_Value = v6_result_value(Result, Event), '
+                'Result_Kind = v6_result_kind(Result, Event)')
+    cur.execute('UPDATE RelayLegs SET Split_Value = v6_result_value(Split_Result, Split_Event), '
+                'Split_Kind = v6_result_kind(Split_Result, Split_Event)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_event_value ON Results(Event, Result_Value)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_relay_legs_event_value ON RelayLegs(Split_Event, Split_Value)')
+
+
+# (event_name, kind, relay legs) in profile display order. kind: time/distance/height/points.
+_SEED_EVENTS = [
+    ('55m', 'time', None), ('60m', 'time', None), ('100m', 'time', None), ('55mH', 'time', None),
+    ('60mH', 'time', None), ('100mH', 'time', None), ('110mH', 'time', None), ('200m', 'time', None),
+    ('300m', 'time', None), ('400m', 'time', None), ('100m RS', 'time', None), ('200m RS', 'time', None),
+    ('400m RS', 'time', None), ('800m RS', 'time', None), ('300mH', 'time', None), ('400mH', 'time', None),
+    ('500m', 'time', None), ('600yd', 'time', None), ('600m', 'time', None), ('800m', 'time', None),
+    ('1000m', 'time', None), ('1500m', 'time', None), ('1600m', 'time', None), ('Mile', 'time', None),
+    ('3000m', 'time', None), ('3000mSC', 'time', None), ('3200m', 'time', None), ('5000m', 'time', None),
+    ('5K XC', 'time', None), ('8K XC', 'time', None), ('5K Road', 'time', None), ('10000m', 'time', None),
+    ('10K XC', 'time', None), ('Half Marathon', 'time', None), ('Marathon', 'time', None),
+    ('High Jump', 'height', None), ('Long Jump', 'distance', None), ('Triple Jump', 'distance', None),
+    ('Shot Put', 'distance', None), ('Discus', 'distance', None), ('Pole Vault', 'height', None),
+    ('Javelin', 'distance', None), ('Hammer', 'distance', None), ('Weight Throw', 'distance', None),
+    ('Pentathlon', 'points', None), ('Heptathlon', 'points', None), ('Decathlon', 'points', None),
+    ('4x100m', 'time', '100m,100m,100m,100m'), ('4x200m', 'time', '200m,200m,200m,200m'),
+    ('4x400m', 'time', '400m,400m,400m,400m'), ('4x800m', 'time', '800m,800m,800m,800m'),
+    ('DMR', 'time', '1200m,400m,800m,1600m'), ('SMR', 'time', '400m,200m,200m,800m'),
+]
+
+_SEED_ALIASES = [
+    ('HJ', 'High Jump'), ('LJ', 'Long Jump'), ('TJ', 'Triple Jump'), ('PV', 'Pole Vault'),
+    ('SP', 'Shot Put'), ('Shot', 'Shot Put'), ('DT', 'Discus'), ('Discus Throw', 'Discus'),
+    ('JT', 'Javelin'), ('Javelin Throw', 'Javelin'), ('HT', 'Hammer'), ('Hammer Throw', 'Hammer'),
+    ('WT', 'Weight Throw'), ('Steeplechase', '3000mSC'), ('1 Mile', 'Mile'),
+    ('Distance Medley Relay', 'DMR'), ('Sprint Medley Relay', 'SMR'),
+]
+
+
+def _events_registry(cur):
+    """Event metadata (sort direction, measurement kind, relay legs) and name aliases."""
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS Events (
+            event_name TEXT PRIMARY KEY,
+            direction TEXT NOT NULL CHECK (direction IN ('ASC', 'DESC')),
+            kind TEXT NOT NULL,
+            relay_legs TEXT,
+            sort_order INTEGER
+        )
+    ''')
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS EventAliases (
+            alias TEXT PRIMARY KEY,
+            event_name TEXT NOT NULL REFERENCES Events(event_name) ON DELETE CASCADE
+        )
+    ''')
+    cur.executemany(
+        'INSERT OR IGNORE INTO Events (event_name, direction, kind, relay_legs, sort_order) VALUES (?, ?, ?, ?, ?)',
+        [(name, 'ASC' if kind == 'time' else 'DESC', kind, legs, order)
+         for order, (name, kind, legs) in enumerate(_SEED_EVENTS, start=1)]
+    )
+    cur.executemany('INSERT OR IGNORE INTO EventAliases (alias, event_name) VALUES (?, ?)', _SEED_ALIASES)
+
+
+def _athlete_bests(cur):
+    """Materialized best result and result count per (athlete, event), populated from Results."""
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS AthleteBests (
+            athlete TEXT NOT NULL,
+            event TEXT NOT NULL,
+            best_value REAL,
+            result TEXT,
+            result_id INTEGER,
+            date TEXT,
+            result_count INTEGER NOT NULL,
+            PRIMARY KEY (athlete, event)
+        )
+    ''')
+    # Frozen copy of utils.athlete_bests.rebuild()
+    cur.execute('DELETE FROM AthleteBests')
+    cur.execute('''
+        INSERT INTO AthleteBests (athlete, event, best_value, result, result_id, date, result_count)
+        SELECT Athlete, Event, Result_Value, Result, Result_ID, Date, n FROM (
+            SELECT Athlete, Event, Result_Value, Result, Result_ID, Date,
+                   COUNT(*) OVER (PARTITION BY Athlete, Event) AS n,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY Athlete, Event
+                       ORDER BY Result_Value IS NULL, (Result IS NULL OR Result = ''),
+                           CASE WHEN Result_Kind = 'time' THEN Result_Value ELSE -Result_Value END,
+                           Date, Result_ID
+                   ) AS rn
+            FROM Results
+            WHERE Athlete IS NOT NULL AND Event IS NOT NULL
+        )
+        WHERE rn = 1
+    ''')
+
+
+def _meet_event_winners(cur):
+    """Materialized home-page feed of (meet, event) winners plus a Counters table for its size."""
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS MeetEventWinners (
+            meet_name TEXT NOT NULL,
+            event TEXT NOT NULL,
+            date TEXT,
+            athlete TEXT,
+            result TEXT,
+            team TEXT,
+            result_id INTEGER,
+            PRIMARY KEY (meet_name, event)
+        )
+    ''')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_meet_event_winners_feed ON MeetEventWinners(date DESC, meet_name, event)')
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS Counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    # Frozen copy of utils.meet_winners.rebuild()
+    cur.execute('DELETE FROM MeetEventWinners')
+    cur.execute('''
+        INSERT INTO MeetEventWinners (meet_name, event, date, athlete, result, team, result_id)
+        SELECT Meet_Name, Event, formatted_date, Athlete, Result, Team, Result_ID FROM (
+            SELECT Meet_Name, Event, strftime('%Y-%m-%d', Date) AS formatted_date,
+                   Athlete, Result, Team, Result_ID,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY Meet_Name, Event
+                       ORDER BY Result_Value IS NULL,
+                           CASE WHEN Result_Kind = 'time' THEN Result_Value ELSE -Result_Value END,
+                           Result_ID
+                   ) AS rn
+            FROM Results
+            WHERE Meet_Name IS NOT NULL AND Event IS NOT NULL
+        )
+        WHERE rn = 1
+    ''')
+    cur.execute("INSERT OR REPLACE INTO Counters (name, value) VALUES ('meet_event_winners', ?)", (cur.rowcount,))
+
+
+def _meets_table(cur):
+    """Meets dimension (id, name, start date, result count); Results becomes a view over ResultRows.
+
+    ResultRows stores Meet_ID instead of the meet name, so renaming a meet is one Meets
+    row update. The Results view keeps the old column list (plus Meet_ID) and its INSTEAD OF
+    triggers route writes to ResultRows and keep Meets.result_count/date current.
+    """
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS Meets (
+            meet_id INTEGER PRIMARY KEY,
+            meet_name TEXT NOT NULL UNIQUE,
+            date TEXT,
+            result_count INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_meets_date ON Meets(date, meet_name)')
+    cur.execute('''
+        INSERT OR IGNORE INTO Meets (meet_name, date, result_count)
+        SELECT COALESCE(Meet_Name, ''), MIN(date(Date)), COUNT(*)
+        FROM Results
+        GROUP BY COALESCE(Meet_Name, '')
+    ''')
+    cur.execute('''
+        CREATE TABLE ResultRows (
+            Result_ID INTEGER PRIMARY KEY,
+            Date TEXT,
+            Athlete TEXT,
+            Meet_ID INTEGER NOT NULL REFERENCES Meets(meet_id),
+            Event TEXT,
+            Result TEXT,
+            Team TEXT,
+            Class TEXT,
+            Result_Value REAL,
+            Result_Kind TEXT
+        )
+    ''')
+    cur.execute('''
+        INSERT INTO ResultRows (Result_ID, Date, Athlete, Meet_ID, Event, Result, Team, Class, Result_Value, Result_Kind)
+        SELECT r.Result_ID, r.Date, r.Athlete, m.meet_id, r.Event, r.Result, r.Team, r.Class, r.Result_Value, r.Result_Kind
+        FROM Results r
+        JOIN Meets m ON m.meet_name = COALESCE(r.Meet_Name, '')
+    ''')
+    cur.execute('DROP TABLE Results')
+    cur.execute('''
+        CREATE VIEW Results AS
+        SELECT ResultRows.Result_ID AS Result_ID, ResultRows.Date AS Date, ResultRows.Athlete AS Athlete,
+               Meets.meet_name AS Meet_Name, ResultRows.Event AS Event, ResultRows.Result AS Result,
+               ResultRows.Team AS Team, ResultRows.Class AS Class, ResultRows.Result_Value AS Result_Value,
+               ResultRows.Result_Kind AS Result_Kind, ResultRows.Meet_ID AS Meet_ID
+        FROM ResultRows
+        JOIN Meets ON Meets.meet_id = ResultRows.Meet_ID
+    ''')
+    cur.execute('''
+        CREATE TRIGGER results_insert INSTEAD OF INSERT ON Results
+        BEGIN
+            INSERT OR IGNORE INTO Meets (meet_name) VALUES (COALESCE(NEW.Meet_Name, ''));
+            INSERT INTO ResultRows (Result_ID, Date, Athlete, Meet_ID, Event, Result, Team, Class, Result_Value, Result_Kind)
+            VALUES (NEW.Result_ID, NEW.Date, NEW.Athlete,
+                    (SELECT meet_id FROM Meets WHERE meet_name = COALESCE(NEW.Meet_Name, '')),
+                    NEW.Event, NEW.Result, NEW.Team, NEW.Class, NEW.Result_Value, NEW.Result_Kind);
+            UPDATE Meets
+            SET result_count = result_count + 1,
+                date = CASE WHEN date(NEW.Date) IS NOT NULL AND (date IS NULL OR date(NEW.Date) < date)
+                            THEN date(NEW.Date) ELSE date END
+            WHERE meet_name = COALESCE(NEW.Meet_Name, '');
+        END
+    ''')
+    cur.execute('''
+        CREATE TRIGGER results_update INSTEAD OF UPDATE ON Results
+        BEGIN
+            INSERT OR IGNORE INTO Meets (meet_name) VALUES (COALESCE(NEW.Meet_Name, ''));
+            UPDATE ResultRows
+            SET Result_ID = NEW.Result_ID, Date = NEW.Date, Athlete = NEW.Athlete,
+                Meet_ID = (SELECT meet_id FROM Meets WHERE meet_name = COALESCE(NEW.Meet_Name, '')),
+                Event = NEW.Event, Result = NEW.Result, Team = NEW.Team, Class = NEW.Class,
+                Result_Value = NEW.Result_Value, Result_Kind = NEW.Result_Kind
+            WHERE Result_ID = OLD.Result_ID;
+            UPDATE Meets
+            SET result_count = (SELECT COUNT(*) FROM ResultRows WHERE Meet_ID = Meets.meet_id),
+                date = (SELECT MIN(date(Date)) FROM ResultRows WHERE Meet_ID = Meets.meet_id)
+            WHERE (OLD.Meet_Name IS NOT NEW.Meet_Name OR OLD.Date IS NOT NEW.Date)
+              AND meet_name IN (OLD.Meet_Name, COALESCE(NEW.Meet_Name, ''));
+        END
+    ''')
+    cur.execute('''
+        CREATE TRIGGER results_delete INSTEAD OF DELETE ON Results
+        BEGIN
+            DELETE FROM ResultRows WHERE Result_ID = OLD.Result_ID;
+            UPDATE Meets
+            SET result_count = result_count - 1,
+                date = CASE WHEN date(OLD.Date) = date
+                            THEN (SELECT MIN(date(Date)) FROM ResultRows WHERE Meet_ID = OLD.Meet_ID)
+                            ELSE date END
+            WHERE meet_id = OLD.Meet_ID;
+        END
+    ''')
+    # Same hot-path indexes as migrations 5/6, with the meet index on Meet_ID
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_athlete ON ResultRows(Athlete, Event, Date, Result)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_event_date ON ResultRows(Event, Date, Athlete, Result)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_meet ON ResultRows(Meet_ID, Event, Date)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_team ON ResultRows(Team, Event, Date)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_date ON ResultRows(Date)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_event_value ON ResultRows(Event, Result_Value)')
+
+
+# Dimension tables keyed by name: (table, id column, name column)
+_ATHLETE_DIM = ('Athletes', 'athlete_id', 'athlete_name')
+_TEAM_DIM = ('Teams', 'team_id', 'team_name')
+_EVENT_DIM = ('Events', 'event_id', 'event_name')
+_MEET_DIM = ('Meets', 'meet_id', 'meet_name')
+
+
+def _ensure_row(dim, value):
+    """Trigger statement adding a dimension row for value if missing.
+
+    NOT EXISTS rather than INSERT OR IGNORE: an outer INSERT OR REPLACE on the view would
+    turn OR IGNORE into OR REPLACE here and give an existing name a fresh id.
+    """
+    table, _, name = dim
+    return f"INSERT INTO {table} ({name}) SELECT {value} WHERE NOT EXISTS (SELECT 1 FROM {table} WHERE {name} = {value});"
+
+
+def _row_id(dim, value):
+    table, id_column, name = dim
+    return f'(SELECT {id_column} FROM {table} WHERE {name} = {value})'
+
+
+def _rebuild_dimension(cur, dim, extra_columns, sources):
+    """Recreate a name-keyed table with an INTEGER PRIMARY KEY id and add a row for every name in sources."""
+    table, id_column, name = dim
+    column_defs = ',\n            '.join(f'{column} {definition}' for column, definition in extra_columns)
+    columns = ', '.join(column for column, _ in extra_columns)
+    cur.execute(f'''
+        CREATE TABLE {table}_new (
+            {id_column} INTEGER PRIMARY KEY,
+            {name} TEXT NOT NULL UNIQUE,
+            {column_defs}
+        )
+    ''')
+    cur.execute(f'INSERT INTO {table}_new ({name}, {columns}) SELECT {name}, {columns} FROM {table} WHERE {name} IS NOT NULL')
+    cur.execute(f'DROP TABLE {table}')
+    cur.execute(f'ALTER TABLE {table}_new RENAME TO {table}')
+    for source_table, source_column in sources:
+        cur.execute(f"INSERT OR IGNORE INTO {table} ({name}) SELECT DISTINCT COALESCE({source_column}, '') FROM {source_table}")
+
+
+def _dictionary_encoded_ids(cur):
+    """Integer athlete/team/event ids: ResultRows, RelayLegs, StaggerScores and StaggerHistory store ids.
+
+    Athletes, Teams and Events gain INTEGER PRIMARY KEY ids (names stay UNIQUE) and get a row
+    for every name in use. RelayLegs, StaggerScores and StaggerHistory become views over
+    *Rows tables like Results did in migration 10, so reads and writes by name keep working;
+    NULL names are stored as ''.
+    """
+    athlete_sources = [('ResultRows', 'Athlete'), ('RelayLegs', 'Athlete'),
+                       ('StaggerScores', 'athlete'), ('StaggerHistory', 'athlete')]
+    event_sources = [('ResultRows', 'Event'), ('RelayLegs', 'Split_Event'),
+                     ('StaggerScores', 'event'), ('StaggerHistory', 'event')]
+    _rebuild_dimension(cur, _ATHLETE_DIM, [
+        ('bio', 'TEXT'),
+        ('is_female', 'INTEGER DEFAULT 0'),
+        ('created_at', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP'),
+        ('updated_at', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP'),
+    ], athlete_sources)
+    _rebuild_dimension(cur, _TEAM_DIM, [
+        ('logo_url', 'TEXT'),
+        ('created_at', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP'),
+        ('updated_at', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP'),
+    ], [('ResultRows', 'Team')])
+    # Rows added for unregistered event names leave direction/kind NULL (name heuristics apply)
+    _rebuild_dimension(cur, _EVENT_DIM, [
+        ('direction', "TEXT CHECK (direction IN ('ASC', 'DESC'))"),
+        ('kind', 'TEXT'),
+        ('relay_legs', 'TEXT'),
+        ('sort_order', 'INTEGER'),
+    ], event_sources)
+
+    athlete, team, event, meet = (
+        lambda v: _row_id(_ATHLETE_DIM, v), lambda v: _row_id(_TEAM_DIM, v),
+        lambda v: _row_id(_EVENT_DIM, v), lambda v: _row_id(_MEET_DIM, v),
+    )
+
+    # Results: ResultRows keeps Meet_ID and now also Athlete_ID/Event_ID/Team_ID
+    cur.execute('DROP VIEW Results')
+    cur.execute('''
+        CREATE TABLE ResultRows_new (
+            Result_ID INTEGER PRIMARY KEY,
+            Date TEXT,
+            Athlete_ID INTEGER NOT NULL REFERENCES Athletes(athlete_id),
+            Meet_ID INTEGER NOT NULL REFERENCES Meets(meet_id),
+            Event_ID INTEGER NOT NULL REFERENCES Events(event_id),
+            Result TEXT,
+            Team_ID INTEGER NOT NULL REFERENCES Teams(team_id),
+            Class TEXT,
+            Result_Value REAL,
+            Result_Kind TEXT
+        )
+    ''')
+    cur.execute(f'''
+        INSERT INTO ResultRows_new (Result_ID, Date, Athlete_ID, Meet_ID, Event_ID, Result, Team_ID, Class, Result_Value, Result_Kind)
+        SELECT Result_ID, Date, {athlete("COALESCE(Athlete, '')")}, Meet_ID, {event("COALESCE(Event, '')")},
+               Result, {team("COALESCE(Team, '')")}, Class, Result_Value, Result_Kind
+        FROM ResultRows
+    ''')
+    cur.execute('DROP TABLE ResultRows')
+    cur.execute('ALTER TABLE ResultRows_new RENAME TO ResultRows')
+    cur.execute('''
+        CREATE VIEW Results AS
+        SELECT ResultRows.Result_ID AS Result_ID, ResultRows.Date AS Date, Athletes.athlete_name AS Athlete,
+               Meets.meet_name AS Meet_Name, Events.event_name AS Event, ResultRows.Result AS Result,
+               Teams.team_name AS Team, ResultRows.Class AS Class, ResultRows.Result_Value AS Result_Value,
+               ResultRows.Result_Kind AS Result_Kind, ResultRows.Meet_ID AS Meet_ID,
+               ResultRows.Athlete_ID AS Athlete_ID, ResultRows.Event_ID AS Event_ID, ResultRows.Team_ID AS Team_ID
+        FROM ResultRows
+        JOIN Athletes ON Athletes.athlete_id = ResultRows.Athlete_ID
+        JOIN Meets ON Meets.meet_id = ResultRows.Meet_ID
+        JOIN Events ON Events.event_id = ResultRows.Event_ID
+        JOIN Teams ON Teams.team_id = ResultRows.Team_ID
+    ''')
+    new_names = ("COALESCE(NEW.Athlete, '')", "COALESCE(NEW.Meet_Name, '')", "COALESCE(NEW.Event, '')", "COALESCE(NEW.Team, '')")
+    ensure_new = '\n'.join(_ensure_row(dim, value) for dim, value in zip(
+        (_ATHLETE_DIM, _MEET_DIM, _EVENT_DIM, _TEAM_DIM), new_names))
+    a, m, e, t = (athlete(new_names[0]), meet(new_names[1]), event(new_names[2]), team(new_names[3]))
+    cur.execute(f'''
+        CREATE TRIGGER results_insert INSTEAD OF INSERT ON Results
+        BEGIN
+            {ensure_new}
+            INSERT INTO ResultRows (Result_ID, Date, Athlete_ID, Meet_ID, Event_ID, Result, Team_ID, Class, Result_Value, Result_Kind)
+            VALUES (NEW.Result_ID, NEW.Date, {a}, {m}, {e}, NEW.Result, {t}, NEW.Class, NEW.Result_Value, NEW.Result_Kind);
+            UPDATE Meets
+            SET result_count = result_count + 1,
+                date = CASE WHEN date(NEW.Date) IS NOT NULL AND (date IS NULL OR date(NEW.Date) < date)
+                            THEN date(NEW.Date) ELSE date END
+            WHERE meet_name = COALESCE(NEW.Meet_Name, '');
+        END
+    ''')
+    cur.execute(f'''
+        CREATE TRIGGER results_update INSTEAD OF UPDATE ON Results
+        BEGIN
+            {ensure_new}
+            UPDATE ResultRows
+            SET Result_ID = NEW.Result_ID, Date = NEW.Date, Athlete_ID = {a}, Meet_ID = {m}, Event_ID = {e},
+                Result = NEW.Result, Team_ID = {t}, Class = NEW.Class,
+                Result_Value = NEW.Result_Value, Result_Kind = NEW.Result_Kind
+            WHERE Result_ID = OLD.Result_ID;
+            UPDATE Meets
+            SET result_count = (SELECT COUNT(*) FROM ResultRows WHERE Meet_ID = Meets.meet_id),
+                date = (SELECT MIN(date(Date)) FROM ResultRows WHERE Meet_ID = Meets.meet_id)
+            WHERE (OLD.Meet_Name IS NOT NEW.Meet_Name OR OLD.Date IS NOT NEW.Date)
+              AND meet_name IN (OLD.Meet_Name, COALESCE(NEW.Meet_Name, ''));
+        END
+    ''')
+    cur.execute('''
+        CREATE TRIGGER results_delete INSTEAD OF DELETE ON Results
+        BEGIN
+            DELETE FROM ResultRows WHERE Result_ID = OLD.Result_ID;
+            UPDATE Meets
+            SET result_count = result_count - 1,
+                date = CASE WHEN date(OLD.Date) = date
+                            THEN (SELECT MIN(date(Date)) FROM ResultRows WHERE Meet_ID = OLD.Meet_ID)
+                            ELSE date END
+            WHERE meet_id = OLD.Meet_ID;
+        END
+    ''')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_athlete ON ResultRows(Athlete_ID, Event_ID, Date, Result)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_event_date ON ResultRows(Event_ID, Date, Athlete_ID, Result)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_meet ON ResultRows(Meet_ID, Event_ID, Date)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_team ON ResultRows(Team_ID, Event_ID, Date, Athlete_ID)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_date ON ResultRows(Date)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_event_value ON ResultRows(Event_ID, Result_Value)')
+
+    # RelayLegs
+    cur.execute('''
+        CREATE TABLE RelayLegRows (
+            Leg_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+            Relay_ID INTEGER,
+            Leg_Number INTEGER,
+            Athlete_ID INTEGER NOT NULL REFERENCES Athletes(athlete_id),
+            Split_Event_ID INTEGER NOT NULL REFERENCES Events(event_id),
+            Split_Result TEXT,
+            Split_Value REAL,
+            Split_Kind TEXT,
+            FOREIGN KEY (Relay_ID) REFERENCES RelayTeams(Relay_ID) ON DELETE CASCADE
+        )
+    ''')
+    cur.execute(f'''
+        INSERT INTO RelayLegRows (Leg_ID, Relay_ID, Leg_Number, Athlete_ID, Split_Event_ID, Split_Result, Split_Value, Split_Kind)
+        SELECT Leg_ID, Relay_ID, Leg_Number, {athlete("COALESCE(Athlete, '')")}, {event("COALESCE(Split_Event, '')")},
+               Split_Result, Split_Value, Split_Kind
+        FROM RelayLegs
+    ''')
+    cur.execute('DROP TABLE RelayLegs')
+    cur.execute('''
+        CREATE VIEW RelayLegs AS
+        SELECT RelayLegRows.Leg_ID AS Leg_ID, RelayLegRows.Relay_ID AS Relay_ID, RelayLegRows.Leg_Number AS Leg_Number,
+               Athletes.athlete_name AS Athlete, Events.event_name AS Split_Event,
+               RelayLegRows.Split_Result AS Split_Result, RelayLegRows.Split_Value AS Split_Value,
+               RelayLegRows.Split_Kind AS Split_Kind,
+               RelayLegRows.Athlete_ID AS Athlete_ID, RelayLegRows.Split_Event_ID AS Split_Event_ID
+        FROM RelayLegRows
+        JOIN Athletes ON Athletes.athlete_id = RelayLegRows.Athlete_ID
+        JOIN Events ON Events.event_id = RelayLegRows.Split_Event_ID
+    ''')
+    leg_names = ("COALESCE(NEW.Athlete, '')", "COALESCE(NEW.Split_Event, '')")
+    ensure_leg = '\n'.join(_ensure_row(dim, value) for dim, value in zip((_ATHLETE_DIM, _EVENT_DIM), leg_names))
+    cur.execute(f'''
+        CREATE TRIGGER relay_legs_insert INSTEAD OF INSERT ON RelayLegs
+        BEGIN
+            {ensure_leg}
+            INSERT INTO RelayLegRows (Leg_ID, Relay_ID, Leg_Number, Athlete_ID, Split_Event_ID, Split_Result, Split_Value, Split_Kind)
+            VALUES (NEW.Leg_ID, NEW.Relay_ID, NEW.Leg_Number, {athlete(leg_names[0])}, {event(leg_names[1])},
+                    NEW.Split_Result, NEW.Split_Value, NEW.Split_Kind);
+        END
+    ''')
+    cur.execute(f'''
+        CREATE TRIGGER relay_legs_update INSTEAD OF UPDATE ON RelayLegs
+        BEGIN
+            {ensure_leg}
+            UPDATE RelayLegRows
+            SET Leg_ID = NEW.Leg_ID, Relay_ID = NEW.Relay_ID, Leg_Number = NEW.Leg_Number,
+                Athlete_ID = {athlete(leg_names[0])}, Split_Event_ID = {event(leg_names[1])},
+                Split_Result = NEW.Split_Result, Split_Value = NEW.Split_Value, Split_Kind = NEW.Split_Kind
+            WHERE Leg_ID = OLD.Leg_ID;
+        END
+    ''')
+    cur.execute('''
+        CREATE TRIGGER relay_legs_delete INSTEAD OF DELETE ON RelayLegs
+        BEGIN
+            DELETE FROM RelayLegRows WHERE Leg_ID = OLD.Leg_ID;
+        END
+    ''')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_relay_legs_relay ON RelayLegRows(Relay_ID, Leg_Number)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_relay_legs_athlete ON RelayLegRows(Athlete_ID)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_relay_legs_event_value ON RelayLegRows(Split_Event_ID, Split_Value)')
+
+    # StaggerScores
+    cur.execute('''
+        CREATE TABLE StaggerScoreRows (
+            athlete_id INTEGER NOT NULL REFERENCES Athletes(athlete_id),
+            event_id INTEGER NOT NULL REFERENCES Events(event_id),
+            score REAL NOT NULL DEFAULT 1000,
+            PRIMARY KEY (athlete_id, event_id)
+        )
+    ''')
+    cur.execute(f'''
+        INSERT INTO StaggerScoreRows (athlete_id, event_id, score)
+        SELECT {athlete("COALESCE(athlete, '')")}, {event("COALESCE(event, '')")}, score
+        FROM StaggerScores
+    ''')
+    cur.execute('DROP TABLE StaggerScores')
+    cur.execute('''
+        CREATE VIEW StaggerScores AS
+        SELECT Athletes.athlete_name AS athlete, Events.event_name AS event, StaggerScoreRows.score AS score,
+               StaggerScoreRows.athlete_id AS athlete_id, StaggerScoreRows.event_id AS event_id
+        FROM StaggerScoreRows
+        JOIN Athletes ON Athletes.athlete_id = StaggerScoreRows.athlete_id
+        JOIN Events ON Events.event_id = StaggerScoreRows.event_id
+    ''')
+    score_names = ("COALESCE(NEW.athlete, '')", "COALESCE(NEW.event, '')")
+    ensure_score = '\n'.join(_ensure_row(dim, value) for dim, value in zip((_ATHLETE_DIM, _EVENT_DIM), score_names))
+    cur.execute(f'''
+        CREATE TRIGGER stagger_scores_insert INSTEAD OF INSERT ON StaggerScores
+        BEGIN
+            {ensure_score}
+            INSERT INTO StaggerScoreRows (athlete_id, event_id, score)
+            VALUES ({athlete(score_names[0])}, {event(score_names[1])}, COALESCE(NEW.score, 1000));
+        END
+    ''')
+    cur.execute(f'''
+        CREATE TRIGGER stagger_scores_update INSTEAD OF UPDATE ON StaggerScores
+        BEGIN
+            {ensure_score}
+            UPDATE StaggerScoreRows
+            SET athlete_id = {athlete(score_names[0])}, event_id = {event(score_names[1])}, score = NEW.score
+            WHERE athlete_id = OLD.athlete_id AND event_id = OLD.event_id;
+        END
+    ''')
+    cur.execute('''
+        CREATE TRIGGER stagger_scores_delete INSTEAD OF DELETE ON StaggerScores
+        BEGIN
+            DELETE FROM StaggerScoreRows WHERE athlete_id = OLD.athlete_id AND event_id = OLD.event_id;
+        END
+    ''')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_stagger_scores_event ON StaggerScoreRows(event_id, score DESC)')
+
+    # StaggerHistory (still keyed by meet_name, which Meet.rename carries along)
+    cur.execute('''
+        CREATE TABLE StaggerHistoryRows (
+            meet_name TEXT,
+            event_id INTEGER NOT NULL REFERENCES Events(event_id),
+            date TEXT,
+            athlete_id INTEGER NOT NULL REFERENCES Athletes(athlete_id),
+            delta REAL NOT NULL,
+            PRIMARY KEY (meet_name, event_id, date, athlete_id)
+        )
+    ''')
+    cur.execute(f'''
+        INSERT INTO StaggerHistoryRows (meet_name, event_id, date, athlete_id, delta)
+        SELECT meet_name, {event("COALESCE(event, '')")}, date, {athlete("COALESCE(athlete, '')")}, delta
+        FROM StaggerHistory
+    ''')
+    cur.execute('DROP TABLE StaggerHistory')
+    cur.execute('''
+        CREATE VIEW StaggerHistory AS
+        SELECT StaggerHistoryRows.meet_name AS meet_name, Events.event_name AS event, StaggerHistoryRows.date AS date,
+               Athletes.athlete_name AS athlete, StaggerHistoryRows.delta AS delta,
+               StaggerHistoryRows.event_id AS event_id, StaggerHistoryRows.athlete_id AS athlete_id
+        FROM StaggerHistoryRows
+        JOIN Events ON Events.event_id = StaggerHistoryRows.event_id
+        JOIN Athletes ON Athletes.athlete_id = StaggerHistoryRows.athlete_id
+    ''')
+    ensure_history = '\n'.join(_ensure_row(dim, value) for dim, value in zip((_ATHLETE_DIM, _EVENT_DIM), score_names))
+    cur.execute(f'''
+        CREATE TRIGGER stagger_history_insert INSTEAD OF INSERT ON StaggerHistory
+        BEGIN
+            {ensure_history}
+            INSERT INTO StaggerHistoryRows (meet_name, event_id, date, athlete_id, delta)
+            VALUES (NEW.meet_name, {event(score_names[1])}, NEW.date, {athlete(score_names[0])}, NEW.delta);
+        END
+    ''')
+    cur.execute(f'''
+        CREATE TRIGGER stagger_history_update INSTEAD OF UPDATE ON StaggerHistory
+        BEGIN
+            {ensure_history}
+            UPDATE StaggerHistoryRows
+            SET meet_name = NEW.meet_name, event_id = {event(score_names[1])}, date = NEW.date,
+                athlete_id = {athlete(score_names[0])}, delta = NEW.delta
+            WHERE meet_name IS OLD.meet_name AND event_id = OLD.event_id AND date IS OLD.date AND athlete_id = OLD.athlete_id;
+        END
+    ''')
+    cur.execute('''
+        CREATE TRIGGER stagger_history_delete INSTEAD OF DELETE ON StaggerHistory
+        BEGIN
+            DELETE FROM StaggerHistoryRows
+            WHERE meet_name IS OLD.meet_name AND event_id = OLD.event_id AND date IS OLD.date AND athlete_id = OLD.athlete_id;
+        END
+    ''')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_stagger_history_athlete ON StaggerHistoryRows(athlete_id, event_id)')
+
+
+def _import_checkpoints(cur):
+    """Progress of interrupted CSV imports (utils.csv_import), one row per source file."""
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS ImportCheckpoints (
+            source TEXT PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            rows_done INTEGER NOT NULL DEFAULT 0,
+            inserted INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def _team_logos_version(cur):
+    """Counters row bumped by triggers whenever Teams names or logos change, so every
+    process can tell when its cached logo map (models.Team.logos) is stale."""
+    cur.execute("INSERT OR IGNORE INTO Counters (name, value) VALUES ('team_logos_version', 0)")
+    bump = "UPDATE Counters SET value = value + 1 WHERE name = 'team_logos_version';"
+    cur.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS teams_logo_version_insert
+        AFTER INSERT ON Teams
+        BEGIN
+            {bump}
+        END
+    ''')
+    cur.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS teams_logo_version_update
+        AFTER UPDATE OF team_name, logo_url ON Teams
+        WHEN OLD.team_name IS NOT NEW.team_name OR OLD.logo_url IS NOT NEW.logo_url
+        BEGIN
+            {bump}
+        END
+    ''')
+    cur.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS teams_logo_version_delete
+        AFTER DELETE ON Teams
+        BEGIN
+            {bump}
+        END
+    ''')
+
+
+def _bump_meets(where):
+    """Trigger statements giving the meets matched by where the next value of the meet_version counter."""
+    return (
+        "UPDATE Counters SET value = value + 1 WHERE name = 'meet_version';\n"
+        f"            UPDATE Meets SET version = (SELECT value FROM Counters WHERE name = 'meet_version') WHERE {where};"
+    )
+
+
+def _meets_ran(athlete_id, event_id):
+    """Meets where the athlete has a result in the event (their PR/debut flags and current Stagger score)."""
+    return f'meet_id IN (SELECT Meet_ID FROM ResultRows WHERE Athlete_ID = {athlete_id} AND Event_ID = {event_id})'
+
+
+def _meet_versions(cur):
+    """Meets.version, moved by triggers on every table the meet page reads (utils.meet_cache).
+
+    Versions come from one counter seeded at random, so they never repeat within a database
+    and are unlikely to match a cache entry left behind by a recreated one.
+    """
+    if 'version' not in _columns(cur, 'Meets'):
+        cur.execute('ALTER TABLE Meets ADD COLUMN version INTEGER NOT NULL DEFAULT 0')
+    cur.execute("INSERT OR IGNORE INTO Counters (name, value) VALUES ('meet_version', abs(random() % 1000000000000))")
+    cur.execute("UPDATE Meets SET version = (SELECT value FROM Counters WHERE name = 'meet_version')")
+
+    relay_meet = "meet_name = (SELECT Meet_Name FROM RelayTeams WHERE Relay_ID = {row}.Relay_ID)"
+    meet_page = "{row}.page_type = 'meet'"
+    # (trigger name prefix, table, {event: meets to bump}, WHEN clause or None); {row} is OLD or NEW
+    triggers = [
+        ('meets', 'Meets', {'INSERT': 'meet_id = NEW.meet_id'}, None),
+        ('result_rows', 'ResultRows', {
+            'INSERT': _meets_ran('NEW.Athlete_ID', 'NEW.Event_ID'),
+            'UPDATE': f"meet_id IN (OLD.Meet_ID, NEW.Meet_ID) OR {_meets_ran('OLD.Athlete_ID', 'OLD.Event_ID')}"
+                      f" OR {_meets_ran('NEW.Athlete_ID', 'NEW.Event_ID')}",
+            'DELETE': f"meet_id = OLD.Meet_ID OR {_meets_ran('OLD.Athlete_ID', 'OLD.Event_ID')}",
+        }, None),
+        ('relay_teams', 'RelayTeams', {
+            'INSERT': 'meet_name = NEW.Meet_Name',
+            'UPDATE': 'meet_name IN (OLD.Meet_Name, NEW.Meet_Name)',
+            'DELETE': 'meet_name = OLD.Meet_Name',
+        }, None),
+        ('relay_leg_rows', 'RelayLegRows', {
+            'INSERT': relay_meet.format(row='NEW'),
+            'UPDATE': f"{relay_meet.format(row='OLD')} OR {relay_meet.format(row='NEW')}",
+            'DELETE': relay_meet.format(row='OLD'),
+        }, None),
+        ('stagger_score_rows', 'StaggerScoreRows', {
+            'INSERT': _meets_ran('NEW.athlete_id', 'NEW.event_id'),
+            'UPDATE': _meets_ran('NEW.athlete_id', 'NEW.event_id'),
+            'DELETE': _meets_ran('OLD.athlete_id', 'OLD.event_id'),
+        }, None),
+        ('athletes', 'Athletes', {
+            'UPDATE': f"meet_id IN (SELECT Meet_ID FROM ResultRows WHERE Athlete_ID = NEW.athlete_id)"
+                      f" OR meet_name IN (SELECT t.Meet_Name FROM RelayLegRows l JOIN RelayTeams t ON t.Relay_ID = l.Relay_ID"
+                      f" WHERE l.Athlete_ID = NEW.athlete_id)",
+        }, 'OLD.athlete_name IS NOT NEW.athlete_name'),
+        ('teams', 'Teams', {
+            'UPDATE': 'meet_id IN (SELECT Meet_ID FROM ResultRows WHERE Team_ID = NEW.team_id)',
+        }, 'OLD.team_name IS NOT NEW.team_name'),
+        ('events', 'Events', {'UPDATE': '1'}, None),
+    ]
+    for table in ('StaggerHistoryRows', 'TeamScores', 'AthleteRankings'):
+        triggers.append((table, table, {
+            'INSERT': 'meet_name = NEW.meet_name',
+            'UPDATE': 'meet_name IN (OLD.meet_name, NEW.meet_name)',
+            'DELETE': 'meet_name = OLD.meet_name',
+        }, None))
+    # TeamScores rows are only inserted right after the meet's old ones are deleted (which bumps)
+    # or by the meet page storing the scores it is rendering; bumping there would make every
+    # first view invalidate its own cache entry
+    del triggers[-2][2]['INSERT']
+    for table in ('Comments', 'BoardPosts'):
+        triggers.append((table, table, {
+            'INSERT': 'meet_name = NEW.page_id',
+            'UPDATE': 'meet_name IN (OLD.page_id, NEW.page_id)',
+            'DELETE': 'meet_name = OLD.page_id',
+        }, None))
+
+    for prefix, table, bumps, when in triggers:
+        for event, where in bumps.items():
+            condition = when
+            if table in ('Comments', 'BoardPosts'):
+                rows = {'INSERT': ['NEW'], 'UPDATE': ['OLD', 'NEW'], 'DELETE': ['OLD']}[event]
+                condition = ' OR '.join(meet_page.format(row=row) for row in rows)
+            cur.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {prefix.lower()}_meet_version_{event.lower()}
+                AFTER {event} ON {table}
+                {f'WHEN {condition}' if condition else ''}
+                BEGIN
+                    {_bump_meets(where)}
+                END
+            ''')
+
+
+def _bump_rankings(event_ids):
+    """Trigger statements giving each event id selected by event_ids the next ranking_version value."""
+    return (
+        "UPDATE Counters SET value = value + 1 WHERE name = 'ranking_version';\n"
+        "            INSERT OR REPLACE INTO Counters (name, value)\n"
+        "            SELECT 'ranking_version:' || event_id, (SELECT value FROM Counters WHERE name = 'ranking_version')\n"
+        f"            FROM ({event_ids});"
+    )
+
+
+def _ranking_versions(cur):
+    """Per-event 'ranking_version:<event_id>' Counters rows, moved by triggers on every write that
+    changes an event's marks or names, so each process can tell when its rank index for that
+    event (models.AthleteRanking.event_indexes) is stale.
+
+    Values come from one 'ranking_version' counter seeded at random, like meet versions.
+    """
+    cur.execute("INSERT OR IGNORE INTO Counters (name, value) VALUES ('ranking_version', abs(random() % 1000000000000))")
+    cur.execute('''
+        INSERT OR IGNORE INTO Counters (name, value)
+        SELECT 'ranking_version:' || event_id, (SELECT value FROM Counters WHERE name = 'ranking_version')
+        FROM Events
+    ''')
+    # (trigger name, AFTER clause, WHEN clause or None, query selecting the event ids to bump)
+    triggers = [
+        ('result_rows_ranking_version_insert', 'INSERT ON ResultRows', None, 'SELECT NEW.Event_ID AS event_id'),
+        ('result_rows_ranking_version_update', 'UPDATE OF Date, Athlete_ID, Event_ID, Result_Value ON ResultRows', None,
+         'SELECT OLD.Event_ID AS event_id UNION SELECT NEW.Event_ID'),
+        ('result_rows_ranking_version_delete', 'DELETE ON ResultRows', None, 'SELECT OLD.Event_ID AS event_id'),
+        ('athletes_ranking_version_update', 'UPDATE OF athlete_name ON Athletes',
+         'OLD.athlete_name IS NOT NEW.athlete_name',
+         'SELECT DISTINCT Event_ID AS event_id FROM ResultRows WHERE Athlete_ID = NEW.athlete_id'),
+        ('events_ranking_version_update', 'UPDATE OF event_name, direction ON Events',
+         'OLD.event_name IS NOT NEW.event_name OR OLD.direction IS NOT NEW.direction',
+         'SELECT NEW.event_id AS event_id'),
+    ]
+    for name, after, when, event_ids in triggers:
+        cur.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {name}
+            AFTER {after}
+            {f'WHEN {when}' if when else ''}
+            BEGIN
+                {_bump_rankings(event_ids)}
+            END
+        ''')
+
+
+def _athlete_bests_value_index(cur):
+    """Best-only leaderboards read AthleteBests in (event, best value) order."""
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_athlete_bests_event_value ON AthleteBests(event, best_value, date)')
+
+
+def _events_version(cur):
+    """Counters row bumped by triggers whenever the registered events or their aliases change,
+    so every process can tell when its cached registry (models.Event) is stale.
+
+    Events rows added for unregistered names (direction NULL) are not part of the registry.
+    """
+    cur.execute("INSERT OR IGNORE INTO Counters (name, value) VALUES ('events_version', 0)")
+    registry_columns = ('event_name', 'direction', 'kind', 'relay_legs', 'sort_order')
+    # (table, event, WHEN clause or None)
+    triggers = [
+        ('Events', 'INSERT', 'NEW.direction IS NOT NULL'),
+        ('Events', f"UPDATE OF {', '.join(registry_columns)}",
+         ' OR '.join(f'OLD.{column} IS NOT NEW.{column}' for column in registry_columns)),
+        ('Events', 'DELETE', 'OLD.direction IS NOT NULL'),
+        ('EventAliases', 'INSERT', None),
+        ('EventAliases', 'UPDATE', None),
+        ('EventAliases', 'DELETE', None),
+    ]
+    for table, event, when in triggers:
+        cur.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table.lower()}_registry_version_{event.split()[0].lower()}
+            AFTER {event} ON {table}
+            {f'WHEN {when}' if when else ''}
+            BEGIN
+                UPDATE Counters SET value = value + 1 WHERE name = 'events_version';
+            END
+        ''')
+
+
+def _athlete_genders_version(cur):
+    """Counters row bumped by triggers whenever an athlete's gender or name changes, so every
+    process can tell when its cached gender map (models.Athlete.genders) is stale.
+
+    Athletes rows added by result writes (is_female 0) read the same as no row and do not bump.
+    """
+    cur.execute("INSERT OR IGNORE INTO Counters (name, value) VALUES ('athlete_genders_version', 0)")
+    # (event, WHEN clause)
+    triggers = [
+        ('INSERT', 'COALESCE(NEW.is_female, 0) != 0'),
+        ('UPDATE OF athlete_name, is_female',
+         'OLD.athlete_name IS NOT NEW.athlete_name OR OLD.is_female IS NOT NEW.is_female'),
+        ('DELETE', 'COALESCE(OLD.is_female, 0) != 0'),
+    ]
+    for event, when in triggers:
+        cur.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS athletes_genders_version_{event.split()[0].lower()}
+            AFTER {event} ON Athletes
+            WHEN {when}
+            BEGIN
+                UPDATE Counters SET value = value + 1 WHERE name = 'athlete_genders_version';
+            END
+        ''')
+
+
+def _events_meet_version_scope(cur):
+    """Renaming or re-sorting an event moves only the meets that list it, and only when a column
+    the meet page reads (name, direction, kind, relay legs) changes; migration 14 bumped every meet
+    on any Events update, including sort_order changes and rows nobody has run.
+    """
+    page_columns = ('event_name', 'direction', 'kind', 'relay_legs')
+    relays = ("meet_name IN (SELECT Meet_Name FROM RelayTeams WHERE Event IN "
+              "(OLD.event_name, NEW.event_name))")
+    cur.execute('DROP TRIGGER IF EXISTS events_meet_version_update')
+    cur.execute(f'''
+        CREATE TRIGGER events_meet_version_update
+        AFTER UPDATE OF {', '.join(page_columns)} ON Events
+        WHEN {' OR '.join(f'OLD.{column} IS NOT NEW.{column}' for column in page_columns)}
+        BEGIN
+            {_bump_meets(f'meet_id IN (SELECT Meet_ID FROM ResultRows WHERE Event_ID = NEW.event_id) OR {relays}')}
+        END
+    ''')
+
+
+def _deferred_meet_versions(cur):
+    """Let bulk imports bump meet versions once per statement instead of once per row.
+
+    A new result bumps every meet where the athlete has run the event, not just its own:
+    those meets show PR and debut flags that the new mark can take away. That lookup and
+    the Meets writes it causes are most of the trigger's cost, so while the
+    'meet_versions_deferred' Counters row is set (utils.meet_cache.deferred_versions, inside
+    the import's transaction) the insert trigger skips them and the import bumps the same
+    meets with one statement at the end.
+    """
+    cur.execute("INSERT OR IGNORE INTO Counters (name, value) VALUES ('meet_versions_deferred', 0)")
+    cur.execute('DROP TRIGGER IF EXISTS result_rows_meet_version_insert')
+    cur.execute(f'''
+        CREATE TRIGGER result_rows_meet_version_insert
+        AFTER INSERT ON ResultRows
+        WHEN (SELECT value FROM Counters WHERE name = 'meet_versions_deferred') = 0
+        BEGIN
+            {_bump_meets(_meets_ran('NEW.Athlete_ID', 'NEW.Event_ID'))}
+        END
+    ''')
+
+
+def _event_direction_rebuilds(cur):
+    """AthleteBests and MeetEventWinners rank by the registered direction (Events.direction), so
+    changing an event's direction recomputes that event's rows; Result_Kind only stands in for
+    events without one. Existing rows are rebuilt once in the new order.
+    """
+    # Frozen copies of utils.athlete_bests._SELECT_BESTS and utils.meet_winners._SELECT_WINNERS
+    best_first = ("CASE WHEN Events.direction = 'DESC' OR (Events.direction IS NULL AND Result_Kind != 'time') "
+                  "THEN -Result_Value ELSE Result_Value END")
+    select_bests = f'''
+        SELECT Athlete, Event, Result_Value, Result, Result_ID, Date, n FROM (
+            SELECT Athlete, Event, Result_Value, Result, Result_ID, Date,
+                   COUNT(*) OVER (PARTITION BY Athlete, Event) AS n,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY Athlete, Event
+                       ORDER BY Result_Value IS NULL, (Result IS NULL OR Result = ''), {best_first}, Date, Result_ID
+                   ) AS rn
+            FROM Results
+            JOIN Events ON Events.event_id = Results.Event_ID
+            WHERE {{where}}
+        )
+        WHERE rn = 1
+    '''
+    select_winners = f'''
+        SELECT Meet_Name, Event, formatted_date, Athlete, Result, Team, Result_ID FROM (
+            SELECT Meet_Name, Event, strftime('%Y-%m-%d', Date) AS formatted_date,
+                   Athlete, Result, Team, Result_ID,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY Meet_Name, Event
+                       ORDER BY Result_Value IS NULL, {best_first}, Result_ID
+                   ) AS rn
+            FROM Results
+            JOIN Events ON Events.event_id = Results.Event_ID
+            WHERE {{where}}
+        )
+        WHERE rn = 1
+    '''
+    insert_bests = 'INSERT INTO AthleteBests (athlete, event, best_value, result, result_id, date, result_count) '
+    insert_winners = 'INSERT INTO MeetEventWinners (meet_name, event, date, athlete, result, team, result_id) '
+
+    cur.execute('DELETE FROM AthleteBests')
+    cur.execute(insert_bests + select_bests.format(where='Athlete IS NOT NULL AND Event IS NOT NULL'))
+    cur.execute('DELETE FROM MeetEventWinners')
+    cur.execute(insert_winners + select_winners.format(where='Meet_Name IS NOT NULL AND Event IS NOT NULL'))
+    cur.execute("INSERT OR REPLACE INTO Counters (name, value) VALUES ('meet_event_winners', ?)", (cur.rowcount,))
+
+    # Same (meet, event) pairs before and after, so the winners counter does not move
+    event = 'Results.Event_ID = NEW.event_id AND {} IS NOT NULL'
+    cur.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS events_direction_rebuild
+        AFTER UPDATE OF direction ON Events
+        WHEN OLD.direction IS NOT NEW.direction
+        BEGIN
+            DELETE FROM AthleteBests WHERE event IN (OLD.event_name, NEW.event_name);
+            {insert_bests + select_bests.format(where=event.format('Athlete'))};
+            DELETE FROM MeetEventWinners WHERE event IN (OLD.event_name, NEW.event_name);
+            {insert_winners + select_winners.format(where=event.format('Meet_Name'))};
+        END
+    ''')
+
+
+# (version, description, step). Append only: never renumber or edit an applied migration.
+MIGRATIONS = [
+    (1, 'baseline track tables', _baseline_track_tables),
+    (2, 'BoardPosts page_type/page_id columns', _board_post_scope_columns),
+    (3, 'football Games/Plays tables', _football_tables),
+    (4, 'Results.Class column', _results_class_column),
+    (5, 'hot-path secondary indexes', _hot_path_indexes),
+    (6, 'Result_Value/Result_Kind columns', _result_value_columns),
+    (7, 'Events registry and aliases', _events_registry),
+    (8, 'AthleteBests table', _athlete_bests),
+    (9, 'MeetEventWinners feed and Counters', _meet_event_winners),
+    (10, 'Meets table; Results view over ResultRows', _meets_table),
+    (11, 'integer athlete/team/event ids', _dictionary_encoded_ids),
+    (12, 'ImportCheckpoints table', _import_checkpoints),
+    (13, 'team logo version counter', _team_logos_version),
+    (14, 'Meets.version and the triggers that move it', _meet_versions),
+    (15, 'per-event ranking versions', _ranking_versions),
+    (16, 'AthleteBests (event, best_value) index', _athlete_bests_value_index),
+    (17, 'event registry version counter', _events_version),
+    (18, 'athlete gender version counter', _athlete_genders_version),
+    (19, 'Events updates bump only the meets that list the event', _events_meet_version_scope),
+    (20, 'deferred meet version bumps for bulk imports', _deferred_meet_versions),
+    (21, 'rebuild bests and winners when an event changes direction', _event_direction_rebuilds),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def pending_migrations(conn):
+    version = get_version(conn)
+    return [m for m in MIGRATIONS if m[0] > version]
+
+
+def migrate(conn, target=None, verbose=False):
+    """Apply pending migrations up to target (default: latest). Returns the versions applied."""
+    applied = []
+    for version, description, step in pending_migrations(conn):
+        if target is not None and version > target:
+            break
+        if verbose:
+            print(f'Applying migration {version}: {description}')
+        # Take the write lock up front so two booting workers can't run the same step twice
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if get_version(conn) >= version:
+                conn.rollback()
+                continue
+            step(conn.cursor())
+            # PRAGMA does not accept bound parameters; version is an int from MIGRATIONS
+            conn.execute(f'PRAGMA user_version = {int(version)}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+    return applied
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply versioned schema migrations.')
+    parser.add_argument('--db', default='track.db', help='path to the sqlite database (default: track.db)')
+    parser.add_argument('--status', action='store_true', help='show the current version and pending migrations')
+    parser.add_argument('--target', type=int, default=None, help='stop after this version')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db, timeout=30)
+    try:
+        if args.status:
+            print(f'{args.db}: schema version {get_version(conn)} (latest {LATEST_VERSION})')
+            for version, description, _ in pending_migrations(conn):
+                print(f'  pending {version}: {description}')
+            return
+        applied = migrate(conn, target=args.target, verbose=True)
+        if applied:
+            print(f'{args.db}: migrated to version {get_version(conn)}')
+        else:
+            print(f'{args.db}: already at version {get_version(conn)}')
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,174 +1,227 @@
 import sqlite3
+import threading
+from datetime import datetime
 from sqlite3 import Error
-from flask import current_app
+from flask import current_app, g, has_app_context
+from utils.result_values import best_first, parse_result, is_time_event
+from utils import athlete_bests, meet_cache, meet_winners, instrumentation, rankings
 
 class Database:
+    # Database paths whose schema has already been bootstrapped by this process
+    _bootstrapped = set()
+
+    @staticmethod
+    def init_app(app):
+        """Bootstrap the schema once at startup and close the per-request connection on teardown."""
+        app.teardown_appcontext(Database.close_connection)
+        with app.app_context():
+            Database.bootstrap()
+
+    @staticmethod
+    def bootstrap(db_path=None):
+        """Bring db_path (defaults to the app's DATABASE) up to the latest schema version.
+
+        With AUTO_MIGRATE disabled the schema must already be current (run migrations.py).
+        """
+        import migrations
+        db_path = db_path or current_app.config['DATABASE']
+        conn = sqlite3.connect(db_path, timeout=30)
+        try:
+            auto_migrate = current_app.config.get('AUTO_MIGRATE', True) if has_app_context() else True
+            if auto_migrate:
+                migrations.migrate(conn)
+            elif migrations.pending_migrations(conn):
+                raise RuntimeError(
+                    f"{db_path} is at schema version {migrations.get_version(conn)}; "
+                    f"run `python migrations.py --db {db_path}` to upgrade to {migrations.LATEST_VERSION}"
+                )
+        finally:
+            conn.close()
+        Database._bootstrapped.add(db_path)
+        Event.invalidate(db_path)
+        Athlete.invalidate(db_path)
+        Team.invalidate(db_path)
+        AthleteRanking.invalidate(db_path)
+
     @staticmethod
     def get_connection():
+        """Return the connection shared by every model call in the current request."""
+        db_path = current_app.config['DATABASE']
+        conn = g.get('_database')
+        if conn is not None and g.get('_database_path') == db_path:
+            return conn
+        if conn is not None:
+            # DATABASE was repointed mid-context (tests); don't leak the old handle
+            Database.close_connection()
+        if db_path not in Database._bootstrapped:
+            Database.bootstrap(db_path)
         conn = None
         try:
             # timeout helps prevent "database is locked" on rapid successive writes
-            conn = sqlite3.connect(current_app.config['DATABASE'], timeout=30)
+            conn = sqlite3.connect(db_path, timeout=30, factory=instrumentation.connection_factory())
             conn.row_factory = sqlite3.Row
-            # Initialize tables on connection
-            Database.initialize_tables(conn)
         except Error as e:
             print(e)
+            return None
+        g._database = conn
+        g._database_path = db_path
         return conn
 
     @staticmethod
-    def initialize_tables(conn):
-        try:
-            cur = conn.cursor()
-            
-            # Create Results table if it doesn't exist (original schema from create_db.py)
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS Results (
-                    Result_ID INTEGER PRIMARY KEY,
-                    Date TEXT,
-                    Athlete TEXT,
-                    Meet_Name TEXT,
-                    Event TEXT,
-                    Result TEXT,
-                    Team TEXT
-                )
-            ''')
-            # Note: If the table already exists you may need to run an ALTER TABLE command
-            # to add the new column "is_female". For a new database, include it here.
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS Athletes (
-                    athlete_name TEXT PRIMARY KEY,
-                    bio TEXT,
-                    is_female INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create Teams table if it doesn't exist
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS Teams (
-                    team_name TEXT PRIMARY KEY,
-                    logo_url TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create TeamScores table if it doesn't exist
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS TeamScores (
-                    meet_name TEXT,
-                    team_name TEXT,
-                    score REAL,
-                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    PRIMARY KEY (meet_name, team_name)
-                )
-            ''')
-            
-            # Create AthleteRankings table if it doesn't exist
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS AthleteRankings (
-                    meet_name TEXT,
-                    event TEXT,
-                    date TEXT,
-                    athlete TEXT,
-                    ranking_before INTEGER,
-                    ranking_after INTEGER,
-                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    PRIMARY KEY (meet_name, event, date, athlete)
-                )
-            ''')
-            
-            # Create Comments table if it doesn't exist
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS Comments (
-                    comment_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    page_type TEXT NOT NULL,
-                    page_id TEXT NOT NULL,
-                    username TEXT NOT NULL,
-                    content TEXT NOT NULL,
-                    parent_id INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (parent_id) REFERENCES Comments(comment_id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Create BoardPosts table (Reddit-style message board)
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS BoardPosts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    author_display_name TEXT NOT NULL,
-                    content TEXT NOT NULL,
-                    parent_id INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    is_ai_generated INTEGER DEFAULT 0,
-                    ai_prompt TEXT,
-                    page_type TEXT DEFAULT 'global',
-                    page_id TEXT DEFAULT '',
-                    FOREIGN KEY (parent_id) REFERENCES BoardPosts(id) ON DELETE CASCADE
-                )
-            ''')
-            # Add columns to existing BoardPosts table if they were created before page_type/page_id existed
-            cur.execute("PRAGMA table_info(BoardPosts)")
-            columns = [row[1] for row in cur.fetchall()]
-            if 'page_type' not in columns:
-                cur.execute("ALTER TABLE BoardPosts ADD COLUMN page_type TEXT DEFAULT 'global'")
-            if 'page_id' not in columns:
-                cur.execute("ALTER TABLE BoardPosts ADD COLUMN page_id TEXT DEFAULT ''")
-            
-            # Stagger (ELO-style placement ranking): one score per athlete per event
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS StaggerScores (
-                    athlete TEXT,
-                    event TEXT,
-                    score REAL NOT NULL DEFAULT 1000,
-                    PRIMARY KEY (athlete, event)
-                )
-            ''')
-            # Deltas applied per meet so we can revert and re-rank
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS StaggerHistory (
-                    meet_name TEXT,
-                    event TEXT,
-                    date TEXT,
-                    athlete TEXT,
-                    delta REAL NOT NULL,
-                    PRIMARY KEY (meet_name, event, date, athlete)
-                )
-            ''')
+    def close_connection(exception=None):
+        """Teardown hook: close the connection opened for this app context, if any."""
+        conn = g.pop('_database', None)
+        g.pop('_database_path', None)
+        if conn is not None:
+            conn.close()
 
-            # Create RelayTeams table for explicit relay entries
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS RelayTeams (
-                    Relay_ID INTEGER PRIMARY KEY AUTOINCREMENT,
-                    Date TEXT,
-                    Meet_Name TEXT,
-                    Team TEXT,
-                    Event TEXT,
-                    Total_Result TEXT,
-                    Team_Designation TEXT DEFAULT 'A'
-                )
-            ''')
 
-            # RelayLegs table for individual legs of explicit relays
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS RelayLegs (
-                    Leg_ID INTEGER PRIMARY KEY AUTOINCREMENT,
-                    Relay_ID INTEGER,
-                    Leg_Number INTEGER,
-                    Athlete TEXT,
-                    Split_Event TEXT,
-                    Split_Result TEXT,
-                    FOREIGN KEY (Relay_ID) REFERENCES RelayTeams(Relay_ID) ON DELETE CASCADE
-                )
-            ''')
+def sync_derived_tables(cur, rows):
+    """Refresh AthleteBests and MeetEventWinners for the (athlete, meet, event) Results rows a write touched.
+
+    Call it on the writer's cursor before commit so the derived rows land in the same transaction.
+    """
+    rows = list(rows)
+    athlete_bests.refresh(cur, [(athlete, event) for athlete, _, event in rows])
+    meet_winners.refresh(cur, [(meet, event) for _, meet, event in rows])
+
+
+class Event:
+    """Read-through cache of the Events/EventAliases registry.
+
+    The registry is loaded once per database path with a single query and then served
+    from memory; events missing from it fall back to the name heuristics in
+    utils.result_values so new events still sort sensibly until they are registered.
+    Triggers on Events/EventAliases bump the VERSION_COUNTER row in Counters (migration 17),
+    which each process checks at most once per request before trusting its copy.
+    """
+    VERSION_COUNTER = 'events_version'
+    # db_path -> (counter value, {'events': {name: row dict}, 'aliases': {alias: name}})
+    _registry = {}
+    _registry_lock = threading.Lock()
+
+    @staticmethod
+    def _load():
+        db_path = current_app.config['DATABASE']
+        checked = g.setdefault('_event_registry_checked', {})
+        cached = Event._registry.get(db_path)
+        if cached is not None and checked.get(db_path) == cached[0]:
+            return cached[1]
+        conn = Database.get_connection()
+        cur = conn.cursor()
+        cur.execute('SELECT value FROM Counters WHERE name = ?', (Event.VERSION_COUNTER,))
+        row = cur.fetchone()
+        version = row[0] if row else None
+        if cached is None or cached[0] != version:
+            with Event._registry_lock:
+                cached = Event._registry.get(db_path)
+                if cached is None or cached[0] != version:
+                    cached = (version, Event._read_registry(cur))
+                    Event._registry[db_path] = cached
+        checked[db_path] = cached[0]
+        return cached[1]
+
+    @staticmethod
+    def _read_registry(cur):
+        """{'events', 'aliases'} read from Events/EventAliases in one query."""
+        cur.execute('''
+            SELECT e.event_name, e.direction, e.kind, e.relay_legs, e.sort_order, a.alias
+            FROM Events e
+            LEFT JOIN EventAliases a ON a.event_name = e.event_name
+            WHERE e.direction IS NOT NULL
+            ORDER BY e.sort_order IS NULL, e.sort_order, e.event_name
+        ''')
+        registry = {'events': {}, 'aliases': {}}
+        for row in cur.fetchall():
+            name = row['event_name']
+            registry['events'].setdefault(name, {
+                'name': name,
+                'direction': row['direction'],
+                'kind': row['kind'],
+                'relay_legs': row['relay_legs'].split(',') if row['relay_legs'] else None,
+                'sort_order': row['sort_order'],
+            })
+            if row['alias']:
+                registry['aliases'][row['alias']] = name
+        return registry
+
+    @staticmethod
+    def invalidate(db_path=None):
+        """Drop the cached registry for db_path (all databases if None)."""
+        if db_path is None:
+            Event._registry.clear()
+        else:
+            Event._registry.pop(db_path, None)
+
+    @staticmethod
+    def canonical_name(event):
+        """Resolve an alias (HJ, Shot, ...) to its registered event name."""
+        if not event:
+            return event
+        registry = Event._load()
+        name = event.strip()
+        return registry['aliases'].get(name, name)
+
+    @staticmethod
+    def get(event):
+        """Metadata dict for event: name, direction, kind, relay_legs, sort_order."""
+        registry = Event._load()
+        name = Event.canonical_name(event)
+        info = registry['events'].get(name)
+        if info is not None:
+            return info
+        timed = is_time_event(name)
+        return {
+            'name': name,
+            'direction': 'ASC' if timed else 'DESC',
+            'kind': 'time' if timed else 'distance',
+            'relay_legs': None,
+            'sort_order': None,
+        }
+
+    @staticmethod
+    def direction(event):
+        """SQL sort direction that puts the best Result_Value first for this event."""
+        return Event.get(event)['direction']
+
+    @staticmethod
+    def is_time_event(event):
+        return Event.direction(event) == 'ASC'
+
+    @staticmethod
+    def parse_result(result_str, event):
+        """utils.result_values.parse_result with the registry deciding how bare numbers read."""
+        return parse_result(result_str, event, time_event=Event.is_time_event(event))
+
+    @staticmethod
+    def relay_legs(event):
+        """Split event for each leg of a registered relay, or None."""
+        return Event.get(event)['relay_legs']
+
+    @staticmethod
+    def is_relay(event):
+        if not event:
+            return False
+        if Event.relay_legs(event):
+            return True
+        return event.startswith('4x') or event.endswith(' Relay')
+
+    @staticmethod
+    def relay_config():
+        """{relay event: [split event per leg]} for every registered relay, in display order."""
+        return {name: info['relay_legs'] for name, info in Event._load()['events'].items() if info['relay_legs']}
+
+    @staticmethod
+    def display_order():
+        """Registered event names in profile display order."""
+        return list(Event._load()['events'])
 
-            conn.commit()
-        except Error as e:
-            print(f"Error initializing tables: {e}")
 
 class Result:
+    INSERT_FIELDS = ('date', 'athlete', 'meet', 'event', 'result', 'team')
+    _INSERT_SQL = ('INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team, Result_Value, Result_Kind) '
+                   'VALUES (?, ?, ?, ?, ?, ?, ?, ?)')
+
     @staticmethod
     def get_recent_results(limit=25, offset=0):
         conn = Database.get_connection()
@@ -207,66 +260,13 @@ class Result:
             # Convert sqlite3.Row objects to tuples if needed
             results = [tuple(r) for r in results] if results else []
             
-            # Get PRs with dates - simple approach with numeric parsing in Python
+            # PR per event from AthleteBests: lower for times, higher for marks, earliest on ties;
+            # events with no parseable result fall back to their first result
             cur.execute("""
-                SELECT Event, Result, Date
-                FROM Results
-                WHERE Athlete = ?
-                ORDER BY Event, Date
+                SELECT event, result, date FROM AthleteBests
+                WHERE athlete = ? AND result IS NOT NULL AND result != ''
             """, (name,))
-            rows = cur.fetchall()
-            
-            # Find best result for each event using proper numeric comparison
-            prs = {}
-            event_rows = {}
-            for row in rows:
-                event = row[0]
-                if event not in event_rows:
-                    event_rows[event] = []
-                event_rows[event].append((row[1], row[2]))  # (result, date)
-            
-            for event, event_results in event_rows.items():
-                if not event_results:
-                    continue
-                best_result = None
-                best_numeric = None
-                best_date = None
-                for result_str, date in event_results:
-                    if not result_str:
-                        continue
-                    try:
-                        # Parse the result to a numeric value
-                        if ':' in result_str:
-                            # Time format like 1:52.34
-                            parts = result_str.split(':')
-                            numeric = float(parts[0]) * 60 + float(parts[1])
-                        else:
-                            numeric = float(result_str)
-                        
-                        if best_numeric is None:
-                            best_result = result_str
-                            best_numeric = numeric
-                            best_date = date
-                        elif 'm' in event or 'H' in event or 'XC' in event or 'Road' in event or 'Marathon' in event:
-                            # For running events, lower is better
-                            if numeric < best_numeric:
-                                best_result = result_str
-                                best_numeric = numeric
-                                best_date = date
-                        else:
-                            # For field events, higher is better
-                            if numeric > best_numeric:
-                                best_result = result_str
-                                best_numeric = numeric
-                                best_date = date
-                    except (ValueError, IndexError):
-                        # If parsing fails, use the first result as fallback
-                        if best_result is None:
-                            best_result = result_str
-                            best_date = date
-                
-                if best_result is not None:
-                    prs[event] = {'result': best_result, 'date': best_date}
+            prs = {row[0]: {'result': row[1], 'date': row[2]} for row in cur.fetchall()}
             
             # Get athlete info
             cur.execute('''
@@ -290,17 +290,13 @@ class Result:
         conn = Database.get_connection()
         with conn:
             cur = conn.cursor()
-            cur.execute('''
+            cur.execute(f'''
                 SELECT strftime('%Y-%m-%d', Date) as formatted_date,
                        Athlete, Event, Result, Team 
                 FROM Results 
+                JOIN Events ON Events.event_id = Results.Event_ID
                 WHERE Meet_Name = ? 
-                ORDER BY Event, 
-                    CASE 
-                        WHEN Event IN ('60m', '100m', '200m', '400m', '60mH', '100mH', '110mH', '400mH') 
-                        THEN CAST(REPLACE(Result, ':', '') AS DECIMAL)
-                        ELSE Result 
-                    END ASC
+                ORDER BY Event, Result_Value IS NULL, {best_first()}
             ''', (meet_name,))
             return cur.fetchall()
 
@@ -309,18 +305,13 @@ class Result:
         conn = Database.get_connection()
         with conn:
             cur = conn.cursor()
-            cur.execute('''
+            cur.execute(f'''
                 SELECT strftime('%Y-%m-%d', Date) as formatted_date,
                        Athlete, Event, Result, Team, Result_ID
                 FROM Results
+                JOIN Events ON Events.event_id = Results.Event_ID
                 WHERE Meet_Name = ?
-                ORDER BY Event,
-                    CASE
-                        WHEN Event IN ('60m', '100m', '200m', '400m', '60mH', '100mH', '110mH',
-                        '400mH')
-                        THEN CAST(REPLACE(Result, ':', '') AS DECIMAL)
-                        ELSE Result
-                    END ASC
+                ORDER BY Event, Result_Value IS NULL, {best_first()}
             ''', (meet_name,))
             return cur.fetchall()
 
@@ -330,20 +321,60 @@ class Result:
         if not conn:
             raise Exception("Could not connect to database")
         
+        # Aliases (HJ, Shot, ...) are stored under the registered name, as insert_many does
+        event = Event.canonical_name(data['event'])
         try:
             with conn:
                 cur = conn.cursor()
                 cur.execute(
-                    'INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team) VALUES (?, ?, ?, ?, ?, ?)',
+                    Result._INSERT_SQL,
                     (data['date'], data['athlete'], data['meet'], 
-                     data['event'], data['result'], data['team'])
+                     event, data['result'], data['team'],
+                     *Event.parse_result(data['result'], event))
                 )
+                sync_derived_tables(cur, [(data['athlete'], data['meet'], event)])
                 conn.commit()
         except Exception as e:
             raise Exception(f"Failed to insert result: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
+
+    @staticmethod
+    def insert_many(rows):
+        """Validate and insert result dicts (date, athlete, meet, event, result, team) in one transaction.
+
+        Invalid rows are skipped and reported rather than failing the batch. Valid rows are
+        written with a single executemany; AthleteBests/MeetEventWinners are refreshed once per
+        touched pair, meet versions moved once for the batch and cached TeamScores/AthleteRankings
+        cleared once per affected meet.
+        Returns (inserted, errors) where errors is a list of (row index, message).
+        """
+        values, errors = [], []
+        for index, data in enumerate(rows):
+            row = {field: str(data.get(field) or '').strip() for field in Result.INSERT_FIELDS}
+            missing = [field for field in Result.INSERT_FIELDS if not row[field]]
+            if missing:
+                errors.append((index, f"missing {', '.join(missing)}"))
+                continue
+            try:
+                datetime.strptime(row['date'], '%Y-%m-%d')
+            except ValueError:
+                errors.append((index, f"invalid date {row['date']!r}, expected YYYY-MM-DD"))
+                continue
+            event = Event.canonical_name(row['event'])
+            values.append((row['date'], row['athlete'], row['meet'], event, row['result'], row['team'],
+                           *Event.parse_result(row['result'], event)))
+        if not values:
+            return 0, errors
+
+        conn = Database.get_connection()
+        with conn:
+            cur = conn.cursor()
+            with meet_cache.deferred_versions(cur):
+                cur.executemany(Result._INSERT_SQL, values)
+            sync_derived_tables(cur, {(athlete, meet, event) for _, athlete, meet, event, *_ in values})
+            meets = [(meet,) for meet in {value[2] for value in values}]
+            cur.executemany('DELETE FROM TeamScores WHERE meet_name = ?', meets)
+            cur.executemany('DELETE FROM AthleteRankings WHERE meet_name = ?', meets)
+        return len(values), errors
 
     @staticmethod
     def get_recent_meets(limit=25, offset=0, search=None):
@@ -351,14 +382,15 @@ class Result:
         with conn:
             cur = conn.cursor()
             query = '''
-                SELECT DISTINCT Meet_Name, strftime('%Y-%m-%d', Date) as formatted_date
-                FROM Results
+                SELECT meet_name AS Meet_Name, date AS formatted_date
+                FROM Meets
+                WHERE result_count > 0
             '''
             params = []
             if search:
-                query += ' WHERE Meet_Name LIKE ?'
+                query += ' AND meet_name LIKE ?'
                 params.append(f'%{search}%')
-            query += ' ORDER BY formatted_date DESC, Meet_Name ASC LIMIT ? OFFSET ?'
+            query += ' ORDER BY date DESC, meet_name ASC LIMIT ? OFFSET ?'
             params.extend([limit, offset])
             cur.execute(query, params)
             return cur.fetchall()
@@ -368,16 +400,18 @@ class Result:
         conn = Database.get_connection()
         with conn:
             cur = conn.cursor()
+            # Meets.date is normalized to YYYY-MM-DD, so the month is a plain idx_meets_date range
             query = '''
-                SELECT DISTINCT Meet_Name, strftime('%Y-%m-%d', Date) as formatted_date
-                FROM Results
-                WHERE strftime('%Y', Date) = ? AND strftime('%m', Date) = ?
+                SELECT meet_name AS Meet_Name, date AS formatted_date
+                FROM Meets
+                WHERE date >= ? AND date < ? AND result_count > 0
             '''
-            params = [str(year), f'{month:02d}']
+            next_month = f'{year + 1}-01' if month == 12 else f'{year}-{month + 1:02d}'
+            params = [f'{year}-{month:02d}', next_month]
             if search:
-                query += ' AND Meet_Name LIKE ?'
+                query += ' AND meet_name LIKE ?'
                 params.append(f'%{search}%')
-            query += ' ORDER BY formatted_date ASC, Meet_Name ASC'
+            query += ' ORDER BY formatted_date ASC, meet_name ASC'
             cur.execute(query, params)
             return cur.fetchall()
 
@@ -387,15 +421,15 @@ class Result:
         with conn:
             cur = conn.cursor()
             query = '''
-                SELECT DISTINCT Meet_Name, strftime('%Y-%m-%d', Date) as formatted_date
-                FROM Results
-                WHERE strftime('%Y-%m-%d', Date) = ?
+                SELECT meet_name AS Meet_Name, date AS formatted_date
+                FROM Meets
+                WHERE date = ? AND result_count > 0
             '''
             params = [date]
             if search:
-                query += ' AND Meet_Name LIKE ?'
+                query += ' AND meet_name LIKE ?'
                 params.append(f'%{search}%')
-            query += ' ORDER BY Meet_Name ASC'
+            query += ' ORDER BY meet_name ASC'
             cur.execute(query, params)
             return cur.fetchall()
 
@@ -404,15 +438,12 @@ class Result:
         conn = Database.get_connection()
         with conn:
             cur = conn.cursor()
-            query = '''
-                SELECT strftime('%Y-%m-%d', Date) as formatted_date
-                FROM Results
-            '''
+            query = 'SELECT date FROM Meets WHERE date IS NOT NULL AND result_count > 0'
             params = []
             if search:
-                query += ' WHERE Meet_Name LIKE ?'
+                query += ' AND meet_name LIKE ?'
                 params.append(f'%{search}%')
-            query += ' ORDER BY formatted_date DESC LIMIT 1'
+            query += ' ORDER BY date DESC LIMIT 1'
             cur.execute(query, params)
             row = cur.fetchone()
             return row[0] if row else None
@@ -422,46 +453,42 @@ class Result:
         conn = Database.get_connection()
         with conn:
             cur = conn.cursor()
-            query = 'SELECT COUNT(*) FROM (SELECT DISTINCT Meet_Name, strftime("%Y-%m-%d", Date) as formatted_date FROM Results'
+            query = 'SELECT COUNT(*) FROM Meets WHERE result_count > 0'
             params = []
             if search:
-                query += ' WHERE Meet_Name LIKE ?'
+                query += ' AND meet_name LIKE ?'
                 params.append(f'%{search}%')
-            query += ')'
             cur.execute(query, params)
             return cur.fetchone()[0]
 
     @staticmethod
-    def get_recent_winners(limit=25, offset=0):
+    def get_recent_winners(limit=25, offset=0, after=None):
+        """Newest (meet, event) winners from MeetEventWinners.
+
+        after is the (date, meet, event) of the last row already shown; when given the
+        page starts right after it (keyset pagination) and offset is ignored. Undated
+        winners sort last, as they do on the first page.
+        """
         conn = Database.get_connection()
         with conn:
             cur = conn.cursor()
-            cur.execute('''
-                WITH RankedResults AS (
-                    SELECT 
-                        strftime('%Y-%m-%d', Date) as formatted_date,
-                        Athlete,
-                        Meet_Name,
-                        Event,
-                        Result,
-                        Team,
-                        ROW_NUMBER() OVER (
-                            PARTITION BY Meet_Name, Event 
-                            ORDER BY 
-                                CASE 
-                                    WHEN Event IN ('60m', '100m', '200m', '400m', '800m', '1500m', 'Mile', '3000m', '5000m', '10000m', '60mH', '100mH', '110mH', '400mH') 
-                                    THEN CAST(REPLACE(Result, ':', '') AS DECIMAL)
-                                    ELSE Result 
-                                END ASC
-                        ) as rn
-                    FROM Results
-                )
-                SELECT formatted_date, Athlete, Meet_Name, Event, Result, Team
-                FROM RankedResults
-                WHERE rn = 1
-                ORDER BY formatted_date DESC, Meet_Name, Event
-                LIMIT ? OFFSET ?
-            ''', (limit, offset))
+            query = '''
+                SELECT date, athlete, meet_name, event, result, team
+                FROM MeetEventWinners
+            '''
+            params = []
+            if after:
+                after_date, after_meet, after_event = after
+                if after_date is None:
+                    query += ' WHERE date IS NULL AND (meet_name, event) > (?, ?)'
+                    params += [after_meet, after_event]
+                else:
+                    query += (' WHERE date < ? OR (date = ? AND (meet_name, event) > (?, ?))'
+                              ' OR date IS NULL')
+                    params += [after_date, after_date, after_meet, after_event]
+                offset = 0
+            query += ' ORDER BY date DESC, meet_name, event LIMIT ? OFFSET ?'
+            cur.execute(query, params + [limit, offset])
             return cur.fetchall()
 
     @staticmethod
@@ -469,15 +496,23 @@ class Result:
         conn = Database.get_connection()
         with conn:
             cur = conn.cursor()
-            cur.execute('''
-                SELECT COUNT(*) FROM (
-                    SELECT DISTINCT Meet_Name, Event
-                    FROM Results
-                )
-            ''')
-            return cur.fetchone()[0]
+            cur.execute('SELECT value FROM Counters WHERE name = ?', (meet_winners.WINNERS_COUNTER,))
+            row = cur.fetchone()
+            return row[0] if row else 0
 
 class Athlete:
+    """Genders are served from a per-process {athlete_name: is_female} map filled on demand.
+
+    Triggers on Athletes bump the GENDERS_COUNTER row in Counters (migration 18) when a
+    gender or name changes, so each process checks that row at most once per request and
+    starts a fresh map when another thread, process or import has changed an athlete.
+    """
+    GENDERS_COUNTER = 'athlete_genders_version'
+    # db_path -> (counter value, {athlete_name: is_female})
+    _genders = {}
+    _genders_lock = threading.Lock()
+    _GENDER_BATCH = 500
+
     @staticmethod
     def get_bio(name):
         conn = Database.get_connection()
@@ -512,25 +547,309 @@ class Athlete:
                 DO UPDATE SET is_female = ?, updated_at = CURRENT_TIMESTAMP
             ''', (name, is_female, is_female))
             conn.commit()
+        Athlete.invalidate(current_app.config['DATABASE'])
 
     @staticmethod
     def get_gender(name):
+        return Athlete.genders([name])[name]
+
+    @staticmethod
+    def _gender_map():
+        db_path = current_app.config['DATABASE']
+        checked = g.setdefault('_athlete_genders_checked', {})
+        cached = Athlete._genders.get(db_path)
+        if cached is not None and checked.get(db_path) == cached[0]:
+            return cached[1]
+        conn = Database.get_connection()
+        cur = conn.cursor()
+        cur.execute('SELECT value FROM Counters WHERE name = ?', (Athlete.GENDERS_COUNTER,))
+        row = cur.fetchone()
+        version = row[0] if row else None
+        if cached is None or cached[0] != version:
+            with Athlete._genders_lock:
+                cached = Athlete._genders.get(db_path)
+                if cached is None or cached[0] != version:
+                    cached = (version, {})
+                    Athlete._genders[db_path] = cached
+        checked[db_path] = cached[0]
+        return cached[1]
+
+    @staticmethod
+    def genders(names):
+        """{name: is_female} for names; ones not cached yet are read with one IN (...) query per batch.
+
+        Names without an Athletes row map to False, as get_gender always has.
+        """
+        cache = Athlete._gender_map()
+        missing = list({name for name in names if name not in cache})
+        if missing:
+            conn = Database.get_connection()
+            cur = conn.cursor()
+            found = {}
+            for start in range(0, len(missing), Athlete._GENDER_BATCH):
+                batch = missing[start:start + Athlete._GENDER_BATCH]
+                cur.execute(f'''
+                    SELECT athlete_name, is_female FROM Athletes
+                    WHERE athlete_name IN ({', '.join('?' * len(batch))})
+                ''', batch)
+                found.update(cur.fetchall())
+            for name in missing:
+                cache[name] = bool(found.get(name))
+        return {name: cache[name] for name in names}
+
+    @staticmethod
+    def invalidate(db_path=None):
+        """Drop cached genders for db_path (all databases if None)."""
+        if db_path is None:
+            Athlete._genders.clear()
+        else:
+            Athlete._genders.pop(db_path, None)
+
+class AthleteBest:
+    """Reads from AthleteBests, kept current by the Results write paths (utils.athlete_bests)."""
+
+    @staticmethod
+    def get(athlete, event):
         conn = Database.get_connection()
         with conn:
             cur = conn.cursor()
-            cur.execute('SELECT is_female FROM Athletes WHERE athlete_name = ?', (name,))
-            result = cur.fetchone()
-            return bool(result[0]) if result and result[0] is not None else False
+            cur.execute('''
+                SELECT athlete, event, best_value, result, result_id, date, result_count
+                FROM AthleteBests
+                WHERE athlete = ? AND event = ?
+            ''', (athlete, event))
+            return cur.fetchone()
 
-class Team:
     @staticmethod
-    def get_team_info(team_name):
+    def get_for_athlete(athlete):
         conn = Database.get_connection()
         with conn:
             cur = conn.cursor()
-            cur.execute('SELECT logo_url FROM Teams WHERE team_name = ?', (team_name,))
-            result = cur.fetchone()
-            return {'logo_url': result[0] if result else None}
+            cur.execute('''
+                SELECT athlete, event, best_value, result, result_id, date, result_count
+                FROM AthleteBests
+                WHERE athlete = ?
+                ORDER BY event
+            ''', (athlete,))
+            return cur.fetchall()
+
+    @staticmethod
+    def pr_and_debut_flags(meet_name):
+        """{Result_ID: (is_pr, is_debut)} for every result at the meet, from one join against AthleteBests.
+
+        A result is a PR when it equals or beats the athlete's best in the event (that best
+        includes this meet) and a debut when it is the athlete's only result in the event.
+        """
+        conn = Database.get_connection()
+        with conn:
+            cur = conn.cursor()
+            cur.execute('''
+                SELECT r.Result_ID, r.Event, r.Result_Value, b.best_value, b.result_count
+                FROM Results r
+                LEFT JOIN AthleteBests b ON b.athlete = r.Athlete AND b.event = r.Event
+                WHERE r.Meet_ID = (SELECT meet_id FROM Meets WHERE meet_name = ?)
+            ''', (meet_name,))
+            flags = {}
+            for result_id, event, value, best_value, result_count in cur.fetchall():
+                if result_count is None:
+                    flags[result_id] = (True, True)  # First time running this event
+                    continue
+                if value is None:
+                    is_pr = False
+                elif best_value is None:
+                    is_pr = True
+                elif Event.is_time_event(event):
+                    is_pr = value <= best_value
+                else:
+                    is_pr = value >= best_value
+                flags[result_id] = (is_pr, result_count == 1)
+            return flags
+
+
+class Meet:
+    """Meets rows: one per meet name with its start date and a cached result count.
+
+    Results rows reference meets by Meet_ID (see migration 10), so renames and date syncs
+    touch Meets/ResultRows directly; the tables still keyed by meet name are carried along
+    (StaggerHistoryRows is the table behind the StaggerHistory view, see migration 11).
+    """
+    # (table, meet name column, date column or None)
+    _MEET_KEYED_TABLES = [
+        ('TeamScores', 'meet_name', None),
+        ('AthleteRankings', 'meet_name', 'date'),
+        ('StaggerHistory', 'meet_name', 'date'),
+        ('RelayTeams', 'Meet_Name', 'Date'),
+    ]
+
+    @staticmethod
+    def get(meet_name):
+        conn = Database.get_connection()
+        with conn:
+            cur = conn.cursor()
+            cur.execute('SELECT meet_id, meet_name, date, result_count FROM Meets WHERE meet_name = ?', (meet_name,))
+            return cur.fetchone()
+
+    @staticmethod
+    def version(meet_name):
+        """Meets.version for the meet, or None if there is no such meet.
+
+        Triggers (migration 14) move it whenever anything the meet page shows changes, so
+        (meet name, version) identifies one rendering of the page's data; see utils.meet_cache.
+        """
+        conn = Database.get_connection()
+        cur = conn.cursor()
+        cur.execute('SELECT version FROM Meets WHERE meet_name = ?', (meet_name,))
+        row = cur.fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _recount(cur, meet_ids):
+        cur.executemany('''
+            UPDATE Meets
+            SET result_count = (SELECT COUNT(*) FROM ResultRows WHERE Meet_ID = Meets.meet_id),
+                date = (SELECT MIN(date(Date)) FROM ResultRows WHERE Meet_ID = Meets.meet_id)
+            WHERE meet_id = ?
+        ''', [(meet_id,) for meet_id in meet_ids])
+
+    @staticmethod
+    def rename(old_name, new_name, date=None):
+        """Rename a meet, or only its results on date. Returns the number of results moved.
+
+        A whole-meet rename to an unused name is a single Meets update; renaming onto an
+        existing meet or splitting off one date moves the ResultRows to the target meet.
+        """
+        conn = Database.get_connection()
+        with conn:
+            cur = conn.cursor()
+            cur.execute('SELECT meet_id, result_count FROM Meets WHERE meet_name = ?', (old_name,))
+            old = cur.fetchone()
+            if not old or old_name == new_name:
+                return 0
+            old_id = old['meet_id']
+            if date:
+                cur.execute('SELECT COUNT(*) FROM ResultRows WHERE Meet_ID = ? AND date(Date) = date(?)', (old_id, date))
+            else:
+                cur.execute('SELECT COUNT(*) FROM ResultRows WHERE Meet_ID = ?', (old_id,))
+            moved = cur.fetchone()[0]
+            if not moved:
+                return 0
+            cur.execute('SELECT DISTINCT Event FROM Results WHERE Meet_ID = ?', (old_id,))
+            events = [row[0] for row in cur.fetchall()]
+            cur.execute('SELECT meet_id FROM Meets WHERE meet_name = ?', (new_name,))
+            target = cur.fetchone()
+
+            if not date and not target:
+                cur.execute('UPDATE Meets SET meet_name = ? WHERE meet_id = ?', (new_name, old_id))
+                cur.execute('UPDATE MeetEventWinners SET meet_name = ? WHERE meet_name = ?', (new_name, old_name))
+            else:
+                if not target:
+                    cur.execute('INSERT INTO Meets (meet_name) VALUES (?)', (new_name,))
+                new_id = target['meet_id'] if target else cur.lastrowid
+                if date:
+                    cur.execute('UPDATE ResultRows SET Meet_ID = ? WHERE Meet_ID = ? AND date(Date) = date(?)',
+                                (new_id, old_id, date))
+                else:
+                    cur.execute('UPDATE ResultRows SET Meet_ID = ? WHERE Meet_ID = ?', (new_id, old_id))
+                Meet._recount(cur, [old_id, new_id])
+                if not date:
+                    cur.execute('DELETE FROM Meets WHERE meet_id = ?', (old_id,))
+                meet_winners.refresh(cur, [(meet, event) for meet in (old_name, new_name) for event in events])
+
+            for table, name_column, date_column in Meet._MEET_KEYED_TABLES:
+                if date and not date_column:
+                    continue
+                query = f'UPDATE OR REPLACE {table} SET {name_column} = ? WHERE {name_column} = ?'
+                params = [new_name, old_name]
+                if date:
+                    query += f' AND date({date_column}) = date(?)'
+                    params.append(date)
+                cur.execute(query, params)
+            if not date:
+                for table in ('Comments', 'BoardPosts'):
+                    cur.execute(f"UPDATE {table} SET page_id = ? WHERE page_type = 'meet' AND page_id = ?",
+                                (new_name, old_name))
+            conn.commit()
+            return moved
+
+    @staticmethod
+    def sync_dates(meet_name, date):
+        """Set every result of the meet (and its meet-keyed rows) to date. Returns the number of results updated."""
+        conn = Database.get_connection()
+        with conn:
+            cur = conn.cursor()
+            cur.execute('SELECT meet_id FROM Meets WHERE meet_name = ?', (meet_name,))
+            meet = cur.fetchone()
+            if not meet:
+                return 0
+            cur.execute('UPDATE ResultRows SET Date = ? WHERE Meet_ID = ?', (date, meet['meet_id']))
+            updated = cur.rowcount
+            if not updated:
+                return 0
+            Meet._recount(cur, [meet['meet_id']])
+            for table, name_column, date_column in Meet._MEET_KEYED_TABLES:
+                if date_column:
+                    cur.execute(f'UPDATE OR REPLACE {table} SET {date_column} = ? WHERE {name_column} = ?',
+                                (date, meet_name))
+            # Dates break PR ties and are shown with PRs and meet winners
+            cur.execute('SELECT DISTINCT Athlete, Meet_Name, Event FROM Results WHERE Meet_ID = ?', (meet['meet_id'],))
+            sync_derived_tables(cur, [tuple(row) for row in cur.fetchall()])
+            conn.commit()
+            return updated
+
+
+class Team:
+    """Team logos are served from a per-process map of the whole Teams table.
+
+    Triggers on Teams bump the LOGOS_COUNTER row in Counters (migration 13), so each
+    process checks that one row at most once per request and reloads the map only when
+    another thread, process or import has changed a team.
+    """
+    LOGOS_COUNTER = 'team_logos_version'
+    # db_path -> (counter value, {team_name: logo_url})
+    _logos = {}
+    _logos_lock = threading.Lock()
+
+    @staticmethod
+    def _logo_map():
+        db_path = current_app.config['DATABASE']
+        checked = g.setdefault('_team_logos_checked', {})
+        cached = Team._logos.get(db_path)
+        if cached is not None and checked.get(db_path) == cached[0]:
+            return cached[1]
+        conn = Database.get_connection()
+        cur = conn.cursor()
+        cur.execute('SELECT value FROM Counters WHERE name = ?', (Team.LOGOS_COUNTER,))
+        row = cur.fetchone()
+        version = row[0] if row else None
+        if cached is None or cached[0] != version:
+            with Team._logos_lock:
+                cached = Team._logos.get(db_path)
+                if cached is None or cached[0] != version:
+                    cur.execute('SELECT team_name, logo_url FROM Teams')
+                    cached = (version, dict(cur.fetchall()))
+                    Team._logos[db_path] = cached
+        checked[db_path] = cached[0]
+        return cached[1]
+
+    @staticmethod
+    def logos(team_names=None):
+        """{team_name: logo_url or None} for team_names, or for every team if None."""
+        logos = Team._logo_map()
+        if team_names is None:
+            return dict(logos)
+        return {name: logos.get(name) for name in team_names}
+
+    @staticmethod
+    def invalidate(db_path=None):
+        """Drop the cached logo map for db_path (all databases if None)."""
+        if db_path is None:
+            Team._logos.clear()
+        else:
+            Team._logos.pop(db_path, None)
+
+    @staticmethod
+    def get_team_info(team_name):
+        return {'logo_url': Team._logo_map().get(team_name)}
 
     @staticmethod
     def update_team_logo(team_name, logo_url):
@@ -544,6 +863,7 @@ class Team:
                 DO UPDATE SET logo_url = ?, updated_at = CURRENT_TIMESTAMP
             ''', (team_name, logo_url, logo_url))
             conn.commit()
+        Team.invalidate(current_app.config['DATABASE'])
 
 class TeamScore:
     @staticmethod
@@ -567,14 +887,106 @@ class TeamScore:
             # Delete existing scores for this meet
             cur.execute('DELETE FROM TeamScores WHERE meet_name = ?', (meet_name,))
             # Insert new scores
-            for team, score in team_scores.items():
-                cur.execute('''
-                    INSERT INTO TeamScores (meet_name, team_name, score)
-                    VALUES (?, ?, ?)
-                ''', (meet_name, team, score))
+            cur.executemany('''
+                INSERT INTO TeamScores (meet_name, team_name, score)
+                VALUES (?, ?, ?)
+            ''', [(meet_name, team, score) for team, score in team_scores.items()])
             conn.commit()
 
 class AthleteRanking:
+    """Trailing-year ranks come from per-process utils.rankings.EventIndex objects.
+
+    Triggers bump each event's 'ranking_version:<event_id>' row in Counters (migration 15)
+    whenever its marks or names change, so every process checks an event's version at
+    most once per request and reloads only the events another thread, process or import
+    has written to, and only for the dates the caller ranks over.
+    """
+    VERSION_PREFIX = 'ranking_version:'
+    # db_path -> {event: (version, EventIndex)}
+    _indexes = {}
+    _indexes_lock = threading.Lock()
+
+    @staticmethod
+    def event_indexes(events, start, end):
+        """{event: EventIndex} holding at least the marks dated start..end ('YYYY-MM-DD').
+
+        Stale events are reloaded for start..end only; current ones that miss some of those
+        dates are extended by just the missing ones. Either way it is a single query.
+        """
+        db_path = current_app.config['DATABASE']
+        events = set(events)
+        checked = g.setdefault('_ranking_versions_checked', {}).setdefault(db_path, {})
+        cached = AthleteRanking._indexes.setdefault(db_path, {})
+        conn = Database.get_connection()
+        cur = conn.cursor()
+        unchecked = sorted(event for event in events if event not in checked)
+        if unchecked:
+            cur.execute(f'''
+                SELECT e.event_name, c.value
+                FROM Events e
+                LEFT JOIN Counters c ON c.name = ? || e.event_id
+                WHERE e.event_name IN ({', '.join('?' * len(unchecked))})
+            ''', (AthleteRanking.VERSION_PREFIX, *unchecked))
+            versions = dict(cur.fetchall())
+            for event in unchecked:
+                checked[event] = versions.get(event)
+
+        def missing(event):
+            entry = cached.get(event)
+            return entry is None or entry[0] != checked[event] or not entry[1].covers(start, end)
+
+        if any(missing(event) for event in events):
+            with AthleteRanking._indexes_lock:
+                # event -> (span to hold, [(first, last)] date ranges to read, index to extend)
+                plans = {}
+                for event in sorted(event for event in events if missing(event)):
+                    version, index = cached.get(event, (None, None))
+                    if index is None or version != checked[event]:
+                        plans[event] = ((start, end), [(start, end)], None)
+                        continue
+                    lo, hi = index.span
+                    reads = []
+                    if start < lo:
+                        reads.append((start, rankings.shift(lo, -1)))
+                    if end > hi:
+                        reads.append((rankings.shift(hi, 1), end))
+                    plans[event] = ((min(start, lo), max(end, hi)), reads, index)
+                if plans:
+                    ranges = [(event, first, last) for event, (_, reads, _) in plans.items() for first, last in reads]
+                    cur.execute(f'''
+                        SELECT Event, Date, Athlete, Result_Value
+                        FROM Results
+                        WHERE Result_Value IS NOT NULL
+                        AND ({' OR '.join(['(Event = ? AND Date >= ? AND Date <= ?)'] * len(ranges))})
+                    ''', [value for dates in ranges for value in dates])
+                    marks = {}
+                    for event, date, athlete, value in cur.fetchall():
+                        marks.setdefault(event, []).append((date, athlete, value))
+                    for event, (span, _, index) in plans.items():
+                        if index is None:
+                            index = rankings.EventIndex(marks.get(event, []), Event.direction(event) == 'DESC', span)
+                        else:
+                            index = index.extended(marks.get(event, []), span)
+                        cached[event] = (checked[event], index)
+        return {event: cached[event][1] for event in events}
+
+    @staticmethod
+    def rank_as_of(event, athlete, date, start=None):
+        """athlete's rank in event over the trailing year ending on date ('YYYY-MM-DD'), or None.
+
+        start overrides the window's first day (default 365 days before date).
+        """
+        start = start or rankings.window_start(date)
+        return AthleteRanking.event_indexes([event], start, date)[event].rank(athlete, date, start)
+
+    @staticmethod
+    def invalidate(db_path=None):
+        """Drop the cached rank indexes for db_path (all databases if None)."""
+        if db_path is None:
+            AthleteRanking._indexes.clear()
+        else:
+            AthleteRanking._indexes.pop(db_path, None)
+
     @staticmethod
     def get_meet_rankings(meet_name):
         """Get cached rankings for a specific meet"""
@@ -598,92 +1010,45 @@ class AthleteRanking:
             # Delete existing rankings for this meet
             cur.execute('DELETE FROM AthleteRankings WHERE meet_name = ?', (meet_name,))
             # Insert new rankings
-            for ranking in rankings_data:
-                cur.execute('''
-                    INSERT INTO AthleteRankings (meet_name, event, date, athlete, ranking_before, ranking_after)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (meet_name, ranking['event'], ranking['date'], ranking['athlete'], 
-                     ranking['ranking_before'], ranking['ranking_after']))
+            cur.executemany('''
+                INSERT INTO AthleteRankings (meet_name, event, date, athlete, ranking_before, ranking_after)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [(meet_name, ranking['event'], ranking['date'], ranking['athlete'],
+                   ranking['ranking_before'], ranking['ranking_after']) for ranking in rankings_data])
             conn.commit()
 
     @staticmethod
-    def calculate_rankings_for_date(event, date, include_current=False):
-        """Calculate rankings for an event as of a specific date"""
-        from datetime import datetime, timedelta
-        
-        # Get date 1 year before the meet date
-        meet_date = datetime.strptime(date, '%Y-%m-%d')
-        one_year_ago = (meet_date - timedelta(days=365)).strftime('%Y-%m-%d')
-        target_date = date if include_current else (meet_date - timedelta(days=1)).strftime('%Y-%m-%d')
-        
+    def calculate_meet_rankings(meet_name):
+        """Trailing-year rank the day before and on the day of the meet for every individual
+        entry, as rows for update_meet_rankings. Both windows start 365 days before the meet,
+        so "before" covers [date-365, date-1] and "after" [date-365, date]. Relays and relay
+        splits are skipped."""
         conn = Database.get_connection()
         with conn:
             cur = conn.cursor()
-            # For time events (lower is better)
-            if 'm' in event or 'Mile' in event:
-                cur.execute('''
-                    WITH RankedResults AS (
-                        SELECT 
-                            Athlete,
-                            Result,
-                            ROW_NUMBER() OVER (ORDER BY Result ASC) as rank
-                        FROM Results 
-                        WHERE Event = ? 
-                        AND Date <= ?
-                        AND Date >= ?
-                        GROUP BY Athlete
-                        HAVING Result = MIN(Result)
-                    )
-                    SELECT Athlete, rank 
-                    FROM RankedResults
-                    ORDER BY rank
-                ''', (event, target_date, one_year_ago))
-            # For field events (higher is better). Ft-in (e.g. 20'0") must be ranked in Python.
-            else:
-                cur.execute('''
-                    SELECT Athlete, Result FROM Results
-                    WHERE Event = ? AND Date <= ? AND Date >= ?
-                ''', (event, target_date, one_year_ago))
-                rows = cur.fetchall()
-                result_strs = [r[1] for r in rows]
-                from utils.field_utils import all_results_are_field_format, parse_field_result
-                from collections import defaultdict
-                if result_strs and all_results_are_field_format(result_strs):
-                    by_athlete = defaultdict(list)
-                    for athlete, result in rows:
-                        by_athlete[athlete].append(result)
-                    best_per_athlete = [(athlete, max(results, key=parse_field_result)) for athlete, results in by_athlete.items()]
-                    best_per_athlete.sort(key=lambda x: parse_field_result(x[1]), reverse=True)
-                    return {athlete: rank for rank, (athlete, _) in enumerate(best_per_athlete, start=1)}
-                cur.execute('''
-                    WITH RankedResults AS (
-                        SELECT 
-                            Athlete,
-                            Result,
-                            ROW_NUMBER() OVER (ORDER BY Result DESC) as rank
-                        FROM Results 
-                        WHERE Event = ? 
-                        AND Date <= ?
-                        AND Date >= ?
-                        GROUP BY Athlete
-                        HAVING Result = MAX(Result)
-                    )
-                    SELECT Athlete, rank 
-                    FROM RankedResults
-                    ORDER BY rank
-                ''', (event, target_date, one_year_ago))
-                return dict(cur.fetchall())
-            
-            return dict(cur.fetchall())
+            cur.execute('''
+                SELECT DISTINCT Event, strftime('%Y-%m-%d', Date), Athlete
+                FROM Results
+                WHERE Meet_Name = ?
+                ORDER BY Event, Date, Athlete
+            ''', (meet_name,))
+            entries = [row for row in cur.fetchall() if not row[0].endswith((' RS', ' Relay'))]
+        if entries:
+            AthleteRanking.event_indexes({event for event, _, _ in entries},
+                                         rankings.window_start(min(date for _, date, _ in entries)),
+                                         max(date for _, date, _ in entries))
+        return [{
+            'event': event,
+            'date': date,
+            'athlete': athlete,
+            'ranking_before': AthleteRanking.rank_as_of(event, athlete, rankings.shift(date, -1),
+                                                        rankings.window_start(date)),
+            'ranking_after': AthleteRanking.rank_as_of(event, athlete, date),
+        } for event, date, athlete in entries]
 
     @staticmethod
     def calculate_athlete_rankings(athlete_name):
         """Calculate current rankings for an athlete across all their events"""
-        from datetime import datetime, timedelta
-        
-        # Get date 1 year ago from today
-        one_year_ago = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
-        
         conn = Database.get_connection()
         with conn:
             cur = conn.cursor()
@@ -696,85 +1061,15 @@ class AthleteRanking:
                 ORDER BY Event
             ''', (athlete_name,))
             events = [row[0] for row in cur.fetchall()]
-            
-            rankings = {}
-            for event in events:
-                # For time events (lower is better)
-                if 'm' in event or 'Mile' in event:
-                    # Convert time strings to numeric values for proper sorting
-                    cur.execute('''
-                        WITH BestResults AS (
-                            SELECT 
-                                Athlete,
-                                Result,
-                                CASE 
-                                    WHEN Result LIKE '%:%' THEN
-                                        CAST(SUBSTR(Result, 1, INSTR(Result, ':') - 1) AS REAL) * 60 +
-                                        CAST(SUBSTR(Result, INSTR(Result, ':') + 1) AS REAL)
-                                    ELSE
-                                        CAST(Result AS REAL)
-                                END as numeric_result
-                            FROM Results 
-                            WHERE Event = ? 
-                            AND Date >= ?
-                        ),
-                        AthletePRs AS (
-                            SELECT 
-                                Athlete,
-                                MIN(numeric_result) as best_result,
-                                MIN(Result) as best_result_str
-                            FROM BestResults
-                            GROUP BY Athlete
-                        ),
-                        RankedResults AS (
-                            SELECT 
-                                Athlete,
-                                best_result_str as Result,
-                                ROW_NUMBER() OVER (ORDER BY best_result ASC) as rank
-                            FROM AthletePRs
-                        )
-                        SELECT rank 
-                        FROM RankedResults
-                        WHERE Athlete = ?
-                    ''', (event, one_year_ago, athlete_name))
-                # For field events (higher is better)
-                else:
-                    cur.execute('''
-                        WITH BestResults AS (
-                            SELECT 
-                                Athlete,
-                                Result,
-                                CAST(Result AS REAL) as numeric_result
-                            FROM Results 
-                            WHERE Event = ? 
-                            AND Date >= ?
-                            AND Result GLOB '[0-9]*.[0-9]*'
-                        ),
-                        AthletePRs AS (
-                            SELECT 
-                                Athlete,
-                                MAX(numeric_result) as best_result,
-                                MAX(Result) as best_result_str
-                            FROM BestResults
-                            GROUP BY Athlete
-                        ),
-                        RankedResults AS (
-                            SELECT 
-                                Athlete,
-                                best_result_str as Result,
-                                ROW_NUMBER() OVER (ORDER BY best_result DESC) as rank
-                            FROM AthletePRs
-                        )
-                        SELECT rank 
-                        FROM RankedResults
-                        WHERE Athlete = ?
-                    ''', (event, one_year_ago, athlete_name))
-                
-                result = cur.fetchone()
-                if result:
-                    rankings[event] = result[0]
-            
-            return rankings
+        
+        today = datetime.now().strftime('%Y-%m-%d')
+        AthleteRanking.event_indexes(events, rankings.window_start(today), today)
+        current = {}
+        for event in events:
+            rank = AthleteRanking.rank_as_of(event, athlete_name, today)
+            if rank is not None:
+                current[event] = rank
+        return current
 
 class Comment:
     @staticmethod
@@ -954,6 +1249,21 @@ class StaggerScore:
             row = cur.fetchone()
             return float(row[0]) if row else None
 
+    @staticmethod
+    def get_scores_for_meet(meet_name):
+        """Return dict (athlete, event) -> current score for every athlete/event entered at the meet."""
+        conn = Database.get_connection()
+        with conn:
+            cur = conn.cursor()
+            cur.execute('''
+                SELECT athlete, event, score FROM StaggerScores
+                WHERE (athlete_id, event_id) IN (
+                    SELECT Athlete_ID, Event_ID FROM ResultRows
+                    WHERE Meet_ID = (SELECT meet_id FROM Meets WHERE meet_name = ?)
+                )
+            ''', (meet_name,))
+            return {(row[0], row[1]): float(row[2]) for row in cur.fetchall()}
+
     @staticmethod
     def get_scores_for_athlete(athlete):
         """Return dict event -> score for an athlete."""
@@ -970,21 +1280,14 @@ class StaggerScore:
     def set_score(athlete, event, score):
         """Insert or update a single (athlete, event) score."""
         conn = Database.get_connection()
-        try:
-            with conn:
-                cur = conn.cursor()
-                clamped = max(STAGGER_FLOOR, min(STAGGER_CEILING, score))
-                cur.execute('''
-                    INSERT INTO StaggerScores (athlete, event, score)
-                    VALUES (?, ?, ?)
-                    ON CONFLICT(athlete, event) DO UPDATE SET score = excluded.score
-                ''', (athlete, event, clamped))
-                conn.commit()
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+        with conn:
+            cur = conn.cursor()
+            clamped = max(STAGGER_FLOOR, min(STAGGER_CEILING, score))
+            cur.execute('''
+                INSERT OR REPLACE INTO StaggerScores (athlete, event, score)
+                VALUES (?, ?, ?)
+            ''', (athlete, event, clamped))
+            conn.commit()
 
     @staticmethod
     def get_meet_history(meet_name):
@@ -1004,82 +1307,59 @@ class StaggerScore:
     def revert_meet(meet_name):
         """Subtract stored deltas from StaggerScores and delete StaggerHistory for this meet."""
         conn = Database.get_connection()
-        try:
-            with conn:
-                cur = conn.cursor()
-                # Acquire write lock early to avoid partial updates
-                cur.execute('BEGIN IMMEDIATE')
+        with conn:
+            cur = conn.cursor()
+            # Acquire write lock early to avoid partial updates
+            cur.execute('BEGIN IMMEDIATE')
+            cur.execute(
+                'SELECT event, athlete, delta FROM StaggerHistory WHERE meet_name = ?',
+                (meet_name,)
+            )
+            rows = cur.fetchall()
+            for event, athlete, delta in rows:
                 cur.execute(
-                    'SELECT event, athlete, delta FROM StaggerHistory WHERE meet_name = ?',
-                    (meet_name,)
+                    'SELECT score FROM StaggerScores WHERE athlete = ? AND event = ?',
+                    (athlete, event)
                 )
-                rows = cur.fetchall()
-                for event, athlete, delta in rows:
-                    cur.execute(
-                        'SELECT score FROM StaggerScores WHERE athlete = ? AND event = ?',
-                        (athlete, event)
-                    )
-                    row = cur.fetchone()
-                    current = float(row[0]) if row else STAGGER_INITIAL
-                    new_score = max(STAGGER_FLOOR, min(STAGGER_CEILING, current - float(delta)))
-                    cur.execute('''
-                        INSERT INTO StaggerScores (athlete, event, score)
-                        VALUES (?, ?, ?)
-                        ON CONFLICT(athlete, event) DO UPDATE SET score = excluded.score
-                    ''', (athlete, event, new_score))
-                cur.execute('DELETE FROM StaggerHistory WHERE meet_name = ?', (meet_name,))
-                conn.commit()
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+                row = cur.fetchone()
+                current = float(row[0]) if row else STAGGER_INITIAL
+                new_score = max(STAGGER_FLOOR, min(STAGGER_CEILING, current - float(delta)))
+                cur.execute('''
+                    INSERT OR REPLACE INTO StaggerScores (athlete, event, score)
+                    VALUES (?, ?, ?)
+                ''', (athlete, event, new_score))
+            cur.execute('DELETE FROM StaggerHistory WHERE meet_name = ?', (meet_name,))
+            conn.commit()
 
     @staticmethod
     def apply_meet_deltas(meet_name, deltas):
         """deltas = list of (event, date, athlete, delta). Update StaggerScores and insert StaggerHistory."""
         conn = Database.get_connection()
-        try:
-            with conn:
-                cur = conn.cursor()
-                # Acquire write lock early to avoid partial updates
-                cur.execute('BEGIN IMMEDIATE')
-                for event, date, athlete, delta in deltas:
-                    cur.execute(
-                        'SELECT score FROM StaggerScores WHERE athlete = ? AND event = ?',
-                        (athlete, event)
-                    )
-                    row = cur.fetchone()
-                    current = float(row[0]) if row else STAGGER_INITIAL
-                    new_score = _stagger_dampen(current, float(delta))
-                    cur.execute('''
-                        INSERT INTO StaggerScores (athlete, event, score)
-                        VALUES (?, ?, ?)
-                        ON CONFLICT(athlete, event) DO UPDATE SET score = excluded.score
-                    ''', (athlete, event, new_score))
-                    # Use INSERT OR REPLACE for safety (PK prevents duplicates anyway)
-                    cur.execute('''
-                        INSERT OR REPLACE INTO StaggerHistory (meet_name, event, date, athlete, delta)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (meet_name, event, date, athlete, delta))
-                conn.commit()
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+        with conn:
+            cur = conn.cursor()
+            # Acquire write lock early to avoid partial updates
+            cur.execute('BEGIN IMMEDIATE')
+            for event, date, athlete, delta in deltas:
+                cur.execute(
+                    'SELECT score FROM StaggerScores WHERE athlete = ? AND event = ?',
+                    (athlete, event)
+                )
+                row = cur.fetchone()
+                current = float(row[0]) if row else STAGGER_INITIAL
+                new_score = _stagger_dampen(current, float(delta))
+                cur.execute('''
+                    INSERT OR REPLACE INTO StaggerScores (athlete, event, score)
+                    VALUES (?, ?, ?)
+                ''', (athlete, event, new_score))
+                # Use INSERT OR REPLACE for safety (PK prevents duplicates anyway)
+                cur.execute('''
+                    INSERT OR REPLACE INTO StaggerHistory (meet_name, event, date, athlete, delta)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (meet_name, event, date, athlete, delta))
+            conn.commit()
 
 
 class RelayTeam:
-    RELAY_CONFIG = {
-        '4x100m': ['100m', '100m', '100m', '100m'],
-        '4x200m': ['200m', '200m', '200m', '200m'],
-        '4x400m': ['400m', '400m', '400m', '400m'],
-        '4x800m': ['800m', '800m', '800m', '800m'],
-        'DMR': ['1200m', '400m', '800m', '1600m'],
-        'SMR': ['400m', '200m', '200m', '800m'],
-    }
-
     @staticmethod
     def insert_relay(data, legs):
         """Insert a relay team and its legs. Also inserts individual Results rows for backward compat."""
@@ -1101,6 +1381,8 @@ class RelayTeam:
                 minutes = int(total_seconds // 60)
                 seconds = total_seconds - minutes * 60
                 total_result = f"{minutes}:{seconds:05.2f}"
+                relay_legs = Event.relay_legs(data.get('event'))
+                touched = []
 
                 cur.execute(
                     'INSERT INTO RelayTeams (Date, Meet_Name, Team, Event, Total_Result, Team_Designation) VALUES (?, ?, ?, ?, ?, ?)',
@@ -1111,94 +1393,79 @@ class RelayTeam:
                 for idx, leg in enumerate(legs, start=1):
                     leg_number = leg.get('leg_number', idx)
                     split_event = leg.get('split_event')
-                    if not split_event and data.get('event') in RelayTeam.RELAY_CONFIG:
-                        split_event = RelayTeam.RELAY_CONFIG[data['event']][idx - 1]
+                    if not split_event and relay_legs:
+                        split_event = relay_legs[idx - 1]
                     cur.execute(
-                        'INSERT INTO RelayLegs (Relay_ID, Leg_Number, Athlete, Split_Event, Split_Result) VALUES (?, ?, ?, ?, ?)',
-                        (relay_id, leg_number, leg['athlete'], split_event, leg['split_result'])
+                        'INSERT INTO RelayLegs (Relay_ID, Leg_Number, Athlete, Split_Event, Split_Result, Split_Value, Split_Kind) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        (relay_id, leg_number, leg['athlete'], split_event, leg['split_result'],
+                         *Event.parse_result(leg['split_result'], split_event))
                     )
                     # Backward compat: also insert into Results so splits show on athlete profiles / meet pages
                     rs_event = f"{split_event} RS" if split_event else ""
                     cur.execute(
-                        'INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team) VALUES (?, ?, ?, ?, ?, ?)',
-                        (data['date'], leg['athlete'], data['meet'], rs_event, leg['split_result'], data['team'])
+                        'INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team, Result_Value, Result_Kind) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                        (data['date'], leg['athlete'], data['meet'], rs_event, leg['split_result'], data['team'],
+                         *Event.parse_result(leg['split_result'], rs_event))
                     )
+                    touched.append((leg['athlete'], data['meet'], rs_event))
+                sync_derived_tables(cur, touched)
                 conn.commit()
                 return relay_id
         except Exception as e:
             raise Exception(f"Failed to insert relay: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
+
+    @staticmethod
+    def fetch_with_legs(cur, where, params=(), order_by='rt.Relay_ID'):
+        """Relay dicts (with their 'legs') for the RelayTeams rows matching where (aliased rt).
+
+        Two queries however many relays match: the teams, then every leg of those teams.
+        """
+        cur.execute(f'''
+            SELECT rt.Relay_ID, rt.Date, rt.Meet_Name, rt.Team, rt.Event, rt.Total_Result, rt.Team_Designation
+            FROM RelayTeams rt
+            WHERE {where}
+            ORDER BY {order_by}
+        ''', params)
+        relays = cur.fetchall()
+        if not relays:
+            return []
+        cur.execute(f'''
+            SELECT Relay_ID, Leg_Number, Athlete, Split_Event, Split_Result
+            FROM RelayLegs
+            WHERE Relay_ID IN (SELECT rt.Relay_ID FROM RelayTeams rt WHERE {where})
+            ORDER BY Relay_ID, Leg_Number
+        ''', params)
+        legs = {}
+        for l in cur.fetchall():
+            legs.setdefault(l[0], []).append(
+                {'leg_number': l[1], 'athlete': l[2], 'split_event': l[3], 'split_result': l[4]})
+        return [{
+            'relay_id': relay[0],
+            'date': relay[1],
+            'meet': relay[2],
+            'team': relay[3],
+            'event': relay[4],
+            'total_result': relay[5],
+            'team_designation': relay[6],
+            'legs': legs.get(relay[0], [])
+        } for relay in relays]
 
     @staticmethod
     def get_relays_for_meet(meet_name):
         conn = Database.get_connection()
         with conn:
-            cur = conn.cursor()
-            cur.execute('''
-                SELECT Relay_ID, Date, Meet_Name, Team, Event, Total_Result, Team_Designation
-                FROM RelayTeams
-                WHERE Meet_Name = ?
-                ORDER BY Event, Team, Team_Designation
-            ''', (meet_name,))
-            relays = cur.fetchall()
-            result = []
-            for relay in relays:
-                relay_id = relay[0]
-                cur.execute('''
-                    SELECT Leg_Number, Athlete, Split_Event, Split_Result
-                    FROM RelayLegs
-                    WHERE Relay_ID = ?
-                    ORDER BY Leg_Number
-                ''', (relay_id,))
-                legs = cur.fetchall()
-                result.append({
-                    'relay_id': relay_id,
-                    'date': relay[1],
-                    'meet': relay[2],
-                    'team': relay[3],
-                    'event': relay[4],
-                    'total_result': relay[5],
-                    'team_designation': relay[6],
-                    'legs': [{'leg_number': l[0], 'athlete': l[1], 'split_event': l[2], 'split_result': l[3]} for l in legs]
-                })
-            return result
+            return RelayTeam.fetch_with_legs(conn.cursor(), 'rt.Meet_Name = ?', (meet_name,),
+                                             'rt.Event, rt.Team, rt.Team_Designation')
 
     @staticmethod
     def get_relays_for_athlete(athlete_name):
         conn = Database.get_connection()
         with conn:
-            cur = conn.cursor()
-            cur.execute('''
-                SELECT rt.Relay_ID, rt.Date, rt.Meet_Name, rt.Team, rt.Event, rt.Total_Result, rt.Team_Designation
-                FROM RelayTeams rt
-                JOIN RelayLegs rl ON rt.Relay_ID = rl.Relay_ID
-                WHERE rl.Athlete = ?
-                ORDER BY rt.Date DESC
-            ''', (athlete_name,))
-            relays = cur.fetchall()
-            result = []
-            for relay in relays:
-                relay_id = relay[0]
-                cur.execute('''
-                    SELECT Leg_Number, Athlete, Split_Event, Split_Result
-                    FROM RelayLegs
-                    WHERE Relay_ID = ?
-                    ORDER BY Leg_Number
-                ''', (relay_id,))
-                legs = cur.fetchall()
-                result.append({
-                    'relay_id': relay_id,
-                    'date': relay[1],
-                    'meet': relay[2],
-                    'team': relay[3],
-                    'event': relay[4],
-                    'total_result': relay[5],
-                    'team_designation': relay[6],
-                    'legs': [{'leg_number': l[0], 'athlete': l[1], 'split_event': l[2], 'split_result': l[3]} for l in legs]
-                })
-            return result
+            return RelayTeam.fetch_with_legs(
+                conn.cursor(), 'rt.Relay_ID IN (SELECT Relay_ID FROM RelayLegs WHERE Athlete = ?)',
+                (athlete_name,), 'rt.Date DESC')
 
     @staticmethod
     def update_relay(relay_id, data, legs):
@@ -1217,6 +1484,7 @@ class RelayTeam:
                 old_date, old_meet, old_team = old['Date'], old['Meet_Name'], old['Team']
 
                 # Delete old backward-compat Results by matching old relay data + legs
+                touched = []
                 cur.execute('SELECT Athlete, Split_Event FROM RelayLegs WHERE Relay_ID = ?', (relay_id,))
                 for leg_row in cur.fetchall():
                     old_rs_event = f"{leg_row['Split_Event']} RS"
@@ -1224,6 +1492,7 @@ class RelayTeam:
                         'DELETE FROM Results WHERE Date=? AND Meet_Name=? AND Athlete=? AND Event=? AND Team=?',
                         (old_date, old_meet, leg_row['Athlete'], old_rs_event, old_team)
                     )
+                    touched.append((leg_row['Athlete'], old_meet, old_rs_event))
 
                 # Compute total time from splits
                 total_seconds = 0
@@ -1237,6 +1506,7 @@ class RelayTeam:
                 minutes = int(total_seconds // 60)
                 seconds = total_seconds - minutes * 60
                 total_result = f"{minutes}:{seconds:05.2f}"
+                relay_legs = Event.relay_legs(data.get('event'))
 
                 cur.execute(
                     'UPDATE RelayTeams SET Date=?, Meet_Name=?, Team=?, Event=?, Total_Result=?, Team_Designation=? WHERE Relay_ID=?',
@@ -1249,25 +1519,28 @@ class RelayTeam:
                 for idx, leg in enumerate(legs, start=1):
                     leg_number = leg.get('leg_number', idx)
                     split_event = leg.get('split_event')
-                    if not split_event and data.get('event') in RelayTeam.RELAY_CONFIG:
-                        split_event = RelayTeam.RELAY_CONFIG[data['event']][idx - 1]
+                    if not split_event and relay_legs:
+                        split_event = relay_legs[idx - 1]
                     cur.execute(
-                        'INSERT INTO RelayLegs (Relay_ID, Leg_Number, Athlete, Split_Event, Split_Result) VALUES (?, ?, ?, ?, ?)',
-                        (relay_id, leg_number, leg['athlete'], split_event, leg['split_result'])
+                        'INSERT INTO RelayLegs (Relay_ID, Leg_Number, Athlete, Split_Event, Split_Result, Split_Value, Split_Kind) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        (relay_id, leg_number, leg['athlete'], split_event, leg['split_result'],
+                         *Event.parse_result(leg['split_result'], split_event))
                     )
                     # Backward compat: insert into Results
                     rs_event = f"{split_event} RS" if split_event else ""
                     cur.execute(
-                        'INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team) VALUES (?, ?, ?, ?, ?, ?)',
-                        (data['date'], leg['athlete'], data['meet'], rs_event, leg['split_result'], data['team'])
+                        'INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team, Result_Value, Result_Kind) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                        (data['date'], leg['athlete'], data['meet'], rs_event, leg['split_result'], data['team'],
+                         *Event.parse_result(leg['split_result'], rs_event))
                     )
+                    touched.append((leg['athlete'], data['meet'], rs_event))
+                sync_derived_tables(cur, touched)
                 conn.commit()
                 return relay_id
         except Exception as e:
             raise Exception(f"Failed to update relay: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
 
     @staticmethod
     def delete_relay(relay_id):
@@ -1285,6 +1558,7 @@ class RelayTeam:
                     raise Exception(f"Relay {relay_id} not found")
                 relay_date, relay_meet, relay_team = relay_row['Date'], relay_row['Meet_Name'], relay_row['Team']
 
+                touched = []
                 cur.execute('SELECT Athlete, Split_Event FROM RelayLegs WHERE Relay_ID = ?', (relay_id,))
                 for leg_row in cur.fetchall():
                     rs_event = f"{leg_row['Split_Event']} RS"
@@ -1292,6 +1566,8 @@ class RelayTeam:
                         'DELETE FROM Results WHERE Date=? AND Meet_Name=? AND Athlete=? AND Event=? AND Team=?',
                         (relay_date, relay_meet, leg_row['Athlete'], rs_event, relay_team)
                     )
+                    touched.append((leg_row['Athlete'], relay_meet, rs_event))
+                sync_derived_tables(cur, touched)
 
                 # Delete legs (ON DELETE CASCADE should handle this, but do it explicitly)
                 cur.execute('DELETE FROM RelayLegs WHERE Relay_ID = ?', (relay_id,))
@@ -1301,9 +1577,6 @@ class RelayTeam:
                 return True
         except Exception as e:
             raise Exception(f"Failed to delete relay: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
 
     @staticmethod
     def get_all_relay_events():
@@ -1326,65 +1599,59 @@ def compute_stagger_deltas_for_meet(meet_name, get_placements_fn):
 
     # Use one connection for all rating lookups to avoid excessive connections / lock contention
     conn = Database.get_connection()
-    try:
-        with conn:
-            cur = conn.cursor()
-            for (event, date), records in placements_by_key.items():
-                if not records:
+    with conn:
+        cur = conn.cursor()
+        for (event, date), records in placements_by_key.items():
+            if not records:
+                continue
+            # Ensure each athlete only appears once per event/date
+            seen = set()
+            unique_records = []
+            for r in records:
+                a = r['athlete']
+                if a in seen:
                     continue
-                # Ensure each athlete only appears once per event/date
-                seen = set()
-                unique_records = []
-                for r in records:
-                    a = r['athlete']
-                    if a in seen:
+                seen.add(a)
+                unique_records.append(r)
+            athletes = [r['athlete'] for r in unique_records]
+
+            ratings = {}
+            for a in athletes:
+                cur.execute('SELECT score FROM StaggerScores WHERE athlete = ? AND event = ?', (a, event))
+                row = cur.fetchone()
+                ratings[a] = float(row[0]) if row else STAGGER_INITIAL
+
+            deltas = {a: 0.0 for a in athletes}
+            n = len(unique_records)
+            for i in range(n):
+                for j in range(n):
+                    if i == j:
                         continue
-                    seen.add(a)
-                    unique_records.append(r)
-                athletes = [r['athlete'] for r in unique_records]
-
-                ratings = {}
-                for a in athletes:
-                    cur.execute('SELECT score FROM StaggerScores WHERE athlete = ? AND event = ?', (a, event))
-                    row = cur.fetchone()
-                    ratings[a] = float(row[0]) if row else STAGGER_INITIAL
-
-                deltas = {a: 0.0 for a in athletes}
-                n = len(unique_records)
-                for i in range(n):
-                    for j in range(n):
-                        if i == j:
-                            continue
-                        place_i = unique_records[i]['place']
-                        place_j = unique_records[j]['place']
-                        ai = unique_records[i]['athlete']
-                        aj = unique_records[j]['athlete']
-                        ri = ratings[ai]
-                        rj = ratings[aj]
-                        if place_i < place_j:
-                            e_i = _stagger_expected(ri, rj)
-                            e_j = 1.0 - e_i
-                            deltas[ai] += STAGGER_K * (1.0 - e_i)
-                            deltas[aj] += STAGGER_K * (0.0 - e_j)
-                        elif place_i > place_j:
-                            e_j = _stagger_expected(rj, ri)
-                            e_i = 1.0 - e_j
-                            deltas[aj] += STAGGER_K * (1.0 - e_j)
-                            deltas[ai] += STAGGER_K * (0.0 - e_i)
-                        else:
-                            e_i = _stagger_expected(ri, rj)
-                            e_j = 1.0 - e_i
-                            deltas[ai] += STAGGER_K * (0.5 - e_i)
-                            deltas[aj] += STAGGER_K * (0.5 - e_j)
-
-                for athlete, delta in deltas.items():
-                    all_deltas.append((event, date, athlete, delta))
-                    new_score = _stagger_dampen(ratings[athlete], delta)
-                    display_changes.append((event, date, athlete, delta, new_score))
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+                    place_i = unique_records[i]['place']
+                    place_j = unique_records[j]['place']
+                    ai = unique_records[i]['athlete']
+                    aj = unique_records[j]['athlete']
+                    ri = ratings[ai]
+                    rj = ratings[aj]
+                    if place_i < place_j:
+                        e_i = _stagger_expected(ri, rj)
+                        e_j = 1.0 - e_i
+                        deltas[ai] += STAGGER_K * (1.0 - e_i)
+                        deltas[aj] += STAGGER_K * (0.0 - e_j)
+                    elif place_i > place_j:
+                        e_j = _stagger_expected(rj, ri)
+                        e_i = 1.0 - e_j
+                        deltas[aj] += STAGGER_K * (1.0 - e_j)
+                        deltas[ai] += STAGGER_K * (0.0 - e_i)
+                    else:
+                        e_i = _stagger_expected(ri, rj)
+                        e_j = 1.0 - e_i
+                        deltas[ai] += STAGGER_K * (0.5 - e_i)
+                        deltas[aj] += STAGGER_K * (0.5 - e_j)
+
+            for athlete, delta in deltas.items():
+                all_deltas.append((event, date, athlete, delta))
+                new_score = _stagger_dampen(ratings[athlete], delta)
+                display_changes.append((event, date, athlete, delta, new_score))
 
     return all_deltas, display_changes
@@ -1,87 +1,55 @@
 import os
 from flask import Blueprint, render_template, request, jsonify, url_for
-from models import Result, Database, Athlete, Team, AthleteRanking, StaggerScore, BoardPost, RelayTeam
+from models import Result, Database, Athlete, Team, AthleteRanking, StaggerScore, BoardPost, RelayTeam, Event
 from forms import SearchForm, BoardPostForm, BoardGenerateForm
-from utils.relay_utils import calculate_relay_results, explicit_relay_to_display_dict, parse_time
-from utils.field_utils import parse_field_result, all_results_are_field_format
+from utils.relay_utils import calculate_relay_results, explicit_relay_to_display_dict
+from utils.result_values import best_first
 
 # Create blueprint
 athlete_bp = Blueprint('athlete', __name__)
 
-def _get_result_places(conn, results):
-    """Return Result_ID -> place for the athlete profile's displayed results."""
-    places = {}
-    event_keys = {
-        (result[0], result[1], result[2])
-        for result in results
-        if result and len(result) > 5
-    }
-
+def _get_result_places(conn, name):
+    """Return Result_ID -> place for every race the athlete ran, in one ranked query."""
     with conn:
         cur = conn.cursor()
-        for date, meet_name, event in event_keys:
-            cur.execute('''
-                SELECT Result_ID, Result
-                FROM Results
-                WHERE Date = ? AND Meet_Name = ? AND Event = ?
-            ''', (date, meet_name, event))
-            rows = [dict(row) for row in cur.fetchall()]
-            if not rows:
-                continue
-
-            result_strs = [row.get('Result') for row in rows if row.get('Result') is not None]
-            if all_results_are_field_format(result_strs):
-                key_fn = lambda row: parse_field_result(row.get('Result') or '')
-                rows.sort(key=key_fn, reverse=True)
-            elif 'm' in event or 'Mile' in event:
-                key_fn = lambda row: parse_time(row.get('Result') or '')
-                rows.sort(key=key_fn)
-            else:
-                def key_fn(row):
-                    try:
-                        return float(row.get('Result') or 0)
-                    except (TypeError, ValueError):
-                        return -1.0
-                rows.sort(key=key_fn, reverse=True)
-
-            current_place = 1
-            previous_key = None
-            for index, row in enumerate(rows):
-                current_key = key_fn(row)
-                if previous_key is not None and current_key != previous_key:
-                    current_place = index + 1
-                places[row['Result_ID']] = current_place
-                previous_key = current_key
-
-    return places
+        # Best-first: lowest time or highest mark, unparseable results last; ties share a place
+        cur.execute(f'''
+            SELECT r.Result_ID,
+                   RANK() OVER (
+                       PARTITION BY r.Meet_ID, r.Event_ID, r.Date
+                       ORDER BY r.Result_Value IS NULL,
+                                {best_first('e.direction', 'r.Result_Value', 'r.Result_Kind')}
+                   ) as place
+            FROM ResultRows r
+            JOIN Events e ON e.event_id = r.Event_ID
+            JOIN (
+                SELECT DISTINCT Meet_ID, Event_ID, Date
+                FROM ResultRows
+                WHERE Athlete_ID = (SELECT athlete_id FROM Athletes WHERE athlete_name = ?)
+            ) races ON r.Meet_ID = races.Meet_ID AND r.Event_ID = races.Event_ID AND r.Date = races.Date
+        ''', (name,))
+        return {result_id: place for result_id, place in cur.fetchall()}
 
 @athlete_bp.route('/athlete/<name>')
 def athlete_profile(name):
     results, prs, athlete_info, bio = Result.get_athlete_results(name)
     
-    # preferred order of events
-    preforder = ['60m', '100m', '100mH', '110mH', '200m', '300m', '400m', '400m RS', '400mH',
-                '500m', '600yd', '600m', '800m', '1000m', '1500m', 'Mile',
-                '3000m', '3200m', '5000m', '5K XC', '5K Road', '10000m',
-                'Half Marathon', 'Marathon', 'High Jump', 'Long Jump',
-                'Triple Jump', 'Shot Put', 'Discus', 'Pole Vault', 'Javelin', '4x400m']
+    # preferred order of events (Events.sort_order)
+    preforder = Event.display_order()
     
     # Get annual PRs (last 365 days)
     conn = Database.get_connection()
     with conn:
         cur = conn.cursor()
-        cur.execute('''
+        cur.execute(f'''
             WITH RankedResults AS (
                 SELECT 
                     Event,
                     Result,
-                    ROW_NUMBER() OVER (PARTITION BY Event ORDER BY 
-                        CASE 
-                            WHEN Event IN ('100m', '200m', '400m', '800m', '1500m', '3000m', '5000m', '10000m') 
-                            THEN CAST(REPLACE(Result, ':', '') AS DECIMAL)
-                            ELSE Result 
-                        END ASC) as rn
+                    ROW_NUMBER() OVER (PARTITION BY Event ORDER BY Result_Value IS NULL,
+                        {best_first()}) as rn
                 FROM Results 
+                JOIN Events ON Events.event_id = Results.Event_ID
                 WHERE Athlete = ? 
                 AND Date >= date('now', '-365 days')
             )
@@ -106,31 +74,16 @@ def athlete_profile(name):
     team = athlete_info.get('Team', 'Unknown')
     athlete_class = athlete_info.get('Class', 'Unknown')
     
-    # Get team logo for current team
-    team_logo = None
-    if team != 'Unknown':
-        team_info = Team.get_team_info(team)
-        if team_info and team_info.get('logo_url'):
-            team_logo = team_info['logo_url']
-    
-    # Get team logos for all teams in results
-    team_logos = {}
+    # Get team logos for the current team and all teams in results
     teams = set()
     for result in results:
         if result and len(result) > 4:
             teams.add(result[4])
+    team_logos = Team.logos(teams)
+    team_logo = Team.get_team_info(team)['logo_url'] if team != 'Unknown' else None
     
-    for team_name in teams:
-        team_info = Team.get_team_info(team_name)
-        if team_info and team_info.get('logo_url'):
-            team_logos[team_name] = team_info['logo_url']
-    
-    # Get gender flag for athlete from Athletes table
-    with conn:
-        cur = conn.cursor()
-        cur.execute('SELECT is_female FROM Athletes WHERE athlete_name = ?', (name,))
-        gender_row = cur.fetchone()
-        is_female = bool(gender_row[0]) if gender_row and gender_row[0] is not None else False
+    # Get gender flag for athlete from the cached Athletes map
+    is_female = Athlete.get_gender(name)
     
     # ---------------------------
     # Compute relay results for the athlete
@@ -139,23 +92,22 @@ def athlete_profile(name):
     
     with conn:
         cur = conn.cursor()
-        for relay_type in relay_types:
-            cur.execute("""
-                SELECT DISTINCT Date, Meet_Name, Team 
-                FROM Results 
-                WHERE Event = ? AND Athlete = ?
-            """, (relay_type, name))
-            relay_keys = cur.fetchall()
-            
-            for date, meet, team in relay_keys:
-                cur.execute("""
-                    SELECT Athlete, Result, Date, Meet_Name, Team
-                    FROM Results 
-                    WHERE Event = ? AND Date=? AND Meet_Name=? AND Team=?
-                """, (relay_type, date, meet, team))
-                splits = cur.fetchall()
-                if splits:
-                    relay_results.extend(calculate_relay_results(splits, relay_type))
+        # Every split from the relays the athlete ran a leg of, grouped per (event, date, meet, team)
+        cur.execute(f"""
+            SELECT Event, Athlete, Result, Date, Meet_Name, Team
+            FROM Results
+            WHERE (Meet_ID, Event_ID, Date, Team_ID) IN (
+                SELECT Meet_ID, Event_ID, Date, Team_ID
+                FROM Results
+                WHERE Athlete = ? AND Event IN ({', '.join('?' for _ in relay_types)})
+            )
+            ORDER BY Date, Meet_Name, Team
+        """, (name, *relay_types))
+        relay_splits = {}
+        for event, *split in cur.fetchall():
+            relay_splits.setdefault((event, split[2], split[3], split[4]), []).append(tuple(split))
+        for key in sorted(relay_splits, key=lambda key: relay_types.index(key[0])):
+            relay_results.extend(calculate_relay_results(relay_splits[key], key[0]))
     
     # Add explicit relay results from RelayTeams/RelayLegs
     explicit_relays = RelayTeam.get_relays_for_athlete(name)
@@ -168,7 +120,7 @@ def athlete_profile(name):
     # Stagger scores per event (for display near PRs)
     stagger_scores = StaggerScore.get_scores_for_athlete(name)
 
-    result_places = _get_result_places(conn, results)
+    result_places = _get_result_places(conn, name)
 
     # Stagger delta by meet for this athlete: (meet_name, event, date) -> delta
     with conn:
@@ -264,54 +216,24 @@ def get_athlete_bests_since(name):
     conn = Database.get_connection()
     with conn:
         cur = conn.cursor()
-        cur.execute('''
-            SELECT Event, Result, Date
-            FROM Results
-            WHERE Athlete = ? AND Date >= ?
-            ORDER BY Event, Date
+        # Best per event since the date; ties go to the earliest, unparseable results only as a fallback
+        cur.execute(f'''
+            SELECT Event, Result, Date FROM (
+                SELECT Event, Result, Date,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY Event
+                           ORDER BY Result_Value IS NULL,
+                               {best_first()},
+                               Date
+                       ) as rn
+                FROM Results
+                JOIN Events ON Events.event_id = Results.Event_ID
+                WHERE Athlete = ? AND Date >= ? AND Result IS NOT NULL AND Result != ''
+            )
+            WHERE rn = 1
+            ORDER BY Event
         ''', (name, since_date))
-        rows = cur.fetchall()
-    
-    # Find best result for each event using numeric comparison
-    event_results = {}
-    for row in rows:
-        event = row[0]
-        if event not in event_results:
-            event_results[event] = []
-        event_results[event].append((row[1], row[2]))
-    
-    bests = []
-    for event, results in event_results.items():
-        best_result = None
-        best_date = None
-        for result_str, date in results:
-            if not result_str:
-                continue
-            try:
-                if ':' in result_str:
-                    parts = result_str.split(':')
-                    numeric = float(parts[0]) * 60 + float(parts[1])
-                else:
-                    numeric = float(result_str)
-                
-                if best_result is None:
-                    best_result = result_str
-                    best_date = date
-                elif 'm' in event or 'H' in event or 'XC' in event or 'Road' in event or 'Marathon' in event:
-                    if numeric < float(best_result.split(':')[0]) * 60 + float(best_result.split(':')[1]) if ':' in best_result else float(best_result):
-                        best_result = result_str
-                        best_date = date
-                else:
-                    if numeric > float(best_result):
-                        best_result = result_str
-                        best_date = date
-            except (ValueError, IndexError):
-                if best_result is None:
-                    best_result = result_str
-                    best_date = date
-        
-        if best_result:
-            bests.append({'event': event, 'result': best_result, 'date': best_date})
+        bests = [{'event': row[0], 'result': row[1], 'date': row[2]} for row in cur.fetchall()]
     
     return jsonify({'success': True, 'bests': bests})
 
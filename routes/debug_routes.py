@@ -0,0 +1,76 @@
+import os
+import tracemalloc
+from flask import (Blueprint, Response, abort, current_app, jsonify, render_template, request, redirect,
+                   send_from_directory, url_for)
+from utils import instrumentation, memory, profiler
+
+# Create blueprint
+debug_bp = Blueprint('debug', __name__)
+
+@debug_bp.route('/debug/perf')
+def perf():
+    """Top endpoints by total SQL time since start-up, with the slowest statements seen."""
+    limit = request.args.get('limit', 25, type=int)
+    endpoints, slowest = instrumentation.endpoint_report(limit=limit)
+    return render_template('debug_perf.html', endpoints=endpoints, slowest=slowest, limit=limit)
+
+@debug_bp.route('/debug/perf/reset', methods=['POST'])
+def reset_perf():
+    instrumentation.reset()
+    return redirect(url_for('debug.perf'))
+
+def _require_profiler():
+    """404 unless PROFILER_ENABLED: saved profiles stay private once profiling is switched off."""
+    if not current_app.config.get('PROFILER_ENABLED', False):
+        abort(404)
+
+@debug_bp.route('/debug/profiles')
+def profiles():
+    """Recently profiled requests (?_profile=1 while PROFILER_ENABLED is set)."""
+    _require_profiler()
+    return render_template('debug_profiles.html', profiles=profiler.recent_profiles(),
+                           profile_dir=profiler.profile_dir())
+
+@debug_bp.route('/debug/profiles/<profile_id>')
+def profile_detail(profile_id):
+    _require_profiler()
+    sort = request.args.get('sort', 'cumulative')
+    if sort not in ('cumulative', 'tottime', 'ncalls'):
+        abort(400)
+    report = profiler.top_functions(profile_id, sort=sort)
+    if report is None:
+        abort(404)
+    return Response(report, mimetype='text/plain')
+
+@debug_bp.route('/debug/profiles/<profile_id>/download/<kind>')
+def profile_download(profile_id, kind):
+    _require_profiler()
+    if kind not in ('pstats', 'collapsed'):
+        abort(404)
+    return send_from_directory(os.path.abspath(profiler.profile_dir()), f'{profile_id}.{kind}', as_attachment=True)
+
+@debug_bp.route('/debug/memory')
+def memory_report():
+    """Per-endpoint peak allocation (MEMORY_TRACKING) and the stored tracemalloc snapshots."""
+    limit = request.args.get('limit', 25, type=int)
+    return render_template('debug_memory.html', endpoints=memory.endpoint_report(limit=limit),
+                           snapshots=memory.snapshots(), tracing=tracemalloc.is_tracing(),
+                           enabled=current_app.config.get('MEMORY_TRACKING', False))
+
+@debug_bp.route('/debug/memory/snapshot', methods=['POST'])
+def memory_snapshot():
+    """Store a snapshot and return its top allocating lines as JSON."""
+    try:
+        return jsonify(memory.take_snapshot(limit=request.args.get('limit', 25, type=int)))
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 409
+
+@debug_bp.route('/debug/memory/diff')
+def memory_diff():
+    """Top allocation changes between a stored snapshot (?base=<id>, default the newest) and now."""
+    try:
+        return jsonify(memory.diff(request.args.get('base', type=int), limit=request.args.get('limit', 25, type=int)))
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 409
+    except KeyError:
+        return jsonify({'error': 'no such snapshot; POST /debug/memory/snapshot to take one first'}), 404
@@ -1,6 +1,6 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from football_forms import PlayForm
-from football_models import Game, Play, FootballDatabase
+from football_models import Game, Play
 from models import Database, Team
 from datetime import date
 
@@ -16,11 +16,7 @@ def football_home():
     games = Game.get_all_games(limit=per_page, offset=offset)
     
     # Get team logos
-    conn = Database.get_connection()
-    with conn:
-        cur = conn.cursor()
-        cur.execute('SELECT team_name, logo_url FROM Teams')
-        team_logos = dict(cur.fetchall())
+    team_logos = Team.logos({team for game in games for team in (game[1], game[2])})
     
     return render_template('football_home.html', 
                          games=games, 
@@ -102,14 +98,7 @@ def play_entry():
     if request.args.get('team'):
         form.team.data = request.args.get('team')
     
-    # Get team logos for display
-    conn = Database.get_connection()
-    with conn:
-        cur = conn.cursor()
-        cur.execute('SELECT team_name, logo_url FROM Teams')
-        team_logos = dict(cur.fetchall())
-    
-    return render_template('play_entry.html', form=form, team_logos=team_logos)
+    return render_template('play_entry.html', form=form)
 
 @football_bp.route('/game/<int:game_id>')
 def view_game(game_id):
@@ -131,11 +120,7 @@ def view_game(game_id):
     player_stats = Play.get_game_player_stats(game_id)
     
     # Get team logos
-    conn = Database.get_connection()
-    with conn:
-        cur = conn.cursor()
-        cur.execute('SELECT team_name, logo_url FROM Teams')
-        team_logos = dict(cur.fetchall())
+    team_logos = Team.logos([game[1], game[2]])
     
     return render_template('football_game.html', 
                          game=game, 
@@ -236,7 +221,6 @@ def api_teams():
     """Get all teams that have played football"""
     try:
         conn = Database.get_connection()
-        FootballDatabase.initialize_football_tables(conn)
         with conn:
             cur = conn.cursor()
             cur.execute('''
@@ -433,13 +417,7 @@ def edit_play(play_id):
         form.is_touchdown.data = bool(play[7])
         form.is_successful.data = bool(play[9])
     
-    # Get team logos for display
-    with conn:
-        cur = conn.cursor()
-        cur.execute('SELECT team_name, logo_url FROM Teams')
-        team_logos = dict(cur.fetchall())
-    
-    return render_template('play_entry.html', form=form, team_logos=team_logos, 
+    return render_template('play_entry.html', form=form,
                          edit_mode=True, play_id=play_id, game_id=play[1])
 
 @football_bp.route('/api/add_incomplete_pass', methods=['POST'])
@@ -1,17 +1,11 @@
 from flask import Blueprint, render_template, request, redirect, url_for
-from models import Database, Team, StaggerScore, RelayTeam
+from models import Database, Team, StaggerScore, RelayTeam, Event
 from utils.relay_utils import calculate_relay_results, parse_time, explicit_relay_to_display_dict
-from utils.field_utils import parse_field_result, all_results_are_field_format
-from collections import defaultdict
 from datetime import datetime, timedelta
 
 # Create blueprint
 leaderboard_bp = Blueprint('leaderboard', __name__)
 
-def is_time_event(event):
-    """Check if an event is time-based (lower is better)"""
-    return 'm' in event or 'Mile' in event
-
 def _get_old_style_relay_results(selected_event, date_filter, cur):
     """Fetch old-style relay results from Results table RS splits."""
     from utils.relay_utils import calculate_relay_results
@@ -42,40 +36,77 @@ def _get_old_style_relay_results(selected_event, date_filter, cur):
 
 def _get_explicit_relay_results(selected_event, date_filter, cur):
     """Fetch explicit relay results from RelayTeams table."""
-    query = '''
-        SELECT rt.Relay_ID, rt.Date, rt.Meet_Name, rt.Team, rt.Event, rt.Total_Result, rt.Team_Designation
-        FROM RelayTeams rt
-        WHERE rt.Event = ?
-    '''
+    where = 'rt.Event = ?'
     params = [selected_event]
     if date_filter:
-        query += ' AND rt.Date >= ?'
+        where += ' AND rt.Date >= ?'
         params.append(date_filter)
-    query += ' ORDER BY rt.Date DESC'
-    cur.execute(query, params)
-    relays = cur.fetchall()
-    results = []
-    for relay in relays:
-        relay_id = relay[0]
-        cur.execute('''
-            SELECT Leg_Number, Athlete, Split_Event, Split_Result
-            FROM RelayLegs
-            WHERE Relay_ID = ?
-            ORDER BY Leg_Number
-        ''', (relay_id,))
-        legs = cur.fetchall()
-        relay_dict = {
-            'relay_id': relay_id,
-            'date': relay[1],
-            'meet': relay[2],
-            'team': relay[3],
-            'event': relay[4],
-            'total_result': relay[5],
-            'team_designation': relay[6],
-            'legs': [{'leg_number': l[0], 'athlete': l[1], 'split_event': l[2], 'split_result': l[3]} for l in legs]
-        }
-        results.append(explicit_relay_to_display_dict(relay_dict))
-    return results
+    relays = RelayTeam.fetch_with_legs(cur, where, params, 'rt.Date DESC')
+    return [explicit_relay_to_display_dict(relay_dict) for relay_dict in relays]
+
+def _best_results(cur, event, date_filter, limit, offset):
+    """One (Athlete, Result, Team, Date, Meet_Name) row per athlete, best first, and the athlete count.
+
+    All-time bests come straight from AthleteBests along idx_athlete_bests_event_value. With a
+    date filter the event's results are read in (Event, Result_Value) order and deduplicated
+    until the page is full, so only the rows ahead of the page are visited.
+    """
+    direction = Event.direction(event)
+    if not date_filter:
+        cur.execute(f'''
+            SELECT r.Athlete, r.Result, r.Team, r.Date, r.Meet_Name
+            FROM AthleteBests b
+            JOIN Results r ON r.Result_ID = b.result_id
+            WHERE b.event = ? AND b.best_value IS NOT NULL
+            ORDER BY b.best_value {direction}, b.date DESC
+            LIMIT ? OFFSET ?
+        ''', (event, limit, offset))
+        rows = cur.fetchall()
+        cur.execute('SELECT COUNT(*) FROM AthleteBests WHERE event = ? AND best_value IS NOT NULL', (event,))
+        return rows, cur.fetchone()[0]
+
+    # Ties go to the most recent performance
+    cur.execute(f'''
+        SELECT Athlete, Result, Team, Date, Meet_Name
+        FROM Results
+        WHERE Event = ? AND Result_Value IS NOT NULL AND Date >= ?
+        ORDER BY Result_Value {direction}, Date DESC
+    ''', (event, date_filter))
+    seen, rows = set(), []
+    for row in cur:
+        if row[0] in seen:
+            continue
+        seen.add(row[0])
+        if len(seen) > offset:
+            rows.append(row)
+            if len(rows) == limit:
+                break
+    cur.execute('SELECT COUNT(DISTINCT Athlete) FROM Results WHERE Event = ? AND Result_Value IS NOT NULL AND Date >= ?',
+                (event, date_filter))
+    return rows, cur.fetchone()[0]
+
+def _bests_for_athletes(cur, event, athletes, date_filter):
+    """{athlete: (Athlete, Result, Team, Date, Meet_Name)} for their best result in event."""
+    placeholders = ','.join(['?'] * len(athletes))
+    if not date_filter:
+        cur.execute(f'''
+            SELECT r.Athlete, r.Result, r.Team, r.Date, r.Meet_Name
+            FROM AthleteBests b
+            JOIN Results r ON r.Result_ID = b.result_id
+            WHERE b.event = ? AND b.athlete IN ({placeholders})
+        ''', [event] + athletes)
+        return {row[0]: row for row in cur.fetchall()}
+    # Only the page's athletes are read, along idx_results_athlete
+    cur.execute(f'''
+        SELECT Athlete, Result, Team, Date, Meet_Name
+        FROM Results
+        WHERE Event = ? AND Athlete IN ({placeholders}) AND Date >= ?
+        ORDER BY Result_Value IS NULL, Result_Value {Event.direction(event)}, Date DESC
+    ''', [event] + athletes + [date_filter])
+    best_rows = {}
+    for row in cur.fetchall():
+        best_rows.setdefault(row[0], row)
+    return best_rows
 
 @leaderboard_bp.route('/leaderboard')
 def leaderboard():
@@ -101,18 +132,20 @@ def leaderboard():
         
         # Get all distinct events for the dropdown
         cur.execute('''
-            SELECT DISTINCT Event 
-            FROM Results 
-            WHERE Event NOT LIKE '% RS'
-            ORDER BY Event ASC
+            SELECT event_name
+            FROM Events
+            WHERE event_name NOT LIKE '% RS'
+              AND EXISTS (SELECT 1 FROM ResultRows WHERE Event_ID = Events.event_id)
+            ORDER BY event_name ASC
         ''')
         all_events = [row[0] for row in cur.fetchall()]
         
         # Get old-style relay events (from RS splits)
         cur.execute('''
-            SELECT DISTINCT Event
-            FROM Results 
-            WHERE Event LIKE '% RS'
+            SELECT event_name
+            FROM Events
+            WHERE event_name LIKE '% RS'
+              AND EXISTS (SELECT 1 FROM ResultRows WHERE Event_ID = Events.event_id)
         ''')
         relay_events_raw = [row[0] for row in cur.fetchall()]
         relay_events = [f"4x{event.replace(' RS', '')}" for event in relay_events_raw]
@@ -125,7 +158,7 @@ def leaderboard():
         
         # Combine all events
         all_events.extend(relay_events)
-        all_events.sort(key=lambda x: (not (x.startswith('4x') or x in RelayTeam.RELAY_CONFIG), x))
+        all_events.sort(key=lambda x: (not Event.is_relay(x), x))
         
         results = []
         total_results = 0
@@ -136,69 +169,30 @@ def leaderboard():
         sort_by_stagger = False
 
         if selected_event:
-            is_relay = selected_event.startswith('4x') or selected_event in RelayTeam.RELAY_CONFIG
+            is_relay = Event.is_relay(selected_event)
             
             # Sort by Stagger rank (non-relay only, ignores year_filter for stagger list)
             if sort_by == 'stagger' and not is_relay:
                 sort_by_stagger = True
-                conn2 = Database.get_connection()
-                with conn2:
-                    cur2 = conn2.cursor()
-                    cur2.execute(
-                        'SELECT athlete, score FROM StaggerScores WHERE event = ? ORDER BY score DESC',
-                        (selected_event,)
-                    )
-                    stagger_rows = cur2.fetchall()
+                cur.execute(
+                    'SELECT athlete, score FROM StaggerScores WHERE event = ? ORDER BY score DESC',
+                    (selected_event,)
+                )
+                stagger_rows = cur.fetchall()
                 total_results = len(stagger_rows)
                 total_pages = (total_results + per_page - 1) // per_page if total_results else 0
                 page_slice = stagger_rows[offset:offset + per_page]
                 if page_slice:
                     athletes = [r[0] for r in page_slice]
-                    conn2 = Database.get_connection()
-                    with conn2:
-                        cur2 = conn2.cursor()
-                        cur2.execute(
-                            'SELECT Athlete, Result, Team, Date, Meet_Name FROM Results WHERE Event = ? AND Athlete IN (' + ','.join(['?'] * len(athletes)) + ')',
-                            [selected_event] + athletes
-                        )
-                        result_rows = cur2.fetchall()
-                    if date_filter:
-                        result_rows = [r for r in result_rows if r[3] >= date_filter]
-                    by_athlete = defaultdict(list)
-                    for row in result_rows:
-                        by_athlete[row[0]].append(row)
-                    if is_time_event(selected_event):
-                        def best_time(rows):
-                            return min(rows, key=lambda r: parse_time(r[1]))
-                        best_fn = best_time
-                    else:
-                        result_strs = [r[1] for r in result_rows if r[1]]
-                        if result_strs and all_results_are_field_format(result_strs):
-                            def best_field_ftin(rows):
-                                return max(rows, key=lambda r: parse_field_result(r[1] or ''))
-                            best_fn = best_field_ftin
-                        else:
-                            def best_field_num(rows):
-                                def num_val(r):
-                                    try:
-                                        return float(r[1])
-                                    except (ValueError, TypeError):
-                                        return -1.0
-                                return max(rows, key=num_val)
-                            best_fn = best_field_num
+                    best_rows = _bests_for_athletes(cur, selected_event, athletes, date_filter)
                     results = []
                     for athlete, score in page_slice:
-                        rows = by_athlete.get(athlete, [])
-                        if not rows:
+                        best_row = best_rows.get(athlete)
+                        if not best_row:
                             results.append((athlete, '—', '—', '', '', score))
                             continue
-                        best_row = best_fn(rows)
                         results.append((best_row[0], best_row[1], best_row[2], best_row[3], best_row[4], score))
-                    teams = set(r[2] for r in results if r[2] and r[2] != '—')
-                    for team in teams:
-                        team_info = Team.get_team_info(team)
-                        if team_info and team_info.get('logo_url'):
-                            team_logos[team] = team_info['logo_url']
+                    team_logos = Team.logos(r[2] for r in results if r[2] and r[2] != '—')
                 else:
                     results = []
             elif is_relay:
@@ -224,248 +218,34 @@ def leaderboard():
                     relay_results.sort(key=lambda x: parse_time(x['result']))
                 
                 # Get team logos
-                teams = set(r['team'] for r in relay_results)
-                for team in teams:
-                    team_info = Team.get_team_info(team)
-                    if team_info and team_info.get('logo_url'):
-                        team_logos[team] = team_info['logo_url']
+                team_logos = Team.logos(r['team'] for r in relay_results)
                 
                 total_results = len(relay_results)
                 total_pages = (total_results + per_page - 1) // per_page
                 results = relay_results[offset:offset + per_page]
             else:
-                # Handle non-relay events
+                # Handle non-relay events. Result_Value is seconds for times and meters for
+                # marks, so one (Event, Result_Value)-ordered query covers every event.
                 if best_only:
-                    # Get best result per athlete
-                    if is_time_event(selected_event):
-                        # Time events: lower is better
-                        query = '''
-                            WITH BestResults AS (
-                                SELECT 
-                                    Athlete,
-                                    Result,
-                                    Team,
-                                    Date,
-                                    Meet_Name,
-                                    CASE 
-                                        WHEN Result LIKE '%:%' THEN
-                                            CAST(SUBSTR(Result, 1, INSTR(Result, ':') - 1) AS REAL) * 60 +
-                                            CAST(SUBSTR(Result, INSTR(Result, ':') + 1) AS REAL)
-                                        ELSE
-                                            CAST(Result AS REAL)
-                                    END as numeric_result
-                                FROM Results 
-                                WHERE Event = ?
-                        '''
-                        params = [selected_event]
-                        
-                        if date_filter:
-                            query += ' AND Date >= ?'
-                            params.append(date_filter)
-                        
-                        query += '''
-                            ),
-                            AthletePRs AS (
-                                SELECT 
-                                    Athlete,
-                                    MIN(numeric_result) as best_result
-                                FROM BestResults
-                                GROUP BY Athlete
-                            ),
-                            RankedResults AS (
-                                SELECT 
-                                    br.Athlete,
-                                    br.Result,
-                                    br.Team,
-                                    br.Date,
-                                    br.Meet_Name,
-                                    pr.best_result,
-                                    ROW_NUMBER() OVER (PARTITION BY br.Athlete ORDER BY br.Date DESC) as rn
-                                FROM BestResults br
-                                INNER JOIN AthletePRs pr ON br.Athlete = pr.Athlete 
-                                    AND br.numeric_result = pr.best_result
-                            )
-                            SELECT 
-                                Athlete,
-                                Result,
-                                Team,
-                                Date,
-                                Meet_Name
-                            FROM RankedResults
-                            WHERE rn = 1
-                            ORDER BY best_result ASC
-                            LIMIT ? OFFSET ?
-                        '''
-                        params.extend([per_page, offset])
-                        
-                        cur.execute(query, params)
-                        results = cur.fetchall()
-                        
-                        # Get total count
-                        count_query = '''
-                            WITH BestResults AS (
-                                SELECT 
-                                    Athlete,
-                                    CASE 
-                                        WHEN Result LIKE '%:%' THEN
-                                            CAST(SUBSTR(Result, 1, INSTR(Result, ':') - 1) AS REAL) * 60 +
-                                            CAST(SUBSTR(Result, INSTR(Result, ':') + 1) AS REAL)
-                                        ELSE
-                                            CAST(Result AS REAL)
-                                    END as numeric_result
-                                FROM Results 
-                                WHERE Event = ?
-                        '''
-                        count_params = [selected_event]
-                        
-                        if date_filter:
-                            count_query += ' AND Date >= ?'
-                            count_params.append(date_filter)
-                        
-                        count_query += '''
-                            )
-                            SELECT COUNT(DISTINCT Athlete) 
-                            FROM BestResults
-                        '''
-                        cur.execute(count_query, count_params)
-                        total_results = cur.fetchone()[0]
-                    else:
-                        # Field events: higher is better. May be decimal or ft-in (e.g. 20'0").
-                        fetch_params = [selected_event]
-                        fetch_query = 'SELECT Athlete, Result, Team, Date, Meet_Name FROM Results WHERE Event = ?'
-                        if date_filter:
-                            fetch_query += ' AND Date >= ?'
-                            fetch_params.append(date_filter)
-                        cur.execute(fetch_query, fetch_params)
-                        all_field_rows = cur.fetchall()
-                        result_strs = [r[1] for r in all_field_rows]
-
-                        if all_results_are_field_format(result_strs):
-                            # Ft-in format: sort by parse_field_result (higher = better) in Python
-                            if best_only:
-                                by_athlete = defaultdict(list)
-                                for row in all_field_rows:
-                                    by_athlete[row[0]].append(row)
-                                best_per_athlete = [max(rows, key=lambda r: parse_field_result(r[1])) for rows in by_athlete.values()]
-                                best_per_athlete.sort(key=lambda r: parse_field_result(r[1]), reverse=True)
-                                total_results = len(best_per_athlete)
-                                results = best_per_athlete[offset:offset + per_page]
-                            else:
-                                all_field_rows.sort(key=lambda r: parse_field_result(r[1]), reverse=True)
-                                total_results = len(all_field_rows)
-                                results = all_field_rows[offset:offset + per_page]
-                            total_pages = (total_results + per_page - 1) // per_page
-                        else:
-                            # Decimal field (e.g. meters): use SQL
-                            query = '''
-                                WITH BestResults AS (
-                                    SELECT 
-                                        Athlete,
-                                        Result,
-                                        Team,
-                                        Date,
-                                        Meet_Name,
-                                        CAST(Result AS REAL) as numeric_result
-                                    FROM Results 
-                                    WHERE Event = ?
-                                        AND Result GLOB '[0-9]*.[0-9]*'
-                            '''
-                            params = [selected_event]
-                            if date_filter:
-                                query += ' AND Date >= ?'
-                                params.append(date_filter)
-                            query += '''
-                                ),
-                                AthletePRs AS (
-                                    SELECT Athlete, MAX(numeric_result) as best_result
-                                    FROM BestResults GROUP BY Athlete
-                                ),
-                                RankedResults AS (
-                                    SELECT br.Athlete, br.Result, br.Team, br.Date, br.Meet_Name, pr.best_result,
-                                    ROW_NUMBER() OVER (PARTITION BY br.Athlete ORDER BY br.Date DESC) as rn
-                                    FROM BestResults br
-                                    INNER JOIN AthletePRs pr ON br.Athlete = pr.Athlete AND br.numeric_result = pr.best_result
-                                )
-                                SELECT Athlete, Result, Team, Date, Meet_Name
-                                FROM RankedResults WHERE rn = 1
-                                ORDER BY best_result DESC
-                                LIMIT ? OFFSET ?
-                            '''
-                            params.extend([per_page, offset])
-                            cur.execute(query, params)
-                            results = cur.fetchall()
-                            count_query = '''
-                                WITH BestResults AS (
-                                    SELECT Athlete, CAST(Result AS REAL) as numeric_result
-                                    FROM Results WHERE Event = ? AND Result GLOB '[0-9]*.[0-9]*'
-                            '''
-                            count_params = [selected_event]
-                            if date_filter:
-                                count_query += ' AND Date >= ?'
-                                count_params.append(date_filter)
-                            count_query += ') SELECT COUNT(DISTINCT Athlete) FROM BestResults'
-                            cur.execute(count_query, count_params)
-                            total_results = cur.fetchone()[0]
-                            total_pages = (total_results + per_page - 1) // per_page
+                    results, total_results = _best_results(cur, selected_event, date_filter, per_page, offset)
                 else:
-                    # Get all performances
-                    query = '''
-                        SELECT Athlete, Result, Team, Date, Meet_Name
-                        FROM Results 
-                        WHERE Event = ?
-                    '''
+                    direction = Event.direction(selected_event)
+                    where = 'WHERE Event = ? AND Result_Value IS NOT NULL'
                     params = [selected_event]
                     if date_filter:
-                        query += ' AND Date >= ?'
+                        where += ' AND Date >= ?'
                         params.append(date_filter)
-
-                    if is_time_event(selected_event):
-                        query += '''
-                            ORDER BY 
-                                CASE 
-                                    WHEN Result LIKE '%:%' THEN
-                                        CAST(SUBSTR(Result, 1, INSTR(Result, ':') - 1) AS REAL) * 60 +
-                                        CAST(SUBSTR(Result, INSTR(Result, ':') + 1) AS REAL)
-                                    ELSE
-                                        CAST(Result AS REAL)
-                                END ASC
-                        '''
-                        query += ' LIMIT ? OFFSET ?'
-                        params.extend([per_page, offset])
-                        cur.execute(query, params)
-                        results = cur.fetchall()
-                        count_query = 'SELECT COUNT(*) FROM Results WHERE Event = ?'
-                        count_params = [selected_event]
-                        if date_filter:
-                            count_query += ' AND Date >= ?'
-                            count_params.append(date_filter)
-                        cur.execute(count_query, count_params)
-                        total_results = cur.fetchone()[0]
-                        total_pages = (total_results + per_page - 1) // per_page
-                    else:
-                        # Field: may be ft-in or decimal
-                        cur.execute(query, params)
-                        all_field_rows = cur.fetchall()
-                        result_strs = [r[1] for r in all_field_rows]
-                        if all_results_are_field_format(result_strs):
-                            all_field_rows.sort(key=lambda r: parse_field_result(r[1]), reverse=True)
-                            total_results = len(all_field_rows)
-                            total_pages = (total_results + per_page - 1) // per_page
-                            results = all_field_rows[offset:offset + per_page]
-                        else:
-                            query += ' ORDER BY CAST(Result AS REAL) DESC'
-                            query += ' LIMIT ? OFFSET ?'
-                            params.extend([per_page, offset])
-                            cur.execute(query, params)
-                            results = cur.fetchall()
-                            count_query = 'SELECT COUNT(*) FROM Results WHERE Event = ?'
-                            count_params = [selected_event]
-                            if date_filter:
-                                count_query += ' AND Date >= ?'
-                                count_params.append(date_filter)
-                            cur.execute(count_query, count_params)
-                            total_results = cur.fetchone()[0]
-                            total_pages = (total_results + per_page - 1) // per_page
+                    cur.execute(f'''
+                        SELECT Athlete, Result, Team, Date, Meet_Name
+                        FROM Results 
+                        {where}
+                        ORDER BY Result_Value {direction}
+                        LIMIT ? OFFSET ?
+                    ''', params + [per_page, offset])
+                    results = cur.fetchall()
+                    cur.execute(f'SELECT COUNT(*) FROM Results {where}', params)
+                    total_results = cur.fetchone()[0]
+                total_pages = (total_results + per_page - 1) // per_page
         
     return render_template('leaderboard.html',
                         all_events=all_events,
@@ -1,9 +1,9 @@
 import os
 from collections import Counter
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
-from models import Result, Team, Database, TeamScore, AthleteRanking, Comment, BoardPost, StaggerScore, compute_stagger_deltas_for_meet, RelayTeam
+from models import Result, Team, Database, TeamScore, AthleteRanking, Comment, BoardPost, StaggerScore, compute_stagger_deltas_for_meet, RelayTeam, Event, AthleteBest, Meet, Athlete
 from utils.relay_utils import parse_time, explicit_relay_to_display_dict
-from utils.field_utils import parse_field_result, all_results_are_field_format
+from utils import meet_cache
 from forms import MeetResultForm, CommentForm, BoardPostForm, BoardGenerateForm
 from datetime import datetime, timedelta
 
@@ -52,34 +52,15 @@ def get_meet_placements(meet_name):
     for (event, date), records in events.items():
         if event.endswith(' Relay'):
             continue
-        result_strs = [r.get('result') for r in records if r.get('result') is not None]
-        is_ft_in = all_results_are_field_format(result_strs)
-
-        # Pick one performance per athlete (best by the same rules the meet page uses)
-        best_by_athlete = {}
+        # Rows arrive best-first per event (Result.get_meet_results orders by Result_Value),
+        # so the first performance seen for an athlete is their best
+        deduped = []
+        seen = set()
         for rec in records:
-            a = rec['athlete']
-            r = rec.get('result') or ''
-            if a not in best_by_athlete:
-                best_by_athlete[a] = rec
-                continue
-            prev = best_by_athlete[a].get('result') or ''
-            if is_ft_in:
-                if parse_field_result(r) > parse_field_result(prev):
-                    best_by_athlete[a] = rec
-            else:
-                if parse_time(r) < parse_time(prev):
-                    best_by_athlete[a] = rec
-
-        deduped = list(best_by_athlete.values())
-
-        # Sort for placement
-        if is_ft_in:
-            deduped.sort(key=lambda x: parse_field_result(x.get('result') or ''), reverse=True)
-            perf_key = lambda x: parse_field_result(x.get('result') or '')
-        else:
-            deduped.sort(key=lambda x: parse_time(x.get('result') or ''))
-            perf_key = lambda x: parse_time(x.get('result') or '')
+            if rec['athlete'] not in seen:
+                seen.add(rec['athlete'])
+                deduped.append(rec)
+        perf_key = lambda x: Event.parse_result(x.get('result'), event)[0]
 
         # Assign places; ties get the same place (based on parsed performance)
         place = 1
@@ -94,91 +75,12 @@ def get_meet_placements(meet_name):
         out[(event, date)] = [{'athlete': r['athlete'], 'place': r['place']} for r in deduped]
     return out
 
-def is_pr_and_debut(athlete, event, result):
-    """Return (is_pr, is_debut) for the athlete's result in this event."""
-    conn = Database.get_connection()
-    with conn:
-        cur = conn.cursor()
-        cur.execute('''
-            SELECT Result 
-            FROM Results 
-            WHERE Athlete = ? AND Event = ?
-        ''', (athlete, event))
-        all_results = [row[0] for row in cur.fetchall()]
-        
-        if not all_results:
-            return True, True  # First time running this event
-        
-        is_debut = len(all_results) == 1
-        # If all results for this event contain ' and " (e.g. 20'0"), higher is better
-        if all_results_are_field_format(all_results):
-            best_val = max(parse_field_result(r) for r in all_results)
-            is_pr = parse_field_result(result) >= best_val
-        else:
-            best_val = min(parse_time(r) for r in all_results)
-            is_pr = parse_time(result) <= best_val
-        return is_pr, is_debut
-
-@meet_bp.route('/meet/<meet_name>', methods=['GET', 'POST'])
-def meet_results(meet_name):
-    form = MeetResultForm()
-    comment_form = CommentForm()
-    board_post_form = BoardPostForm()
-    board_generate_form = BoardGenerateForm()
-    
-    if request.method == 'POST' and request.form.getlist('date[]'):
-        dates = request.form.getlist('date[]')
-        athletes = request.form.getlist('athlete[]')
-        events_to_add = request.form.getlist('event[]')
-        results_to_add = request.form.getlist('result[]')
-        teams_to_add = request.form.getlist('team[]')
-
-        inserted = 0
-        for row in zip(dates, athletes, events_to_add, results_to_add, teams_to_add):
-            date, athlete, event, result, team = [value.strip() for value in row]
-            if not any([date, athlete, event, result, team]):
-                continue
-            if not all([date, athlete, event, result, team]):
-                flash('Each result row needs a date, athlete, event, result, and team.', 'error')
-                return redirect(url_for('meet.meet_results', meet_name=meet_name))
-            Result.insert_result({
-                'date': date,
-                'athlete': athlete,
-                'meet': meet_name,
-                'event': event,
-                'result': result,
-                'team': team
-            })
-            inserted += 1
-
-        if inserted:
-            TeamScore.update_meet_scores(meet_name, {})
-            AthleteRanking.update_meet_rankings(meet_name, [])
-            flash(f'{inserted} result{"s" if inserted != 1 else ""} added!', 'success')
-        else:
-            flash('No result rows were submitted.', 'warning')
-        return redirect(url_for('meet.meet_results', meet_name=meet_name))
-
-    if form.validate_on_submit():
-        # Insert the result for this meet
-        data = {
-            'date': form.date.data.strftime('%Y-%m-%d'),
-            'athlete': form.athlete.data,
-            'meet': meet_name,
-            'event': form.event.data,
-            'result': form.result.data,
-            'team': form.team.data
-        }
-        Result.insert_result(data)
-        # Clear cached team scores and rankings since we added a new result
-        TeamScore.update_meet_scores(meet_name, {})
-        AthleteRanking.update_meet_rankings(meet_name, [])
-        flash('Result added!', 'success')
-        return redirect(url_for('meet.meet_results', meet_name=meet_name))
-
+def _meet_view(meet_name):
+    """Everything the meet page renders from the database except team logos and genders,
+    which have caches of their own. Served through utils.meet_cache, so treat it as read-only."""
     raw_results = Result.get_meet_results_with_ids(meet_name)
     date_counts = Counter((row[0] or '')[:10] for row in raw_results if row[0])
-    meet_default_date = date_counts.most_common(1)[0][0] if date_counts else datetime.today().strftime('%Y-%m-%d')
+    default_date = date_counts.most_common(1)[0][0] if date_counts else None
     # Group standard results by (event, date)
     events = {}
     # Gather relay splits separately for computing the combined relay result
@@ -192,13 +94,6 @@ def meet_results(meet_name):
     # Initialize sorted_teams as empty list in case no results exist
     sorted_teams = []
     
-    # Get team logos for all teams
-    team_logos = {}
-    for team in teams:
-        team_info = Team.get_team_info(team)
-        if team_info and team_info.get('logo_url'):
-            team_logos[team] = team_info['logo_url']
-
     # Get cached team scores
     cached_scores = TeamScore.get_meet_scores(meet_name)
     if cached_scores:
@@ -278,7 +173,8 @@ def meet_results(meet_name):
                 'ranking_after': ranking_after
             }
 
-    stagger_score_cache = {}
+    stagger_scores = StaggerScore.get_scores_for_meet(meet_name)
+    pr_debut_flags = AthleteBest.pr_and_debut_flags(meet_name)
 
     for row in raw_results:
         date, athlete, event, result, team, result_id = row
@@ -301,7 +197,7 @@ def meet_results(meet_name):
             ranking_key = (event, date, athlete)
             rankings = rankings_dict.get(ranking_key, {})
 
-            pr_debut = is_pr_and_debut(athlete, event, result)
+            pr_debut = pr_debut_flags.get(result_id, (False, False))
             events[event_key].append({
                 'result_id': result_id,
                 'athlete': athlete,
@@ -322,10 +218,7 @@ def meet_results(meet_name):
             ranking_key = (event, date, athlete)
             rankings = rankings_dict.get(ranking_key, {})
 
-            pr_debut = is_pr_and_debut(athlete, event, result)
-            score_key = (athlete, event)
-            if score_key not in stagger_score_cache:
-                stagger_score_cache[score_key] = StaggerScore.get_score_if_exists(athlete, event)
+            pr_debut = pr_debut_flags.get(result_id, (False, False))
             events[event_key].append({
                 'result_id': result_id,
                 'athlete': athlete,
@@ -335,7 +228,7 @@ def meet_results(meet_name):
                 'is_debut': pr_debut[1],
                 'ranking_before': rankings.get('ranking_before'),
                 'ranking_after': rankings.get('ranking_after'),
-                'stagger_score_current': stagger_score_cache[score_key]
+                'stagger_score_current': stagger_scores.get((athlete, event))
             })
 
     # Process relay splits: for each (event, team, date) grouping, if there are at least 4 splits,
@@ -382,21 +275,24 @@ def meet_results(meet_name):
 
     # Sort each event's results and assign places.
     for event_key, records in events.items():
-        if event_key[0].endswith(' Relay') or event_key[0] in RelayTeam.RELAY_CONFIG:
+        if Event.is_relay(event_key[0]):
             records.sort(key=lambda x: x.get('relay_time_numeric', float('inf')))
-        elif event_key[0].endswith(' RS'):
-            # RS splits already added above; no need to sort separately
-            pass
-        else:
-            result_strs = [r.get('result') for r in records if r.get('result') is not None]
-            if all_results_are_field_format(result_strs):
-                records.sort(key=lambda x: parse_field_result(x.get('result') or ''), reverse=True)
-            else:
-                records.sort(key=lambda x: parse_time(x.get('result') or ''))
+        # Individual events and RS splits arrive best-first from Result.get_meet_results_with_ids
         # Assign rankings (place numbers)
         for place, record in enumerate(records, start=1):
             record['place'] = place
 
+    # Every name the page links, coloured by gender outside the cached view
+    rendered_athletes = set()
+    for records in events.values():
+        for record in records:
+            if 'legs' in record:
+                rendered_athletes.update(leg['athlete'].strip() for leg in record['legs'])
+            elif 'athletes' in record:
+                rendered_athletes.update(athlete.strip() for athlete in record['athletes'])
+            else:
+                rendered_athletes.add(record['athlete'])
+
     # Get comments for this meet
     comments = Comment.get_comments('meet', meet_name)
     comment_count = Comment.get_comment_count('meet', meet_name)
@@ -406,21 +302,94 @@ def meet_results(meet_name):
     stagger_changes = [{'event': row[0], 'date': row[1], 'athlete': row[2], 'delta': row[3]} for row in stagger_history]
 
     board_posts = BoardPost.get_threaded_posts(page_type='meet', page_id=meet_name)
+
+    return {
+        'events': events,
+        'teams': sorted(teams),
+        'athletes': sorted(rendered_athletes),
+        'default_date': default_date,
+        'sorted_teams': sorted_teams,
+        'comments': comments,
+        'comment_count': comment_count,
+        'meet_is_staggered': meet_is_staggered,
+        'stagger_changes': stagger_changes,
+        'board_posts': board_posts,
+    }
+
+@meet_bp.route('/meet/<meet_name>', methods=['GET', 'POST'])
+def meet_results(meet_name):
+    form = MeetResultForm()
+    comment_form = CommentForm()
+    board_post_form = BoardPostForm()
+    board_generate_form = BoardGenerateForm()
+    
+    if request.method == 'POST' and request.form.getlist('date[]'):
+        dates = request.form.getlist('date[]')
+        athletes = request.form.getlist('athlete[]')
+        events_to_add = request.form.getlist('event[]')
+        results_to_add = request.form.getlist('result[]')
+        teams_to_add = request.form.getlist('team[]')
+
+        rows, positions = [], []
+        for position, row in enumerate(zip(dates, athletes, events_to_add, results_to_add, teams_to_add)):
+            date, athlete, event, result, team = [value.strip() for value in row]
+            if not any([date, athlete, event, result, team]):
+                continue
+            rows.append({
+                'date': date,
+                'athlete': athlete,
+                'meet': meet_name,
+                'event': event,
+                'result': result,
+                'team': team
+            })
+            positions.append(position)
+
+        inserted, errors = Result.insert_many(rows)
+        for index, message in errors:
+            flash(f'Row {positions[index] + 1}: {message}', 'error')
+        if inserted:
+            flash(f'{inserted} result{"s" if inserted != 1 else ""} added!', 'success')
+        elif not errors:
+            flash('No result rows were submitted.', 'warning')
+        return redirect(url_for('meet.meet_results', meet_name=meet_name))
+
+    if form.validate_on_submit():
+        # Insert the result for this meet
+        data = {
+            'date': form.date.data.strftime('%Y-%m-%d'),
+            'athlete': form.athlete.data,
+            'meet': meet_name,
+            'event': form.event.data,
+            'result': form.result.data,
+            'team': form.team.data
+        }
+        Result.insert_result(data)
+        # Clear cached team scores and rankings since we added a new result
+        TeamScore.update_meet_scores(meet_name, {})
+        AthleteRanking.update_meet_rankings(meet_name, [])
+        flash('Result added!', 'success')
+        return redirect(url_for('meet.meet_results', meet_name=meet_name))
+
+    view = meet_cache.get_or_build(meet_name, Meet.version(meet_name), lambda: _meet_view(meet_name))
+    team_logos = Team.logos(view['teams'])
+    genders = Athlete.genders(view['athletes'])
     openrouter_available = bool(os.environ.get("OPENROUTER_API_KEY", "").strip())
 
     return render_template('meet.html', 
                          meet_name=meet_name, 
-                         events=events, 
-                         team_logos=team_logos, 
+                         events=view['events'], 
+                         team_logos=team_logos,
+                         genders=genders,
                          form=form, 
-                         meet_default_date=meet_default_date,
-                         sorted_teams=sorted_teams,
+                         meet_default_date=view['default_date'] or datetime.today().strftime('%Y-%m-%d'),
+                         sorted_teams=view['sorted_teams'],
                          comment_form=comment_form,
-                         comments=comments,
-                         comment_count=comment_count,
-                         meet_is_staggered=meet_is_staggered,
-                         stagger_changes=stagger_changes,
-                         board_posts=board_posts,
+                         comments=view['comments'],
+                         comment_count=view['comment_count'],
+                         meet_is_staggered=view['meet_is_staggered'],
+                         stagger_changes=view['stagger_changes'],
+                         board_posts=view['board_posts'],
                          post_form=board_post_form,
                          generate_form=board_generate_form,
                          openrouter_available=openrouter_available,
@@ -437,31 +406,11 @@ def rename_meet(old_name):
         flash('New meet name is required', 'error')
         return redirect(url_for('meet.meet_results', meet_name=old_name))
     
-    conn = Database.get_connection()
-    with conn:
-        cur = conn.cursor()
-        
-        # If a date is provided, only rename results for that specific date
-        if meet_date:
-            cur.execute('''
-                UPDATE Results 
-                SET Meet_Name = ? 
-                WHERE Meet_Name = ? AND DATE(Date) = DATE(?)
-            ''', (new_name, old_name, meet_date))
-            rows_affected = cur.rowcount
-            if rows_affected == 0:
-                flash(f'No results found for meet "{old_name}" on date {meet_date}. No changes made.', 'warning')
-                return redirect(url_for('meet.meet_results', meet_name=old_name))
-        else:
-            # Otherwise rename all results for this meet
-            cur.execute('''
-                UPDATE Results 
-                SET Meet_Name = ? 
-                WHERE Meet_Name = ?
-            ''', (new_name, old_name))
-            rows_affected = cur.rowcount
-        
-        conn.commit()
+    # If a date is provided, only rename results for that specific date
+    rows_affected = Meet.rename(old_name, new_name, date=meet_date or None)
+    if meet_date and rows_affected == 0:
+        flash(f'No results found for meet "{old_name}" on date {meet_date}. No changes made.', 'warning')
+        return redirect(url_for('meet.meet_results', meet_name=old_name))
     
     flash(f'Meet renamed successfully to {new_name} ({rows_affected} results updated)', 'success')
     return redirect(url_for('meet.meet_results', meet_name=new_name))
@@ -480,23 +429,11 @@ def sync_meet_dates(meet_name):
         flash('Please confirm that you want to change all dates', 'error')
         return redirect(url_for('meet.meet_results', meet_name=meet_name))
     
-    conn = Database.get_connection()
-    with conn:
-        cur = conn.cursor()
-        
-        # Update all dates for this meet to the sync_date
-        cur.execute('''
-            UPDATE Results 
-            SET Date = ? 
-            WHERE Meet_Name = ?
-        ''', (sync_date, meet_name))
-        rows_affected = cur.rowcount
-        
-        if rows_affected == 0:
-            flash(f'No results found for meet "{meet_name}". No changes made.', 'warning')
-            return redirect(url_for('meet.meet_results', meet_name=meet_name))
-        
-        conn.commit()
+    # Update all dates for this meet to the sync_date
+    rows_affected = Meet.sync_dates(meet_name, sync_date)
+    if rows_affected == 0:
+        flash(f'No results found for meet "{meet_name}". No changes made.', 'warning')
+        return redirect(url_for('meet.meet_results', meet_name=meet_name))
     
     flash(f'All dates synced to {sync_date} ({rows_affected} results updated)', 'success')
     return redirect(url_for('meet.meet_results', meet_name=meet_name))
@@ -539,22 +476,8 @@ def calculate_meet_scores(meet_name):
             'team': team
         })
     
-    # Calculate places for each event. If all results contain ' and " (e.g. 20'0"), higher is better.
+    # Calculate places for each event; rows arrive best-first from Result.get_meet_results
     for (event, date), results in events.items():
-        result_strs = [r['result'] for r in results]
-        if all_results_are_field_format(result_strs):
-            results.sort(key=lambda x: parse_field_result(x['result']), reverse=True)
-        elif 'm' in event or 'Mile' in event:
-            results.sort(key=lambda x: parse_time(x['result']))
-        else:
-            # Decimal field events (e.g. meters)
-            def _field_sort_key(x):
-                try:
-                    return float(x['result'])
-                except (ValueError, TypeError):
-                    return -1.0
-            results.sort(key=_field_sort_key, reverse=True)
-        
         # Assign places
         current_place = 1
         current_result = None
@@ -619,47 +542,7 @@ def calculate_meet_scores(meet_name):
 @meet_bp.route('/meet/<meet_name>/calculate_rankings', methods=['POST'])
 def calculate_rankings(meet_name):
     """Calculate and cache rankings for all athletes in a meet"""
-    # Get all results for this meet
-    raw_results = Result.get_meet_results(meet_name)
-    
-    # Group results by event and date
-    events_by_date = {}
-    for row in raw_results:
-        date, athlete, event, result, team = row
-        event_date_key = (event, date)
-        if event_date_key not in events_by_date:
-            events_by_date[event_date_key] = []
-        events_by_date[event_date_key].append({
-            'athlete': athlete,
-            'result': result,
-            'team': team
-        })
-    
-    # Calculate rankings for each event/date combination
-    rankings_data = []
-    for (event, date), results in events_by_date.items():
-        # Skip relay splits as they're part of the relay event
-        if event.endswith(' RS'):
-            continue
-        if event.endswith(' Relay'):
-            continue
-            
-        # Calculate rankings before the meet (excluding current results)
-        rankings_before = AthleteRanking.calculate_rankings_for_date(event, date, include_current=False)
-        
-        # Calculate rankings after the meet (including current results)
-        rankings_after = AthleteRanking.calculate_rankings_for_date(event, date, include_current=True)
-        
-        # Store rankings for each athlete in this event
-        for result in results:
-            athlete = result['athlete']
-            rankings_data.append({
-                'event': event,
-                'date': date,
-                'athlete': athlete,
-                'ranking_before': rankings_before.get(athlete),
-                'ranking_after': rankings_after.get(athlete)
-            })
+    rankings_data = AthleteRanking.calculate_meet_rankings(meet_name)
     
     # Cache the calculated rankings
     AthleteRanking.update_meet_rankings(meet_name, rankings_data)
@@ -701,16 +584,11 @@ def api_generate_results(meet_name):
         conn = Database.get_connection()
         with conn:
             cur = conn.cursor()
-            cur.execute('''
+            cur.execute(f'''
                 SELECT Athlete, Result, Team
                 FROM Results
                 WHERE Meet_Name = ? AND Event = ?
-                ORDER BY 
-                    CASE 
-                        WHEN Event IN ('60m','100m','200m','400m','800m','1500m','Mile','3000m','5000m','10000m','60mH','100mH','110mH','400mH')
-                        THEN CAST(REPLACE(Result, ':','') AS DECIMAL)
-                        ELSE Result
-                    END ASC
+                ORDER BY Result_Value IS NULL, Result_Value {Event.direction(event)}, Result_ID
             ''', (meet_name, event))
             seed_results = [
                 {'athlete': row['Athlete'], 'result': row['Result'], 'team': row['Team']}
@@ -754,10 +632,10 @@ def api_update_relay(meet_name):
         if not filled_legs:
             return jsonify({'ok': False, 'error': 'At least one leg with athlete or split must be provided'}), 400
 
-        if event not in RelayTeam.RELAY_CONFIG:
+        expected_legs = Event.relay_legs(event)
+        if not expected_legs:
             return jsonify({'ok': False, 'error': f"Unknown relay event: {event}"}), 400
 
-        expected_legs = RelayTeam.RELAY_CONFIG[event]
         if len(filled_legs) > len(expected_legs):
             return jsonify({'ok': False, 'error': f"{event} has {len(expected_legs)} legs, got {len(filled_legs)}"}), 400
 
@@ -818,30 +696,18 @@ def api_insert_generated_results(meet_name):
         if not isinstance(results, list) or not results:
             return jsonify({'ok': False, 'error': 'no results provided'}), 400
 
-        inserted = 0
-        for r in results:
-            athlete = (r.get('athlete') or '').strip()
-            result_val = (r.get('result') or '').strip()
-            team = (r.get('team') or '').strip()
-            event = (r.get('event') or '').strip()
-            date = (r.get('date') or '').strip()
-            if not all([athlete, result_val, team, event, date]):
-                continue
-            Result.insert_result({
-                'date': date,
-                'athlete': athlete,
-                'meet': meet_name,
-                'event': event,
-                'result': result_val,
-                'team': team,
-            })
-            inserted += 1
-
-        if inserted > 0:
-            TeamScore.update_meet_scores(meet_name, {})
-            AthleteRanking.update_meet_rankings(meet_name, [])
-
-        return jsonify({'ok': True, 'inserted': inserted})
+        rows = [{
+            'date': r.get('date'),
+            'athlete': r.get('athlete'),
+            'meet': meet_name,
+            'event': r.get('event'),
+            'result': r.get('result'),
+            'team': r.get('team'),
+        } for r in results]
+        inserted, errors = Result.insert_many(rows)
+
+        return jsonify({'ok': True, 'inserted': inserted,
+                        'errors': [{'row': index, 'error': message} for index, message in errors]})
     except Exception as e:
         return jsonify({'ok': False, 'error': str(e)}), 500 
 
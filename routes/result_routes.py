@@ -1,6 +1,7 @@
 from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash
-from models import Result, Database, RelayTeam, TeamScore, AthleteRanking
+from models import Result, Database, RelayTeam, TeamScore, AthleteRanking, Event, sync_derived_tables
 from forms import ResultForm
+import db_normalization
 
 # Create blueprint
 result_bp = Blueprint('result', __name__)
@@ -40,7 +41,8 @@ def insert_result():
             row = cur.fetchone()
             if row:
                 last_meet = row['Meet_Name'] or ''
-        return render_template('insert.html', form=form, today=today, last_meet=last_meet)
+        return render_template('insert.html', form=form, today=today, last_meet=last_meet,
+                               relay_config=Event.relay_config())
     if request.method == 'POST':
         try:
             # Get all the arrays from the form
@@ -51,30 +53,39 @@ def insert_result():
             results = request.form.getlist('result[]')
             teams = request.form.getlist('team[]')
             
-            # Insert each result
+            rows, positions = [], []
             for i in range(len(dates)):
+                if not any(value[i].strip() for value in (athletes, events, results)):
+                    continue
                 # Auto-fill meet name with date in YYYYMMDD format if empty
                 meet_name = meets[i].strip() if meets[i] else ''
                 if not meet_name and dates[i]:
                     # Convert date from YYYY-MM-DD to YYYYMMDD
                     meet_name = dates[i].replace('-', '')
                 
-                data = {
+                rows.append({
                     'date': dates[i],
                     'athlete': athletes[i],
                     'meet': meet_name,
                     'event': events[i],
                     'result': results[i],
                     'team': teams[i]
-                }
-                Result.insert_result(data)
+                })
+                positions.append(i)
+            inserted, errors = Result.insert_many(rows)
+            row_errors = [f'Row {positions[index] + 1}: {message}' for index, message in errors]
             
             # If the request wants JSON, return JSON response
             if request.headers.get('Accept') == 'application/json':
-                return jsonify({'success': True})
+                return jsonify({'success': not errors, 'inserted': inserted, 'errors': row_errors})
+            
+            for message in row_errors:
+                flash(message, 'error')
+            if not inserted:
+                return redirect(url_for('result.insert_result'))
             
             # Otherwise, flash message and redirect
-            flash('Results successfully added!', 'success')
+            flash(f'{inserted} result{"s" if inserted != 1 else ""} added!', 'success')
             return redirect(url_for('home'))
             
         except Exception as e:
@@ -93,7 +104,8 @@ def insert_result():
         row = cur.fetchone()
         if row:
             last_meet = row['Meet_Name'] or ''
-    return render_template('insert.html', form=form, today=today, last_meet=last_meet)
+    return render_template('insert.html', form=form, today=today, last_meet=last_meet,
+                           relay_config=Event.relay_config())
 
 @result_bp.route('/delete_result/<int:result_id>', methods=['POST'])
 def delete_athlete_result(result_id):
@@ -101,7 +113,11 @@ def delete_athlete_result(result_id):
         conn = Database.get_connection()
         with conn:
             cur = conn.cursor()
+            cur.execute('SELECT Athlete, Meet_Name, Event FROM Results WHERE Result_ID = ?', (result_id,))
+            existing = cur.fetchone()
             cur.execute('DELETE FROM Results WHERE Result_ID = ?', (result_id,))
+            if existing:
+                sync_derived_tables(cur, [tuple(existing)])
             conn.commit()
         return jsonify({'success': True})
     except Exception as e:
@@ -125,7 +141,7 @@ def update_result(result_id):
         conn = Database.get_connection()
         with conn:
             cur = conn.cursor()
-            cur.execute('SELECT Meet_Name FROM Results WHERE Result_ID = ?', (result_id,))
+            cur.execute('SELECT Meet_Name, Athlete, Event FROM Results WHERE Result_ID = ?', (result_id,))
             existing = cur.fetchone()
             old_meet = existing['Meet_Name'] if existing else None
 
@@ -135,6 +151,9 @@ def update_result(result_id):
             for field, value in data.items():
                 db_field = field_mapping.get(field)
                 if db_field:
+                    if field == 'event':
+                        # Aliases (HJ, Shot, ...) are stored under the registered name, as on insert
+                        value = Event.canonical_name(value)
                     updates.append(f"{db_field} = ?")
                     values.append(value)
             if not updates:
@@ -143,9 +162,14 @@ def update_result(result_id):
             
             query = f"UPDATE Results SET {', '.join(updates)} WHERE Result_ID = ?"
             cur.execute(query, values)
-            cur.execute('SELECT Meet_Name FROM Results WHERE Result_ID = ?', (result_id,))
+            cur.execute('SELECT Meet_Name, Athlete, Event, Result FROM Results WHERE Result_ID = ?', (result_id,))
             updated = cur.fetchone()
             new_meet = updated['Meet_Name'] if updated else None
+            if updated:
+                # Keep the persisted numeric value in step with the edited result/event
+                cur.execute('UPDATE Results SET Result_Value = ?, Result_Kind = ? WHERE Result_ID = ?',
+                            (*Event.parse_result(updated['Result'], updated['Event']), result_id))
+            sync_derived_tables(cur, [(row['Athlete'], row['Meet_Name'], row['Event']) for row in (existing, updated) if row])
             conn.commit()
 
         for meet_name in {old_meet, new_meet}:
@@ -159,6 +183,32 @@ def update_result(result_id):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@result_bp.route('/api/normalize_results', methods=['POST'])
+def normalize_results():
+    """List the Result_IDs the db_normalization rules would change; {"dry_run": false} applies them.
+
+    The duplicates rule deletes rows (prelims included) and is only run from the command line.
+    """
+    payload = request.get_json(force=True, silent=True) or {}
+    rules = payload.get('rules')
+    if rules and 'duplicates' in rules:
+        return jsonify({'success': False,
+                        'error': 'the duplicates rule deletes results; run db_normalization.py --rule duplicates'}), 400
+    try:
+        conn = Database.get_connection()
+        if payload.get('dry_run', True) is not False:
+            affected = {}
+            for name, result_id in db_normalization.iter_affected(conn.cursor(), rules):
+                affected.setdefault(name, []).append(result_id)
+            return jsonify({'success': True, 'dry_run': True, 'affected': affected})
+        with conn:
+            counts = db_normalization.apply_rules(conn.cursor(), rules)
+        return jsonify({'success': True, 'dry_run': False, 'changed': counts})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @result_bp.route('/insert_relay', methods=['POST'])
 def insert_relay():
     try:
@@ -182,10 +232,10 @@ def insert_relay():
             return jsonify({'success': False, 'error': 'At least one leg with athlete or split must be provided'}), 400
 
         # Validate event is known
-        if event not in RelayTeam.RELAY_CONFIG:
+        expected_legs = Event.relay_legs(event)
+        if not expected_legs:
             return jsonify({'success': False, 'error': f"Unknown relay event: {event}"}), 400
 
-        expected_legs = RelayTeam.RELAY_CONFIG[event]
         if len(filled_legs) > len(expected_legs):
             return jsonify({'success': False, 'error': f"{event} has {len(expected_legs)} legs, got {len(filled_legs)}"}), 400
 
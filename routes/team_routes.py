@@ -1,17 +1,10 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
-from models import Database, Team
-from utils.relay_utils import parse_time
-from utils.field_utils import parse_field_result
+from models import Database, Team, Event
 
 # Create blueprint
 team_bp = Blueprint('team', __name__)
 
 
-def _is_time_event(event_name: str) -> bool:
-    """Return True if this looks like a time-based track event."""
-    return 'm' in event_name or 'Mile' in event_name
-
-
 def get_team_leaderboard_results(cursor, team_name: str, selected_event: str, best_only: bool, page: int = 1, per_page: int = 50):
     """
     Return list of leaderboard dicts for the given team/event/mode.
@@ -20,75 +13,39 @@ def get_team_leaderboard_results(cursor, team_name: str, selected_event: str, be
     """
     if not selected_event:
         return [], 0
-    cursor.execute(
-        '''
-        SELECT Athlete, Result, Date, Meet_Name
-        FROM Results
-        WHERE Team = ? AND Event = ?
-        ''',
-        (team_name, selected_event),
-    )
-    rows = cursor.fetchall()
-    time_based = _is_time_event(selected_event)
+    direction = Event.direction(selected_event)
+    where = 'WHERE Team = ? AND Event = ? AND Result_Value IS NOT NULL'
+    params = [team_name, selected_event]
     if best_only:
-        best_per_athlete = {}
-        for athlete, result, date, meet in rows:
-            if not result:
-                continue
-            metric = (
-                parse_time(result) if time_based else parse_field_result(result)
+        query = f'''
+            SELECT Athlete, Result, Date, Meet_Name, Result_Value FROM (
+                SELECT Athlete, Result, Date, Meet_Name, Result_Value,
+                       ROW_NUMBER() OVER (PARTITION BY Athlete ORDER BY Result_Value {direction}) as rn
+                FROM Results
+                {where}
             )
-            existing = best_per_athlete.get(athlete)
-            if existing is None:
-                best_per_athlete[athlete] = {
-                    'athlete': athlete,
-                    'result': result,
-                    'date': date,
-                    'meet': meet,
-                    'metric': metric,
-                }
-            else:
-                better = (
-                    metric < existing['metric']
-                    if time_based
-                    else metric > existing['metric']
-                )
-                if better:
-                    best_per_athlete[athlete] = {
-                        'athlete': athlete,
-                        'result': result,
-                        'date': date,
-                        'meet': meet,
-                        'metric': metric,
-                    }
-        sorted_results = sorted(
-            best_per_athlete.values(),
-            key=lambda r: r['metric'],
-            reverse=not time_based,
-        )
+            WHERE rn = 1
+            ORDER BY Result_Value {direction}
+            LIMIT ? OFFSET ?
+        '''
+        count_query = f'SELECT COUNT(DISTINCT Athlete) FROM Results {where}'
     else:
-        enriched = []
-        for athlete, result, date, meet in rows:
-            if not result:
-                continue
-            metric = (
-                parse_time(result) if time_based else parse_field_result(result)
-            )
-            enriched.append({
-                'athlete': athlete,
-                'result': result,
-                'date': date,
-                'meet': meet,
-                'metric': metric,
-            })
-        sorted_results = sorted(
-            enriched,
-            key=lambda r: r['metric'],
-            reverse=not time_based,
-        )
-    total_results = len(sorted_results)
+        query = f'''
+            SELECT Athlete, Result, Date, Meet_Name, Result_Value
+            FROM Results
+            {where}
+            ORDER BY Result_Value {direction}
+            LIMIT ? OFFSET ?
+        '''
+        count_query = f'SELECT COUNT(*) FROM Results {where}'
     offset = (page - 1) * per_page
-    return sorted_results[offset:offset + per_page], total_results
+    cursor.execute(query, params + [per_page, offset])
+    results = [
+        {'athlete': athlete, 'result': result, 'date': date, 'meet': meet, 'metric': value}
+        for athlete, result, date, meet, value in cursor.fetchall()
+    ]
+    cursor.execute(count_query, params)
+    return results, cursor.fetchone()[0]
 
 
 @team_bp.route('/teams')
@@ -99,17 +56,17 @@ def teams():
         # Get all teams with their athlete and result counts
         cur.execute('''
             SELECT 
-                Team,
-                COUNT(DISTINCT Athlete) as athlete_count,
+                t.team_name as Team,
+                COUNT(DISTINCT r.Athlete_ID) as athlete_count,
                 COUNT(*) as result_count
-            FROM Results 
-            GROUP BY Team 
-            ORDER BY Team ASC
+            FROM ResultRows r
+            JOIN Teams t ON t.team_id = r.Team_ID
+            GROUP BY r.Team_ID
+            ORDER BY t.team_name ASC
         ''')
         teams = cur.fetchall()
-        # Get team logos for display
-        cur.execute('SELECT team_name, logo_url FROM Teams')
-        team_logos = dict(cur.fetchall())
+    # Get team logos for display
+    team_logos = Team.logos(team[0] for team in teams)
     
     return render_template('teams.html', teams=teams, team_logos=team_logos)
 
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Tests for the AthleteBests table kept in step with Results writes."""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wavelight import app
+from models import Database, Result, RelayTeam, AthleteBest
+from utils import athlete_bests
+
+TEST_DB = 'test_athlete_bests.db'
+
+
+def setup_test_db():
+    app.config['DATABASE'] = TEST_DB
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    Database.bootstrap(TEST_DB)
+
+
+def teardown_test_db():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def _bests():
+    conn = sqlite3.connect(TEST_DB)
+    rows = conn.execute('SELECT athlete, event, best_value, result, result_id, date, result_count '
+                        'FROM AthleteBests ORDER BY athlete, event').fetchall()
+    conn.close()
+    return rows
+
+
+def _insert(athlete, event, result, date='2024-04-20'):
+    Result.insert_result({'date': date, 'athlete': athlete, 'meet': f'Meet {date}',
+                          'event': event, 'result': result, 'team': 'Team A'})
+
+
+def test_bests_follow_writes():
+    original_db = app.config['DATABASE']
+    csrf_enabled = app.config.get('WTF_CSRF_ENABLED', True)
+    app.config['WTF_CSRF_ENABLED'] = False
+    try:
+        setup_test_db()
+        with app.app_context():
+            _insert('Alice', '400m', '58.10', '2024-04-01')
+            _insert('Alice', '400m', '57.20', '2024-04-08')
+            _insert('Alice', '400m', '59.00', '2024-04-15')
+            _insert('Alice', 'Long Jump', '17\'6"', '2024-04-08')
+            best = AthleteBest.get('Alice', '400m')
+            assert (best['result'], best['date'], best['result_count']) == ('57.20', '2024-04-08', 3)
+            assert AthleteBest.get('Alice', 'Long Jump')['result_count'] == 1
+            best_id = best['result_id']
+
+            with app.test_client() as client:
+                # Editing the PR to a slower time hands the PR back to the first race
+                assert client.post(f'/update_result/{best_id}', json={'result': '58.50'}).status_code == 200
+                assert AthleteBest.get('Alice', '400m')['result'] == '58.10'
+                # Moving a result to another event refreshes both pairs
+                assert client.post(f'/update_result/{best_id}', json={'event': '300m'}).status_code == 200
+                assert AthleteBest.get('Alice', '400m')['result_count'] == 2
+                assert AthleteBest.get('Alice', '300m')['result'] == '58.50'
+                assert client.post(f'/delete_result/{best_id}').status_code == 200
+                assert AthleteBest.get('Alice', '300m') is None
+
+            relay_id = RelayTeam.insert_relay(
+                {'date': '2024-04-20', 'meet': 'Relay Meet', 'team': 'Team A', 'event': '4x100m'},
+                [{'athlete': name, 'split_result': '12.00'} for name in ('Alice', 'Bea', 'Cy', 'Di')])
+            assert AthleteBest.get('Bea', '100m RS')['result'] == '12.00'
+            RelayTeam.delete_relay(relay_id)
+            assert AthleteBest.get('Bea', '100m RS') is None
+
+        incremental = _bests()
+        conn = sqlite3.connect(TEST_DB)
+        with conn:
+            athlete_bests.rebuild(conn.cursor())
+        conn.close()
+        assert _bests() == incremental
+        print("PASS: AthleteBests follows inserts, edits, deletes and relays")
+    finally:
+        app.config['WTF_CSRF_ENABLED'] = csrf_enabled
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_prs_served_from_bests():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.app_context():
+            _insert('Alice', '800m', '2:05.00', '2024-04-01')
+            _insert('Alice', '800m', '1:59.80', '2024-04-08')
+            _insert('Alice', 'Shot Put', '10.50', '2024-04-01')
+            _insert('Alice', 'Shot Put', '11.25', '2024-04-08')
+            _, prs, _, _ = Result.get_athlete_results('Alice')
+            assert prs['800m'] == {'result': '1:59.80', 'date': '2024-04-08'}
+            assert prs['Shot Put']['result'] == '11.25'
+        with app.test_client() as client:
+            prs = client.get('/get_athlete_prs/Alice').get_json()['prs']
+            assert {'event': '800m', 'pr': '1:59.80'} in prs
+        print("PASS: PRs served from AthleteBests")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_pr_and_debut_flags_for_meet():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.app_context():
+            _insert('Alice', '400m', '58.10', '2024-04-01')
+            _insert('Alice', '400m', '57.20', '2024-04-08')
+            _insert('Bob', '400m', '55.00', '2024-04-01')
+            _insert('Bob', '400m', '56.40', '2024-04-08')
+            _insert('Bob', 'Shot Put', '10.50', '2024-04-08')
+            _insert('Cara', '400m', 'DNF', '2024-04-08')
+            flags = AthleteBest.pr_and_debut_flags('Meet 2024-04-08')
+        conn = sqlite3.connect(TEST_DB)
+        ids = {(athlete, event): result_id for result_id, athlete, event in conn.execute(
+            "SELECT Result_ID, Athlete, Event FROM Results WHERE Date = '2024-04-08'")}
+        conn.close()
+        assert len(flags) == 4
+        assert flags[ids[('Alice', '400m')]] == (True, False)
+        assert flags[ids[('Bob', '400m')]] == (False, False)
+        assert flags[ids[('Bob', 'Shot Put')]] == (True, True)
+        assert flags[ids[('Cara', '400m')]][0] is False
+        print("PASS: PR and debut flags for a whole meet")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+if __name__ == '__main__':
+    test_bests_follow_writes()
+    test_prs_served_from_bests()
+    test_pr_and_debut_flags_for_meet()
+    print("\n=== All tests passed ===")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Tests for the streaming CSV importer (utils.csv_import)."""
+
+import csv
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import migrations
+from utils import csv_import
+
+TEST_DB = 'test_csv_import.db'
+TEST_CSV = 'test_csv_import.csv'
+
+ROWS = [
+    ['4/6/2024', 'Alice', 'Spring Open', '400m', '058.1', 'North/South'],
+    ['04/06/2024', 'Bea', 'Spring Open', '400m', '57.2', 'Team B'],
+    ['4/6/2024', 'Alice', 'Spring Open', '800m', '2:05.3', ''],
+    ['4/6/2024', 'Cy', 'Spring Open', '100m', '1:02.00', 'Team B'],
+    ['4/6/2024', 'Bea', 'Spring Open', '400m', '57.9', 'Team B'],
+    ['', '', '', '', '', ''],
+    ['2024-04-13', 'Di', 'Relays', 'Long Jump', '5.5', 'Team B'],
+]
+
+
+def _write_csv(rows):
+    with open(TEST_CSV, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Date', 'Athlete', 'Meet', 'Event', 'Result', 'Team'])
+        writer.writerows(rows)
+
+
+def _connect():
+    conn = sqlite3.connect(TEST_DB)
+    migrations.migrate(conn)
+    return conn
+
+
+def _cleanup():
+    for path in (TEST_DB, TEST_CSV):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def test_import_normalizes_and_dedupes():
+    _cleanup()
+    try:
+        _write_csv(ROWS)
+        conn = _connect()
+        stats = csv_import.import_csv(conn, TEST_CSV, chunk_size=3)
+        assert (stats.read, stats.inserted, stats.duplicates, stats.invalid) == (7, 4, 1, 2)
+        rows = conn.execute('SELECT Date, Athlete, Event, Result, Team FROM Results ORDER BY Result_ID').fetchall()
+        assert rows == [
+            ('2024-04-06', 'Alice', '400m', '58.10', 'North South'),
+            ('2024-04-06', 'Bea', '400m', '57.20', 'Team B'),
+            ('2024-04-06', 'Alice', '800m', '2:05.30', 'North South'),
+            ('2024-04-13', 'Di', 'Long Jump', '5.50', 'Team B'),
+        ]
+        assert conn.execute("SELECT result FROM AthleteBests WHERE athlete = 'Di'").fetchone() == ('5.50',)
+        assert conn.execute('SELECT COUNT(*) FROM MeetEventWinners').fetchone()[0] == 3
+        assert conn.execute('SELECT COUNT(*) FROM ImportCheckpoints').fetchone()[0] == 0
+
+        # Re-importing the same file only finds duplicates
+        stats = csv_import.import_csv(conn, TEST_CSV)
+        assert (stats.inserted, stats.duplicates) == (0, 5)
+        conn.close()
+        print("PASS: CSV import normalizes, fills teams and skips duplicates")
+    finally:
+        _cleanup()
+
+
+def test_aliases_import_under_the_registered_event():
+    _cleanup()
+    try:
+        _write_csv([
+            ['4/6/2024', 'Eli', 'Spring Open', 'HJ', '1.85', 'Team C'],
+            ['4/6/2024', 'Eli', 'Spring Open', 'High Jump', '1.85', 'Team C'],
+            ['4/6/2024', 'Fay', 'Spring Open', 'Shot', '12.10', 'Team C'],
+        ])
+        conn = _connect()
+        stats = csv_import.import_csv(conn, TEST_CSV)
+        assert (stats.inserted, stats.duplicates) == (2, 1)
+        rows = conn.execute('SELECT Athlete, Event, Result_Kind FROM Results ORDER BY Result_ID').fetchall()
+        assert rows == [('Eli', 'High Jump', 'metric'), ('Fay', 'Shot Put', 'metric')], rows
+        assert conn.execute("SELECT event FROM AthleteBests WHERE athlete = 'Eli'").fetchall() == [('High Jump',)]
+        assert conn.execute("SELECT COUNT(*) FROM Events WHERE event_name IN ('HJ', 'Shot')").fetchone()[0] == 0
+        conn.close()
+        print("PASS: aliased events import under their registered names")
+    finally:
+        _cleanup()
+
+
+def test_interrupted_import_resumes():
+    _cleanup()
+    try:
+        _write_csv(ROWS)
+        conn = _connect()
+
+        def interrupt(stats):
+            raise KeyboardInterrupt
+
+        try:
+            csv_import.import_csv(conn, TEST_CSV, chunk_size=2, progress=interrupt)
+        except KeyboardInterrupt:
+            pass
+        assert conn.execute('SELECT rows_done, inserted FROM ImportCheckpoints').fetchone() == (2, 2)
+
+        stats = csv_import.import_csv(conn, TEST_CSV, chunk_size=2)
+        assert (stats.resumed_from, stats.read, stats.inserted, stats.duplicates) == (2, 5, 4, 1)
+        assert conn.execute('SELECT COUNT(*) FROM Results').fetchone()[0] == 4
+        conn.close()
+        print("PASS: interrupted import resumes from its checkpoint")
+    finally:
+        _cleanup()
+
+
+if __name__ == '__main__':
+    test_import_normalizes_and_dedupes()
+    test_aliases_import_under_the_registered_event()
+    test_interrupted_import_resumes()
+    print("\n=== All tests passed ===")
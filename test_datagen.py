@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Tests for the synthetic benchmark database generator."""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks import datagen
+
+TEST_DBS = ('test_datagen_a.db', 'test_datagen_b.db')
+
+
+def _cleanup():
+    for path in TEST_DBS:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _dump(path):
+    conn = sqlite3.connect(path)
+    rows = conn.execute('SELECT Date, Athlete, Meet_Name, Event, Result, Team, Result_Value FROM Results '
+                        'ORDER BY Result_ID').fetchall()
+    conn.close()
+    return rows
+
+
+def test_generate_is_deterministic_and_realistic():
+    _cleanup()
+    try:
+        counts = datagen.generate(TEST_DBS[0], results=3000, seed=7)
+        datagen.generate(TEST_DBS[1], results=3000, seed=7)
+        assert counts['ResultRows'] == 3000
+        assert all(counts[table] > 0 for table in ('RelayTeams', 'RelayLegRows', 'StaggerHistoryRows',
+                                                   'Comments', 'Plays', 'AthleteBests', 'MeetEventWinners'))
+        rows = _dump(TEST_DBS[0])
+        assert rows == _dump(TEST_DBS[1])
+        results = {row[4] for row in rows}
+        assert any(result.endswith('"') for result in results)  # ft-in marks
+        assert any(':' in result for result in results)
+        assert any(row[3].endswith(' RS') for row in rows)
+
+        conn = sqlite3.connect(TEST_DBS[0])
+        # Meets counts are maintained like the Results triggers would
+        assert conn.execute('SELECT SUM(result_count) FROM Meets').fetchone()[0] == 3000
+        assert conn.execute('SELECT COUNT(*) FROM Meets WHERE date IS NULL').fetchone()[0] == 0
+        conn.close()
+        print("PASS: generator is deterministic and covers ft-in marks, times and RS splits")
+    finally:
+        _cleanup()
+
+
+if __name__ == '__main__':
+    test_generate_is_deterministic_and_realistic()
+    print("\n=== All tests passed ===")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Tests for the integer athlete/team/event ids behind the Results, RelayLegs and Stagger views."""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import migrations
+from wavelight import app
+from models import Database, Result, Athlete, RelayTeam, StaggerScore, Event
+
+TEST_DB = 'test_dimension_ids.db'
+
+
+def setup_test_db():
+    app.config['DATABASE'] = TEST_DB
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    Database.bootstrap(TEST_DB)
+
+
+def teardown_test_db():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def _insert(athlete, event, result, team='Team A'):
+    Result.insert_result({'date': '2024-04-20', 'athlete': athlete, 'meet': 'Spring Open',
+                          'event': event, 'result': result, 'team': team})
+
+
+def test_view_writes_create_dimension_rows():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.app_context():
+            Athlete.update_bio('Alice', 'sprinter')
+            _insert('Alice', '400m', '58.10')
+            _insert('Alice', '300m Dash', '41.00', team='Team B')
+            conn = Database.get_connection()
+            alice_id = conn.execute("SELECT athlete_id FROM Athletes WHERE athlete_name = 'Alice'").fetchone()[0]
+            assert {r['Athlete_ID'] for r in conn.execute('SELECT Athlete_ID FROM Results')} == {alice_id}
+            assert Athlete.get_bio('Alice') == 'sprinter'
+            assert conn.execute("SELECT COUNT(*) FROM Teams WHERE team_name IN ('Team A', 'Team B')").fetchone()[0] == 2
+
+            # An unregistered event gets a dimension row but stays out of the registry
+            assert conn.execute("SELECT direction FROM Events WHERE event_name = '300m Dash'").fetchone()[0] is None
+            assert '300m Dash' not in Event.display_order()
+
+            # INSERT OR REPLACE through the view must not re-key existing dimension rows
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO Results (Date, Athlete, Meet_Name, Event, Result, Team) "
+                             "VALUES ('2024-04-21', 'Alice', 'Spring Open', '400m', '57.00', 'Team A')")
+            assert conn.execute("SELECT athlete_id FROM Athletes WHERE athlete_name = 'Alice'").fetchone()[0] == alice_id
+
+            # Renaming the Athletes row renames every result at once
+            with conn:
+                conn.execute("UPDATE Athletes SET athlete_name = 'Alice B' WHERE athlete_id = ?", (alice_id,))
+            assert {r[0] for r in conn.execute('SELECT Athlete FROM Results')} == {'Alice B'}
+        print("PASS: view writes create dimension rows")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_relay_and_stagger_views():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.app_context():
+            relay_id = RelayTeam.insert_relay(
+                {'date': '2024-04-20', 'meet': 'Relay Meet', 'team': 'Team A', 'event': '4x100m'},
+                [{'athlete': name, 'split_result': '12.00'} for name in ('Alice', 'Bea', 'Cy', 'Di')])
+            conn = Database.get_connection()
+            legs = conn.execute('SELECT Athlete, Split_Event FROM RelayLegs WHERE Relay_ID = ? ORDER BY Leg_Number',
+                                (relay_id,)).fetchall()
+            assert [tuple(leg) for leg in legs] == [(name, '100m') for name in ('Alice', 'Bea', 'Cy', 'Di')]
+            RelayTeam.delete_relay(relay_id)
+            assert conn.execute('SELECT COUNT(*) FROM RelayLegRows').fetchone()[0] == 0
+
+            StaggerScore.set_score('Alice', '400m', 1010)
+            StaggerScore.set_score('Alice', '400m', 1020)
+            assert StaggerScore.get_score('Alice', '400m') == 1020
+            assert conn.execute('SELECT COUNT(*) FROM StaggerScoreRows').fetchone()[0] == 1
+            StaggerScore.apply_meet_deltas('Spring Open', [('400m', '2024-04-20', 'Alice', 5)])
+            StaggerScore.revert_meet('Spring Open')
+            assert conn.execute('SELECT COUNT(*) FROM StaggerHistoryRows').fetchone()[0] == 0
+        print("PASS: relay legs and stagger rows go through the views")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_migration_encodes_existing_rows():
+    teardown_test_db()
+    try:
+        conn = sqlite3.connect(TEST_DB)
+        migrations.migrate(conn, target=10)
+        conn.executemany('INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team) VALUES (?, ?, ?, ?, ?, ?)', [
+            ('2024-04-20', 'Alice', 'Old Meet', '800m', '2:01.50', 'Team A'),
+            ('2024-04-19', 'Bea', 'Old Meet', '800m', '2:03.00', None),
+        ])
+        conn.execute("INSERT INTO StaggerScores (athlete, event, score) VALUES ('Alice', '800m', 1040)")
+        conn.execute("INSERT INTO Athletes (athlete_name, bio) VALUES ('Alice', 'miler')")
+        conn.commit()
+        migrations.migrate(conn)
+        rows = conn.execute('SELECT Athlete, Meet_Name, Event, Team FROM Results ORDER BY Athlete').fetchall()
+        assert rows == [('Alice', 'Old Meet', '800m', 'Team A'), ('Bea', 'Old Meet', '800m', '')]
+        assert conn.execute("SELECT bio FROM Athletes WHERE athlete_name = 'Alice'").fetchone() == ('miler',)
+        assert conn.execute('SELECT athlete, event, score FROM StaggerScores').fetchall() == [('Alice', '800m', 1040)]
+        assert conn.execute("SELECT direction FROM Events WHERE event_name = '800m'").fetchone() == ('ASC',)
+        conn.close()
+        print("PASS: migration encodes existing rows")
+    finally:
+        teardown_test_db()
+
+
+if __name__ == '__main__':
+    test_view_writes_create_dimension_rows()
+    test_relay_and_stagger_views()
+    test_migration_encodes_existing_rows()
+    print("\n=== All tests passed ===")
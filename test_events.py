@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Tests for the Events registry (sort direction, aliases, relay legs)."""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wavelight import app
+from models import Database, Event, Result, AthleteBest
+
+TEST_DB = 'test_events.db'
+
+
+def setup_test_db():
+    app.config['DATABASE'] = TEST_DB
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    Database.bootstrap(TEST_DB)
+
+
+def teardown_test_db():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def test_registry_lookups():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.app_context():
+            assert Event.direction('800m') == 'ASC'
+            assert Event.direction('Hammer') == 'DESC'
+            assert Event.get('High Jump')['kind'] == 'height'
+            # Aliases resolve to the registered event
+            assert Event.canonical_name('HJ') == 'High Jump'
+            assert Event.direction('SP') == 'DESC'
+            # Unregistered events fall back to the name heuristic
+            assert Event.direction('150m') == 'ASC'
+            assert Event.direction('Standing Long Jump') == 'DESC'
+            assert Event.relay_legs('DMR') == ['1200m', '400m', '800m', '1600m']
+            assert Event.relay_legs('400m') is None
+            order = Event.display_order()
+            assert order.index('100m') < order.index('Mile') < order.index('High Jump')
+        print("PASS: registry lookups")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_registry_drives_direction():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        # Register an event the heuristic would read as timed (no field word in the name)
+        conn = sqlite3.connect(TEST_DB)
+        with conn:
+            conn.execute("INSERT INTO Events (event_name, direction, kind) VALUES ('Standing Triple', 'DESC', 'distance')")
+        conn.close()
+        Event.invalidate()
+        with app.app_context():
+            assert Event.direction('Standing Triple') == 'DESC'
+            for athlete, result in [('Short', '8.10'), ('Long', '9.40'), ('Mid', '8.95')]:
+                Result.insert_result({'date': '2024-04-20', 'athlete': athlete, 'meet': 'Spring Open',
+                                      'event': 'Standing Triple', 'result': result, 'team': 'Team A'})
+        with app.test_client() as client:
+            body = client.get('/leaderboard?event=Standing Triple').get_data(as_text=True)
+            assert body.index('>Long<') < body.index('>Mid<') < body.index('>Short<')
+        print("PASS: registry direction used by leaderboard")
+    finally:
+        Event.invalidate()
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_registry_follows_other_writers():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.app_context():
+            assert Event.direction('Hammer') == 'DESC'
+            assert Event.canonical_name('Ham') == 'Ham'
+            # Another worker edits the registry; this request keeps the copy it checked
+            conn = sqlite3.connect(TEST_DB)
+            with conn:
+                conn.execute("INSERT INTO EventAliases (alias, event_name) VALUES ('Ham', 'Hammer')")
+                conn.execute("UPDATE Events SET direction = 'ASC' WHERE event_name = 'Hammer'")
+            assert Event.direction('Hammer') == 'DESC'
+        with app.app_context():
+            assert Event.canonical_name('Ham') == 'Hammer'
+            assert Event.direction('Hammer') == 'ASC'
+            # Unregistered names added by result writes leave the registry alone
+            with conn:
+                conn.execute("INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team) "
+                             "VALUES ('2024-04-20', 'Alice', 'Spring Open', '150m', '17.00', 'Team A')")
+            version = conn.execute("SELECT value FROM Counters WHERE name = 'events_version'").fetchone()[0]
+            assert Event._registry[TEST_DB][0] == version
+        conn.close()
+        print("PASS: registry edits from another process are picked up on the next request")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_direction_change_reorders_stored_rows():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        conn = sqlite3.connect(TEST_DB)
+        with conn:
+            conn.execute("INSERT INTO Events (event_name, direction, kind) VALUES ('Standing Triple', 'ASC', 'time')")
+        Event.invalidate()
+        with app.app_context():
+            for athlete, result, date in [('Short', '8.10', '2024-04-20'), ('Long', '9.40', '2024-04-20'),
+                                          ('Short', '8.60', '2024-04-27')]:
+                Result.insert_result({'date': date, 'athlete': athlete, 'meet': f'Meet {date}',
+                                      'event': 'Standing Triple', 'result': result, 'team': 'Team A'})
+            assert AthleteBest.get('Short', 'Standing Triple')['result'] == '8.10'
+
+        # The registry is corrected by hand; stored rows follow without a rebuild
+        with conn:
+            conn.execute("UPDATE Events SET direction = 'DESC' WHERE event_name = 'Standing Triple'")
+        with app.app_context():
+            assert AthleteBest.get('Short', 'Standing Triple')['result'] == '8.60'
+            assert [row[1] for row in Result.get_meet_results('Meet 2024-04-20')] == ['Long', 'Short']
+        winner = conn.execute("SELECT athlete FROM MeetEventWinners WHERE meet_name = 'Meet 2024-04-20'").fetchone()
+        assert winner == ('Long',)
+        counter = conn.execute("SELECT value FROM Counters WHERE name = 'meet_event_winners'").fetchone()[0]
+        assert counter == conn.execute('SELECT COUNT(*) FROM MeetEventWinners').fetchone()[0] == 2
+        conn.close()
+        print("PASS: changing an event's direction reorders bests, winners and meet results")
+    finally:
+        Event.invalidate()
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+if __name__ == '__main__':
+    test_registry_lookups()
+    test_registry_drives_direction()
+    test_registry_follows_other_writers()
+    test_direction_change_reorders_stored_rows()
+    print("\n=== All tests passed ===")
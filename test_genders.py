@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Tests for the prefetched athlete gender map used to colour names."""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wavelight import app
+from models import Database, Result, Athlete
+from utils.instrumentation import capture_requests
+
+TEST_DB = 'test_genders.db'
+MEET = 'Gender Invitational'
+
+
+def setup_test_db():
+    app.config['DATABASE'] = TEST_DB
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    Database.bootstrap(TEST_DB)
+    with app.app_context():
+        for athlete, result in [('Alice', '12.40'), ('Bob', '11.90'), ('Cara', '12.80')]:
+            Result.insert_result({'date': '2024-04-20', 'athlete': athlete, 'meet': MEET,
+                                  'event': '100m', 'result': result, 'team': 'Team A'})
+        Athlete.update_gender('Alice', 1)
+        Athlete.update_gender('Cara', 1)
+
+
+def teardown_test_db():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def _female_links(html):
+    return {name for name in ('Alice', 'Bob', 'Cara')
+            if f'class="athlete-name female-text"><b>{name}</b>' in html}
+
+
+def test_genders_batch_and_cache():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.app_context():
+            assert Athlete.genders(['Alice', 'Bob', 'Nobody']) == {'Alice': True, 'Bob': False, 'Nobody': False}
+        with app.test_client() as client, capture_requests() as captured:
+            client.get('/')
+        statements = captured[0][1].statements
+        assert not any('is_female' in sql for sql in statements), statements
+        print("PASS: genders are read in one batch and then served from memory")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_meet_page_follows_gender_updates():
+    original_db = app.config['DATABASE']
+    csrf_enabled = app.config.get('WTF_CSRF_ENABLED', True)
+    app.config['WTF_CSRF_ENABLED'] = False
+    try:
+        setup_test_db()
+        with app.test_client() as client:
+            assert _female_links(client.get(f'/meet/{MEET}').get_data(as_text=True)) == {'Alice', 'Cara'}
+            assert client.post('/update_gender/Bob', json={'is_female': True}).get_json()['success']
+            assert _female_links(client.get(f'/meet/{MEET}').get_data(as_text=True)) == {'Alice', 'Bob', 'Cara'}
+        print("PASS: meet page reflects gender updates")
+    finally:
+        app.config['DATABASE'] = original_db
+        app.config['WTF_CSRF_ENABLED'] = csrf_enabled
+        teardown_test_db()
+
+
+def test_genders_follow_other_writers():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.test_client() as client:
+            assert _female_links(client.get(f'/meet/{MEET}').get_data(as_text=True)) == {'Alice', 'Cara'}
+            # Another worker (or import_results filling is_female) changes genders directly
+            conn = sqlite3.connect(TEST_DB)
+            with conn:
+                conn.execute("UPDATE Athletes SET is_female = 1 WHERE athlete_name = 'Bob'")
+                conn.execute("UPDATE Athletes SET is_female = 0 WHERE athlete_name = 'Cara'")
+            assert _female_links(client.get(f'/meet/{MEET}').get_data(as_text=True)) == {'Alice', 'Bob'}
+            # New athletes from result writes do not throw the map away
+            with conn:
+                version = conn.execute("SELECT value FROM Counters WHERE name = 'athlete_genders_version'").fetchone()[0]
+                conn.execute("INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team) "
+                             "VALUES ('2024-04-20', 'Dan', ?, '100m', '12.90', 'Team A')", (MEET,))
+                assert conn.execute("SELECT value FROM Counters WHERE name = 'athlete_genders_version'").fetchone()[0] == version
+            conn.close()
+        print("PASS: gender changes from other processes reach the next request")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+if __name__ == '__main__':
+    test_genders_batch_and_cache()
+    test_meet_page_follows_gender_updates()
+    test_genders_follow_other_writers()
+    print("\n=== All tests passed ===")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Tests for Result.insert_many and the routes that batch their rows through it."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wavelight import app
+from models import Database, Result, AthleteBest, TeamScore
+
+TEST_DB = 'test_insert_many.db'
+
+
+def setup_test_db():
+    app.config['DATABASE'] = TEST_DB
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    Database.bootstrap(TEST_DB)
+
+
+def teardown_test_db():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def _row(athlete, event, result, date='2024-04-20', meet='Spring Open'):
+    return {'date': date, 'athlete': athlete, 'meet': meet, 'event': event, 'result': result, 'team': 'Team A'}
+
+
+def test_insert_many_skips_invalid_rows():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.app_context():
+            TeamScore.update_meet_scores('Spring Open', {'Team A': 10})
+            inserted, errors = Result.insert_many([
+                _row('Alice', '400m', '58.10'),
+                _row('Bea', '400m', ''),
+                _row('Cy', 'HJ', '1.80'),
+                _row('Di', '400m', '57.00', date='04/20/2024'),
+                _row(' Alice ', '400m', ' 57.50 ', date='2024-04-21'),
+                _row('Flo', '400m', '59.00', date='2024-04-20garbage'),
+            ])
+            assert inserted == 3
+            assert errors == [(1, 'missing result'), (3, "invalid date '04/20/2024', expected YYYY-MM-DD"),
+                              (5, "invalid date '2024-04-20garbage', expected YYYY-MM-DD")]
+            assert AthleteBest.get('Alice', '400m')['result'] == '57.50'
+            assert AthleteBest.get('Cy', 'High Jump')['result'] == '1.80'
+            assert TeamScore.get_meet_scores('Spring Open') == []
+            assert Result.insert_many([_row('Ed', '', '')]) == (0, [(0, 'missing event, result')])
+            # The single-row path stores aliases under the registered name too
+            Result.insert_result(_row('Gus', 'HJ', '1.70'))
+            assert AthleteBest.get('Gus', 'High Jump')['result'] == '1.70'
+        print("PASS: insert_many writes valid rows and reports the rest")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_routes_batch_rows():
+    original_db = app.config['DATABASE']
+    csrf_enabled = app.config.get('WTF_CSRF_ENABLED', True)
+    app.config['WTF_CSRF_ENABLED'] = False
+    try:
+        setup_test_db()
+        with app.test_client() as client:
+            resp = client.post('/insert', headers={'Accept': 'application/json'}, data={
+                'date[]': ['2024-04-20', '2024-04-20', '2024-04-20'],
+                'athlete[]': ['Alice', 'Bea', ''],
+                'meet[]': ['', 'Spring Open', ''],
+                'event[]': ['400m', '400m', ''],
+                'result[]': ['58.10', '', ''],
+                'team[]': ['Team A', 'Team A', ''],
+            })
+            assert resp.get_json() == {'success': False, 'inserted': 1, 'errors': ['Row 2: missing result']}
+
+            resp = client.post('/meet/Spring Open/api/insert_generated_results', json={'results': [
+                _row('Bea', '400m', '57.20'), _row('Cy', '400m', None)]})
+            assert resp.get_json() == {'ok': True, 'inserted': 1, 'errors': [{'row': 1, 'error': 'missing result'}]}
+
+            # Editing a result's event stores an alias under the registered name as well
+            with app.app_context():
+                bea_id = Database.get_connection().execute(
+                    "SELECT Result_ID FROM Results WHERE Athlete = 'Bea'").fetchone()[0]
+            resp = client.post(f'/update_result/{bea_id}', json={'event': 'LJ', 'result': '5.50'})
+            assert resp.get_json() == {'success': True}
+            with app.app_context():
+                assert AthleteBest.get('Bea', 'Long Jump')['result'] == '5.50'
+                assert AthleteBest.get('Bea', 'LJ') is None
+
+        with app.app_context():
+            assert {r['Meet_Name'] for r in Result.get_recent_meets()} == {'Spring Open', '20240420'}
+        print("PASS: /insert and generated results go through insert_many")
+    finally:
+        app.config['WTF_CSRF_ENABLED'] = csrf_enabled
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+if __name__ == '__main__':
+    test_insert_many_skips_invalid_rows()
+    test_routes_batch_rows()
+    print("\n=== All tests passed ===")
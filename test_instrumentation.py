@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Tests for the per-request SQL instrumentation (Server-Timing, slow-query log, /debug/perf)."""
+
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DEBUG_ROUTES', '1')
+
+from wavelight import app
+from models import Database
+from utils import instrumentation
+
+TEST_DB = 'test_instrumentation.db'
+SLOW_LOG = 'test_instrumentation_slow.jsonl'
+
+
+def setup_test_db():
+    app.config['DATABASE'] = TEST_DB
+    for path in (TEST_DB, SLOW_LOG):
+        if os.path.exists(path):
+            os.remove(path)
+    Database.bootstrap(TEST_DB)
+
+
+def teardown_test_db():
+    for path in (TEST_DB, SLOW_LOG):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def test_server_timing_header():
+    original_db = app.config['DATABASE']
+    instrumented = app.config['SQL_INSTRUMENTATION']
+    try:
+        setup_test_db()
+        with app.test_client() as client:
+            assert 'Server-Timing' not in client.get('/teams').headers
+        app.config['SQL_INSTRUMENTATION'] = True
+        with app.test_client() as client:
+            resp = client.get('/')
+            assert resp.status_code == 200
+            timing = resp.headers['Server-Timing']
+            assert timing.startswith('db;dur=') and ', app;dur=' in timing
+            queries = int(timing.split('desc="')[1].split(' ')[0])
+            assert queries > 0
+        print("PASS: responses carry a Server-Timing header with the query count once SQL_INSTRUMENTATION is set")
+    finally:
+        app.config['SQL_INSTRUMENTATION'] = instrumented
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_slow_query_log_and_report():
+    original_db = app.config['DATABASE']
+    original_ms, original_log = app.config['SLOW_QUERY_MS'], app.config['SLOW_QUERY_LOG']
+    instrumented = app.config['SQL_INSTRUMENTATION']
+    assert original_log is None
+    app.config['SLOW_QUERY_MS'] = 0
+    app.config['SLOW_QUERY_LOG'] = SLOW_LOG
+    app.config['SQL_INSTRUMENTATION'] = True
+    try:
+        setup_test_db()
+        instrumentation.reset()
+        with app.test_client() as client:
+            assert client.get('/teams').status_code == 200
+            with open(SLOW_LOG) as f:
+                lines = [json.loads(line) for line in f]
+            assert lines and all(line['endpoint'] == 'team.teams' for line in lines)
+            assert all({'ts', 'path', 'ms', 'sql', 'params'} <= line.keys() for line in lines)
+
+            endpoints, slowest = instrumentation.endpoint_report()
+            assert [row['endpoint'] for row in endpoints] == ['team.teams']
+            assert endpoints[0]['requests'] == 1 and endpoints[0]['queries'] == len(lines)
+            assert slowest
+
+            page = client.get('/debug/perf').get_data(as_text=True)
+            assert 'team.teams' in page
+        print("PASS: slow statements are logged and totalled per endpoint")
+    finally:
+        app.config['SLOW_QUERY_MS'], app.config['SLOW_QUERY_LOG'] = original_ms, original_log
+        app.config['SQL_INSTRUMENTATION'] = instrumented
+        app.config['DATABASE'] = original_db
+        instrumentation.reset()
+        teardown_test_db()
+
+
+def test_debug_routes_need_a_flag():
+    env = {key: value for key, value in os.environ.items()
+           if key not in ('DEBUG_ROUTES', 'SQL_INSTRUMENTATION', 'PROFILER_ENABLED', 'MEMORY_TRACKING', 'SLOW_QUERY_LOG')}
+    check = ("from wavelight import app; "
+             "print(sorted(r.rule for r in app.url_map.iter_rules() if r.rule.startswith('/debug')), "
+             "app.config['SQL_INSTRUMENTATION'], app.config['SLOW_QUERY_LOG'])")
+    here = os.path.dirname(os.path.abspath(__file__))
+    out = subprocess.run([sys.executable, '-c', check], cwd=here, env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ['[]', 'False', 'None'], out.stdout
+    env['SQL_INSTRUMENTATION'] = '1'
+    out = subprocess.run([sys.executable, '-c', check], cwd=here, env=env, capture_output=True, text=True, check=True)
+    assert "'/debug/perf'" in out.stdout, out.stdout
+    print("PASS: /debug pages and the slow-query log stay off unless configured")
+
+
+if __name__ == '__main__':
+    test_server_timing_header()
+    test_slow_query_log_and_report()
+    test_debug_routes_need_a_flag()
+    print("\n=== All tests passed ===")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Tests for the in-process load-test harness."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import got_request_exception
+
+from benchmarks import datagen, loadtest
+from wavelight import app
+
+TEST_DB = 'test_loadtest.db'
+
+
+def teardown_test_db():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def test_in_process_mixed_load():
+    original_db = app.config['DATABASE']
+    csrf_enabled = app.config.get('WTF_CSRF_ENABLED', True)
+    teardown_test_db()
+    try:
+        datagen.generate(TEST_DB, results=1500, seed=3)
+        app.config['DATABASE'] = TEST_DB
+        app.config['WTF_CSRF_ENABLED'] = False
+        got_request_exception.connect(loadtest.InProcessClient.record_exception, app)
+        target = loadtest.load_target(TEST_DB)
+        mix = loadtest.parse_mix('meet=2,leaderboard=1,insert=2,stagger_rank=1')
+        report = loadtest.run(loadtest.InProcessClient, target, mix, clients=3, requests_per_client=4, seed=1)
+
+        assert report['requests'] == 12
+        assert report['errors'] == 0 and report['locked'] == 0
+        assert set(report['operations']) <= set(mix)
+        assert report['p50_ms'] <= report['p95_ms'] <= report['p99_ms'] <= report['max_ms']
+        assert report['throughput_rps'] > 0
+        print("PASS: mixed read/write load runs in-process without errors")
+    finally:
+        got_request_exception.disconnect(loadtest.InProcessClient.record_exception, app)
+        app.config['WTF_CSRF_ENABLED'] = csrf_enabled
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_parse_mix_rejects_unknown_operations():
+    assert loadtest.parse_mix('meet=3, insert') == {'meet': 3.0, 'insert': 1.0}
+    try:
+        loadtest.parse_mix('meet=1,delete=1')
+    except ValueError as e:
+        assert 'delete' in str(e)
+    else:
+        raise AssertionError('unknown operation accepted')
+    print("PASS: parse_mix")
+
+
+if __name__ == '__main__':
+    test_in_process_mixed_load()
+    test_parse_mix_rejects_unknown_operations()
+    print("\n=== All tests passed ===")
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Tests for the versioned meet view-model cache (utils.meet_cache, migration 14)."""
+
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wavelight import app
+from models import (Database, Result, Meet, RelayTeam, StaggerScore, Comment, BoardPost,
+                    TeamScore, AthleteRanking)
+from utils import meet_cache
+from utils.instrumentation import capture_requests
+
+TEST_DB = 'test_meet_cache.db'
+MEET = 'Cache Invitational'
+OTHER_MEET = 'Later Invitational'
+
+
+def setup_test_db():
+    app.config['DATABASE'] = TEST_DB
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    Database.bootstrap(TEST_DB)
+    meet_cache.reset()
+    with app.app_context():
+        for athlete, result in [('Alice', '12.40'), ('Bob', '11.90'), ('Cara', '12.80')]:
+            Result.insert_result({'date': '2024-04-20', 'athlete': athlete, 'meet': MEET,
+                                  'event': '100m', 'result': result, 'team': 'Team A'})
+
+
+def teardown_test_db():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def _result_id(athlete, meet=MEET):
+    conn = sqlite3.connect(TEST_DB)
+    row = conn.execute('SELECT Result_ID FROM Results WHERE Athlete = ? AND Meet_Name = ?', (athlete, meet)).fetchone()
+    conn.close()
+    return row[0]
+
+
+def test_second_view_is_served_from_cache():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.test_client() as client, capture_requests() as captured:
+            first = client.get(f'/meet/{MEET}').get_data(as_text=True)
+            second = client.get(f'/meet/{MEET}').get_data(as_text=True)
+        assert meet_cache.stats() == {'hits': 1, 'misses': 1}
+        assert captured[1][1].queries <= 3, captured[1][1].statements
+        assert 'Bob' in second and first.count('Alice') == second.count('Alice')
+        print("PASS: repeat meet views come from the cache")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_every_write_path_moves_the_version():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.app_context():
+            # The meet page's first view stores the scores it renders without moving the version
+            before = Meet.version(MEET)
+            TeamScore.update_meet_scores(MEET, {'Team A': 0})
+            assert Meet.version(MEET) == before
+            writes = [
+                ('insert', lambda: Result.insert_result({'date': '2024-04-20', 'athlete': 'Dan', 'meet': MEET,
+                                                         'event': '200m', 'result': '25.00', 'team': 'Team B'})),
+                ('update', lambda: _execute('UPDATE Results SET Result = ? WHERE Result_ID = ?', ('25.10', _result_id('Dan')))),
+                ('delete', lambda: _execute('DELETE FROM Results WHERE Result_ID = ?', (_result_id('Dan'),))),
+                ('relay', lambda: RelayTeam.insert_relay(
+                    {'date': '2024-04-20', 'meet': MEET, 'team': 'Team A', 'event': '4x100m'},
+                    [{'athlete': name, 'split_result': '12.00'} for name in ('Alice', 'Bob', 'Cara', 'Dan')])),
+                ('stagger', lambda: StaggerScore.apply_meet_deltas(MEET, [('100m', '2024-04-20', 'Bob', 12.0)])),
+                ('comment', lambda: Comment.add_comment('meet', MEET, 'fan', 'Fast heat')),
+                ('board post', lambda: BoardPost.add_post('fan', 'Great meet', page_type='meet', page_id=MEET)),
+                ('team scores', lambda: TeamScore.update_meet_scores(MEET, {'Team A': 10})),
+                ('rankings', lambda: AthleteRanking.update_meet_rankings(MEET, [{
+                    'event': '100m', 'date': '2024-04-20', 'athlete': 'Bob', 'ranking_before': 3, 'ranking_after': 1}])),
+                ('sync dates', lambda: Meet.sync_dates(MEET, '2024-04-21')),
+                # A faster 100m elsewhere takes Bob's PR flag away from this meet
+                ('other meet', lambda: Result.insert_result({'date': '2024-05-01', 'athlete': 'Bob', 'meet': OTHER_MEET,
+                                                             'event': '100m', 'result': '11.50', 'team': 'Team A'})),
+                # Bulk inserts bump once per batch, reaching the same meets
+                ('bulk other meet', lambda: Result.insert_many([{'date': '2024-05-02', 'athlete': 'Cara', 'meet': OTHER_MEET,
+                                                                 'event': '100m', 'result': '11.40', 'team': 'Team A'}])),
+                ('event rename', lambda: _execute("UPDATE Events SET event_name = '100 Metres' WHERE event_name = '100m'", ())),
+                ('relay event', lambda: _execute("UPDATE Events SET relay_legs = '100 Metres,100 Metres,100 Metres,100 Metres' WHERE event_name = '4x100m'", ())),
+            ]
+            for name, write in writes:
+                before = Meet.version(MEET)
+                write()
+                assert Meet.version(MEET) != before, name
+
+            # Unrelated writes leave the version alone
+            before = Meet.version(MEET)
+            Comment.add_comment('athlete', 'Alice', 'fan', 'Nice')
+            Result.insert_result({'date': '2024-05-01', 'athlete': 'Eve', 'meet': OTHER_MEET,
+                                  'event': '100m', 'result': '13.00', 'team': 'Team C'})
+            Result.insert_many([{'date': '2024-05-02', 'athlete': 'Eve', 'meet': OTHER_MEET,
+                                 'event': '200m', 'result': '26.00', 'team': 'Team C'}])
+            _execute("UPDATE Events SET sort_order = 99 WHERE event_name = '100 Metres'", ())
+            _execute("UPDATE Events SET event_name = 'One Mile' WHERE event_name = 'Mile'", ())
+            assert Meet.version(MEET) == before
+
+            conn = Database.get_connection()
+            assert conn.execute("SELECT value FROM Counters WHERE name = 'meet_versions_deferred'").fetchone()[0] == 0
+
+            Meet.rename(MEET, 'Renamed Invitational')
+            assert Meet.version('Renamed Invitational') is not None
+            assert Meet.version(MEET) is None
+        print("PASS: every write path that touches a meet moves its version")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def _execute(sql, params):
+    conn = Database.get_connection()
+    with conn:
+        conn.execute(sql, params)
+
+
+def test_page_reflects_writes():
+    original_db = app.config['DATABASE']
+    csrf_enabled = app.config.get('WTF_CSRF_ENABLED', True)
+    app.config['WTF_CSRF_ENABLED'] = False
+    try:
+        setup_test_db()
+        with app.test_client() as client:
+            assert 'Dan' not in client.get(f'/meet/{MEET}').get_data(as_text=True)
+            client.post(f'/comment/meet/{MEET}', data={'username': 'fan', 'content': 'Photo finish'})
+            assert 'Photo finish' in client.get(f'/meet/{MEET}').get_data(as_text=True)
+            # A write from another process reaches the page through the triggers
+            conn = sqlite3.connect(TEST_DB)
+            with conn:
+                conn.execute("INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team) "
+                             "VALUES ('2024-04-20', 'Dan', ?, '100m', '12.10', 'Team A')", (MEET,))
+            conn.close()
+            assert 'Dan' in client.get(f'/meet/{MEET}').get_data(as_text=True)
+        print("PASS: the cached meet page follows writes")
+    finally:
+        app.config['DATABASE'] = original_db
+        app.config['WTF_CSRF_ENABLED'] = csrf_enabled
+        teardown_test_db()
+
+
+def test_sqlite_backend_is_shared():
+    original = {key: app.config.get(key) for key in ('DATABASE', 'MEET_CACHE', 'MEET_CACHE_PATH')}
+    scratch = tempfile.mkdtemp()
+    try:
+        setup_test_db()
+        app.config['MEET_CACHE'] = 'sqlite'
+        app.config['MEET_CACHE_PATH'] = os.path.join(scratch, 'meet_cache.db')
+        with app.test_client() as client:
+            html = client.get(f'/meet/{MEET}').get_data(as_text=True)
+        # A second process opens the same file and finds the pickled view-model
+        other = meet_cache.SQLiteBackend(app.config['MEET_CACHE_PATH'])
+        with app.app_context():
+            key_version = Meet.version(MEET)
+        (entry,) = other._connect().execute('SELECT key FROM meet_views').fetchall()
+        version, view = other.get(entry[0])
+        assert version == key_version
+        assert [record['athlete'] for record in view['events'][('100m', '2024-04-20')]] == ['Bob', 'Alice', 'Cara']
+        with app.test_client() as client:
+            assert client.get(f'/meet/{MEET}').get_data(as_text=True).count('Alice') == html.count('Alice')
+        assert meet_cache.stats()['hits'] == 1
+
+        lru = meet_cache.MemoryBackend(max_entries=2)
+        for number in range(3):
+            lru.set(number, 1, number)
+        assert lru.get(0) is None and lru.get(2) == (1, 2)
+        print("PASS: sqlite backend is shared through its file; memory backend evicts LRU")
+    finally:
+        app.config.update(original)
+        meet_cache.reset()
+        teardown_test_db()
+
+
+if __name__ == '__main__':
+    test_second_view_is_served_from_cache()
+    test_every_write_path_moves_the_version()
+    test_page_reflects_writes()
+    test_sqlite_backend_is_shared()
+    print("\n=== All tests passed ===")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Tests for the trailing-year rank index (AthleteRanking.rank_as_of) and the meet and profile rankings built on it."""
+
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wavelight import app
+from models import Database, Result, AthleteRanking
+from utils.instrumentation import capture_requests
+
+TEST_DB = 'test_meet_rankings.db'
+MEET = 'Ranking Invitational'
+
+
+def setup_test_db():
+    app.config['DATABASE'] = TEST_DB
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    Database.bootstrap(TEST_DB)
+    rows = [
+        # Outside the trailing year of the meet
+        ('2023-01-01', 'Bob', 'Old Meet', '100m', '10.00'),
+        # 366 days before the meet: outside "before" as well, which ends the day before the meet
+        ('2023-05-01', 'Finn', 'Edge Meet', 'Long Jump', '7.00'),
+        ('2024-03-01', 'Alice', 'Early Meet', '100m', '11.80'),
+        ('2024-03-01', 'Cara', 'Early Meet', '100m', '11.60'),
+        ('2024-03-01', 'Dan', 'Early Meet', 'Long Jump', '6.00'),
+        ('2024-05-01', 'Alice', MEET, '100m', '12.00'),
+        # A second heat: one ranking row per athlete and event
+        ('2024-05-01', 'Alice', MEET, '100m', '12.10'),
+        ('2024-05-01', 'Bob', MEET, '100m', '11.50'),
+        ('2024-05-01', 'Eve', MEET, 'Long Jump', '6.50'),
+        ('2024-05-01', 'Dan', MEET, 'Long Jump', '5.90'),
+        ('2024-05-01', 'Alice', MEET, '100 RS', '12.30'),
+        # Later results are not part of either ranking
+        ('2024-06-01', 'Cara', 'Late Meet', '100m', '11.00'),
+    ]
+    with app.app_context():
+        for date, athlete, meet, event, result in rows:
+            Result.insert_result({'date': date, 'athlete': athlete, 'meet': meet,
+                                  'event': event, 'result': result, 'team': 'Team A'})
+
+
+def teardown_test_db():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def test_before_and_after_ranks():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.app_context():
+            rows = AthleteRanking.calculate_meet_rankings(MEET)
+        ranks = {(row['event'], row['athlete']): (row['ranking_before'], row['ranking_after']) for row in rows}
+        assert ranks == {
+            ('100m', 'Alice'): (2, 3),
+            ('100m', 'Bob'): (None, 1),
+            ('Long Jump', 'Dan'): (1, 2),
+            ('Long Jump', 'Eve'): (None, 1),
+        }, ranks
+        assert {row['date'] for row in rows} == {'2024-05-01'}
+        print("PASS: before/after ranks over the meet's trailing year, field events best-high, relays skipped")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_route_stores_rankings_in_two_reads():
+    original_db = app.config['DATABASE']
+    csrf_enabled = app.config.get('WTF_CSRF_ENABLED', True)
+    app.config['WTF_CSRF_ENABLED'] = False
+    try:
+        setup_test_db()
+        with app.test_client() as client, capture_requests() as captured:
+            client.post(f'/meet/{MEET}/calculate_rankings')
+        (_, stats), = captured
+        assert sum(1 for sql in stats.statements if 'FROM Results' in sql) == 2, stats.statements
+        with app.app_context():
+            stored = AthleteRanking.get_meet_rankings(MEET)
+        assert [tuple(row) for row in stored] == [
+            ('100m', '2024-05-01', 'Alice', 2, 3),
+            ('100m', '2024-05-01', 'Bob', None, 1),
+            ('Long Jump', '2024-05-01', 'Dan', 1, 2),
+            ('Long Jump', '2024-05-01', 'Eve', None, 1),
+        ], stored
+        print("PASS: calculate_rankings reads Results twice and stores one row per entry")
+    finally:
+        app.config['DATABASE'] = original_db
+        app.config['WTF_CSRF_ENABLED'] = csrf_enabled
+        teardown_test_db()
+
+
+def test_rank_as_of_follows_writes():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.app_context():
+            assert AthleteRanking.rank_as_of('100m', 'Bob', '2024-05-01') == 1
+            assert AthleteRanking.rank_as_of('100m', 'Bob', '2024-04-30') is None
+            assert AthleteRanking.rank_as_of('100m', 'Cara', '2025-05-31') == 1
+            assert AthleteRanking.rank_as_of('100m', 'Alice', '2025-05-31') is None
+            assert AthleteRanking.rank_as_of('Long Jump', 'Eve', '2024-05-01') == 1
+            assert AthleteRanking.rank_as_of('Long Jump', 'Dan', '2024-04-30') == 2
+            assert AthleteRanking.rank_as_of('Long Jump', 'Dan', '2024-04-30', '2023-05-02') == 1
+            long_jump = AthleteRanking.event_indexes(['Long Jump'], '2023-05-02', '2024-05-01')['Long Jump']
+
+        # Writes from another process reach the index through the per-event version
+        conn = sqlite3.connect(TEST_DB)
+        with conn:
+            conn.execute("INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team, Result_Value, Result_Kind) "
+                         "VALUES ('2024-05-01', 'Dan', ?, '100m', '11.40', 'Team A', 11.4, 'time')", (MEET,))
+        with app.app_context():
+            assert AthleteRanking.rank_as_of('100m', 'Bob', '2024-05-01') == 2
+            assert AthleteRanking.event_indexes(['Long Jump'], '2023-05-02', '2024-05-01')['Long Jump'] is long_jump
+        with conn:
+            conn.execute("UPDATE Athletes SET athlete_name = 'Robert' WHERE athlete_name = 'Bob'")
+        conn.close()
+        with app.app_context():
+            assert AthleteRanking.rank_as_of('100m', 'Robert', '2024-05-01') == 2
+            assert AthleteRanking.rank_as_of('100m', 'Bob', '2024-05-01') is None
+        print("PASS: rank_as_of follows result writes and renames, reloading only the event written to")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_index_loads_only_the_dates_asked_for():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.test_request_context():
+            index = AthleteRanking.event_indexes(['100m'], '2023-05-02', '2024-05-01')['100m']
+            assert index.span == ('2023-05-02', '2024-05-01')
+            assert [mark[0] for mark in index.marks] == ['2024-03-01'] * 2 + ['2024-05-01'] * 3, index.marks
+        # A later window adds only the dates it is missing; an earlier one is already held
+        with app.test_request_context():
+            assert AthleteRanking.rank_as_of('100m', 'Cara', '2024-06-01') == 1
+            index = AthleteRanking.event_indexes(['100m'], '2023-06-02', '2024-06-01')['100m']
+            assert index.span == ('2023-05-02', '2024-06-01')
+            assert [mark[0] for mark in index.marks][-1] == '2024-06-01'
+            assert AthleteRanking.rank_as_of('100m', 'Alice', '2024-05-01') == 3
+        with app.test_request_context():
+            assert AthleteRanking.event_indexes(['100m'], '2023-05-02', '2024-06-01')['100m'] is index
+        print("PASS: the rank index holds only the requested dates and extends by the missing ones")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_profile_rankings_reuse_the_index():
+    original_db = app.config['DATABASE']
+    csrf_enabled = app.config.get('WTF_CSRF_ENABLED', True)
+    app.config['WTF_CSRF_ENABLED'] = False
+    try:
+        setup_test_db()
+        recent = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+        with app.app_context():
+            for athlete, result in [('Alice', '11.70'), ('Bob', '11.90')]:
+                Result.insert_result({'date': recent, 'athlete': athlete, 'meet': 'Recent Meet',
+                                      'event': '100m', 'result': result, 'team': 'Team A'})
+        with app.test_client() as client, capture_requests() as captured:
+            first = client.post('/athlete/Bob/calculate_rankings').get_json()
+            second = client.post('/athlete/Bob/calculate_rankings').get_json()
+        assert first == second == {'success': True, 'rankings': {'100m': 2}}, (first, second)
+        # The repeat only lists Bob's events; versions are unchanged so no marks are loaded
+        reads = [sql for sql in captured[1][1].statements if 'FROM Results' in sql]
+        assert len(reads) == 1 and 'SELECT DISTINCT Event' in reads[0], captured[1][1].statements
+        print("PASS: profile rankings come from the shared index")
+    finally:
+        app.config['DATABASE'] = original_db
+        app.config['WTF_CSRF_ENABLED'] = csrf_enabled
+        teardown_test_db()
+
+
+if __name__ == '__main__':
+    test_before_and_after_ranks()
+    test_route_stores_rankings_in_two_reads()
+    test_rank_as_of_follows_writes()
+    test_index_loads_only_the_dates_asked_for()
+    test_profile_rankings_reuse_the_index()
+    print("\n=== All tests passed ===")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Tests for the MeetEventWinners home-page feed and its row counter."""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wavelight import app
+from models import Database, Result
+from utils import meet_winners
+
+TEST_DB = 'test_meet_winners.db'
+
+
+def setup_test_db():
+    app.config['DATABASE'] = TEST_DB
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    Database.bootstrap(TEST_DB)
+
+
+def teardown_test_db():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def _insert(athlete, meet, event, result, date='2024-04-20'):
+    Result.insert_result({'date': date, 'athlete': athlete, 'meet': meet,
+                          'event': event, 'result': result, 'team': 'Team A'})
+
+
+def _feed():
+    conn = sqlite3.connect(TEST_DB)
+    rows = conn.execute('SELECT meet_name, event, athlete, result FROM MeetEventWinners ORDER BY meet_name, event').fetchall()
+    counter = conn.execute('SELECT value FROM Counters WHERE name = ?', (meet_winners.WINNERS_COUNTER,)).fetchone()[0]
+    conn.close()
+    return rows, counter
+
+
+def test_winners_follow_writes():
+    original_db = app.config['DATABASE']
+    csrf_enabled = app.config.get('WTF_CSRF_ENABLED', True)
+    app.config['WTF_CSRF_ENABLED'] = False
+    try:
+        setup_test_db()
+        with app.app_context():
+            _insert('Alice', 'Spring Open', '400m', '58.10')
+            _insert('Bea', 'Spring Open', '400m', '57.20')
+            _insert('Cy', 'Spring Open', 'Shot Put', '11.00')
+            _insert('Di', 'Spring Open', 'Shot Put', '12.40')
+            assert _feed() == ([('Spring Open', '400m', 'Bea', '57.20'), ('Spring Open', 'Shot Put', 'Di', '12.40')], 2)
+            bea_id = Database.get_connection().execute(
+                "SELECT Result_ID FROM Results WHERE Athlete = 'Bea'").fetchone()[0]
+
+            with app.test_client() as client:
+                client.post(f'/update_result/{bea_id}', json={'result': '59.00'})
+                assert _feed()[0][0] == ('Spring Open', '400m', 'Alice', '58.10')
+                client.post(f'/update_result/{bea_id}', json={'event': '800m', 'result': '2:10.00'})
+                assert _feed()[1] == 3
+                client.post(f'/delete_result/{bea_id}')
+                assert _feed()[1] == 2
+                client.post('/meet/Spring Open/rename', data={'new_name': 'Spring Classic'})
+                rows, counter = _feed()
+                assert {row[0] for row in rows} == {'Spring Classic'} and counter == 2
+
+        incremental = _feed()
+        conn = sqlite3.connect(TEST_DB)
+        with conn:
+            meet_winners.rebuild(conn.cursor())
+        conn.close()
+        assert _feed() == incremental
+        print("PASS: MeetEventWinners follows inserts, edits, deletes and renames")
+    finally:
+        app.config['WTF_CSRF_ENABLED'] = csrf_enabled
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_keyset_pagination_matches_offset():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.app_context():
+            for i in range(12):
+                _insert(f'Athlete {i}', f'Meet {i % 4}', ['100m', '200m', '400m'][i % 3], '12.00',
+                        date=f'2024-04-{10 + i % 3}')
+            # Undated winners come last on every page
+            conn = sqlite3.connect(TEST_DB)
+            with conn:
+                conn.executemany("INSERT INTO MeetEventWinners (meet_name, event, date, athlete, result, team) "
+                                 "VALUES (?, ?, NULL, ?, '12.00', 'Team A')",
+                                 [('Meet 0', 'Mile', 'Undated 1'), ('Meet 1', 'Mile', 'Undated 2')])
+                conn.execute('UPDATE Counters SET value = value + 2 WHERE name = ?', (meet_winners.WINNERS_COUNTER,))
+            conn.close()
+            everything = [tuple(r) for r in Result.get_recent_winners(limit=100)]
+            assert [r[1] for r in everything[-2:]] == ['Undated 1', 'Undated 2']
+            assert len(everything) == Result.get_total_winners()
+            pages, after = [], None
+            while True:
+                page = Result.get_recent_winners(limit=4, after=after)
+                if not page:
+                    break
+                pages.extend(tuple(r) for r in page)
+                after = (page[-1][0], page[-1][2], page[-1][3])
+            assert pages == everything
+        print("PASS: keyset pagination matches offset order")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+if __name__ == '__main__':
+    test_winners_follow_writes()
+    test_keyset_pagination_matches_offset()
+    print("\n=== All tests passed ===")
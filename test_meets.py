@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Tests for the Meets table, the Results view over ResultRows, and meet renames/date syncs."""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import migrations
+from wavelight import app
+from models import Database, Result, Meet, Comment
+
+TEST_DB = 'test_meets.db'
+
+
+def setup_test_db():
+    app.config['DATABASE'] = TEST_DB
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    Database.bootstrap(TEST_DB)
+
+
+def teardown_test_db():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def _insert(athlete, meet, event, result, date):
+    Result.insert_result({'date': date, 'athlete': athlete, 'meet': meet,
+                          'event': event, 'result': result, 'team': 'Team A'})
+
+
+def _meet_rows():
+    conn = sqlite3.connect(TEST_DB)
+    rows = conn.execute('SELECT meet_name, date, result_count FROM Meets ORDER BY meet_name').fetchall()
+    conn.close()
+    return rows
+
+
+def test_results_view_keeps_meets_current():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.app_context():
+            _insert('Alice', 'Spring Open', '400m', '58.10', '2024-04-21')
+            _insert('Bea', 'Spring Open', '400m', '57.20', '2024-04-20')
+            _insert('Cy', 'Summer Games', '100m', '11.90', '2024-06-01')
+            assert _meet_rows() == [('Spring Open', '2024-04-20', 2), ('Summer Games', '2024-06-01', 1)]
+
+            conn = Database.get_connection()
+            with conn:
+                conn.execute("UPDATE Results SET Meet_Name = 'Summer Games' WHERE Athlete = 'Bea'")
+                conn.execute("DELETE FROM Results WHERE Athlete = 'Cy'")
+            assert _meet_rows() == [('Spring Open', '2024-04-21', 1), ('Summer Games', '2024-04-20', 1)]
+
+            assert [tuple(r) for r in Result.get_meets_for_month(2024, 4)] == [
+                ('Summer Games', '2024-04-20'), ('Spring Open', '2024-04-21')]
+            assert [tuple(r) for r in Result.get_meets_for_date('2024-04-21')] == [('Spring Open', '2024-04-21')]
+            assert Result.get_latest_meet_date() == '2024-04-21'
+            assert Result.get_total_meets(search='Spring') == 1
+        print("PASS: Results view keeps Meets current")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_rename_and_sync_dates():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.app_context():
+            _insert('Alice', 'Spring Open', '400m', '58.10', '2024-04-20')
+            _insert('Bea', 'Spring Open', '400m', '57.20', '2024-04-21')
+            Comment.add_comment('meet', 'Spring Open', 'fan', 'nice')
+            conn = Database.get_connection()
+            with conn:
+                conn.execute("INSERT INTO TeamScores (meet_name, team_name, score) VALUES ('Spring Open', 'Team A', 10)")
+            meet_id = Meet.get('Spring Open')['meet_id']
+
+            # Whole-meet rename is a Meets update: same id, results and meet-keyed rows follow
+            assert Meet.rename('Spring Open', 'Spring Classic') == 2
+            assert Meet.get('Spring Classic')['meet_id'] == meet_id
+            assert len(Result.get_meet_results('Spring Classic')) == 2
+            assert Comment.get_comment_count('meet', 'Spring Classic') == 1
+            assert conn.execute("SELECT meet_name FROM TeamScores").fetchone()[0] == 'Spring Classic'
+
+            # Renaming one day splits it into its own meet
+            assert Meet.rename('Spring Classic', 'Spring Classic Day 2', date='2024-04-21') == 1
+            assert _meet_rows() == [('Spring Classic', '2024-04-20', 1), ('Spring Classic Day 2', '2024-04-21', 1)]
+            assert Meet.rename('Spring Classic', 'Nowhere', date='2024-05-01') == 0
+
+            # Renaming onto an existing meet merges them
+            assert Meet.rename('Spring Classic Day 2', 'Spring Classic') == 1
+            assert _meet_rows() == [('Spring Classic', '2024-04-20', 2)]
+
+            assert Meet.sync_dates('Spring Classic', '2024-04-22') == 2
+            assert _meet_rows() == [('Spring Classic', '2024-04-22', 2)]
+            assert {r[0] for r in Result.get_meet_results('Spring Classic')} == {'2024-04-22'}
+        print("PASS: meet rename and date sync")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_migration_moves_existing_results():
+    teardown_test_db()
+    try:
+        conn = sqlite3.connect(TEST_DB)
+        migrations.migrate(conn, target=9)
+        conn.executemany('INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team) VALUES (?, ?, ?, ?, ?, ?)', [
+            ('2024-04-20', 'Alice', 'Old Meet', '800m', '2:01.50', 'Team A'),
+            ('2024-04-19', 'Bea', 'Old Meet', '800m', '2:03.00', 'Team A'),
+        ])
+        conn.commit()
+        migrations.migrate(conn)
+        assert conn.execute('SELECT meet_name, date, result_count FROM Meets').fetchall() == [('Old Meet', '2024-04-19', 2)]
+        rows = conn.execute('SELECT Athlete, Meet_Name FROM Results ORDER BY Athlete').fetchall()
+        assert rows == [('Alice', 'Old Meet'), ('Bea', 'Old Meet')]
+        conn.close()
+        print("PASS: migration moves Results into ResultRows")
+    finally:
+        teardown_test_db()
+
+
+if __name__ == '__main__':
+    test_results_view_keeps_meets_current()
+    test_rename_and_sync_dates()
+    test_migration_moves_existing_results()
+    print("\n=== All tests passed ===")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Tests for the tracemalloc request instrumentation and snapshot endpoints."""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DEBUG_ROUTES', '1')
+
+from wavelight import app
+from models import Database
+from utils import memory
+
+TEST_DB = 'test_memory.db'
+
+
+def setup_test_db():
+    app.config['DATABASE'] = TEST_DB
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    Database.bootstrap(TEST_DB)
+    conn = sqlite3.connect(TEST_DB)
+    with conn:
+        conn.executemany('INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team) '
+                         "VALUES ('2024-04-20', ?, 'Spring Open', '400m', ?, 'Team A')",
+                         [(f'Athlete {i}', f'{55 + i / 100:.2f}') for i in range(300)])
+    conn.close()
+
+
+def teardown_test_db():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def test_request_peaks_and_snapshots():
+    original_db = app.config['DATABASE']
+    tracking = app.config.get('MEMORY_TRACKING', False)
+    csrf_enabled = app.config.get('WTF_CSRF_ENABLED', True)
+    app.config['WTF_CSRF_ENABLED'] = False
+    try:
+        setup_test_db()
+        memory.reset()
+        with app.test_client() as client:
+            assert client.get('/debug/memory/snapshot').status_code == 405
+            assert client.post('/debug/memory/snapshot').status_code == 409
+
+            app.config['MEMORY_TRACKING'] = True
+            assert client.get('/team/Team A').status_code == 200
+            rows = {row['endpoint']: row for row in memory.endpoint_report()}
+            assert rows['team.team_results']['requests'] == 1
+            assert rows['team.team_results']['peak_max'] > 0
+
+            snapshot = client.post('/debug/memory/snapshot?limit=5').get_json()
+            assert snapshot['id'] == memory.snapshots()[-1][0]
+            assert len(snapshot['top']) == 5 and snapshot['top'][0]['size'] >= snapshot['top'][-1]['size']
+            assert {'file', 'line', 'size', 'count'} <= snapshot['top'][0].keys()
+
+            diff = client.get(f"/debug/memory/diff?base={snapshot['id']}").get_json()
+            assert diff['base'] == snapshot['id'] and isinstance(diff['top'], list)
+            assert client.get('/debug/memory/diff?base=999').status_code == 404
+
+            page = client.get('/debug/memory').get_data(as_text=True)
+            assert 'team.team_results' in page and '/team/Team' in page
+        print("PASS: per-request peaks are recorded and snapshots diff")
+    finally:
+        memory.stop()
+        app.config['MEMORY_TRACKING'] = tracking
+        app.config['WTF_CSRF_ENABLED'] = csrf_enabled
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+if __name__ == '__main__':
+    test_request_peaks_and_snapshots()
+    print("\n=== All tests passed ===")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Tests for the set-based database merge in import_results.py."""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import migrations
+import import_results
+
+SOURCE_DB = 'test_merge_source.db'
+TARGET_DB = 'test_merge_target.db'
+
+_INSERT_RESULT = 'INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team) VALUES (?, ?, ?, ?, ?, ?)'
+
+
+def _create(path):
+    conn = sqlite3.connect(path)
+    migrations.migrate(conn)
+    return conn
+
+
+def _add_relay(conn, meet, team, legs):
+    cur = conn.execute("INSERT INTO RelayTeams (Date, Meet_Name, Team, Event, Total_Result) "
+                       "VALUES ('2024-04-20', ?, ?, '4x400m', '3:30.00')", (meet, team))
+    conn.executemany('INSERT INTO RelayLegs (Relay_ID, Leg_Number, Athlete, Split_Event, Split_Result) '
+                     "VALUES (?, ?, ?, '400m', ?)",
+                     [(cur.lastrowid, number, athlete, split) for number, (athlete, split) in enumerate(legs, 1)])
+
+
+def _cleanup():
+    for path in (SOURCE_DB, TARGET_DB):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def test_merge_inserts_missing_rows_and_remaps_relays():
+    _cleanup()
+    try:
+        source = _create(SOURCE_DB)
+        with source:
+            source.executemany(_INSERT_RESULT, [
+                ('2024-04-20', 'Alice', 'Spring Open', '400m', '58.10', 'Team A'),
+                ('2024-04-20', 'Bea', 'Spring Open', '400m', '57.20', 'Team A'),
+                ('2024-04-27', 'Cy', 'Relays', 'Shot Put', '11.00', 'Team B'),
+            ])
+            source.execute("UPDATE Athletes SET bio = 'miler' WHERE athlete_name = 'Bea'")
+            source.execute("UPDATE Teams SET logo_url = '/b.png' WHERE team_name = 'Team B'")
+            _add_relay(source, 'Spring Open', 'Team A', [('Alice', '52.0'), ('Bea', '51.5')])
+            _add_relay(source, 'Relays', 'Team B', [('Cy', '55.0'), ('Di', '54.0')])
+        source.close()
+
+        target = _create(TARGET_DB)
+        with target:
+            target.execute(_INSERT_RESULT, ('2024-04-20', 'Alice', 'Spring Open', '400m', '58.10', 'Team A'))
+            _add_relay(target, 'Spring Open', 'Team A', [('Alice', '52.0'), ('Bea', '51.5')])
+            target.execute("INSERT INTO RelayTeams (Meet_Name) VALUES ('placeholder')")  # shift target ids
+
+        counts = import_results.merge(target, SOURCE_DB)
+        assert counts == {'athletes': 2, 'teams': 1, 'results': 2, 'relay teams': 1, 'relay legs': 2}
+        assert target.execute("SELECT bio FROM Athletes WHERE athlete_name = 'Bea'").fetchone() == ('miler',)
+        assert target.execute("SELECT logo_url FROM Teams WHERE team_name = 'Team B'").fetchone() == ('/b.png',)
+        assert target.execute("SELECT Result_Kind FROM Results WHERE Athlete = 'Cy'").fetchone() == ('metric',)
+        legs = target.execute('''
+            SELECT rl.Athlete, rl.Split_Value FROM RelayLegs rl JOIN RelayTeams rt ON rt.Relay_ID = rl.Relay_ID
+            WHERE rt.Meet_Name = 'Relays' ORDER BY rl.Leg_Number
+        ''').fetchall()
+        assert legs == [('Cy', 55.0), ('Di', 54.0)]
+        assert target.execute("SELECT result FROM AthleteBests WHERE athlete = 'Bea'").fetchone() == ('57.20',)
+        assert target.execute('SELECT COUNT(*) FROM MeetEventWinners').fetchone()[0] == 2
+
+        # Merging again finds nothing new
+        counts = import_results.merge(target, SOURCE_DB)
+        assert set(counts.values()) == {0}
+        target.close()
+        print("PASS: merge inserts missing rows and remaps relay ids")
+    finally:
+        _cleanup()
+
+
+def test_merge_resolves_event_aliases():
+    _cleanup()
+    try:
+        source = _create(SOURCE_DB)
+        with source:
+            source.executemany(_INSERT_RESULT, [
+                ('2024-04-27', 'Cy', 'Relays', 'SP', '11.00', 'Team B'),
+                ('2024-04-27', 'Di', 'Relays', 'HJ', '1.60', 'Team B'),
+            ])
+            for event, split_event in (('Sprint Medley Relay', '400m'), ('4x1600m', '1 Mile')):
+                cur = source.execute("INSERT INTO RelayTeams (Date, Meet_Name, Team, Event, Total_Result) "
+                                     "VALUES ('2024-04-27', 'Relays', 'Team B', ?, '4:00.00')", (event,))
+                source.execute('INSERT INTO RelayLegs (Relay_ID, Leg_Number, Athlete, Split_Event, Split_Result) '
+                               "VALUES (?, 1, 'Cy', ?, '5:00.00')", (cur.lastrowid, split_event))
+        source.close()
+
+        target = _create(TARGET_DB)
+        with target:
+            target.execute(_INSERT_RESULT, ('2024-04-27', 'Cy', 'Relays', 'Shot Put', '11.00', 'Team B'))
+            target.execute("INSERT INTO RelayTeams (Date, Meet_Name, Team, Event, Total_Result) "
+                           "VALUES ('2024-04-27', 'Relays', 'Team B', 'SMR', '4:00.00')")
+
+        counts = import_results.merge(target, SOURCE_DB)
+        assert (counts['results'], counts['relay teams'], counts['relay legs']) == (1, 1, 1), counts
+        assert target.execute('SELECT Athlete, Event FROM Results ORDER BY Result_ID').fetchall() == [
+            ('Cy', 'Shot Put'), ('Di', 'High Jump')]
+        assert target.execute('SELECT Event FROM RelayTeams ORDER BY Relay_ID').fetchall() == [('SMR',), ('4x1600m',)]
+        assert target.execute('SELECT Split_Event FROM RelayLegs').fetchall() == [('Mile',)]
+        target.close()
+        print("PASS: merge stores aliased events under their registered names")
+    finally:
+        _cleanup()
+
+
+if __name__ == '__main__':
+    test_merge_inserts_missing_rows_and_remaps_relays()
+    test_merge_resolves_event_aliases()
+    print("\n=== All tests passed ===")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Tests for the versioned schema migration runner."""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import migrations
+from wavelight import app
+from models import Database
+
+TEST_DB = 'test_migrations.db'
+
+
+def _remove_test_db():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def _tables(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")}
+
+
+def test_fresh_database_reaches_latest_version():
+    _remove_test_db()
+    try:
+        conn = sqlite3.connect(TEST_DB)
+        applied = migrations.migrate(conn)
+        assert applied == [m[0] for m in migrations.MIGRATIONS]
+        assert migrations.get_version(conn) == migrations.LATEST_VERSION
+        assert {'Results', 'Athletes', 'BoardPosts', 'RelayLegs', 'Games', 'Plays'} <= _tables(conn)
+        # Re-running is a no-op
+        assert migrations.migrate(conn) == []
+        conn.close()
+        print("PASS: fresh database migrates to latest version")
+    finally:
+        _remove_test_db()
+
+
+def test_legacy_database_is_upgraded_in_place():
+    _remove_test_db()
+    try:
+        # Shape of a pre-versioning track.db: original Results + BoardPosts without page scope
+        conn = sqlite3.connect(TEST_DB)
+        conn.execute('CREATE TABLE Results (Result_ID INTEGER PRIMARY KEY, Date TEXT, Athlete TEXT, '
+                     'Meet_Name TEXT, Event TEXT, Result TEXT, Team TEXT)')
+        conn.execute('CREATE TABLE BoardPosts (id INTEGER PRIMARY KEY AUTOINCREMENT, author_display_name TEXT NOT NULL, '
+                     'content TEXT NOT NULL, parent_id INTEGER, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, '
+                     'is_ai_generated INTEGER DEFAULT 0, ai_prompt TEXT)')
+        conn.execute("INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team) "
+                     "VALUES ('2024-04-20', 'Alice', 'Legacy Meet', '400m', '55.00', 'Team A')")
+        conn.commit()
+        assert migrations.get_version(conn) == 0
+
+        migrations.migrate(conn)
+        board_columns = migrations._columns(conn.cursor(), 'BoardPosts')
+        assert 'page_type' in board_columns and 'page_id' in board_columns
+        assert 'Class' in migrations._columns(conn.cursor(), 'Results')
+        assert conn.execute('SELECT COUNT(*) FROM Results').fetchone()[0] == 1
+        conn.close()
+        print("PASS: legacy database upgraded without data loss")
+    finally:
+        _remove_test_db()
+
+
+def test_request_path_issues_no_ddl():
+    original_db = app.config['DATABASE']
+    _remove_test_db()
+    app.config['DATABASE'] = TEST_DB
+    try:
+        Database.bootstrap(TEST_DB)
+        statements = []
+        with app.app_context():
+            conn = Database.get_connection()
+            conn.set_trace_callback(statements.append)
+            from models import Result, Comment
+            Result.get_recent_winners()
+            Comment.get_comments('meet', 'Nothing')
+            assert Database.get_connection() is conn
+        ddl = [s for s in statements if s.lstrip().upper().startswith(('CREATE', 'ALTER', 'PRAGMA'))]
+        assert ddl == [], ddl
+        print("PASS: request path issues no DDL")
+    finally:
+        app.config['DATABASE'] = original_db
+        _remove_test_db()
+
+
+if __name__ == '__main__':
+    test_fresh_database_reaches_latest_version()
+    test_legacy_database_is_upgraded_in_place()
+    test_request_path_issues_no_ddl()
+    print("\n=== All tests passed ===")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Tests for the set-based normalization rules in db_normalization."""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import db_normalization
+from wavelight import app
+from models import Database
+
+TEST_DB = 'test_normalization.db'
+
+ROWS = [
+    ('Alice', 'Spring Open', '400m', '058.1'),
+    ('Bea', 'Spring Open', '400m', '57.234'),
+    ('Cy', 'Spring Open', '800m', '2:05'),
+    ('Di', 'Spring Open', '400m', '1:02.00'),
+    ('Ed', 'Spring Open', 'Long Jump', '17\'6"'),
+    ('Bea', 'Spring Open', '400m', '57.90'),
+    ('Fay', 'Spring Open', 'Decathlon', '3500'),
+]
+
+
+def setup_test_db():
+    app.config['DATABASE'] = TEST_DB
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    Database.bootstrap(TEST_DB)
+    conn = sqlite3.connect(TEST_DB)
+    with conn:
+        conn.executemany("INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team) "
+                         "VALUES ('2024-04-20', ?, ?, ?, ?, 'Team A')", ROWS)
+    conn.close()
+
+
+def teardown_test_db():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def _results():
+    conn = sqlite3.connect(TEST_DB)
+    rows = conn.execute('SELECT Result_ID, Result, Result_Value FROM Results ORDER BY Result_ID').fetchall()
+    conn.close()
+    return rows
+
+
+def test_dry_run_then_apply():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        conn = sqlite3.connect(TEST_DB)
+        affected = list(db_normalization.iter_affected(conn.cursor()))
+        assert affected == [('leading_zero', 1), ('padding', 1), ('padding', 2), ('sprint_colon', 4)]
+        assert list(db_normalization.iter_affected(conn.cursor(), ['duplicates'])) == [('duplicates', 6)]
+        conn.close()
+        assert [row[1] for row in _results()] == [row[3] for row in ROWS]
+
+        counts = db_normalization.normalization(TEST_DB)
+        assert counts == {'leading_zero': 1, 'padding': 2, 'sprint_colon': 1}
+        assert _results()[:3] == [(1, '58.10', 58.1), (2, '57.23', 57.23), (3, '2:05', None)]
+        assert [row[:2] for row in _results()[3:]] == [(5, '17\'6"'), (6, '57.90'), (7, '3500')]
+        assert db_normalization.normalization(TEST_DB, ['duplicates']) == {'duplicates': 1}
+        assert len(_results()) == 5
+        print("PASS: dry run lists the ids the rules then change")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_normalize_endpoint():
+    original_db = app.config['DATABASE']
+    csrf_enabled = app.config.get('WTF_CSRF_ENABLED', True)
+    app.config['WTF_CSRF_ENABLED'] = False
+    try:
+        setup_test_db()
+        with app.test_client() as client:
+            data = client.post('/api/normalize_results', json={'dry_run': True, 'rules': ['padding']}).get_json()
+            assert data == {'success': True, 'dry_run': True, 'affected': {'padding': [1, 2]}}
+            # Without dry_run: false nothing is written
+            data = client.post('/api/normalize_results', json={}).get_json()
+            assert data['dry_run'] and data['affected']['padding'] == [1, 2], data
+            data = client.post('/api/normalize_results', json={'dry_run': False}).get_json()
+            assert data['changed'] == {'leading_zero': 1, 'padding': 2, 'sprint_colon': 1}
+            resp = client.post('/api/normalize_results', json={'rules': ['nope']})
+            assert resp.status_code == 400
+            before = _results()
+            resp = client.post('/api/normalize_results', json={'dry_run': False, 'rules': ['duplicates']})
+            assert resp.status_code == 400 and 'db_normalization.py' in resp.get_json()['error']
+            assert _results() == before
+        with app.app_context():
+            best = Database.get_connection().execute(
+                "SELECT result FROM AthleteBests WHERE athlete = 'Alice'").fetchone()
+            assert best[0] == '58.10'
+        print("PASS: normalization is callable from the app, dry run by default and without duplicates")
+    finally:
+        app.config['WTF_CSRF_ENABLED'] = csrf_enabled
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_whole_padding_skips_points():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        conn = sqlite3.connect(TEST_DB)
+        assert list(db_normalization.iter_affected(conn.cursor(), ['whole_padding'])) == [('whole_padding', 3)]
+        conn.close()
+        assert db_normalization.normalization(TEST_DB, ['whole_padding']) == {'whole_padding': 1}
+        results = _results()
+        assert results[2] == (3, '2:05.00', 125.0)
+        # Points totals are left as entered
+        assert results[6][:2] == (7, '3500')
+        print("PASS: whole-number padding is opt-in and leaves points results alone")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+if __name__ == '__main__':
+    test_dry_run_then_apply()
+    test_normalize_endpoint()
+    test_whole_padding_skips_points()
+    print("\n=== All tests passed ===")
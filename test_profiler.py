@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Tests for the on-demand request profiler."""
+
+import os
+import shutil
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DEBUG_ROUTES', '1')
+
+from wavelight import app
+from models import Database
+
+TEST_DB = 'test_profiler.db'
+PROFILE_DIR = 'test_profiles'
+
+
+def setup_test_db():
+    app.config['DATABASE'] = TEST_DB
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    Database.bootstrap(TEST_DB)
+
+
+def teardown_test_db():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    shutil.rmtree(PROFILE_DIR, ignore_errors=True)
+
+
+def test_profile_on_request():
+    original_db = app.config['DATABASE']
+    original = {key: app.config.get(key) for key in ('PROFILER_ENABLED', 'PROFILE_DIR', 'PROFILE_INTERVAL_MS')}
+    app.config.update(PROFILER_ENABLED=True, PROFILE_DIR=PROFILE_DIR, PROFILE_INTERVAL_MS=0.2)
+    try:
+        setup_test_db()
+        with app.test_client() as client:
+            assert 'X-Profile-Id' not in client.get('/teams').headers
+
+            profile_id = client.get('/teams?_profile=1').headers['X-Profile-Id']
+            files = sorted(os.listdir(PROFILE_DIR))
+            assert files == [profile_id + suffix for suffix in ('.collapsed', '.json', '.pstats')]
+            with open(os.path.join(PROFILE_DIR, profile_id + '.collapsed')) as f:
+                lines = f.read().splitlines()
+            assert lines and all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+            assert any('teams (team_routes.py' in line for line in lines)
+
+            report = client.get(f'/debug/profiles/{profile_id}').get_data(as_text=True)
+            assert 'cumulative' in report and 'team_routes.py' in report
+
+            sampled = client.get('/teams', headers={'X-Profile': 'sample'}).headers['X-Profile-Id']
+            assert not os.path.exists(os.path.join(PROFILE_DIR, sampled + '.pstats'))
+
+            page = client.get('/debug/profiles').get_data(as_text=True)
+            assert profile_id in page and sampled in page
+            resp = client.get(f'/debug/profiles/{profile_id}/download/collapsed')
+            assert resp.status_code == 200 and resp.data
+            assert client.get('/debug/profiles/nope/download/pstats').status_code == 404
+
+        app.config['PROFILER_ENABLED'] = False
+        with app.test_client() as client:
+            assert 'X-Profile-Id' not in client.get('/teams?_profile=1').headers
+            for path in ('/debug/profiles', f'/debug/profiles/{profile_id}',
+                         f'/debug/profiles/{profile_id}/download/collapsed'):
+                assert client.get(path).status_code == 404, path
+        print("PASS: ?_profile=1 saves pstats and collapsed stacks, listed on /debug/profiles while profiling is on")
+    finally:
+        app.config.update(original)
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+if __name__ == '__main__':
+    test_profile_on_request()
+    print("\n=== All tests passed ===")
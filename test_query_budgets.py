@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Query budgets for the main pages, to catch N+1 regressions.
+
+Each page is requested under instrumentation.query_budget(). The seeded meet, athlete and
+game are big enough (dozens of entries, relays, players) that a query issued per row
+blows the budget, so a budget only needs raising when a page gains a new kind of query.
+"""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wavelight import app
+from models import Database
+from utils.instrumentation import query_budget
+
+TEST_DB = 'test_query_budgets.db'
+
+MEET = 'Budget Invitational'
+ATHLETE = 'Athlete 1'
+TEAM = 'Team 1'
+
+EVENTS = ['100m', '400m', '1600m', 'Long Jump', 'Shot Put']
+
+
+def setup_test_db():
+    app.config['DATABASE'] = TEST_DB
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    Database.bootstrap(TEST_DB)
+    conn = sqlite3.connect(TEST_DB)
+    with conn:
+        rows = []
+        for meet_number in range(12):
+            meet = MEET if meet_number == 0 else f'Meet {meet_number}'
+            date = f'2024-{1 + meet_number % 12:02d}-15'
+            for athlete in range(40):
+                event = EVENTS[athlete % len(EVENTS)]
+                if event in ('Long Jump', 'Shot Put'):
+                    result = f'{5 + (athlete + meet_number) % 30 / 10:.2f}'
+                elif event == '1600m':
+                    result = f'5:{10 + (athlete + meet_number) % 40:02d}.00'
+                else:
+                    result = f'{11 + (athlete + meet_number) % 50 / 10:.2f}'
+                rows.append((date, f'Athlete {athlete}', meet, event, result, f'Team {athlete % 4}'))
+        conn.executemany('INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team) '
+                         'VALUES (?, ?, ?, ?, ?, ?)', rows)
+        for relay in range(8):
+            cur = conn.execute("INSERT INTO RelayTeams (Date, Meet_Name, Team, Event, Total_Result, Team_Designation) "
+                               "VALUES ('2024-01-15', ?, ?, '4x100m', ?, ?)",
+                               (MEET, f'Team {relay % 4}', f'{44 + relay}.00', 'AB'[relay // 4]))
+            conn.executemany('INSERT INTO RelayLegs (Relay_ID, Leg_Number, Athlete, Split_Event, Split_Result) '
+                             "VALUES (?, ?, ?, '100m', ?)",
+                             [(cur.lastrowid, leg, f'Athlete {(relay * 4 + leg) % 40}', f'{11 + leg / 10:.2f}')
+                              for leg in range(1, 5)])
+        game = conn.execute("INSERT INTO Games (home_team, away_team, game_date, season_year) "
+                            "VALUES ('Hawks', 'Owls', '2024-09-01', 2024)")
+        plays = []
+        for i in range(120):
+            team = 'Hawks' if i % 2 else 'Owls'
+            play_type = ('Pass', 'Rush', 'Incomplete', 'FG')[i % 4]
+            plays.append((game.lastrowid, play_type, f'QB {team}', f'{team} Player {i % 15}', team, i % 20,
+                          1 if play_type == 'Pass' else 0))
+        conn.executemany('INSERT INTO Plays (game_id, play_type, quarterback, player_name, team, yards, is_complete) '
+                         'VALUES (?, ?, ?, ?, ?, ?, ?)', plays)
+    conn.close()
+    return game.lastrowid
+
+
+def teardown_test_db():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def _page_budgets(game_id):
+    # path -> most statements the page may issue through Database
+    return {
+        '/': 5,
+        f'/meet/{MEET}': 20,
+        f'/athlete/{ATHLETE}': 20,
+        '/leaderboard': 5,
+        '/leaderboard?event=100m': 8,
+        '/leaderboard?event=4x100m': 12,
+        f'/team/{TEAM}': 8,
+        f'/football/game/{game_id}': 8,
+    }
+
+
+def test_page_query_budgets():
+    original_db = app.config['DATABASE']
+    try:
+        game_id = setup_test_db()
+        with app.test_client() as client:
+            for path, budget in _page_budgets(game_id).items():
+                with query_budget(budget) as captured:
+                    resp = client.get(path)
+                assert resp.status_code == 200, (path, resp.status_code)
+                assert len(captured) == 1, (path, captured)
+        print("PASS: main pages stay within their query budgets")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+if __name__ == '__main__':
+    test_page_query_budgets()
+    print("\n=== All tests passed ===")
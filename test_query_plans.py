@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""EXPLAIN QUERY PLAN checks for the queries behind the hot routes.
+
+Drives the home/meet/athlete/leaderboard/team pages, the meets calendar and the football model through the
+test client, captures every SELECT they issue and fails if any of them has to
+scan a large table (or build an automatic index on one) instead of using an index.
+"""
+
+import os
+import re
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wavelight import app
+from models import Database
+
+TEST_DB = 'test_query_plans.db'
+
+# Tables that grow with usage; full scans on anything else (Teams, TeamScores...) are fine
+LARGE_TABLES = {
+    'Results', 'ResultRows', 'Meets', 'RelayTeams', 'RelayLegs', 'StaggerHistory', 'StaggerScores', 'AthleteRankings',
+    'Comments', 'BoardPosts', 'Games', 'Plays', 'AthleteBests', 'MeetEventWinners',
+    'RelayLegRows', 'StaggerScoreRows', 'StaggerHistoryRows',
+}
+
+# Substring of the query -> why a scan is unavoidable there
+ALLOWED_SCANS = {
+    "Athlete LIKE": 'substring search on athlete names cannot use a b-tree index',
+}
+
+MEET = 'Plan Invitational'
+ATHLETE = 'Athlete 1'
+TEAM = 'Team 1'
+
+_TABLE_REF = re.compile(r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(?!WHERE|JOIN|ON|INNER|LEFT|GROUP|ORDER|LIMIT)(\w+))?', re.I)
+_LITERAL = re.compile(r"'[^']*'|\b\d+(?:\.\d+)?\b")
+_BAD_STEP = re.compile(r'^(?:SCAN (\w+)$|SEARCH (\w+) USING AUTOMATIC)')
+
+
+def setup_test_db():
+    app.config['DATABASE'] = TEST_DB
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    Database.bootstrap(TEST_DB)
+    conn = sqlite3.connect(TEST_DB)
+    with conn:
+        events = ['100m', '400m', '1500m', 'Long Jump', 'Shot Put', '100 RS']
+        for i in range(600):
+            event = events[i % len(events)]
+            result = f"{5 + (i % 40) / 10:.2f}" if event in ('Long Jump', 'Shot Put') else f"{11 + (i % 90) / 10:.2f}"
+            meet = MEET if i < 200 else f'Meet {i % 5}'
+            conn.execute(
+                'INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team) VALUES (?, ?, ?, ?, ?, ?)',
+                (f'2024-0{1 + i % 6}-1{i % 10}', f'Athlete {i % 40}', meet, event, result, f'Team {i % 4}')
+            )
+        cur = conn.execute("INSERT INTO RelayTeams (Date, Meet_Name, Team, Event, Total_Result) "
+                           "VALUES ('2024-04-10', ?, ?, '4x100m', '44.00')", (MEET, TEAM))
+        for leg in range(1, 5):
+            conn.execute('INSERT INTO RelayLegs (Relay_ID, Leg_Number, Athlete, Split_Event, Split_Result) '
+                         'VALUES (?, ?, ?, ?, ?)', (cur.lastrowid, leg, f'Athlete {leg}', '100m', '11.00'))
+        conn.execute("INSERT INTO StaggerScores (athlete, event, score) VALUES (?, '100m', 1010)", (ATHLETE,))
+        conn.execute("INSERT INTO StaggerHistory (meet_name, event, date, athlete, delta) "
+                     "VALUES (?, '100m', '2024-04-10', ?, 10)", (MEET, ATHLETE))
+        conn.execute("INSERT INTO Comments (page_type, page_id, username, content) VALUES ('meet', ?, 'fan', 'nice')", (MEET,))
+        game = conn.execute("INSERT INTO Games (home_team, away_team, game_date, season_year) "
+                            "VALUES ('Hawks', 'Owls', '2024-09-01', 2024)")
+        for i in range(20):
+            conn.execute("INSERT INTO Plays (game_id, play_type, quarterback, player_name, team, yards) "
+                         "VALUES (?, ?, 'QB One', ?, 'Hawks', ?)",
+                         (game.lastrowid, 'Pass' if i % 2 else 'Rush', f'Player {i % 3}', i))
+    conn.close()
+    return game.lastrowid
+
+
+def teardown_test_db():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def _capture_selects(paths, posts=(), model_calls=()):
+    """Run the paths (and any direct model calls) on one traced connection; return one SELECT per query shape."""
+    statements = []
+    csrf_enabled = app.config.get('WTF_CSRF_ENABLED', True)
+    app.config['WTF_CSRF_ENABLED'] = False
+    try:
+        with app.app_context():
+            conn = Database.get_connection()
+            conn.set_trace_callback(statements.append)
+            # Requests reuse the active app context, so they share the traced connection
+            with app.test_client() as client:
+                for path in paths:
+                    resp = client.get(path)
+                    assert resp.status_code == 200, (path, resp.status_code)
+                for path, data in posts:
+                    resp = client.post(path, data=data)
+                    assert resp.status_code == 200, (path, resp.status_code)
+            for call in model_calls:
+                call()
+            conn.set_trace_callback(None)
+    finally:
+        app.config['WTF_CSRF_ENABLED'] = csrf_enabled
+    shapes = {}
+    for sql in statements:
+        if sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+            shapes.setdefault(_LITERAL.sub('?', sql), sql)
+    return list(shapes.values())
+
+
+def _plan_violations(conn, sql):
+    aliases = {}
+    for table, alias in _TABLE_REF.findall(sql):
+        aliases[table] = table
+        if alias:
+            aliases[alias] = table
+    violations = []
+    for row in conn.execute('EXPLAIN QUERY PLAN ' + sql):
+        match = _BAD_STEP.match(row[3])
+        if not match:
+            continue
+        table = aliases.get(match.group(1) or match.group(2), match.group(1) or match.group(2))
+        if table in LARGE_TABLES:
+            violations.append(row[3])
+    return violations
+
+
+def _assert_indexed(selects):
+    conn = sqlite3.connect(TEST_DB)
+    try:
+        failures = []
+        for sql in selects:
+            if any(marker in sql for marker in ALLOWED_SCANS):
+                continue
+            violations = _plan_violations(conn, sql)
+            if violations:
+                failures.append(f"{violations}: {' '.join(sql.split())[:200]}")
+        assert not failures, 'queries fall back to a full scan:\n' + '\n'.join(failures)
+    finally:
+        conn.close()
+
+
+def test_track_route_query_plans():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        selects = _capture_selects([
+            '/',
+            f'/?page=2&after_date=2024-04-10&after_meet={MEET}&after_event=100m',
+            f'/meet/{MEET}',
+            f'/athlete/{ATHLETE}',
+            f'/get_athlete_bests_since/{ATHLETE}?since=2024-03-01',
+            f'/lookup_team/{ATHLETE}',
+            '/leaderboard',
+            '/leaderboard?event=100m',
+            '/leaderboard?event=100m&best_only=false',
+            '/leaderboard?event=100m&year=last_year',
+            '/leaderboard?event=Long Jump',
+            '/leaderboard?event=100m&sort_by=stagger',
+            '/leaderboard?event=4x100m',
+            '/teams',
+            f'/team/{TEAM}',
+            f'/team/{TEAM}/leaderboard?event=100m',
+            '/meets?year=2024&month=4',
+            '/meets?day=2024-04-13',
+        ], posts=[('/search', {'athlete': 'Athlete'})])
+        assert len(selects) > 10, len(selects)
+        _assert_indexed(selects)
+        print(f"PASS: {len(selects)} track route queries use indexes")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_football_model_query_plans():
+    from football_models import Game, Play
+
+    original_db = app.config['DATABASE']
+    try:
+        game_id = setup_test_db()
+        selects = _capture_selects([], model_calls=[
+            lambda: Game.get_game_info(game_id),
+            lambda: Game.get_team_games('Hawks'),
+            lambda: Game.get_team_record('Hawks', 2024),
+            lambda: Game.get_team_record_alltime('Hawks'),
+            lambda: Game.get_all_games(),
+            lambda: Play.get_game_plays(game_id),
+            lambda: Play.get_game_plays_count(game_id),
+            lambda: Play.get_player_stats('Player 1'),
+            lambda: Play.get_player_stats('QB One'),
+            lambda: Play.get_player_game_log('Player 1'),
+            lambda: Play.get_team_players('Hawks'),
+            lambda: Play.get_game_player_stats(game_id),
+        ])
+        _assert_indexed(selects)
+        print(f"PASS: {len(selects)} football model queries use indexes")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+if __name__ == '__main__':
+    test_track_route_query_plans()
+    test_football_model_query_plans()
+    print("\n=== All tests passed ===")
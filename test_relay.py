@@ -8,7 +8,7 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from wavelight import app
-from models import Database, RelayTeam
+from models import Database, RelayTeam, Event
 
 TEST_DB = 'test_relay.db'
 
@@ -25,10 +25,8 @@ def setup_test_db():
             except PermissionError:
                 import time
                 time.sleep(0.05)
-    # Force table creation by getting a connection
-    conn = Database.get_connection()
-    conn.commit()
-    conn.close()
+    # Schema is bootstrapped once per path; force it since the file was just removed
+    Database.bootstrap(TEST_DB)
 
 def teardown_test_db():
     import sqlite3, time
@@ -41,13 +39,17 @@ def teardown_test_db():
             time.sleep(0.05)
 
 def test_relay_config():
-    assert '4x100m' in RelayTeam.RELAY_CONFIG
-    assert RelayTeam.RELAY_CONFIG['4x100m'] == ['100m', '100m', '100m', '100m']
-    assert 'DMR' in RelayTeam.RELAY_CONFIG
-    assert RelayTeam.RELAY_CONFIG['DMR'] == ['1200m', '400m', '800m', '1600m']
-    assert 'SMR' in RelayTeam.RELAY_CONFIG
-    assert RelayTeam.RELAY_CONFIG['SMR'] == ['400m', '200m', '200m', '800m']
-    print("PASS: relay configuration")
+    with app.app_context():
+        setup_test_db()
+        try:
+            relay_config = Event.relay_config()
+            assert relay_config['4x100m'] == ['100m', '100m', '100m', '100m']
+            assert relay_config['DMR'] == ['1200m', '400m', '800m', '1600m']
+            assert relay_config['SMR'] == ['400m', '200m', '200m', '800m']
+            assert Event.is_relay('4x400m') and not Event.is_relay('400m')
+            print("PASS: relay configuration")
+        finally:
+            teardown_test_db()
 
 def test_insert_relay():
     with app.app_context():
@@ -100,7 +102,6 @@ def test_insert_relay():
                 assert len(rows) == 1
                 assert rows[0][1] == '1200m RS'
                 assert rows[0][2] == '3:45.00'
-            conn.close()
             print("PASS: backward-compat Results inserted")
         finally:
             teardown_test_db()
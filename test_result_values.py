@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Tests for the canonical result parser and the persisted Result_Value/Result_Kind columns."""
+
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import migrations
+from wavelight import app
+from models import Database, Result, RelayTeam
+from utils.result_values import parse_result, KIND_TIME, KIND_FT_IN, KIND_METRIC
+
+TEST_DB = 'test_result_values.db'
+
+
+def setup_test_db():
+    app.config['DATABASE'] = TEST_DB
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    Database.bootstrap(TEST_DB)
+
+
+def teardown_test_db():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def test_parse_result():
+    assert parse_result('1:52.34', '800m') == (112.34, KIND_TIME)
+    assert parse_result('58.1', '400m') == (58.1, KIND_TIME)
+    assert parse_result('10.51q', '100m') == (10.51, KIND_TIME)
+    assert parse_result('2:15:00', 'Marathon') == (8100.0, KIND_TIME)
+    assert parse_result('17\'6"', 'Long Jump') == (5.334, KIND_FT_IN)
+    assert parse_result('17’ 6”', 'Long Jump') == (5.334, KIND_FT_IN)
+    assert parse_result('5.33', 'Long Jump') == (5.33, KIND_METRIC)
+    assert parse_result('DNF', '100m') == (None, None)
+    assert parse_result('', '100m') == (None, None)
+    # "1:52.34" used to sort ahead of "58.1" once the colon was stripped
+    assert parse_result('58.1', '400m')[0] < parse_result('1:52.34', '800m')[0]
+    print("PASS: parse_result")
+
+
+def test_values_persisted_on_write():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.app_context():
+            Result.insert_result({'date': '2024-04-20', 'athlete': 'Alice', 'meet': 'Spring Open',
+                                  'event': 'Long Jump', 'result': '18\'2"', 'team': 'Team A'})
+            RelayTeam.insert_relay({'date': '2024-04-20', 'meet': 'Spring Open', 'team': 'Team A', 'event': '4x100m'},
+                                   [{'athlete': f'R{i}', 'split_result': '11.50'} for i in range(4)])
+        conn = sqlite3.connect(TEST_DB)
+        value, kind = conn.execute("SELECT Result_Value, Result_Kind FROM Results WHERE Athlete = 'Alice'").fetchone()
+        assert kind == KIND_FT_IN and abs(value - 5.5372) < 1e-4
+        legs = conn.execute('SELECT Split_Value, Split_Kind FROM RelayLegs').fetchall()
+        assert legs == [(11.5, KIND_TIME)] * 4
+        conn.close()
+        print("PASS: values persisted on insert")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_migration_backfills_existing_rows():
+    teardown_test_db()
+    try:
+        conn = sqlite3.connect(TEST_DB)
+        migrations.migrate(conn, target=5)
+        conn.executemany('INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team) VALUES (?, ?, ?, ?, ?, ?)', [
+            ('2024-04-20', 'Alice', 'Old Meet', '800m', '2:01.50', 'Team A'),
+            ('2024-04-20', 'Bea', 'Old Meet', 'Shot Put', '12.10', 'Team A'),
+            ('2024-04-20', 'Cy', 'Old Meet', '800m', 'DQ', 'Team A'),
+        ])
+        conn.commit()
+        migrations.migrate(conn)
+        rows = dict((a, (v, k)) for a, v, k in conn.execute('SELECT Athlete, Result_Value, Result_Kind FROM Results'))
+        assert rows == {'Alice': (121.5, KIND_TIME), 'Bea': (12.1, KIND_METRIC), 'Cy': (None, None)}
+        conn.close()
+        print("PASS: migration backfills Result_Value")
+    finally:
+        teardown_test_db()
+
+
+def test_leaderboard_orders_by_value():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.app_context():
+            for athlete, result in [('Slow', '1:05.00'), ('Fast', '58.10'), ('Mid', '59.99'), ('Out', 'DNF')]:
+                Result.insert_result({'date': '2024-04-20', 'athlete': athlete, 'meet': 'Spring Open',
+                                      'event': '400m', 'result': result, 'team': 'Team A'})
+            for athlete, result in [('Short', '17\'11"'), ('Long', '18\'2"'), ('Metric', '5.60')]:
+                Result.insert_result({'date': '2024-04-20', 'athlete': athlete, 'meet': 'Spring Open',
+                                      'event': 'Long Jump', 'result': result, 'team': 'Team A'})
+        with app.test_client() as client:
+            body = client.get('/leaderboard?event=400m').get_data(as_text=True)
+            assert body.index('Fast') < body.index('Mid') < body.index('Slow')
+            assert 'Out' not in body.split('<tbody')[-1]
+            body = client.get('/leaderboard?event=Long Jump').get_data(as_text=True)
+            # 5.60m beats 18'2" (5.54m) beats 17'11"
+            assert body.index('Metric') < body.index('>Long<') < body.index('Short')
+        print("PASS: leaderboard ordered by Result_Value")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_best_only_leaderboard_one_row_per_athlete():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        recent = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+        with app.app_context():
+            for date, athlete, result in [('2024-04-20', 'Fast', '58.10'), (recent, 'Fast', '60.00'),
+                                          (recent, 'Mid', '59.99'), ('2024-04-20', 'Mid', '61.00')]:
+                Result.insert_result({'date': date, 'athlete': athlete, 'meet': 'Spring Open',
+                                      'event': '400m', 'result': result, 'team': 'Team A'})
+        with app.test_client() as client:
+            body = client.get('/leaderboard?event=400m').get_data(as_text=True).split('<tbody')[-1]
+            assert '58.10' in body and '59.99' in body and '60.00' not in body and '61.00' not in body
+            assert body.index('58.10') < body.index('59.99')
+            # Within the last year Fast's best is the 60.00
+            body = client.get('/leaderboard?event=400m&year=last_year').get_data(as_text=True).split('<tbody')[-1]
+            assert '58.10' not in body and body.index('59.99') < body.index('60.00')
+            body = client.get('/leaderboard?event=400m&best_only=false').get_data(as_text=True).split('<tbody')[-1]
+            assert all(result in body for result in ('58.10', '59.99', '60.00', '61.00'))
+        print("PASS: best-only leaderboard keeps each athlete's best, with and without the year filter")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+if __name__ == '__main__':
+    test_parse_result()
+    test_values_persisted_on_write()
+    test_migration_backfills_existing_rows()
+    test_leaderboard_orders_by_value()
+    test_best_only_leaderboard_one_row_per_athlete()
+    print("\n=== All tests passed ===")
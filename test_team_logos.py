@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Tests for the process-wide team logo cache and its Counters version check."""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wavelight import app
+from models import Database, Result, Team
+from utils.instrumentation import capture_requests
+
+TEST_DB = 'test_team_logos.db'
+MEET = 'Logo Invitational'
+
+
+def setup_test_db():
+    app.config['DATABASE'] = TEST_DB
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    Database.bootstrap(TEST_DB)
+    with app.app_context():
+        for athlete, team in [('Alice', 'Team A'), ('Bob', 'Team B')]:
+            Result.insert_result({'date': '2024-04-20', 'athlete': athlete, 'meet': MEET,
+                                  'event': '100m', 'result': '12.00', 'team': team})
+        Team.update_team_logo('Team A', 'https://example.com/a.png')
+
+
+def teardown_test_db():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def _teams_reads(captured):
+    return sum(1 for _, stats in captured for sql in stats.statements if 'FROM Teams' in sql)
+
+
+def test_logos_served_from_cache():
+    original_db = app.config['DATABASE']
+    try:
+        setup_test_db()
+        with app.app_context():
+            assert Team.logos(['Team A', 'Team B', 'Nobody']) == {
+                'Team A': 'https://example.com/a.png', 'Team B': None, 'Nobody': None}
+            assert set(Team.logos()) == {'Team A', 'Team B'}
+        with app.test_client() as client, capture_requests() as captured:
+            for path in ('/', '/teams', f'/meet/{MEET}', '/football/'):
+                assert client.get(path).status_code == 200, path
+        assert _teams_reads(captured) == 0, captured
+        print("PASS: team logos served from the cache")
+    finally:
+        app.config['DATABASE'] = original_db
+        teardown_test_db()
+
+
+def test_logo_writes_invalidate():
+    original_db = app.config['DATABASE']
+    csrf_enabled = app.config.get('WTF_CSRF_ENABLED', True)
+    app.config['WTF_CSRF_ENABLED'] = False
+    try:
+        setup_test_db()
+        with app.test_client() as client:
+            client.post('/team/Team B/update_logo', data={'logo_url': 'https://example.com/b.png'})
+            assert 'https://example.com/b.png' in client.get(f'/meet/{MEET}').get_data(as_text=True)
+
+            # A write from another process only shows up through the version counter
+            conn = sqlite3.connect(TEST_DB)
+            with conn:
+                conn.execute("UPDATE Teams SET logo_url = 'https://example.com/a2.png' WHERE team_name = 'Team A'")
+            conn.close()
+            html = client.get(f'/meet/{MEET}').get_data(as_text=True)
+            assert 'https://example.com/a2.png' in html
+            assert 'https://example.com/a.png' not in html
+        print("PASS: logo writes from this or another process invalidate the cache")
+    finally:
+        app.config['DATABASE'] = original_db
+        app.config['WTF_CSRF_ENABLED'] = csrf_enabled
+        teardown_test_db()
+
+
+if __name__ == '__main__':
+    test_logos_served_from_cache()
+    test_logo_writes_invalidate()
+    print("\n=== All tests passed ===")
@@ -0,0 +1,65 @@
+"""AthleteBests: one row per (athlete, event) holding the best result and the result count.
+
+The table is derived from Results. Write paths call refresh() with the (athlete, event)
+pairs they touched, on their own cursor, so it commits or rolls back with the write;
+rebuild() recomputes it from scratch and is safe to re-run.
+
+    python -m utils.athlete_bests --db track.db
+"""
+import argparse
+import sqlite3
+
+from utils.result_values import best_first
+
+# Best first: parseable before unparseable, in the event's registered direction, then earliest
+_BEST_ORDER = f'''Result_Value IS NULL, (Result IS NULL OR Result = ''),
+                 {best_first()},
+                 Date, Result_ID'''
+
+_SELECT_BESTS = f'''
+    SELECT Athlete, Event, Result_Value, Result, Result_ID, Date, n FROM (
+        SELECT Athlete, Event, Result_Value, Result, Result_ID, Date,
+               COUNT(*) OVER (PARTITION BY Athlete, Event) AS n,
+               ROW_NUMBER() OVER (PARTITION BY Athlete, Event ORDER BY {_BEST_ORDER}) AS rn
+        FROM Results
+        JOIN Events ON Events.event_id = Results.Event_ID
+        WHERE {{where}}
+    )
+    WHERE rn = 1
+'''
+
+_INSERT = 'INSERT INTO AthleteBests (athlete, event, best_value, result, result_id, date, result_count) '
+
+
+def refresh(cur, pairs):
+    """Recompute the AthleteBests rows for the given (athlete, event) pairs."""
+    pairs = {(athlete, event) for athlete, event in pairs if athlete and event}
+    if not pairs:
+        return
+    cur.executemany('DELETE FROM AthleteBests WHERE athlete = ? AND event = ?', pairs)
+    cur.executemany(_INSERT + _SELECT_BESTS.format(where='Athlete = ? AND Event = ?'), pairs)
+
+
+def rebuild(cur):
+    """Recompute every AthleteBests row from Results. Returns the number of rows written."""
+    cur.execute('DELETE FROM AthleteBests')
+    cur.execute(_INSERT + _SELECT_BESTS.format(where='Athlete IS NOT NULL AND Event IS NOT NULL'))
+    return cur.rowcount
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild the AthleteBests table from Results.')
+    parser.add_argument('--db', default='track.db', help='path to the sqlite database (default: track.db)')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db, timeout=30)
+    try:
+        with conn:
+            count = rebuild(conn.cursor())
+        print(f'{args.db}: rebuilt {count} athlete bests')
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
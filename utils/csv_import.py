@@ -0,0 +1,203 @@
+"""Streaming, resumable import of a results CSV (Date, Athlete, Meet, Event, Result, Team).
+
+The file is read through a generator and handled in chunks: each chunk is normalized,
+de-duplicated against an in-memory key set, written with one executemany and committed
+together with its AthleteBests/MeetEventWinners refresh and the ImportCheckpoints row. An
+interrupted import re-run on the same unchanged file resumes after the last committed chunk.
+
+    python -m utils.csv_import results_csv.csv --db track.db
+"""
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from itertools import islice
+
+import migrations
+from db_normalization import SPRINT_EVENTS
+from utils.result_values import parse_result, load_event_aliases, load_time_events
+from utils import athlete_bests, meet_cache, meet_winners
+
+DEFAULT_CHUNK_SIZE = 5000
+
+_DECIMAL_RESULT = re.compile(r'^[\d:]*\.\d*$')
+
+_INSERT = ('INSERT INTO Results (Date, Athlete, Meet_Name, Event, Result, Team, Result_Value, Result_Kind) '
+           'VALUES (?, ?, ?, ?, ?, ?, ?, ?)')
+
+
+class ImportStats:
+    def __init__(self):
+        self.read = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.resumed_from = 0
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+    def report(self):
+        resumed = f' (resumed after row {self.resumed_from})' if self.resumed_from else ''
+        return (f'read {self.read} rows{resumed}: {self.inserted} inserted, {self.duplicates} duplicates, '
+                f'{self.invalid} invalid in {self.elapsed:.1f}s ({self.rows_per_second:,.0f} rows/s)')
+
+
+def normalize_date(value):
+    """MM/DD/YYYY (or already ISO) to YYYY-MM-DD; blank means today. None if unparseable."""
+    value = value.strip()
+    if not value:
+        return datetime.today().strftime('%Y-%m-%d')
+    for fmt in ('%m/%d/%Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(value, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return None
+
+
+def normalize_result(value):
+    """Drop leading zeros ("02:05.3" -> "2:05.30") and pad/truncate plain decimals to two places."""
+    value = re.sub(r'^0+(?=\d)', '', value.strip())
+    if _DECIMAL_RESULT.match(value):
+        value = (value + '00')[:value.index('.') + 3]
+    return value
+
+
+def read_rows(path, skip=0):
+    """Yield data rows of the CSV after the header, skipping the first skip of them."""
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        yield from islice(reader, skip, None)
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def fingerprint(path):
+    """Size and mtime: enough to notice the source file was replaced between runs."""
+    st = os.stat(path)
+    return f'{st.st_size}:{int(st.st_mtime)}'
+
+
+def load_existing(cur):
+    """Duplicate keys (athlete, meet, event, team) and each athlete's most recent team."""
+    seen, teams = set(), {}
+    cur.execute('SELECT Athlete, Meet_Name, Event, Team FROM Results ORDER BY Date')
+    for athlete, meet, event, team in cur:
+        seen.add((athlete, meet, event, team))
+        if team:
+            teams[athlete] = team
+    return seen, teams
+
+
+def normalize_chunk(chunk, seen, teams, time_events, aliases, stats):
+    """Turn raw CSV rows into Results insert tuples, updating seen/teams as rows are accepted.
+
+    Event aliases (HJ, Shot, ...) are stored under their registered name, as Result.insert_result does.
+    """
+    values = []
+    # A chunk holds a handful of distinct dates; parse each once
+    dates = {raw: normalize_date(raw) for raw in {row[0] for row in chunk if row}}
+    for row in chunk:
+        if len(row) < 6 or not any(field.strip() for field in row):
+            stats.invalid += 1
+            continue
+        date = dates[row[0]]
+        athlete, meet, event = row[1].strip(), row[2].strip(), row[3].strip()
+        event = aliases.get(event, event)
+        result = normalize_result(row[4])
+        if date is None or not (athlete and meet and event and result):
+            stats.invalid += 1
+            continue
+        if event in SPRINT_EVENTS and ':' in result:
+            stats.invalid += 1
+            continue
+        # Slashes in team names break the team page URLs
+        team = row[5].strip().replace('/', ' ') or teams.get(athlete, '')
+        key = (athlete, meet, event, team)
+        if key in seen:
+            stats.duplicates += 1
+            continue
+        seen.add(key)
+        if team:
+            teams[athlete] = team
+        values.append((date, athlete, meet, event, result, team,
+                       *parse_result(result, event, time_event=time_events.get(event))))
+    return values
+
+
+def import_csv(conn, path, chunk_size=DEFAULT_CHUNK_SIZE, restart=False, progress=None):
+    """Import path into conn's Results table, resuming from its checkpoint unless restart. Returns ImportStats."""
+    started = time.perf_counter()
+    stats = ImportStats()
+    source = os.path.abspath(path)
+    current = fingerprint(path)
+    cur = conn.cursor()
+
+    cur.execute('SELECT fingerprint, rows_done, inserted FROM ImportCheckpoints WHERE source = ?', (source,))
+    checkpoint = cur.fetchone()
+    if checkpoint and not restart and checkpoint[0] == current:
+        stats.resumed_from, stats.inserted = checkpoint[1], checkpoint[2]
+
+    seen, teams = load_existing(cur)
+    time_events = load_time_events(cur)
+    aliases = load_event_aliases(cur)
+    rows_done = stats.resumed_from
+    for chunk in chunked(read_rows(path, skip=stats.resumed_from), chunk_size):
+        values = normalize_chunk(chunk, seen, teams, time_events, aliases, stats)
+        rows_done += len(chunk)
+        stats.read += len(chunk)
+        with conn:
+            with meet_cache.deferred_versions(cur):
+                cur.executemany(_INSERT, values)
+            athlete_bests.refresh(cur, [(v[1], v[3]) for v in values])
+            meet_winners.refresh(cur, [(v[2], v[3]) for v in values])
+            stats.inserted += len(values)
+            cur.execute('INSERT OR REPLACE INTO ImportCheckpoints (source, fingerprint, rows_done, inserted, updated_at) '
+                        'VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)', (source, current, rows_done, stats.inserted))
+        if progress:
+            stats.elapsed = time.perf_counter() - started
+            progress(stats)
+
+    with conn:
+        cur.execute('DELETE FROM ImportCheckpoints WHERE source = ?', (source,))
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import a results CSV (Date, Athlete, Meet, Event, Result, Team).')
+    parser.add_argument('csv', help='path to the CSV export')
+    parser.add_argument('--db', default='track.db', help='path to the sqlite database (default: track.db)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'rows per transaction (default: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--restart', action='store_true', help='ignore any checkpoint and start from the first row')
+    parser.add_argument('--quiet', action='store_true', help='only print the final report')
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db, timeout=30)
+    try:
+        migrations.migrate(conn)
+        progress = None if args.quiet else lambda stats: print(stats.report(), file=sys.stderr)
+        stats = import_csv(conn, args.csv, chunk_size=args.chunk_size, restart=args.restart, progress=progress)
+        print(f'{args.csv}: {stats.report()}')
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,5 @@
 """Parse and compare field event results (e.g. 17'6" = 17 ft 6 in). Bigger is better."""
-import re
+from utils.result_values import parse_result
 
 # Unicode alternatives for feet (') and inches (") so pasted/copy data still parses
 _FEET_CHARS = "'\u2019\u2032\u00b4"   # ASCII apostrophe, right single quote, prime, acute
@@ -19,16 +19,6 @@ def _normalize_quotes(s):
     return s
 
 
-def _strip_result_suffix(s):
-    """Strip trailing letters (e.g. q, w) from result strings for parsing."""
-    if not s or not isinstance(s, str):
-        return s
-    s = s.strip()
-    while s and s[-1].isalpha():
-        s = s[:-1]
-    return s.strip()
-
-
 def parse_field_result(result_str):
     """
     Parse a field result string into a numeric value for comparison (bigger = better).
@@ -36,24 +26,13 @@ def parse_field_result(result_str):
       - Feet and inches: 17'6", 17'6, 17' 6" (and Unicode quote variants)
       - Decimal (e.g. meters): 17.5
     Trailing letters (q, w, etc.) are stripped before parsing.
-    Returns total inches for ft-in, or the decimal value. Unparseable returns -1 (sorts last).
+    Returns meters for ft-in (so it compares with metric marks), or the decimal value.
+    Unparseable returns -1 (sorts last). See utils.result_values.parse_result.
     """
     if result_str is None or not isinstance(result_str, str):
         return -1.0
-    s = _strip_result_suffix(result_str)
-    if not s:
-        return -1.0
-    s = _normalize_quotes(s)
-    # Match feet'inches" or feet'inches: e.g. 17'6", 17'6, 17' 6"
-    m = re.match(r"(\d+)\s*'\s*(\d+)\s*\"?", s)
-    if m:
-        feet = int(m.group(1))
-        inches = int(m.group(2))
-        return float(feet * 12 + inches)
-    try:
-        return float(s)
-    except (ValueError, TypeError):
-        return -1.0
+    value, _ = parse_result(result_str)
+    return -1.0 if value is None else value
 
 
 def looks_like_field_result(result_str):
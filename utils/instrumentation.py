@@ -0,0 +1,318 @@
+"""Per-request SQL instrumentation for the shared sqlite connection.
+
+Database.get_connection() opens its connection with InstrumentedConnection, whose cursors
+time every statement (execute plus the fetches that drain it) into the current request's
+RequestStats. init_app() wires the request hooks:
+
+* a Server-Timing header (`db;dur=..;desc="N queries", app;dur=..`) on every response,
+* a JSONL line in SLOW_QUERY_LOG for each statement at or over SLOW_QUERY_MS,
+* process-wide per-endpoint totals, shown on /debug/perf (routes/debug_routes.py).
+
+Tests use query_budget() to fail when a request issues more statements than it should;
+requests made inside capture_requests() are instrumented even while SQL_INSTRUMENTATION is off.
+
+Config: SQL_INSTRUMENTATION (default False), SLOW_QUERY_MS (default 200),
+SLOW_QUERY_LOG (path, default None = no log file), SLOWEST_PER_REQUEST (default 5).
+"""
+import heapq
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from flask import current_app, g, has_app_context, has_request_context, request
+
+# endpoint -> {'requests', 'queries', 'db_ms', 'wall_ms', 'max_db_ms'}
+_endpoint_totals = {}
+# (ms, endpoint, sql, params) of the slowest statements since start-up, smallest first
+_slowest = []
+_SLOWEST_KEPT = 20
+_lock = threading.Lock()
+# Lists receiving (endpoint, RequestStats) for each finished request, see capture_requests()
+_captures = []
+
+
+class RequestStats:
+    def __init__(self, keep):
+        self.queries = 0
+        self.db_time = 0.0
+        self.keep = keep
+        self.slowest = []  # min-heap of (seconds, seq, sql, params)
+        self.pending = set()
+        self.started = time.perf_counter()
+        self.statements = None  # every SQL string, only while capture_requests() is active
+
+    def add(self, sql, params, seconds):
+        self.queries += 1
+        self.db_time += seconds
+        if self.statements is not None:
+            self.statements.append(sql)
+        entry = (seconds, self.queries, sql, params)
+        if len(self.slowest) < self.keep:
+            heapq.heappush(self.slowest, entry)
+        elif self.slowest and seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def finish(self):
+        for cursor in list(self.pending):
+            cursor._finish_statement()
+        return sorted(self.slowest, reverse=True)
+
+
+def _current_stats():
+    return g.get('_sql_stats') if has_app_context() else None
+
+
+def _jsonable(params):
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {key: _jsonable_value(value) for key, value in params.items()}
+    return [_jsonable_value(value) for value in params]
+
+
+def _jsonable_value(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f'<{len(value)} bytes>'
+    return value
+
+
+def _log_slow(sql, params, seconds):
+    threshold = current_app.config.get('SLOW_QUERY_MS', 200)
+    path = current_app.config.get('SLOW_QUERY_LOG')
+    ms = seconds * 1000
+    if not path or ms < threshold:
+        return
+    line = json.dumps({
+        'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+        'endpoint': request.endpoint,
+        'path': request.full_path,
+        'ms': round(ms, 3),
+        'sql': ' '.join(sql.split()),
+        'params': _jsonable(params),
+    }, default=str)
+    with _lock:
+        with open(path, 'a') as f:
+            f.write(line + '\n')
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that charges execute and fetch time to the statement it is running."""
+
+    _statement = None  # [sql, params, seconds] of the statement not yet recorded
+
+    def _begin_statement(self, sql, params):
+        self._finish_statement()
+        stats = _current_stats()
+        if stats is not None:
+            self._statement = [sql, params, 0.0]
+            stats.pending.add(self)
+        return stats
+
+    def _charge(self, started):
+        if self._statement is not None:
+            self._statement[2] += time.perf_counter() - started
+
+    def _finish_statement(self):
+        statement, self._statement = self._statement, None
+        if statement is None:
+            return
+        stats = _current_stats()
+        if stats is None:
+            return
+        stats.pending.discard(self)
+        sql, params, seconds = statement
+        stats.add(sql, params, seconds)
+        if has_request_context():
+            _log_slow(sql, params, seconds)
+
+    def execute(self, sql, parameters=()):
+        self._begin_statement(sql, parameters)
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._charge(started)
+
+    def executemany(self, sql, seq_of_parameters):
+        # The parameter rows may be a one-shot generator; log only the statement
+        self._begin_statement(sql, None)
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._charge(started)
+            self._finish_statement()
+
+    def executescript(self, sql_script):
+        self._begin_statement(sql_script, None)
+        started = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            self._charge(started)
+            self._finish_statement()
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._charge(started)
+        if row is None:
+            self._finish_statement()
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._charge(started)
+        if not rows:
+            self._finish_statement()
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._charge(started)
+        self._finish_statement()
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            return super().__next__()
+        except StopIteration:
+            self._finish_statement()
+            raise
+        finally:
+            self._charge(started)
+
+    def close(self):
+        self._finish_statement()
+        super().close()
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """sqlite3 connection whose cursors (including conn.execute shortcuts) are InstrumentedCursors."""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def connection_factory():
+    """Connection class for Database.get_connection() under the current app's config."""
+    if current_app.config.get('SQL_INSTRUMENTATION', False) or _captures:
+        return InstrumentedConnection
+    return sqlite3.Connection
+
+
+def _before_request():
+    if current_app.config.get('SQL_INSTRUMENTATION', False) or _captures:
+        g._sql_stats = RequestStats(current_app.config.get('SLOWEST_PER_REQUEST', 5))
+        if _captures:
+            g._sql_stats.statements = []
+
+
+def _after_request(response):
+    stats = g.get('_sql_stats')
+    if stats is None:
+        return response
+    # Record statements whose cursors were never drained before detaching the stats
+    slowest = stats.finish()
+    g.pop('_sql_stats')
+    db_ms = stats.db_time * 1000
+    wall_ms = (time.perf_counter() - stats.started) * 1000
+    response.headers['Server-Timing'] = (
+        f'db;dur={db_ms:.2f};desc="{stats.queries} queries", app;dur={wall_ms:.2f}'
+    )
+    endpoint = request.endpoint or request.path
+    for captured in _captures:
+        captured.append((endpoint, stats))
+    with _lock:
+        totals = _endpoint_totals.setdefault(
+            endpoint, {'requests': 0, 'queries': 0, 'db_ms': 0.0, 'wall_ms': 0.0, 'max_db_ms': 0.0})
+        totals['requests'] += 1
+        totals['queries'] += stats.queries
+        totals['db_ms'] += db_ms
+        totals['wall_ms'] += wall_ms
+        totals['max_db_ms'] = max(totals['max_db_ms'], db_ms)
+        for seconds, _, sql, params in slowest:
+            entry = (seconds * 1000, endpoint, ' '.join(sql.split()), repr(params))
+            if len(_slowest) < _SLOWEST_KEPT:
+                heapq.heappush(_slowest, entry)
+            elif entry[0] > _slowest[0][0]:
+                heapq.heapreplace(_slowest, entry)
+    return response
+
+
+def endpoint_report(limit=25):
+    """Per-endpoint totals sorted by total DB time, plus the slowest statements seen."""
+    with _lock:
+        endpoints = [dict(endpoint=name, **totals) for name, totals in _endpoint_totals.items()]
+        slowest = sorted(_slowest, reverse=True)
+    endpoints.sort(key=lambda row: row['db_ms'], reverse=True)
+    for row in endpoints:
+        row['avg_queries'] = row['queries'] / row['requests']
+        row['avg_db_ms'] = row['db_ms'] / row['requests']
+        row['avg_wall_ms'] = row['wall_ms'] / row['requests']
+    return endpoints[:limit], slowest
+
+
+@contextmanager
+def capture_requests():
+    """Collect (endpoint, RequestStats) for every request finished inside the block.
+
+    Captures are process-wide; meant for the test client, not a server under load.
+    """
+    captured = []
+    _captures.append(captured)
+    try:
+        yield captured
+    finally:
+        _captures.remove(captured)
+
+
+@contextmanager
+def query_budget(max_queries):
+    """Fail with AssertionError if any request made inside the block issues more than max_queries statements.
+
+        with query_budget(25):
+            client.get('/meet/Spring Open')
+
+    The message lists the most repeated statements, which is usually where the N+1 is.
+    """
+    with capture_requests() as captured:
+        yield captured
+    over = [(endpoint, stats) for endpoint, stats in captured if stats.queries > max_queries]
+    if over:
+        lines = []
+        for endpoint, stats in over:
+            lines.append(f'{endpoint}: {stats.queries} queries (budget {max_queries})')
+            repeated = Counter(' '.join(sql.split()) for sql in stats.statements)
+            for sql, count in repeated.most_common(5):
+                lines.append(f'  {count}x {sql[:160]}')
+        raise AssertionError('query budget exceeded:\n' + '\n'.join(lines))
+
+
+def reset():
+    """Forget the per-endpoint totals and slowest statements (tests, or after a deploy)."""
+    with _lock:
+        _endpoint_totals.clear()
+        _slowest.clear()
+
+
+def init_app(app):
+    """Register the request hooks that collect stats and set the Server-Timing header."""
+    app.before_request(_before_request)
+    app.after_request(_after_request)
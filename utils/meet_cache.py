@@ -0,0 +1,193 @@
+"""Cache of computed meet page view-models, keyed by meet and Meets.version.
+
+The meet page's view-model (grouped events, relays, places, rankings, stagger, comments
+and board posts; see routes.meet_routes._meet_view) is stored together with the meet's
+version. Triggers added in migration 14 move the version on every write the page could
+show: results, relays, stagger, team scores, rankings, comments and board posts, plus
+results and stagger scores at other meets that change this meet's PR/debut flags or
+current scores. So a stored view-model is valid exactly while the version is unchanged,
+and nothing has to be invalidated by hand. Bulk imports wrap their inserts in
+deferred_versions() to make those bumps once per batch rather than once per row.
+
+Backends (config MEET_CACHE):
+
+* 'memory'  per-process LRU of MEET_CACHE_SIZE entries (default),
+* 'sqlite'  a file at MEET_CACHE_PATH shared by every worker process on the host;
+            values are pickled, so the file must only be writable by the app,
+* None/'off' no caching.
+"""
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from flask import current_app
+
+BACKENDS = ('memory', 'sqlite')
+
+
+class MemoryBackend:
+    """Thread-safe LRU of {key: (version, value)} in this process."""
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, version, value):
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteBackend:
+    """{key: (version, pickled value)} in a SQLite file that several processes can share.
+
+    One row per meet: a newer version replaces the row, and past max_entries the entries
+    stored longest ago are dropped. Each thread keeps its own connection.
+    """
+
+    def __init__(self, path, max_entries=1000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS meet_views (
+                    key TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL,
+                    value BLOB NOT NULL,
+                    stored_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_meet_views_stored ON meet_views(stored_at)')
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._connect().execute('SELECT version, value FROM meet_views WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        return row[0], pickle.loads(row[1])
+
+    def set(self, key, version, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO meet_views (key, version, value, stored_at) VALUES (?, ?, ?, ?)',
+                         (key, version, blob, time.time()))
+            conn.execute('''
+                DELETE FROM meet_views WHERE stored_at < (
+                    SELECT stored_at FROM meet_views ORDER BY stored_at DESC LIMIT 1 OFFSET ?
+                )
+            ''', (self.max_entries - 1,))
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM meet_views')
+
+
+# (backend name, size, path) -> backend, so config changes (tests) pick up a fresh one
+_backends = {}
+_backends_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def backend():
+    """The configured backend, or None when MEET_CACHE is off."""
+    config = current_app.config
+    name = config.get('MEET_CACHE')
+    if name not in BACKENDS:
+        return None
+    size = config.get('MEET_CACHE_SIZE', 128)
+    path = os.path.abspath(config.get('MEET_CACHE_PATH', 'meet_cache.db')) if name == 'sqlite' else None
+    spec = (name, size, path)
+    with _backends_lock:
+        cache = _backends.get(spec)
+        if cache is None:
+            cache = MemoryBackend(size) if name == 'memory' else SQLiteBackend(path, size)
+            _backends[spec] = cache
+    return cache
+
+
+def get_or_build(meet_name, version, build):
+    """The view-model stored for (meet_name, version), or build() stored under it.
+
+    Read version before building: a write that lands during build() then leaves the
+    entry one version behind, so it is rebuilt next time instead of served stale.
+    A version of None (no Meets row) is never cached.
+    """
+    cache = backend()
+    if cache is None or version is None:
+        return build()
+    key = json.dumps([os.path.abspath(current_app.config['DATABASE']), meet_name])
+    entry = cache.get(key)
+    if entry is not None and entry[0] == version:
+        _stats['hits'] += 1
+        return entry[1]
+    _stats['misses'] += 1
+    value = build()
+    cache.set(key, version, value)
+    return value
+
+
+def stats():
+    """{'hits', 'misses'} since the last reset()."""
+    return dict(_stats)
+
+
+def reset():
+    """Empty every backend created by this process and zero the hit counters."""
+    with _backends_lock:
+        for cache in _backends.values():
+            cache.clear()
+    _stats.update(hits=0, misses=0)
+
+
+@contextmanager
+def deferred_versions(cur):
+    """Bump meet versions once for the rows inserted into Results inside the block.
+
+    Bulk write paths use this inside their transaction: the per-row insert trigger is
+    skipped (migration 20) and, on the way out, every meet where a new row's athlete has
+    run the same event gets one new version, which is what the trigger would have done
+    row by row.
+    """
+    cur.execute('SELECT COALESCE(MAX(Result_ID), 0) FROM ResultRows')
+    before = cur.fetchone()[0]
+    cur.execute("UPDATE Counters SET value = 1 WHERE name = 'meet_versions_deferred'")
+    try:
+        yield
+    finally:
+        cur.execute("UPDATE Counters SET value = 0 WHERE name = 'meet_versions_deferred'")
+    cur.execute("UPDATE Counters SET value = value + 1 WHERE name = 'meet_version'")
+    cur.execute('''
+        UPDATE Meets SET version = (SELECT value FROM Counters WHERE name = 'meet_version')
+        WHERE meet_id IN (
+            SELECT r.Meet_ID
+            FROM (SELECT DISTINCT Athlete_ID, Event_ID FROM ResultRows WHERE Result_ID > ?) n
+            JOIN ResultRows r ON r.Athlete_ID = n.Athlete_ID AND r.Event_ID = n.Event_ID
+        )
+    ''', (before,))
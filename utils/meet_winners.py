@@ -0,0 +1,74 @@
+"""MeetEventWinners: the winning result of every (meet, event), feeding the home page.
+
+Derived from Results like AthleteBests (utils.athlete_bests): write paths call refresh()
+with the (meet, event) pairs they touched, on their own cursor, and the row count is kept
+in Counters under WINNERS_COUNTER so the feed never has to COUNT the table.
+
+    python -m utils.meet_winners --db track.db
+"""
+import argparse
+import sqlite3
+
+from utils.result_values import best_first
+
+WINNERS_COUNTER = 'meet_event_winners'
+
+_SELECT_WINNERS = f'''
+    SELECT Meet_Name, Event, formatted_date, Athlete, Result, Team, Result_ID FROM (
+        SELECT Meet_Name, Event, strftime('%Y-%m-%d', Date) AS formatted_date,
+               Athlete, Result, Team, Result_ID,
+               ROW_NUMBER() OVER (
+                   PARTITION BY Meet_Name, Event
+                   ORDER BY Result_Value IS NULL, {best_first()}, Result_ID
+               ) AS rn
+        FROM Results
+        JOIN Events ON Events.event_id = Results.Event_ID
+        WHERE {{where}}
+    )
+    WHERE rn = 1
+'''
+
+_INSERT = 'INSERT INTO MeetEventWinners (meet_name, event, date, athlete, result, team, result_id) '
+
+
+def _adjust_counter(cur, delta):
+    if delta:
+        cur.execute('UPDATE Counters SET value = value + ? WHERE name = ?', (delta, WINNERS_COUNTER))
+
+
+def refresh(cur, pairs):
+    """Recompute the winners of the given (meet, event) pairs and keep the counter in step."""
+    pairs = {(meet, event) for meet, event in pairs if meet is not None and event is not None}
+    if not pairs:
+        return
+    cur.executemany('DELETE FROM MeetEventWinners WHERE meet_name = ? AND event = ?', pairs)
+    removed = cur.rowcount
+    cur.executemany(_INSERT + _SELECT_WINNERS.format(where='Meet_Name = ? AND Event = ?'), pairs)
+    _adjust_counter(cur, cur.rowcount - removed)
+
+
+def rebuild(cur):
+    """Recompute every winner and reset the counter. Returns the number of rows written."""
+    cur.execute('DELETE FROM MeetEventWinners')
+    cur.execute(_INSERT + _SELECT_WINNERS.format(where='Meet_Name IS NOT NULL AND Event IS NOT NULL'))
+    count = cur.rowcount
+    cur.execute('INSERT OR REPLACE INTO Counters (name, value) VALUES (?, ?)', (WINNERS_COUNTER, count))
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild the MeetEventWinners feed from Results.')
+    parser.add_argument('--db', default='track.db', help='path to the sqlite database (default: track.db)')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db, timeout=30)
+    try:
+        with conn:
+            count = rebuild(conn.cursor())
+        print(f'{args.db}: rebuilt {count} meet event winners')
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
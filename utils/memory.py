@@ -0,0 +1,150 @@
+"""Opt-in tracemalloc instrumentation: per-request peak allocation and snapshot diffs.
+
+With MEMORY_TRACKING set, tracemalloc starts on the first request and every request
+records how far the traced heap peaked above where it started. Per-endpoint
+totals are kept for /debug/memory, where routes whose peak grows with the database show up.
+POST /debug/memory/snapshot stores a snapshot and returns its top allocating lines;
+/debug/memory/diff compares a new snapshot with a stored one.
+
+Peaks come from one process-wide counter (tracemalloc.reset_peak), so with concurrent
+requests a peak includes whatever other requests allocated at the same time; profile
+one route at a time for exact numbers. Tracing slows allocation-heavy code several times over.
+
+Config: MEMORY_TRACKING (default False), MEMORY_TRACE_FRAMES (default 1),
+MEMORY_PEAK_LOG_MB (log a warning for requests peaking above it; default None).
+"""
+import itertools
+import os
+import threading
+import tracemalloc
+from datetime import datetime
+
+from flask import current_app, g, request
+
+# endpoint -> {'requests', 'peak_total', 'peak_max', 'peak_max_path'}
+_endpoint_peaks = {}
+# snapshot id -> (taken at, tracemalloc.Snapshot); the oldest is dropped past _SNAPSHOTS_KEPT
+_snapshots = {}
+_SNAPSHOTS_KEPT = 5
+_snapshot_ids = itertools.count(1)
+_lock = threading.Lock()
+
+# Frames that are the tracer itself or the import machinery, not the app
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+def _before_request():
+    if not current_app.config.get('MEMORY_TRACKING'):
+        return
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(current_app.config.get('MEMORY_TRACE_FRAMES', 1))
+    tracemalloc.reset_peak()
+    g._memory_start = tracemalloc.get_traced_memory()[0]
+
+
+def _after_request(response):
+    start = g.pop('_memory_start', None)
+    if start is None or not tracemalloc.is_tracing():
+        return response
+    peak = max(0, tracemalloc.get_traced_memory()[1] - start)
+    endpoint = request.endpoint or request.path
+    with _lock:
+        totals = _endpoint_peaks.setdefault(
+            endpoint, {'requests': 0, 'peak_total': 0, 'peak_max': 0, 'peak_max_path': None})
+        totals['requests'] += 1
+        totals['peak_total'] += peak
+        if peak >= totals['peak_max']:
+            totals['peak_max'] = peak
+            totals['peak_max_path'] = request.full_path.rstrip('?')
+    limit_mb = current_app.config.get('MEMORY_PEAK_LOG_MB')
+    if limit_mb is not None and peak > limit_mb * 1024 * 1024:
+        current_app.logger.warning('%s peaked at %.1f MB (limit %s MB)', request.full_path, peak / 1048576, limit_mb)
+    return response
+
+
+def endpoint_report(limit=25):
+    """Per-endpoint peak allocation in bytes, largest peak first."""
+    with _lock:
+        rows = [dict(endpoint=name, **totals) for name, totals in _endpoint_peaks.items()]
+    for row in rows:
+        row['peak_avg'] = row['peak_total'] / row['requests']
+    rows.sort(key=lambda row: row['peak_max'], reverse=True)
+    return rows[:limit]
+
+
+def _line_stats(stats, limit):
+    rows = []
+    for stat in stats[:limit]:
+        frame = stat.traceback[0]
+        rows.append({
+            'file': os.path.relpath(frame.filename) if os.path.isabs(frame.filename) else frame.filename,
+            'line': frame.lineno,
+            'size': stat.size,
+            'count': stat.count,
+            'size_diff': getattr(stat, 'size_diff', None),
+            'count_diff': getattr(stat, 'count_diff', None),
+        })
+    return rows
+
+
+def _take():
+    if not tracemalloc.is_tracing():
+        raise RuntimeError('memory tracking is off (set MEMORY_TRACKING and make a request first)')
+    return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+
+def take_snapshot(limit=25):
+    """Store a snapshot and return {'id', 'taken', 'traced', 'top': [line stats]}."""
+    snapshot = _take()
+    taken = datetime.now().isoformat(timespec='seconds')
+    with _lock:
+        snapshot_id = next(_snapshot_ids)
+        _snapshots[snapshot_id] = (taken, snapshot)
+        for old in sorted(_snapshots)[:-_SNAPSHOTS_KEPT]:
+            del _snapshots[old]
+    stats = snapshot.statistics('lineno')
+    return {'id': snapshot_id, 'taken': taken, 'traced': sum(stat.size for stat in stats),
+            'top': _line_stats(stats, limit)}
+
+
+def diff(base_id=None, limit=25):
+    """Lines whose allocations changed most between stored snapshot base_id (default: newest) and now."""
+    with _lock:
+        if base_id is None and _snapshots:
+            base_id = max(_snapshots)
+        if base_id not in _snapshots:
+            raise KeyError(base_id)
+        taken, base = _snapshots[base_id]
+    stats = _take().compare_to(base, 'lineno')
+    return {'base': base_id, 'base_taken': taken, 'size_diff': sum(stat.size_diff for stat in stats),
+            'top': _line_stats(stats, limit)}
+
+
+def snapshots():
+    """[(id, taken at)] of the stored snapshots, oldest first."""
+    with _lock:
+        return [(snapshot_id, taken) for snapshot_id, (taken, _) in sorted(_snapshots.items())]
+
+
+def reset():
+    """Forget per-endpoint peaks and stored snapshots."""
+    with _lock:
+        _endpoint_peaks.clear()
+        _snapshots.clear()
+
+
+def stop():
+    """Stop tracing and free tracemalloc's bookkeeping (tests, or when done investigating)."""
+    reset()
+    tracemalloc.stop()
+
+
+def init_app(app):
+    """Register the hooks that measure each request's peak allocation."""
+    app.before_request(_before_request)
+    app.after_request(_after_request)
@@ -0,0 +1,238 @@
+"""On-demand profiling of single requests.
+
+With PROFILER_ENABLED set, a request carrying ?_profile=1 (or an X-Profile: 1 header)
+is profiled from before_request to after_request, so the view, its SQL and the
+template rendering are all inside the profile. Each profile is saved to PROFILE_DIR as
+
+* <id>.pstats     cProfile stats (mode 'cprofile' only), for `python -m pstats` or snakeviz,
+* <id>.collapsed  collapsed stacks ("a;b;c <microseconds>") for flamegraph.pl / speedscope,
+* <id>.json       endpoint, path, duration, SQL count and mode, listed on /debug/profiles.
+
+Modes: 'cprofile' (deterministic; collapsed stacks are approximated from its caller/callee
+totals) or 'sample' (a thread reads the request thread's stack every PROFILE_INTERVAL_MS
+through sys._current_frames, so stacks are exact and overhead stays flat). The query
+parameter may name the mode: ?_profile=sample.
+
+Config: PROFILER_ENABLED (default False), PROFILE_DIR (default 'profiles'),
+PROFILE_MODE (default 'cprofile'), PROFILE_INTERVAL_MS (default 1), PROFILES_KEPT (default 50).
+"""
+import cProfile
+import io
+import itertools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from flask import current_app, g, request
+
+MODES = ('cprofile', 'sample')
+_MAX_DEPTH = 200
+_sequence = itertools.count(1)
+
+
+def _requested_mode():
+    flag = request.args.get('_profile') or request.headers.get('X-Profile')
+    if not flag or flag in ('0', 'false'):
+        return None
+    return flag if flag in MODES else current_app.config.get('PROFILE_MODE', 'cprofile')
+
+
+def _frame_label(filename, lineno, name):
+    if filename == '~':  # builtins
+        return name
+    return f'{name} ({os.path.basename(filename)}:{lineno})'
+
+
+def collapsed_from_stats(stats):
+    """Approximate collapsed stacks {stack: seconds} from cProfile's caller/callee totals.
+
+    cProfile keeps no stacks, only per-edge times, so each function's time is split
+    between its callers in proportion to the time each call edge accounts for.
+    """
+    entries = stats.stats
+    children = defaultdict(list)
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            children[caller].append((func, edge[3]))
+    roots = [func for func, value in entries.items() if not any(caller in entries for caller in value[4])]
+    stacks = Counter()
+
+    def walk(func, budget, path, on_path):
+        _, _, tt, ct, _ = entries[func]
+        if budget < 1e-6 or not ct or len(path) > _MAX_DEPTH:
+            return
+        share = budget / ct
+        path = path + (_frame_label(*func),)
+        stacks[';'.join(path)] += tt * share
+        for child, edge_time in children[func]:
+            if child not in on_path:
+                walk(child, edge_time * share, path, on_path | {child})
+
+    for root in roots:
+        walk(root, entries[root][3], (), {root})
+    return stacks
+
+
+class _Sampler:
+    """Samples one thread's Python stack at a fixed interval; stacks are root-first."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            # Weight by the real gap: under the GIL samples can arrive later than the interval
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(_frame_label(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += elapsed
+
+
+def _before_request():
+    if not current_app.config.get('PROFILER_ENABLED'):
+        return
+    mode = _requested_mode()
+    if mode is None:
+        return
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler (a debugger, coverage) already owns the hook
+            return
+    else:
+        interval = current_app.config.get('PROFILE_INTERVAL_MS', 1) / 1000
+        profiler = _Sampler(threading.get_ident(), interval)
+        profiler.start()
+    g._profile = (mode, profiler, time.perf_counter())
+
+
+def _stop(state):
+    mode, profiler, _ = state
+    if mode == 'cprofile':
+        profiler.disable()
+    else:
+        profiler.stop()
+
+
+def _after_request(response):
+    state = g.pop('_profile', None)
+    if state is None:
+        return response
+    _stop(state)
+    mode, profiler, started = state
+    stats = g.get('_sql_stats')
+    profile_id = save(profiler, mode, {
+        'endpoint': request.endpoint,
+        'path': request.full_path.rstrip('?'),
+        'method': request.method,
+        'status': response.status_code,
+        'ms': round((time.perf_counter() - started) * 1000, 2),
+        'queries': stats.queries if stats is not None else None,
+    })
+    response.headers['X-Profile-Id'] = profile_id
+    return response
+
+
+def _teardown_request(exception=None):
+    # after_request does not run when the view raised; still release the profiler
+    state = g.pop('_profile', None)
+    if state is not None:
+        _stop(state)
+
+
+def profile_dir():
+    return current_app.config.get('PROFILE_DIR', 'profiles')
+
+
+def save(profiler, mode, meta):
+    """Write the profile files for one request and prune old ones. Returns the profile id."""
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    endpoint = (meta.get('endpoint') or 'unknown').replace('.', '-')
+    profile_id = f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}-{next(_sequence):06d}-{endpoint}"
+    base = os.path.join(directory, profile_id)
+    if mode == 'cprofile':
+        stats = pstats.Stats(profiler)
+        stats.dump_stats(base + '.pstats')
+        stacks = collapsed_from_stats(stats)
+    else:
+        stacks = profiler.stacks
+    with open(base + '.collapsed', 'w') as f:
+        for stack, seconds in sorted(stacks.items()):
+            microseconds = round(seconds * 1e6)
+            if microseconds:
+                f.write(f'{stack} {microseconds}\n')
+    with open(base + '.json', 'w') as f:
+        json.dump(dict(meta, id=profile_id, mode=mode, created=datetime.now().isoformat(timespec='seconds')), f)
+    _prune(directory, current_app.config.get('PROFILES_KEPT', 50))
+    return profile_id
+
+
+def _prune(directory, keep):
+    ids = sorted(name[:-5] for name in os.listdir(directory) if name.endswith('.json'))
+    for profile_id in ids[:-keep] if keep > 0 else []:
+        for suffix in ('.json', '.pstats', '.collapsed'):
+            path = os.path.join(directory, profile_id + suffix)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def recent_profiles(limit=50):
+    """Metadata of the newest saved profiles, newest first."""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if not name.endswith('.json'):
+            continue
+        with open(os.path.join(directory, name)) as f:
+            meta = json.load(f)
+        meta['files'] = [suffix for suffix in ('.pstats', '.collapsed')
+                         if os.path.exists(os.path.join(directory, meta['id'] + suffix))]
+        profiles.append(meta)
+        if len(profiles) >= limit:
+            break
+    return profiles
+
+
+def top_functions(profile_id, sort='cumulative', limit=40):
+    """pstats text report for a saved cProfile profile, or None if it has no .pstats file."""
+    path = os.path.join(profile_dir(), profile_id + '.pstats')
+    if not os.path.exists(path):
+        return None
+    stream = io.StringIO()
+    pstats.Stats(path, stream=stream).strip_dirs().sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+def init_app(app):
+    """Register the hooks; call after instrumentation.init_app so the SQL count is still available."""
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
@@ -0,0 +1,95 @@
+"""Trailing-year event rankings computed in memory.
+
+An athlete's rank in an event as of a date orders everyone by their best Result_Value
+dated within the WINDOW_DAYS up to and including that day; a meet's "before" rank keeps
+the meet's own window start and only drops the meet day itself. EventIndex holds one event's
+marks for the dates asked about, sorted by date, and, per window asked about, the sorted
+bests of that window, so after the first lookup for a window every rank is a dictionary
+hit and a bisection. models.AthleteRanking keeps one EventIndex per event and database,
+loads only the dates a caller needs, extends it when a later caller asks for others, and
+starts over from the requested dates when the event's ranking version (migration 15) moves.
+"""
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+WINDOW_DAYS = 365
+
+
+def shift(date, days):
+    """'YYYY-MM-DD' date moved by days."""
+    return (datetime.strptime(date, '%Y-%m-%d') + timedelta(days=days)).strftime('%Y-%m-%d')
+
+
+def window_start(date):
+    """First day of the ranking window that ends on date."""
+    return shift(date, -WINDOW_DAYS)
+
+
+class EventIndex:
+    """Rank-as-of-date lookups over one event's (date, athlete, value) marks.
+
+    Only the marks dated within span are held, so windows must lie inside it (see covers()).
+    Lower values rank first unless descending; tied bests share the better rank. The
+    windows of the last max_dates (start, as-of) pairs are kept, least recently used dropped first.
+    """
+
+    def __init__(self, marks, descending=False, span=None, max_dates=32):
+        self.marks = sorted(marks, key=lambda mark: mark[0])
+        self.dates = [mark[0] for mark in self.marks]
+        self.descending = descending
+        # (first, last) date the marks were loaded for; None means every mark of the event
+        self.span = span
+        self.max_dates = max_dates
+        # (start, as_of) -> ({athlete: best key}, sorted best keys)
+        self._windows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def covers(self, start, end):
+        """True if every mark dated start..end is loaded."""
+        return self.span is None or (self.span[0] <= start and end <= self.span[1])
+
+    def extended(self, marks, span):
+        """A copy that also holds marks, loaded for the dates span adds to this one's.
+
+        Windows already computed lie inside the old span, so they carry over unchanged.
+        """
+        index = EventIndex(self.marks + list(marks), self.descending, span, self.max_dates)
+        with self._lock:
+            index._windows.update(self._windows)
+        return index
+
+    def _window(self, as_of, start=None):
+        key = (start or window_start(as_of), as_of)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is not None:
+                self._windows.move_to_end(key)
+                return window
+        best = {}
+        for _, athlete, value in self.marks[bisect_left(self.dates, key[0]):
+                                            bisect_right(self.dates, as_of)]:
+            mark = -value if self.descending else value
+            if mark < best.get(athlete, float('inf')):
+                best[athlete] = mark
+        window = (best, sorted(best.values()))
+        with self._lock:
+            self._windows[key] = window
+            while len(self._windows) > self.max_dates:
+                self._windows.popitem(last=False)
+        return window
+
+    def rank(self, athlete, as_of, start=None):
+        """athlete's rank as of the date, or None without a mark in the window.
+
+        The window runs from start (default window_start(as_of)) through as_of.
+        """
+        best, ordered = self._window(as_of, start)
+        key = best.get(athlete)
+        return None if key is None else bisect_left(ordered, key) + 1
+
+    def ranks(self, as_of, start=None):
+        """{athlete: rank} for everyone with a mark in the window ending on as_of."""
+        best, ordered = self._window(as_of, start)
+        return {athlete: bisect_left(ordered, key) + 1 for athlete, key in best.items()}
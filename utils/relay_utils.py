@@ -1,16 +1,9 @@
-from models import RelayTeam
+from models import Event
+from utils.result_values import parse_result
 
 def parse_time(time_str):
-    if ':' in time_str:
-        parts = time_str.split(':')
-        if len(parts) == 2:
-            minutes = float(parts[0])
-            seconds = float(parts[1])
-            return minutes * 60 + seconds
-    try:
-        return float(time_str)
-    except:
-        return float('inf')
+    value, _ = parse_result(time_str)
+    return float('inf') if value is None else value
 
 def format_relay_time(total_seconds):
     minutes = int(total_seconds // 60)
@@ -19,7 +12,7 @@ def format_relay_time(total_seconds):
 
 def is_relay_event(event):
     """Check if an event name is a relay event."""
-    return event in RelayTeam.RELAY_CONFIG or event.endswith(' Relay')
+    return Event.is_relay(event)
 
 def calculate_relay_results(splits, relay_type):
     """
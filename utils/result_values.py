@@ -0,0 +1,136 @@
+"""Canonical numeric value for a result string (seconds for times, meters for marks).
+
+Every sort and comparison of results goes through parse_result so that "1:52.34",
+"58.1", 17'6" and 5.33 all land on one comparable scale. The value and its kind are
+persisted on write as Results.Result_Value/Result_Kind (RelayLegs.Split_Value/Split_Kind)
+so SQL can order by them through the (Event, Result_Value) index.
+"""
+import re
+
+KIND_TIME = 'time'
+KIND_FT_IN = 'ft-in'
+KIND_METRIC = 'metric'
+
+METERS_PER_INCH = 0.0254
+
+# Events measured in distance/height/points: higher is better. Everything else is timed.
+# Name heuristic only; the Events registry (models.Event) is authoritative where an event is registered.
+_FIELD_WORDS = ('jump', 'vault', 'put', 'throw', 'discus', 'javelin', 'hammer', 'weight', 'athlon')
+_FIELD_ABBREVIATIONS = {'HJ', 'LJ', 'TJ', 'PV', 'SP', 'DT', 'JT', 'HT', 'WT'}
+
+_FEET_CHARS = "'\u2019\u2032\u00b4"   # ASCII apostrophe, right single quote, prime, acute
+_INCH_CHARS = '"\u201c\u201d\u2033\u2034'  # ASCII quote, curly left/right, double prime
+_FT_IN = re.compile(r"^(\d+)\s*'\s*(\d+(?:\.\d+)?)?\s*\"?$")
+_TIME = re.compile(r'^(?:(\d+):)?(\d+):(\d+(?:\.\d+)?)$')
+
+
+def is_time_event(event):
+    """Return True if lower results are better for this event."""
+    if not event:
+        return True
+    name = event.strip()
+    if name.upper() in _FIELD_ABBREVIATIONS:
+        return False
+    lowered = name.lower()
+    return not any(word in lowered for word in _FIELD_WORDS)
+
+
+def _clean(result_str):
+    s = result_str.strip()
+    for c in _FEET_CHARS[1:]:
+        s = s.replace(c, "'")
+    for c in _INCH_CHARS[1:]:
+        s = s.replace(c, '"')
+    # Trailing qualifiers/wind/hand-timing marks: 10.51q, 7.12w, 11.2h, 6.50m
+    while s and s[-1].isalpha():
+        s = s[:-1].rstrip()
+    return s
+
+
+def parse_result(result_str, event=None, time_event=None):
+    """
+    Parse a result into (value, kind).
+
+    value is seconds for times and meters for ft-in/metric marks; kind is one of
+    KIND_TIME, KIND_FT_IN, KIND_METRIC. Plain numbers are times for timed events
+    and metric marks otherwise; pass time_event to override the name heuristic
+    (models.Event does this from the Events registry). Unparseable results
+    (DNF, DQ, NM...) return (None, None).
+    """
+    if result_str is None:
+        return None, None
+    s = _clean(str(result_str))
+    if not s:
+        return None, None
+
+    m = _FT_IN.match(s)
+    if m:
+        inches = int(m.group(1)) * 12 + float(m.group(2) or 0)
+        return round(inches * METERS_PER_INCH, 4), KIND_FT_IN
+
+    m = _TIME.match(s)
+    if m:
+        hours = int(m.group(1) or 0)
+        return hours * 3600 + int(m.group(2)) * 60 + float(m.group(3)), KIND_TIME
+
+    try:
+        value = float(s)
+    except ValueError:
+        return None, None
+    if time_event is None:
+        time_event = is_time_event(event)
+    return value, (KIND_TIME if time_event else KIND_METRIC)
+
+
+def sort_key(value, kind):
+    """Ascending sort key that puts the best result first and unparseable results last."""
+    if value is None:
+        return (1, 0.0)
+    return (0, value if kind == KIND_TIME else -value)
+
+
+def best_first(direction='Events.direction', value='Result_Value', kind='Result_Kind'):
+    """SQL ordering term that puts the best mark first: lowest first for ASC events, highest for DESC.
+
+    The query joins Events for direction, so a changed registry entry reorders stored rows at
+    once; events without a registered direction fall back to the stored kind. Sort
+    `value IS NULL` ahead of it to put unparseable results last.
+    """
+    return (f"CASE WHEN {direction} = 'DESC' OR ({direction} IS NULL AND {kind} != 'time') "
+            f"THEN -{value} ELSE {value} END")
+
+
+def load_time_events(cur):
+    """{event name: True if timed} from the Events registry; unregistered events use the name heuristic."""
+    cur.execute('SELECT event_name, direction FROM Events WHERE direction IS NOT NULL')
+    return {name: direction == 'ASC' for name, direction in cur.fetchall()}
+
+
+def load_event_aliases(cur):
+    """{alias: registered event name} from EventAliases, for write paths outside the app (models.Event)."""
+    cur.execute('SELECT alias, event_name FROM EventAliases')
+    return dict(cur.fetchall())
+
+
+def register_functions(conn, time_events=None):
+    """Expose result_value(result, event) and result_kind(result, event) to SQL on this connection.
+
+    time_events ({event: timed?}, see load_time_events) decides how bare numbers read for
+    registered events.
+    """
+    time_events = time_events or {}
+
+    def parse(result, event):
+        return parse_result(result, event, time_event=time_events.get(event))
+
+    conn.create_function('result_value', 2, lambda r, e: parse(r, e)[0], deterministic=True)
+    conn.create_function('result_kind', 2, lambda r, e: parse(r, e)[1], deterministic=True)
+
+
+def backfill(cur):
+    """Recompute the persisted values for every Results row and relay leg."""
+    register_functions(cur.connection)
+    cur.execute('UPDATE Results SET Result_Value = result_value(Result, Event), '
+                'Result_Kind = result_kind(Result, Event)')
+    cur.execute('UPDATE RelayLegs SET Split_Value = result_value(Split_Result, Split_Event), '
+                'Split_Kind = result_kind(Split_Result, Split_Event)')
@@ -2,11 +2,12 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import calendar
+import os
 from datetime import date, datetime
 from flask import Flask, render_template, redirect, url_for, flash, request, jsonify
 from flask_wtf import CSRFProtect
 from forms import ResultForm, SearchForm
-from models import Result, Database, Athlete
+from models import Result, Database, Athlete, Team
 from utils.template_filters import markdown_to_html
 
 # Import blueprints
@@ -18,12 +19,41 @@ from routes.leaderboard_routes import leaderboard_bp
 from routes.comment_routes import comment_bp
 from routes.football_routes import football_bp
 from routes.board_routes import board_bp
+from routes.debug_routes import debug_bp
+from utils import instrumentation, memory, profiler
 
 app = Flask(__name__)
 app.config['DATABASE'] = 'track.db'
 app.secret_key = 'your_secret_key_here'
 csrf = CSRFProtect(app)
 
+# Create the schema once and share one connection per request (closed on teardown)
+Database.init_app(app)
+
+# Per-request SQL timing: Server-Timing header, slow-query JSONL log (only if SLOW_QUERY_LOG is set), /debug/perf
+app.config['SQL_INSTRUMENTATION'] = os.environ.get('SQL_INSTRUMENTATION') == '1'
+app.config['SLOW_QUERY_MS'] = float(os.environ.get('SLOW_QUERY_MS', 200))
+app.config['SLOW_QUERY_LOG'] = os.environ.get('SLOW_QUERY_LOG')
+instrumentation.init_app(app)
+
+# Single-request profiles on ?_profile=1 (or X-Profile: 1), listed on /debug/profiles
+app.config['PROFILER_ENABLED'] = os.environ.get('PROFILER_ENABLED') == '1'
+app.config['PROFILE_DIR'] = os.environ.get('PROFILE_DIR', 'profiles')
+profiler.init_app(app)
+
+# Per-request peak allocation with tracemalloc, shown on /debug/memory (slows every request while on)
+app.config['MEMORY_TRACKING'] = os.environ.get('MEMORY_TRACKING') == '1'
+memory.init_app(app)
+
+# Meet page view-models cached by (meet, Meets.version): 'memory' (per process), 'sqlite' (shared file) or 'off'
+app.config['MEET_CACHE'] = os.environ.get('MEET_CACHE', 'memory')
+app.config['MEET_CACHE_SIZE'] = int(os.environ.get('MEET_CACHE_SIZE', 128))
+app.config['MEET_CACHE_PATH'] = os.environ.get('MEET_CACHE_PATH', 'meet_cache.db')
+
+# The /debug pages show bound SQL parameters and profiles and have no auth: off unless asked for
+app.config['DEBUG_ROUTES'] = os.environ.get('DEBUG_ROUTES') == '1' or any(
+    app.config[flag] for flag in ('SQL_INSTRUMENTATION', 'PROFILER_ENABLED', 'MEMORY_TRACKING'))
+
 # Register blueprints
 app.register_blueprint(athlete_bp)
 app.register_blueprint(result_bp)
@@ -33,6 +63,8 @@ app.register_blueprint(leaderboard_bp)
 app.register_blueprint(comment_bp)
 app.register_blueprint(football_bp)
 app.register_blueprint(board_bp)
+if app.config['DEBUG_ROUTES']:
+    app.register_blueprint(debug_bp)
 
 # Exempt API endpoint from CSRF (JSON POST; no form)
 if 'result.fill_result_blanks' in app.view_functions:
@@ -50,14 +82,12 @@ def home():
     # Event filter options
     filter_events = ['100m', '200m', '400m', '800m', '1500m', 'Mile', '3000m', '5000m', '10000m']
     
-    # Get team logos for all teams
-    conn = Database.get_connection()
-    with conn:
-        cur = conn.cursor()
-        cur.execute('SELECT team_name, logo_url FROM Teams')
-        team_logos = dict(cur.fetchall())
-    
-    results = Result.get_recent_winners(limit=per_page, offset=(page-1)*per_page)
+    after = (request.args.get('after_date'), request.args.get('after_meet'), request.args.get('after_event'))
+    results = Result.get_recent_winners(limit=per_page, offset=(page-1)*per_page,
+                                        after=after if all(after) else None)
+    # Logos for the teams on this page; they also fill the (client-side) team filter
+    team_logos = Team.logos(sorted({row[5] for row in results if row[5]}))
+    genders = Athlete.genders([row[1] for row in results])
     total_results = Result.get_total_winners()
     total_pages = (total_results + per_page - 1) // per_page
     
@@ -65,14 +95,11 @@ def home():
                          results=results, 
                          form=form, 
                          team_logos=team_logos,
+                         genders=genders,
                          filter_events=filter_events,
                          page=page,
                          total_pages=total_pages)
 
-@app.context_processor
-def inject_get_gender():
-    return dict(get_gender=Athlete.get_gender)
-
 @app.route('/get_team_members/<team_name>')
 def get_team_members(team_name):
     conn = Database.get_connection()
@@ -103,11 +130,10 @@ def get_athlete_prs(athlete_name):
     with conn:
         cur = conn.cursor()
         cur.execute('''
-            SELECT Event, MIN(Result) as PR
-            FROM Results 
-            WHERE Athlete = ? 
-            GROUP BY Event
-            ORDER BY Event
+            SELECT event, result AS PR
+            FROM AthleteBests
+            WHERE athlete = ?
+            ORDER BY event
         ''', (athlete_name,))
         prs = [{'event': row[0], 'pr': row[1]} for row in cur.fetchall()]
         return jsonify({'prs': prs})